@@ -18,7 +18,9 @@ from sqlalchemy.dialects import postgresql
 # revision identifiers, used by Alembic.
 revision: str = '002'
 down_revision: Union[str, None] = '001'
-branch_labels: Union[str, Sequence[str], None] = None
+# Other migrations share the revision id '002'; later storage migrations
+# depend on this one through its label
+branch_labels: Union[str, Sequence[str], None] = ('storage',)
 depends_on: Union[str, Sequence[str], None] = None
 
 
@@ -0,0 +1,95 @@
+"""add_storage_blobs
+
+Revision ID: e5b1c7d2a4f6
+Revises: 001
+Create Date: 2026-10-18 09:00:00
+
+Adds content-addressed storage for uploaded files:
+- storage_blobs: One row per distinct content (SHA-256) and backend,
+  reference-counted by the files sharing it
+- files.blob_id: Blob holding the file content (NULL for files that keep
+  owning their storage path)
+
+Existing files are backfilled: each distinct content gets a blob holding
+its oldest copy, referenced by that file, so new uploads of it are
+deduplicated. Other existing copies of the same content keep owning their
+storage path until they are deleted.
+
+The files table is created by the storage tables migration, whose revision
+id ('002') is shared with other migrations; this migration revises its
+parent ('001') and depends on it through its 'storage' branch label.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b1c7d2a4f6'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = 'storage'
+
+
+def upgrade() -> None:
+    # storage_backend_enum already exists (created with the files table)
+    op.create_table(
+        'storage_blobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('checksum', sa.String(64), nullable=False),
+        sa.Column(
+            'storage_backend',
+            postgresql.ENUM('local', 's3', name='storage_backend_enum', create_type=False),
+            nullable=False
+        ),
+        sa.Column('storage_path', sa.String(500), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(100), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('orphaned_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('checksum', 'storage_backend', name='uq_storage_blobs_checksum_backend'),
+    )
+    op.create_index('ix_storage_blobs_orphaned_at', 'storage_blobs', ['orphaned_at'], unique=False)
+
+    op.add_column('files', sa.Column('blob_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        'fk_files_blob_id_storage_blobs',
+        'files', 'storage_blobs',
+        ['blob_id'], ['id'],
+        ondelete='SET NULL'
+    )
+    op.create_index('ix_files_blob_id', 'files', ['blob_id'], unique=False)
+
+    # Backfill: one blob per existing content, holding its oldest copy
+    op.execute("""
+        INSERT INTO storage_blobs (
+            id, checksum, storage_backend, storage_path, size_bytes, content_type, ref_count
+        )
+        SELECT DISTINCT ON (checksum, storage_backend)
+            gen_random_uuid(), checksum, storage_backend, storage_path, size_bytes,
+            content_type,
+            count(*) OVER (PARTITION BY checksum, storage_backend, storage_path)
+        FROM files
+        WHERE checksum IS NOT NULL
+        ORDER BY checksum, storage_backend, created_at, id
+    """)
+    op.execute("""
+        UPDATE files
+        SET blob_id = storage_blobs.id
+        FROM storage_blobs
+        WHERE files.checksum = storage_blobs.checksum
+          AND files.storage_backend = storage_blobs.storage_backend
+          AND files.storage_path = storage_blobs.storage_path
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_files_blob_id', table_name='files')
+    op.drop_constraint('fk_files_blob_id_storage_blobs', 'files', type_='foreignkey')
+    op.drop_column('files', 'blob_id')
+
+    op.drop_index('ix_storage_blobs_orphaned_at', table_name='storage_blobs')
+    op.drop_table('storage_blobs')
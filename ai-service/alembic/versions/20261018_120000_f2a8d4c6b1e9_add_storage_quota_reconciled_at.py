@@ -0,0 +1,31 @@
+"""add_storage_quota_reconciled_at
+
+Revision ID: f2a8d4c6b1e9
+Revises: e5b1c7d2a4f6
+Create Date: 2026-10-18 12:00:00
+
+Adds storage_quotas.reconciled_at, when the usage of a quota was last
+recounted from its files. Quotas updated since then are due for
+reconciliation; NULL (all existing quotas) means never reconciled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d4c6b1e9'
+down_revision: Union[str, None] = 'e5b1c7d2a4f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'storage_quotas',
+        sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('storage_quotas', 'reconciled_at')
@@ -0,0 +1,129 @@
+"""partition_audit_logs_by_month
+
+Revision ID: b8d2f6a4c1e3
+Revises: f2a8d4c6b1e9
+Create Date: 2026-10-18 15:00:00
+
+Recreates audit_logs and document_audit_logs as tables range-partitioned
+by month on their event time, so time-filtered audit queries only scan the
+months they cover and expired history can be dropped a month at a time.
+
+The partition key must be part of the primary key, which becomes
+(id, <event time>). Monthly partitions are created from the first month
+with events to a few months ahead, plus a default partition catching
+events of months without one; the audit writer creates later months as
+time goes by (see app/services/audit_partitions.py). Existing rows are
+copied into the new tables.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f6a4c1e3'
+down_revision: Union[str, None] = 'f2a8d4c6b1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months after the current one partitioned up front
+MONTHS_AHEAD = 3
+
+# Partitioned tables: partition column, indexes and foreign keys
+AUDIT_TABLES = {
+    'audit_logs': {
+        'column': 'created_at',
+        'indexes': {
+            'ix_audit_logs_user_id': ['user_id'],
+            'ix_audit_logs_action': ['action'],
+            'ix_audit_logs_created_at': ['created_at'],
+            'ix_audit_logs_user_action': ['user_id', 'action'],
+            'ix_audit_logs_resource': ['resource_type', 'resource_id'],
+            'ix_audit_logs_created_at_desc': ['created_at'],
+        },
+        'foreign_keys': [],
+    },
+    'document_audit_logs': {
+        'column': 'timestamp',
+        'indexes': {
+            'ix_document_audit_logs_event_type': ['event_type'],
+            'ix_document_audit_logs_document_id': ['document_id'],
+            'ix_document_audit_logs_user_id': ['user_id'],
+            'ix_document_audit_logs_signature_id': ['signature_id'],
+            'ix_document_audit_logs_signature_request_id': ['signature_request_id'],
+            'ix_document_audit_logs_timestamp': ['timestamp'],
+        },
+        'foreign_keys': [
+            ('document_id', 'documents', 'CASCADE'),
+            ('signature_id', 'signatures', 'SET NULL'),
+            ('signature_request_id', 'signature_requests', 'SET NULL'),
+        ],
+    },
+}
+
+
+def _month(day: date, offset: int = 0) -> date:
+    """First day of the month ``offset`` months after the month of ``day``."""
+    months = day.year * 12 + day.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _rebuild(table: str, source: str, partitioned: bool) -> None:
+    """Create ``table`` from the columns of ``source``, copy its rows and drop it."""
+    spec = AUDIT_TABLES[table]
+    column = spec['column']
+
+    partition_by = f' PARTITION BY RANGE ("{column}")' if partitioned else ''
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS INCLUDING COMMENTS)'
+        f'{partition_by}'
+    )
+    primary_key = f'id, "{column}"' if partitioned else 'id'
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})')
+    for local_column, referent, ondelete in spec['foreign_keys']:
+        op.create_foreign_key(
+            f'{table}_{local_column}_fkey', table, referent,
+            [local_column], ['id'], ondelete=ondelete,
+        )
+    for name, columns in spec['indexes'].items():
+        op.create_index(name, table, columns, unique=False)
+
+    if partitioned:
+        first = op.get_bind().execute(
+            sa.text(f'SELECT min("{column}") FROM {source}')
+        ).scalar()
+        today = date.today()
+        month = _month(first.date() if first is not None else today)
+        last = _month(today, MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f'CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} '
+                f'PARTITION OF {table} '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_month(month, 1).isoformat()}')"
+            )
+            month = _month(month, 1)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {source}')
+    op.execute(f'DROP TABLE {source}')
+
+
+def _set_aside(table: str, suffix: str) -> str:
+    """Rename a table and free the names of its indexes and primary key."""
+    for name in AUDIT_TABLES[table]['indexes']:
+        op.drop_index(name, table_name=table)
+    source = f'{table}_{suffix}'
+    op.execute(f'ALTER TABLE {table} RENAME TO {source}')
+    op.execute(f'ALTER TABLE {source} RENAME CONSTRAINT {table}_pkey TO {source}_pkey')
+    return source
+
+
+def upgrade() -> None:
+    for table in AUDIT_TABLES:
+        _rebuild(table, _set_aside(table, 'unpartitioned'), partitioned=True)
+
+
+def downgrade() -> None:
+    for table in AUDIT_TABLES:
+        _rebuild(table, _set_aside(table, 'partitioned'), partitioned=False)
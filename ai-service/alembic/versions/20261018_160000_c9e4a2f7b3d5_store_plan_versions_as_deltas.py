@@ -0,0 +1,218 @@
+"""store_plan_versions_as_deltas
+
+Revision ID: c9e4a2f7b3d5
+Revises: b8d2f6a4c1e3
+Create Date: 2026-10-18 16:00:00
+
+Stores intervention plan versions as deltas from the previous version
+instead of full snapshots (see app/services/plan_versioning.py):
+- intervention_versions.delta_data: JSON-patch operations turning the
+  previous version's snapshot into this version's
+- intervention_versions.is_checkpoint: Whether the version keeps its full
+  snapshot; one version in every 10 does
+
+Existing versions are converted plan by plan: every version gets the delta
+from its predecessor, and the snapshots of versions that are not
+checkpoints are cleared. Versions without a snapshot are left as they are,
+and the next version with one becomes a checkpoint. The downgrade rebuilds
+every snapshot from the checkpoints and deltas.
+
+The diff and patch functions are copied here so that later changes to the
+application cannot change what this migration does.
+"""
+import copy
+from itertools import chain
+from typing import Any, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a2f7b3d5'
+down_revision: Union[str, None] = 'b8d2f6a4c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+# Runs after the intervention plan migrations, which create and validate
+# the snapshots converted here
+depends_on: Union[str, Sequence[str], None] = 'c4f9d8e3a5b2'
+
+CHECKPOINT_INTERVAL = 10
+
+PLAN_SECTIONS = (
+    'strengths', 'needs', 'goals', 'strategies',
+    'monitoring', 'parent_involvements', 'consultations',
+)
+
+_MISSING = object()
+
+versions_table = sa.table(
+    'intervention_versions',
+    sa.column('id', postgresql.UUID(as_uuid=True)),
+    sa.column('plan_id', postgresql.UUID(as_uuid=True)),
+    sa.column('version_number', sa.Integer()),
+    sa.column('snapshot_data', postgresql.JSONB(none_as_null=True)),
+    sa.column('delta_data', postgresql.JSONB(none_as_null=True)),
+    sa.column('is_checkpoint', sa.Boolean()),
+)
+
+
+def _pointer(*tokens: str) -> str:
+    return ''.join('/' + token.replace('~', '~0').replace('/', '~1') for token in tokens)
+
+
+def _tokens(pointer: str) -> list:
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer.split('/')[1:]]
+
+
+def _section_items(value: Any) -> Optional[dict]:
+    if not isinstance(value, list):
+        return None
+    if not all(isinstance(item, dict) and 'id' in item for item in value):
+        return None
+    return {str(item['id']): item for item in value}
+
+
+def _diff_value(tokens: tuple, old: Any, new: Any, delta: list) -> None:
+    path = _pointer(*tokens)
+    if old is _MISSING and new is _MISSING or old == new:
+        return
+    if old is _MISSING:
+        delta.append({'op': 'add', 'path': path, 'value': new})
+        return
+    delta.append({'op': 'test', 'path': path, 'value': old})
+    if new is _MISSING:
+        delta.append({'op': 'remove', 'path': path})
+    else:
+        delta.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def _diff(old: dict, new: dict) -> list:
+    delta: list = []
+    for key in chain(old, (key for key in new if key not in old)):
+        before = old.get(key, _MISSING)
+        after = new.get(key, _MISSING)
+        before_items = _section_items(before) if key in PLAN_SECTIONS else None
+        after_items = _section_items(after) if key in PLAN_SECTIONS else None
+        if before_items is None or after_items is None:
+            _diff_value((key,), before, after, delta)
+            continue
+        for item_id, item in before_items.items():
+            changed = after_items.get(item_id, _MISSING)
+            if changed is _MISSING:
+                _diff_value((key, item_id), item, _MISSING, delta)
+                continue
+            for field in chain(item, (field for field in changed if field not in item)):
+                _diff_value(
+                    (key, item_id, field),
+                    item.get(field, _MISSING),
+                    changed.get(field, _MISSING),
+                    delta,
+                )
+        for item_id, item in after_items.items():
+            if item_id not in before_items:
+                _diff_value((key, item_id), _MISSING, item, delta)
+    return delta
+
+
+def _apply(snapshot: dict, delta: list) -> dict:
+    state = copy.deepcopy(snapshot)
+    sections: dict = {}
+    for operation in delta:
+        if operation['op'] == 'test':
+            continue
+        tokens = _tokens(operation['path'])
+        key = tokens[0]
+        removed = operation['op'] == 'remove'
+        value = None if removed else copy.deepcopy(operation['value'])
+        if len(tokens) == 1:
+            sections.pop(key, None)
+            if removed:
+                state.pop(key, None)
+            else:
+                state[key] = value
+            continue
+        if key not in sections:
+            sections[key] = _section_items(state.get(key, []))
+        items = sections[key]
+        if len(tokens) == 2:
+            if removed:
+                items.pop(tokens[1], None)
+            else:
+                items[tokens[1]] = value
+        elif removed:
+            items[tokens[1]].pop(tokens[2], None)
+        else:
+            items[tokens[1]][tokens[2]] = value
+    for key, items in sections.items():
+        state[key] = list(items.values())
+    return state
+
+
+def _plan_versions(bind, plan_id) -> list:
+    return bind.execute(
+        sa.select(
+            versions_table.c.id,
+            versions_table.c.snapshot_data,
+            versions_table.c.delta_data,
+            versions_table.c.is_checkpoint,
+        )
+        .where(versions_table.c.plan_id == plan_id)
+        .order_by(versions_table.c.version_number)
+    ).all()
+
+
+def _plan_ids(bind) -> list:
+    return bind.execute(sa.select(versions_table.c.plan_id).distinct()).scalars().all()
+
+
+def upgrade() -> None:
+    op.add_column(
+        'intervention_versions',
+        sa.Column('delta_data', postgresql.JSONB(), nullable=True),
+    )
+    op.add_column(
+        'intervention_versions',
+        sa.Column('is_checkpoint', sa.Boolean(), nullable=False, server_default=sa.true()),
+    )
+
+    bind = op.get_bind()
+    for plan_id in _plan_ids(bind):
+        previous = None
+        since_checkpoint = 0
+        for row in _plan_versions(bind, plan_id):
+            if row.snapshot_data is None:
+                # Nothing to diff; the next version with a snapshot is a checkpoint
+                values = {'is_checkpoint': False}
+                previous = None
+            else:
+                delta = _diff(previous, row.snapshot_data) if previous is not None else None
+                is_checkpoint = delta is None or since_checkpoint >= CHECKPOINT_INTERVAL
+                since_checkpoint = 1 if is_checkpoint else since_checkpoint + 1
+                values = {'delta_data': delta, 'is_checkpoint': is_checkpoint}
+                if not is_checkpoint:
+                    values['snapshot_data'] = None
+                previous = row.snapshot_data
+            bind.execute(
+                versions_table.update().where(versions_table.c.id == row.id).values(**values)
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for plan_id in _plan_ids(bind):
+        state = None
+        for row in _plan_versions(bind, plan_id):
+            if row.is_checkpoint:
+                state = row.snapshot_data
+            elif row.delta_data is not None and state is not None:
+                state = _apply(state, row.delta_data)
+                bind.execute(
+                    versions_table.update()
+                    .where(versions_table.c.id == row.id)
+                    .values(snapshot_data=state)
+                )
+            else:
+                state = None
+
+    op.drop_column('intervention_versions', 'is_checkpoint')
+    op.drop_column('intervention_versions', 'delta_data')
@@ -8,7 +8,7 @@ from __future__ import annotations
 from typing import Any, Callable, Optional, Type, TypeVar
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy import and_, cast, or_, select, String
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,6 +25,7 @@ ModelType = TypeVar("ModelType")
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
+    request: Request = None,
 ) -> dict[str, Any]:
     """Dependency to get the current authenticated user from JWT token.
 
@@ -35,6 +36,8 @@ async def get_current_user(
     Args:
         credentials: HTTP Authorization credentials injected by FastAPI
         db: Async database session for blacklist lookup
+        request: The current request, injected by FastAPI; the token payload
+            decoded for it by the middlewares is reused
 
     Returns:
         dict[str, Any]: Decoded token payload containing user information
@@ -48,7 +51,7 @@ async def get_current_user(
         async def get_profile(current_user: dict = Depends(get_current_user)):
             return {"user_id": current_user["sub"], "email": current_user["email"]}
     """
-    return await verify_token(credentials, db)
+    return await verify_token(credentials, db, request)
 
 
 def require_role(*allowed_roles: UserRole) -> Callable:
@@ -8,18 +8,37 @@ from typing import Any, Optional
 
 import jwt
 from jwt.exceptions import InvalidTokenError
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from starlette.datastructures import Headers
+from starlette.types import Scope
 
 from app.config import settings
+from app.core.hot_queries import HotQuery
 
 
 # HTTPBearer security scheme for token extraction
 security = HTTPBearer()
 
 
+def _token_blacklisted_query() -> Select:
+    """Build the blacklist lookup of the ``token`` parameter."""
+    # Import here to avoid circular dependency
+    from app.auth.models import TokenBlacklist
+
+    return select(TokenBlacklist.id).where(TokenBlacklist.token == bindparam("token"))
+
+
+# Runs for every authenticated request
+TOKEN_BLACKLISTED_QUERY = HotQuery("auth.token_blacklisted", _token_blacklisted_query)
+
+# Key of the decoded bearer token payload in the request state
+TOKEN_PAYLOAD_STATE_KEY = "token_payload"
+
+
 def create_token(
     subject: str,
     expires_delta_seconds: int = 3600,
@@ -115,19 +134,84 @@ def decode_token(token: str) -> dict[str, Any]:
         )
 
 
+def get_bearer_token_payload(authorization: Optional[str]) -> Optional[dict[str, Any]]:
+    """Decode the token of an Authorization header without raising.
+
+    Intended for middleware that only needs to know who is calling (e.g. to
+    key rate limits or cached responses). Invalid or missing tokens yield
+    None; endpoints still reject them through ``verify_token``. The blacklist
+    is not consulted.
+
+    Args:
+        authorization: Value of the Authorization header, if any
+
+    Returns:
+        Optional[dict[str, Any]]: Token payload, or None if the header does
+        not carry a valid bearer token
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token)
+    except HTTPException:
+        return None
+
+
+def get_request_token_payload(scope: Scope) -> Optional[dict[str, Any]]:
+    """Decode the bearer token of a request once and share the result.
+
+    Like ``get_bearer_token_payload``, but the payload (or None) is kept in
+    the request state (``scope["state"]``), so the middlewares and
+    dependencies that need to know the caller decode the token only once
+    per request. The blacklist is not consulted.
+
+    Args:
+        scope: ASGI scope of the request
+
+    Returns:
+        Optional[dict[str, Any]]: Token payload, or None if the request does
+        not carry a valid bearer token
+    """
+    request_state = scope.setdefault("state", {})
+    if TOKEN_PAYLOAD_STATE_KEY not in request_state:
+        authorization = Headers(scope=scope).get("authorization")
+        request_state[TOKEN_PAYLOAD_STATE_KEY] = get_bearer_token_payload(authorization)
+    return request_state[TOKEN_PAYLOAD_STATE_KEY]
+
+
+async def is_token_blacklisted(db: AsyncSession, token: str) -> bool:
+    """Check whether a token has been revoked.
+
+    Args:
+        db: Async database session for the blacklist lookup
+        token: Encoded JWT token
+
+    Returns:
+        bool: True if the token is blacklisted
+    """
+    result = await TOKEN_BLACKLISTED_QUERY.execute(db, {"token": token})
+    return result.scalar_one_or_none() is not None
+
+
 async def verify_token(
     credentials: HTTPAuthorizationCredentials,
     db: AsyncSession,
+    request: Optional[Request] = None,
 ) -> dict[str, Any]:
     """Verify and decode a JWT token, checking against the blacklist.
 
     This function extracts the token from HTTP credentials, decodes it,
     and verifies it has not been revoked (blacklisted). Use this for
     authenticated endpoints to ensure tokens are valid and not revoked.
+    When the request is given, the payload the middlewares already decoded
+    (see ``get_request_token_payload``) is reused; the token is only decoded
+    here when there is none, which also raises the appropriate error.
 
     Args:
         credentials: HTTP Authorization credentials containing the Bearer token
         db: Async database session for blacklist lookup
+        request: The request the credentials were read from, if available
 
     Returns:
         dict[str, Any]: Decoded token payload containing claims
@@ -144,18 +228,16 @@ async def verify_token(
             payload = await verify_token(credentials, db)
             return {"user_id": payload["sub"]}
     """
-    # Import here to avoid circular dependency
-    from app.auth.models import TokenBlacklist
-
     token = credentials.credentials
 
-    # Decode and validate the token (handles expiration, signature, etc.)
-    payload = decode_token(token)
+    # Reuse the payload decoded for this request, or decode and validate the
+    # token (handles expiration, signature, etc.)
+    payload = get_request_token_payload(request.scope) if request is not None else None
+    if payload is None:
+        payload = decode_token(token)
 
     # Check if token is blacklisted
-    stmt = select(TokenBlacklist).where(TokenBlacklist.token == token)
-    result = await db.execute(stmt)
-    if result.scalar_one_or_none() is not None:
+    if await is_token_blacklisted(db, token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
@@ -27,7 +27,11 @@ from app.auth.schemas import (
     TokenRevocationRequest,
     TokenRevocationResponse,
 )
-from app.auth.jwt import create_token as create_jwt_token, decode_token
+from app.auth.jwt import (
+    TOKEN_BLACKLISTED_QUERY,
+    create_token as create_jwt_token,
+    decode_token,
+)
 from app.core.security import verify_password, hash_password, hash_token
 from app.config import settings
 
@@ -256,8 +260,7 @@ class AuthService:
         Returns:
             bool: True if token is blacklisted, False otherwise
         """
-        stmt = select(TokenBlacklist).where(TokenBlacklist.token == token)
-        result = await self.db.execute(stmt)
+        result = await TOKEN_BLACKLISTED_QUERY.execute(self.db, {"token": token})
         return result.scalar_one_or_none() is not None
 
     async def logout(self, logout_request: LogoutRequest) -> LogoutResponse:
@@ -34,6 +34,10 @@ class Settings(BaseSettings):
     jwt_issuer: str = "laya-ai-service"
     jwt_audience: str = "laya-api"
 
+    # Security configuration
+    cors_origins: str = ""
+    enforce_https: bool = False
+
     # Database connection pool configuration
     db_pool_size: int = 10
     db_max_overflow: int = 20
@@ -42,6 +46,119 @@ class Settings(BaseSettings):
     db_pool_pre_ping: bool = True
     db_echo: bool = False
 
+    # Statement caches: compiled SQL per engine, and asyncpg prepared
+    # statements per connection (sized to hold the hot queries of
+    # app.core.hot_queries alongside the ad-hoc ones)
+    db_compiled_cache_size: int = 1200
+    db_prepared_statement_cache_size: int = 500
+
+    # Pool governor: max overflow adjusted within bounds from checkout waits
+    db_pool_governor_enabled: bool = True
+    db_pool_overflow_min: int = 5
+    db_pool_overflow_max: int = 40
+    db_pool_wait_target: float = 0.05
+    db_pool_governor_interval: float = 15.0
+
+    # Per-route-group DB bulkheads (comma-separated "group=limit:queue" pairs)
+    db_bulkheads: str = "analytics=4:8"
+    db_bulkhead_default_limit: int = 10
+    db_bulkhead_default_queue: int = 20
+    db_bulkhead_queue_timeout: float = 5.0
+
+    # Read replicas (comma-separated async database URLs)
+    database_replica_urls: str = ""
+    db_replica_max_lag: float = 5.0
+    db_replica_lag_check_interval: float = 5.0
+    db_read_your_writes_window: float = 10.0
+
+    # Paginated listing totals
+    db_count_cache_ttl: int = 30
+    db_count_estimate_threshold: int = 10000
+
+    # Per-request query instrumentation
+    db_query_tracking_enabled: bool = True
+    db_n_plus_one_threshold: int = 5
+
+    # Redis configuration
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    redis_db: int = 0
+
+    # Rate limiting configuration (requests per minute unless noted)
+    rate_limit_enabled: bool = True
+    rate_limit_general: int = 100
+    rate_limit_auth: int = 10
+    rate_limit_user: int = 300
+    rate_limit_organization: int = 3000
+    rate_limit_storage_uri: str = "memory://"
+    rate_limit_lease_max: int = 20
+    rate_limit_lease_ttl: float = 1.0
+
+    # Logging: records are rendered and written by a background thread when
+    # the queue is enabled; LOG_SAMPLING holds comma-separated
+    # "event=rate[/per_second]" rules for high-volume events
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_queue_enabled: bool = True
+    log_queue_size: int = 10000
+    log_sampling: str = (
+        "verify_success=0.01,Outbound request=1/50,Outbound request completed=1/50"
+    )
+
+    # Streaming uploads: chunk size read from the request, and S3 multipart
+    # part size (minimum 5 MB) and parts uploaded in parallel
+    upload_chunk_size: int = 64 * 1024
+    upload_s3_part_size_mb: int = 8
+    upload_s3_max_parallel_parts: int = 4
+
+    # Thumbnails: worker processes encoding them, and whether every size is
+    # generated in the background after an image is uploaded
+    thumbnail_workers: int = 2
+    thumbnail_on_upload: bool = True
+
+    # Local read-through cache of S3 objects, shared by the workers of a
+    # host: directory, size limit and largest object cached
+    s3_cache_enabled: bool = True
+    s3_cache_dir: str = "/tmp/laya-s3-cache"
+    s3_cache_max_mb: int = 2048
+    s3_cache_max_object_mb: int = 64
+
+    # Garbage collection of stored content no file references any more:
+    # seconds between runs, and how long content stays unreferenced first
+    blob_gc_enabled: bool = True
+    blob_gc_interval_seconds: int = 3600
+    blob_gc_grace_seconds: int = 3600
+
+    # Recount of storage quotas changed since their last reconciliation:
+    # seconds between runs and quotas recounted per run
+    quota_reconcile_enabled: bool = True
+    quota_reconcile_interval_seconds: int = 900
+    quota_reconcile_batch_size: int = 200
+
+    # Audit events bulk-inserted in the background: events per batch, longest
+    # wait for a batch to fill, and queued events beyond which callers wait
+    audit_writer_enabled: bool = True
+    audit_writer_batch_size: int = 500
+    audit_writer_flush_interval_seconds: float = 0.5
+    audit_writer_queue_size: int = 10000
+
+    # Monthly audit log partitions prepared ahead, and months of audit history
+    # kept besides the current one (0 keeps everything)
+    audit_partition_months_ahead: int = 3
+    audit_retention_months: int = 0
+
+    # Import heavy optional subsystems (AWS SDK, Pillow, LLM providers) at
+    # startup instead of on first use
+    preload_subsystems: bool = False
+
+    # Cache warming configuration; child profiles are cached per caller
+    # credential, so they are only warmed for the Gibbon service credential
+    # when one is configured
+    cache_warming_enabled: bool = True
+    cache_warming_concurrency: int = 4
+    cache_warming_top_n: int = 20
+    cache_warming_gibbon_token: str = ""
+
     @property
     def database_url(self) -> str:
         """Construct the async database URL.
@@ -54,6 +171,43 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def replica_urls(self) -> list[str]:
+        """Parse the read replica database URLs.
+
+        Returns:
+            list[str]: Async database URLs of the read replicas
+        """
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+
+    @property
+    def bulkhead_limits(self) -> dict[str, tuple[int, int]]:
+        """Parse the per-route-group bulkhead limits.
+
+        Returns:
+            dict[str, tuple[int, int]]: Concurrency limit and queue size by group
+        """
+        limits = {}
+        for entry in self.db_bulkheads.split(","):
+            group, _, spec = entry.partition("=")
+            if not group.strip() or not spec.strip():
+                continue
+            limit, _, queue = spec.partition(":")
+            limits[group.strip()] = (
+                int(limit),
+                int(queue) if queue.strip() else self.db_bulkhead_default_queue,
+            )
+        return limits
+
+    @property
+    def redis_url(self) -> str:
+        """Construct the Redis URL.
+
+        Returns:
+            str: Redis connection URL
+        """
+        return f"redis://{self.redis_host}:{self.redis_port}/{self.redis_db}"
+
     class Config:
         """Pydantic settings configuration."""
 
@@ -4,6 +4,6 @@ This package contains core infrastructure components like logging,
 configuration, and shared utilities.
 """
 
-from app.core.logging import configure_logging, get_logger
+from app.core.logging import configure_logging, get_logger, shutdown_logging
 
-__all__ = ["configure_logging", "get_logger"]
+__all__ = ["configure_logging", "get_logger", "shutdown_logging"]
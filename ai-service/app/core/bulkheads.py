@@ -0,0 +1,221 @@
+"""Database bulkheads and statement timeouts for LAYA AI Service.
+
+All routes share one connection pool, so a burst of slow requests on one
+route group (e.g. analytics dashboards) can hold every connection and stall
+unrelated endpoints. A ``Bulkhead`` caps how many requests of a group use
+the database at once:
+
+- Up to ``limit`` requests run concurrently.
+- Up to ``max_queue`` more wait for a slot, each for at most
+  ``queue_timeout`` seconds.
+- Anything beyond that fails fast with ``BulkheadFullError`` instead of
+  queueing on the pool, where it would also delay other groups.
+
+Limits are configured per group with ``DB_BULKHEADS`` (``"group=limit:queue"``
+pairs); other groups use ``db_bulkhead_default_limit`` and
+``db_bulkhead_default_queue``.
+
+Routes can also bound how long their statements run. The timeout is held in
+a context variable and applied with ``SET LOCAL statement_timeout`` when a
+session begins a transaction on PostgreSQL (see
+``install_statement_timeouts``).
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Statement timeout (seconds) of the current route, if any
+_statement_timeout: ContextVar[Optional[float]] = ContextVar(
+    "db_statement_timeout", default=None
+)
+
+# Bulkheads by route group
+_bulkheads: Dict[str, "Bulkhead"] = {}
+
+
+class BulkheadFullError(Exception):
+    """Raised when a bulkhead has no free slot and its queue is full or timed out.
+
+    Attributes:
+        group: Route group of the bulkhead
+        retry_after: Suggested seconds before retrying
+    """
+
+    def __init__(self, group: str, retry_after: float) -> None:
+        """Initialize the error.
+
+        Args:
+            group: Route group of the bulkhead
+            retry_after: Suggested seconds before retrying
+        """
+        super().__init__(f"Too many concurrent '{group}' requests, try again later")
+        self.group = group
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    """Concurrency limit with a bounded wait queue for one route group.
+
+    Attributes:
+        group: Route group name
+        limit: Requests allowed to run at once
+        max_queue: Requests allowed to wait for a slot
+        queue_timeout: Seconds a request waits for a slot before failing
+        in_flight: Requests currently holding a slot
+        waiting: Requests currently waiting for a slot
+        admitted: Requests admitted since startup
+        rejected: Requests rejected since startup
+    """
+
+    def __init__(
+        self,
+        group: str,
+        limit: int,
+        max_queue: int,
+        queue_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the bulkhead.
+
+        Args:
+            group: Route group name
+            limit: Concurrency limit
+            max_queue: Wait queue size (0 to fail fast as soon as all slots are taken)
+            queue_timeout: Maximum wait for a slot (uses config default if None)
+        """
+        self.group = group
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = (
+            queue_timeout if queue_timeout is not None else settings.db_bulkhead_queue_timeout
+        )
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if all are in use.
+
+        Raises:
+            BulkheadFullError: If the queue is full or the wait timed out
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFullError(self.group, self.queue_timeout or 1.0)
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise BulkheadFullError(self.group, self.queue_timeout) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Give back a slot taken with ``acquire``."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of a block.
+
+        Raises:
+            BulkheadFullError: If no slot could be taken
+        """
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage of the bulkhead for pool health reports.
+
+        Returns:
+            Dict[str, Any]: Limits, current usage and admission counters
+        """
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+def get_bulkhead(group: str) -> Bulkhead:
+    """Get the bulkhead of a route group, creating it on first use.
+
+    Args:
+        group: Route group name
+
+    Returns:
+        Bulkhead: The group's bulkhead, sized from the configuration
+    """
+    bulkhead = _bulkheads.get(group)
+    if bulkhead is None:
+        limit, max_queue = settings.bulkhead_limits.get(
+            group, (settings.db_bulkhead_default_limit, settings.db_bulkhead_default_queue)
+        )
+        bulkhead = _bulkheads[group] = Bulkhead(group, limit, max_queue)
+    return bulkhead
+
+
+def bulkhead_stats() -> Dict[str, Dict[str, Any]]:
+    """Usage of every bulkhead created so far.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Stats keyed by route group
+    """
+    return {group: bulkhead.stats() for group, bulkhead in sorted(_bulkheads.items())}
+
+
+def set_statement_timeout(seconds: Optional[float]) -> Token:
+    """Bound the statements of the current request.
+
+    Args:
+        seconds: Statement timeout, or None (or 0) for no timeout
+
+    Returns:
+        Token: Token for ``reset_statement_timeout``
+    """
+    return _statement_timeout.set(seconds or None)
+
+
+def reset_statement_timeout(token: Token) -> None:
+    """Restore the statement timeout in effect before ``set_statement_timeout``.
+
+    Args:
+        token: Token returned by ``set_statement_timeout``
+    """
+    _statement_timeout.reset(token)
+
+
+def _after_begin(session: Session, transaction: Any, connection: Any) -> None:
+    """Apply the route's statement timeout to a new transaction."""
+    timeout = _statement_timeout.get()
+    if timeout and connection.dialect.name == "postgresql":
+        # SET LOCAL ends with the transaction, so pooled connections are unaffected
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout * 1000)}")
+
+
+def install_statement_timeouts() -> None:
+    """Attach the session event applying per-route statement timeouts."""
+    if not event.contains(Session, "after_begin", _after_begin):
+        event.listen(Session, "after_begin", _after_begin)
@@ -6,9 +6,14 @@ configurable TTL (Time To Live) and key prefixes.
 
 import functools
 import hashlib
+import inspect
 import json
-from typing import Any, Callable, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
 
+from app.core.cache_metrics import get_cache_metrics
+from app.core.cache_tags import tag_keys
 from app.redis_client import get_redis_client
 
 
@@ -43,57 +48,150 @@ def _generate_cache_key(key_prefix: str, func_name: str, args: tuple, kwargs: di
     return f"{key_prefix}:{func_name}:{key_hash}"
 
 
-def cache(ttl: int = 300, key_prefix: str = "cache"):
+# When set, cached functions skip the read and overwrite the cached value
+_refresh_cache: ContextVar[bool] = ContextVar("refresh_cache", default=False)
+
+
+@contextmanager
+def refreshing_cache() -> Iterator[None]:
+    """Force cached functions called in this context to recompute their value.
+
+    Used by cache warming to re-populate entries ahead of expiry without
+    serving (or counting a hit for) the value that is about to expire.
+
+    Example:
+        with refreshing_cache():
+            await service.get_dashboard(facility_id=facility_id)
+    """
+    token = _refresh_cache.set(True)
+    try:
+        yield
+    finally:
+        _refresh_cache.reset(token)
+
+
+TagFunc = Callable[[Any, Dict[str, Any]], Iterable[str]]
+
+# Parameters that do not change a cached value and are left out of its key
+UNKEYED_ARGUMENTS = frozenset({"self"})
+
+
+def _bound_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    """Map a call's arguments to parameter names, including defaults."""
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        return {}
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def cache(
+    ttl: int = 300,
+    key_prefix: str = "cache",
+    warm_arg: Optional[str] = None,
+    tags: Optional[TagFunc] = None,
+):
     """Decorator to cache function results in Redis with TTL.
 
+    Entries are keyed by the call's arguments bound to parameter names, with
+    defaults applied, so ``f(x)``, ``f(x=x)`` and ``f(x, y=default)`` share one
+    entry. Parameters in ``UNKEYED_ARGUMENTS`` (the instance) are left out of
+    the key; credentials such as an ``auth_token`` stay in it, so a result
+    fetched with one caller's credentials is never served to another.
+
     Args:
         ttl: Time to live in seconds (default: 300 = 5 minutes)
         key_prefix: Prefix for cache keys (default: "cache")
+        warm_arg: Optional argument name whose values are tracked as access
+            statistics so cache warming can pre-populate the hottest entries
+        tags: Optional function ``tags(result, arguments)`` returning the
+            entity tags the cached result was derived from, so writes to
+            those entities can invalidate it with ``invalidate_tags``
 
     Returns:
         Decorated function with caching
 
     Example:
-        @cache(ttl=300, key_prefix="activities")
+        @cache(
+            ttl=300,
+            key_prefix="activities",
+            warm_arg="child_id",
+            tags=lambda result, args: [entity_tag("child", args["child_id"])],
+        )
         async def get_activities(child_id: UUID):
             # Expensive operation
             return data
     """
     def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        # Bound instances are not part of the cached value's identity
+        is_method = next(iter(signature.parameters), None) == "self"
+
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = _generate_cache_key(
-                key_prefix=key_prefix,
-                func_name=func.__name__,
-                args=args,
-                kwargs=kwargs
-            )
-
-            # Get Redis client
+            # Generate cache key from the arguments by parameter name, with
+            # defaults applied, so equivalent calls share one entry whether
+            # arguments are passed positionally, by keyword or left out
+            arguments = _bound_arguments(signature, args, kwargs)
+            if arguments:
+                cache_key = _generate_cache_key(
+                    key_prefix=key_prefix,
+                    func_name=func.__name__,
+                    args=(),
+                    kwargs={
+                        name: value
+                        for name, value in arguments.items()
+                        if name not in UNKEYED_ARGUMENTS
+                    },
+                )
+            else:
+                cache_key = _generate_cache_key(
+                    key_prefix=key_prefix,
+                    func_name=func.__name__,
+                    args=args[1:] if is_method else args,
+                    kwargs=kwargs
+                )
+
+            # Get Redis client and statistics recorder
             redis = await get_redis_client()
+            metrics = get_cache_metrics()
+            refresh = _refresh_cache.get()
+
+            if warm_arg is not None and not refresh:
+                metrics.record_access(key_prefix, arguments.get(warm_arg))
 
             # Try to get cached value
-            try:
-                cached_value = await redis.get(cache_key)
-                if cached_value is not None:
-                    # Cache hit - deserialize and return
-                    return json.loads(cached_value)
-            except Exception:
-                # If cache read fails, continue to execute function
-                pass
+            if not refresh:
+                try:
+                    cached_value = await redis.get(cache_key)
+                    if cached_value is not None:
+                        # Cache hit - deserialize and return
+                        result = json.loads(cached_value)
+                        metrics.record_hit(key_prefix, len(cached_value))
+                        await metrics.maybe_flush()
+                        return result
+                except Exception:
+                    # If cache read fails, continue to execute function
+                    pass
+
+                # Cache miss - execute function
+                metrics.record_miss(key_prefix)
 
-            # Cache miss - execute function
             result = await func(*args, **kwargs)
 
             # Store result in cache with TTL
             try:
                 serialized_result = json.dumps(result, default=str)
                 await redis.setex(cache_key, ttl, serialized_result)
+                metrics.record_set(key_prefix, cache_key, len(serialized_result), ttl)
+                if tags is not None:
+                    await tag_keys(cache_key, tags(result, arguments), ttl)
             except Exception:
                 # If cache write fails, just return the result without caching
                 pass
 
+            await metrics.maybe_flush()
             return result
 
         return async_wrapper
@@ -131,7 +229,9 @@ async def invalidate_cache(key_prefix: str, pattern: str = "*") -> int:
 
         # Delete keys if any found
         if keys:
-            return await redis.delete(*keys)
+            deleted = await redis.delete(*keys)
+            get_cache_metrics().record_invalidation(key_prefix, deleted)
+            return deleted
         return 0
     except Exception:
         return 0
@@ -0,0 +1,496 @@
+"""Incremental cache statistics for LAYA AI Service.
+
+Maintains per-prefix cache counters as the cache is used so that statistics
+can be reported without scanning the Redis keyspace. Counters are kept in
+per-worker memory and periodically flushed to Redis, where they are
+aggregated across all workers:
+
+- ``cache_stats:{prefix}`` hash with hit, miss, set, eviction, invalidation
+  and byte counters
+- ``cache_stats:{prefix}:keys:{slice}:{index}`` HyperLogLogs of the keys
+  written during each slice of the prefix's TTL, used for approximate key
+  cardinality
+- ``cache_stats:{prefix}:w:{bucket}`` short-lived hashes holding per-bucket
+  hit/miss counts used for sliding-window hit ratios
+- ``cache_stats:{prefix}:hot`` sorted set of access counts per identifier
+  (e.g. child or facility id) used by cache warming
+
+A HyperLogLog never forgets a key, so rather than one per prefix, each
+prefix's TTL is split into ``KEY_WINDOW_SLICES`` slices with a HyperLogLog
+each, expiring once every key added to it has expired. The key count is the
+number of distinct keys written within the last TTL (plus at most one
+slice), which approximates the keys currently cached; keys removed early by
+eviction or invalidation are still counted until their slice expires.
+
+Evictions are approximated as keys written again within the slice of an
+earlier write, i.e. well before their TTL elapsed, so the earlier entry was
+evicted (or invalidated) early. Re-populations after an entry expired
+naturally fall into a later slice and are not counted.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key namespace for cache statistics
+STATS_KEY_PREFIX = "cache_stats"
+
+# Sliding window configuration for hit ratios
+WINDOW_BUCKET_SECONDS = 60
+HIT_RATIO_WINDOWS: Dict[str, int] = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+}
+
+# Counter fields stored in the per-prefix Redis hash
+COUNTER_FIELDS = (
+    "hits",
+    "misses",
+    "sets",
+    "evictions",
+    "invalidations",
+    "bytes_set",
+    "bytes_served",
+)
+
+# Seconds between flushes of buffered counters to Redis
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Maximum number of distinct keys buffered per flush for cardinality tracking
+MAX_PENDING_KEYS = 1000
+
+# Number of HyperLogLog slices a prefix's TTL is split into for key counts
+KEY_WINDOW_SLICES = 4
+
+# TTL assumed for prefixes whose entries were written without one
+DEFAULT_KEY_TTL = 300
+
+
+def _stats_key(prefix: str) -> str:
+    """Build the Redis hash key holding counters for a prefix."""
+    return f"{STATS_KEY_PREFIX}:{prefix}"
+
+
+def _key_slice_seconds(ttl: int) -> int:
+    """Get the length of one key cardinality slice for a TTL."""
+    return max(math.ceil(ttl / KEY_WINDOW_SLICES), 1)
+
+
+def _hll_key(prefix: str, slice_seconds: int, index: int) -> str:
+    """Build the Redis HyperLogLog key tracking keys written during one slice."""
+    return f"{STATS_KEY_PREFIX}:{prefix}:keys:{slice_seconds}:{index}"
+
+
+def _live_key_slices(prefix: str, ttl: int, now: Optional[float] = None) -> List[str]:
+    """Get the HyperLogLog keys of the slices that can still hold live entries."""
+    slice_seconds = _key_slice_seconds(ttl)
+    current = int((now if now is not None else time.time()) // slice_seconds)
+    return [
+        _hll_key(prefix, slice_seconds, current - offset)
+        for offset in range(KEY_WINDOW_SLICES + 1)
+    ]
+
+
+def _hot_key(prefix: str) -> str:
+    """Build the Redis sorted set key tracking the hottest identifiers for a prefix."""
+    return f"{STATS_KEY_PREFIX}:{prefix}:hot"
+
+
+def _window_key(prefix: str, bucket: int) -> str:
+    """Build the Redis hash key for a sliding-window bucket."""
+    return f"{STATS_KEY_PREFIX}:{prefix}:w:{bucket}"
+
+
+def _current_bucket(now: Optional[float] = None) -> int:
+    """Get the sliding-window bucket index for a timestamp."""
+    return int((now if now is not None else time.time()) // WINDOW_BUCKET_SECONDS)
+
+
+def compute_hit_ratio(hits: int, misses: int) -> Optional[float]:
+    """Compute a hit ratio, or None when there were no lookups."""
+    lookups = hits + misses
+    if lookups == 0:
+        return None
+    return round(hits / lookups, 4)
+
+
+@dataclass
+class PrefixCounters:
+    """Cache counters for a single key prefix.
+
+    Attributes:
+        hits: Number of cache hits
+        misses: Number of cache misses
+        sets: Number of cache writes
+        evictions: Number of keys written again before their TTL elapsed
+        invalidations: Number of keys removed by explicit invalidation
+        bytes_set: Total serialized bytes written to the cache
+        bytes_served: Total serialized bytes served from the cache
+        ttl: Most recently configured TTL for the prefix in seconds
+    """
+
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    bytes_set: int = 0
+    bytes_served: int = 0
+    ttl: Optional[int] = None
+
+    def add(self, field_name: str, amount: int) -> None:
+        """Increment a counter field by the given amount."""
+        setattr(self, field_name, getattr(self, field_name) + amount)
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the numeric counters as a dictionary."""
+        return {name: getattr(self, name) for name in COUNTER_FIELDS}
+
+
+@dataclass
+class _PendingFlush:
+    """Buffered counter deltas awaiting a flush to Redis."""
+
+    counters: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    keys: Dict[str, Set[str]] = field(default_factory=dict)
+    windows: Dict[Tuple[str, int], Dict[str, int]] = field(default_factory=dict)
+    ttls: Dict[str, int] = field(default_factory=dict)
+    accesses: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    key_count: int = 0
+
+    def is_empty(self) -> bool:
+        """Check whether there is anything to flush."""
+        return not (
+            self.counters or self.keys or self.windows or self.ttls or self.accesses
+        )
+
+
+class CacheMetrics:
+    """Per-worker cache statistics recorder with Redis aggregation.
+
+    Recording is synchronous and only touches process memory; buffered
+    deltas are written to Redis in a single pipeline by ``flush``. Reading
+    statistics costs a fixed number of Redis commands per prefix regardless
+    of how many keys are cached.
+
+    Attributes:
+        flush_interval: Minimum seconds between automatic flushes
+    """
+
+    def __init__(self, flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """Initialize the metrics recorder.
+
+        Args:
+            flush_interval: Minimum seconds between automatic flushes
+        """
+        self.flush_interval = flush_interval
+        self._local: Dict[str, PrefixCounters] = {}
+        self._local_windows: Dict[Tuple[str, int], Dict[str, int]] = {}
+        self._pending = _PendingFlush()
+        self._last_flush = time.monotonic()
+
+    def _record(self, prefix: str, field_name: str, amount: int = 1) -> None:
+        """Record a counter increment locally and buffer it for Redis."""
+        self._local.setdefault(prefix, PrefixCounters()).add(field_name, amount)
+        pending = self._pending.counters.setdefault(prefix, {})
+        pending[field_name] = pending.get(field_name, 0) + amount
+
+    def _record_lookup(self, prefix: str, field_name: str) -> None:
+        """Record a hit or miss into the current sliding-window bucket."""
+        bucket_key = (prefix, _current_bucket())
+        for windows in (self._local_windows, self._pending.windows):
+            bucket = windows.setdefault(bucket_key, {})
+            bucket[field_name] = bucket.get(field_name, 0) + 1
+
+    def record_hit(self, prefix: str, size: int = 0) -> None:
+        """Record a cache hit.
+
+        Args:
+            prefix: Cache key prefix
+            size: Size of the served value in bytes
+        """
+        self._record(prefix, "hits")
+        self._record(prefix, "bytes_served", size)
+        self._record_lookup(prefix, "hits")
+
+    def record_miss(self, prefix: str) -> None:
+        """Record a cache miss.
+
+        Args:
+            prefix: Cache key prefix
+        """
+        self._record(prefix, "misses")
+        self._record_lookup(prefix, "misses")
+
+    def record_set(self, prefix: str, key: str, size: int, ttl: Optional[int] = None) -> None:
+        """Record a cache write.
+
+        Args:
+            prefix: Cache key prefix
+            key: Full cache key that was written
+            size: Size of the stored value in bytes
+            ttl: TTL applied to the entry in seconds
+        """
+        self._record(prefix, "sets")
+        self._record(prefix, "bytes_set", size)
+        if ttl is not None:
+            self._local[prefix].ttl = ttl
+            self._pending.ttls[prefix] = ttl
+        if self._pending.key_count < MAX_PENDING_KEYS:
+            keys = self._pending.keys.setdefault(prefix, set())
+            if key not in keys:
+                keys.add(key)
+                self._pending.key_count += 1
+
+    def record_invalidation(self, prefix: str, count: int) -> None:
+        """Record keys removed by explicit invalidation.
+
+        Args:
+            prefix: Cache key prefix
+            count: Number of keys removed
+        """
+        if count > 0:
+            self._record(prefix, "invalidations", count)
+
+    def record_access(self, prefix: str, identifier: Optional[object]) -> None:
+        """Record an access to a cached entity for hot-key tracking.
+
+        Args:
+            prefix: Cache key prefix
+            identifier: Entity identifier (e.g. child or facility id); ignored if None
+        """
+        if identifier is None:
+            return
+        accesses = self._pending.accesses.setdefault(prefix, {})
+        if len(accesses) < MAX_PENDING_KEYS:
+            name = str(identifier)
+            accesses[name] = accesses.get(name, 0) + 1
+
+    async def get_hottest(self, prefix: str, limit: int) -> List[str]:
+        """Get the most frequently accessed identifiers for a prefix.
+
+        Args:
+            prefix: Cache key prefix
+            limit: Maximum number of identifiers to return
+
+        Returns:
+            list: Identifiers ordered from most to least accessed
+        """
+        if limit <= 0:
+            return []
+        redis = await get_redis_client()
+        return list(await redis.zrevrange(_hot_key(prefix), 0, limit - 1))
+
+    async def decay_accesses(self, prefix: str, factor: float = 0.5) -> None:
+        """Scale down access counts so hot-key rankings follow recent traffic.
+
+        Args:
+            prefix: Cache key prefix
+            factor: Multiplier applied to every access count
+        """
+        redis = await get_redis_client()
+        key = _hot_key(prefix)
+        await redis.zunionstore(key, {key: factor})
+        await redis.zremrangebyscore(key, "-inf", 0.5)
+
+    def local_snapshot(self) -> Dict[str, PrefixCounters]:
+        """Get this worker's cumulative counters.
+
+        Returns:
+            dict: Mapping of prefix to a copy of its counters
+        """
+        return {
+            prefix: PrefixCounters(**vars(counters))
+            for prefix, counters in self._local.items()
+        }
+
+    def local_hit_ratios(self, prefix: str) -> Dict[str, Optional[float]]:
+        """Compute sliding-window hit ratios from this worker's counters.
+
+        Args:
+            prefix: Cache key prefix
+
+        Returns:
+            dict: Mapping of window name to hit ratio (None if no lookups)
+        """
+        current = _current_bucket()
+        oldest = current - max(HIT_RATIO_WINDOWS.values()) // WINDOW_BUCKET_SECONDS
+        for stale in [k for k in self._local_windows if k[1] <= oldest]:
+            del self._local_windows[stale]
+
+        buckets = [
+            self._local_windows.get((prefix, current - offset), {})
+            for offset in range(max(HIT_RATIO_WINDOWS.values()) // WINDOW_BUCKET_SECONDS)
+        ]
+        return _window_ratios(buckets)
+
+    async def maybe_flush(self) -> None:
+        """Flush buffered counters if the flush interval has elapsed."""
+        if (
+            time.monotonic() - self._last_flush >= self.flush_interval
+            or self._pending.key_count >= MAX_PENDING_KEYS
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered counter deltas to Redis in a single pipeline.
+
+        Failures are logged and the buffered deltas are dropped so that a
+        Redis outage never grows the buffer without bound.
+        """
+        pending, self._pending = self._pending, _PendingFlush()
+        self._last_flush = time.monotonic()
+        if pending.is_empty():
+            return
+
+        try:
+            redis = await get_redis_client()
+            pipe = redis.pipeline(transaction=False)
+
+            for prefix, deltas in pending.counters.items():
+                for field_name, amount in deltas.items():
+                    if amount:
+                        pipe.hincrby(_stats_key(prefix), field_name, amount)
+            for prefix, ttl in pending.ttls.items():
+                pipe.hset(_stats_key(prefix), "ttl", ttl)
+
+            window_ttl = max(HIT_RATIO_WINDOWS.values()) + WINDOW_BUCKET_SECONDS
+            for prefix, accesses in pending.accesses.items():
+                for identifier, amount in accesses.items():
+                    pipe.zincrby(_hot_key(prefix), amount, identifier)
+
+            for (prefix, bucket), deltas in pending.windows.items():
+                key = _window_key(prefix, bucket)
+                for field_name, amount in deltas.items():
+                    pipe.hincrby(key, field_name, amount)
+                pipe.expire(key, window_ttl)
+
+            # One PFADD per key into the current slice, so a 0 reply
+            # identifies a key written again before its TTL elapsed
+            hll_adds: List[str] = []
+            slice_expirations: Dict[str, int] = {}
+            now = time.time()
+            for prefix, keys in pending.keys.items():
+                local = self._local.get(prefix)
+                ttl = pending.ttls.get(prefix) or (local.ttl if local else None) or DEFAULT_KEY_TTL
+                slice_seconds = _key_slice_seconds(ttl)
+                hll_key = _hll_key(prefix, slice_seconds, int(now // slice_seconds))
+                for key in keys:
+                    pipe.pfadd(hll_key, key)
+                    hll_adds.append(prefix)
+                slice_expirations[hll_key] = ttl + slice_seconds
+            for hll_key, seconds in slice_expirations.items():
+                pipe.expire(hll_key, seconds)
+
+            results = await pipe.execute()
+
+            first_add = len(results) - len(slice_expirations) - len(hll_adds)
+            evictions: Dict[str, int] = {}
+            for prefix, added in zip(hll_adds, results[first_add:]):
+                if not added:
+                    evictions[prefix] = evictions.get(prefix, 0) + 1
+            if evictions:
+                pipe = redis.pipeline(transaction=False)
+                for prefix, count in evictions.items():
+                    self._local.setdefault(prefix, PrefixCounters()).add("evictions", count)
+                    pipe.hincrby(_stats_key(prefix), "evictions", count)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to flush cache statistics: {e}")
+
+    async def read_prefix_stats(
+        self, prefixes: List[str]
+    ) -> Dict[str, Tuple[PrefixCounters, int, Dict[str, Optional[float]]]]:
+        """Read aggregated statistics for the given prefixes from Redis.
+
+        Issues a fixed number of commands per prefix in two pipelines: one
+        ``HGETALL`` and one ``HMGET`` per window bucket, then one ``PFCOUNT``
+        over the key cardinality slices of the prefix's TTL.
+
+        Args:
+            prefixes: Cache key prefixes to read
+
+        Returns:
+            dict: Mapping of prefix to (counters, approximate number of keys
+                currently cached, sliding-window hit ratios)
+        """
+        redis = await get_redis_client()
+        current = _current_bucket()
+        bucket_count = max(HIT_RATIO_WINDOWS.values()) // WINDOW_BUCKET_SECONDS
+
+        pipe = redis.pipeline(transaction=False)
+        for prefix in prefixes:
+            pipe.hgetall(_stats_key(prefix))
+            for offset in range(bucket_count):
+                pipe.hmget(_window_key(prefix, current - offset), "hits", "misses")
+        results = await pipe.execute()
+
+        read: List[Tuple[PrefixCounters, Dict[str, Optional[float]]]] = []
+        stride = 1 + bucket_count
+        for index in range(len(prefixes)):
+            chunk = results[index * stride:(index + 1) * stride]
+            raw_counters = chunk[0] or {}
+            counters = PrefixCounters(
+                **{name: int(raw_counters.get(name, 0) or 0) for name in COUNTER_FIELDS}
+            )
+            ttl = raw_counters.get("ttl")
+            counters.ttl = int(ttl) if ttl not in (None, "") else None
+
+            buckets = [
+                {"hits": int(hits or 0), "misses": int(misses or 0)}
+                for hits, misses in chunk[1:]
+            ]
+            read.append((counters, _window_ratios(buckets)))
+
+        pipe = redis.pipeline(transaction=False)
+        for prefix, (counters, _) in zip(prefixes, read):
+            pipe.pfcount(*_live_key_slices(prefix, counters.ttl or DEFAULT_KEY_TTL))
+        key_counts = await pipe.execute()
+
+        return {
+            prefix: (counters, int(key_count or 0), windows)
+            for prefix, (counters, windows), key_count in zip(prefixes, read, key_counts)
+        }
+
+    def reset(self) -> None:
+        """Clear all per-worker counters and buffered deltas."""
+        self._local.clear()
+        self._local_windows.clear()
+        self._pending = _PendingFlush()
+        self._last_flush = time.monotonic()
+
+
+def _window_ratios(buckets: List[Dict[str, int]]) -> Dict[str, Optional[float]]:
+    """Compute hit ratios for each configured window from newest-first buckets."""
+    ratios: Dict[str, Optional[float]] = {}
+    for name, seconds in HIT_RATIO_WINDOWS.items():
+        window = buckets[: seconds // WINDOW_BUCKET_SECONDS]
+        hits = sum(bucket.get("hits", 0) for bucket in window)
+        misses = sum(bucket.get("misses", 0) for bucket in window)
+        ratios[name] = compute_hit_ratio(hits, misses)
+    return ratios
+
+
+# Global metrics instance shared by the cache decorator and stats endpoint
+_cache_metrics: Optional[CacheMetrics] = None
+
+
+def get_cache_metrics() -> CacheMetrics:
+    """Get or create the global cache metrics recorder.
+
+    Returns:
+        CacheMetrics: The process-wide metrics recorder
+    """
+    global _cache_metrics
+
+    if _cache_metrics is None:
+        _cache_metrics = CacheMetrics()
+
+    return _cache_metrics
@@ -0,0 +1,152 @@
+"""Entity-level dependency tracking for cache invalidation.
+
+Cached entries can be tagged with the entities they were derived from
+(e.g. ``child:<id>``, ``facility:<id>``). Each tag is a Redis set holding
+the keys of the entries that depend on it, so a write to one entity
+invalidates only the entries that were built from it rather than every
+entry under a prefix.
+
+Caches that do not keep their entries in Redis (such as the LLM response
+cache) register a listener for their key namespace and are told which of
+their keys to drop when a tag is invalidated.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.cache_metrics import get_cache_metrics
+from app.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key namespace for tag sets
+TAG_KEY_PREFIX = "cache_tags"
+
+# Minimum lifetime of a tag set; it must outlive every entry it references
+MIN_TAG_TTL = 86400
+
+# Tags shared by every entry of a kind (e.g. every organization-wide dashboard)
+ORGANIZATION_DASHBOARD_TAG = "facility:all"
+SIGNATURE_DASHBOARD_TAG = "signature_dashboard:all"
+
+TagListener = Callable[[List[str], Any], Awaitable[int]]
+
+# Listeners for non-Redis caches keyed by key namespace
+_tag_listeners: Dict[str, TagListener] = {}
+
+
+def entity_tag(entity_type: str, entity_id: Any) -> str:
+    """Build the cache tag for an entity.
+
+    Args:
+        entity_type: Kind of entity (e.g. "activity", "child", "facility")
+        entity_id: Identifier of the entity
+
+    Returns:
+        str: Tag such as ``"child:3f2c..."``
+    """
+    return f"{entity_type}:{entity_id}"
+
+
+def _tag_key(tag: str) -> str:
+    """Build the Redis set key holding the entries that depend on a tag."""
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+def register_tag_listener(namespace: str, listener: TagListener) -> None:
+    """Register a listener invalidating tagged entries outside Redis.
+
+    Keys tagged with ``tag_keys`` whose first segment equals ``namespace``
+    are passed to the listener (with that segment stripped) instead of
+    being deleted from Redis.
+
+    Args:
+        namespace: Key namespace owned by the listener (e.g. "llm_cache")
+        listener: Coroutine ``listener(keys, db)`` returning the number of
+            entries it removed
+    """
+    _tag_listeners[namespace] = listener
+
+
+async def tag_keys(cache_key: str, tags: Iterable[str], ttl: int) -> None:
+    """Record that a cached entry depends on the given tags.
+
+    Args:
+        cache_key: Key of the cached entry
+        tags: Tags the entry was derived from
+        ttl: TTL of the cached entry in seconds
+    """
+    tags = [tag for tag in tags if tag]
+    if not tags:
+        return
+
+    try:
+        redis = await get_redis_client()
+        pipe = redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.sadd(_tag_key(tag), cache_key)
+            pipe.expire(_tag_key(tag), max(ttl, MIN_TAG_TTL))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to tag cache key {cache_key}: {e}")
+
+
+async def invalidate_tags(*tags: str, db: Optional[Any] = None) -> int:
+    """Invalidate every cached entry that depends on any of the given tags.
+
+    Args:
+        *tags: Tags to invalidate
+        db: Optional database session passed to listeners for database-backed
+            caches
+
+    Returns:
+        int: Number of cached entries removed
+
+    Example:
+        # Drop cached entries built from one child
+        await invalidate_tags(entity_tag("child", child_id))
+    """
+    tags = tuple(tag for tag in tags if tag)
+    if not tags:
+        return 0
+
+    try:
+        redis = await get_redis_client()
+        pipe = redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.smembers(_tag_key(tag))
+        members = await pipe.execute()
+
+        redis_keys: set = set()
+        listener_keys: Dict[str, set] = defaultdict(set)
+        for keys in members:
+            for key in keys or ():
+                namespace, _, rest = key.partition(":")
+                if namespace in _tag_listeners:
+                    listener_keys[namespace].add(rest)
+                else:
+                    redis_keys.add(key)
+
+        removed = 0
+        if redis_keys:
+            removed += await redis.delete(*redis_keys)
+            by_prefix: Dict[str, int] = defaultdict(int)
+            for key in redis_keys:
+                by_prefix[key.partition(":")[0]] += 1
+            metrics = get_cache_metrics()
+            for prefix, count in by_prefix.items():
+                metrics.record_invalidation(prefix, count)
+
+        await redis.delete(*(_tag_key(tag) for tag in tags))
+
+        for namespace, keys in listener_keys.items():
+            try:
+                removed += await _tag_listeners[namespace](sorted(keys), db)
+            except Exception as e:
+                logger.warning(f"Tag invalidation listener {namespace} failed: {e}")
+
+        return removed
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+        return 0
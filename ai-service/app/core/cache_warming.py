@@ -1,55 +1,62 @@
-"""Cache warming utility for preloading frequently accessed data on startup.
+"""Cache warming scheduler for preloading frequently accessed data.
 
 Warms Redis cache with frequently accessed data to improve initial response
-times and reduce load on downstream services.
+times and reduce load on downstream services. Besides a one-off warm-up on
+startup, the scheduler periodically re-warms the hottest entries (learned
+from cache access statistics) ahead of their expiry:
+
+- each target is warmed by at most one worker at a time, coordinated with a
+  Redis lease so a fleet of workers does not duplicate work
+- per-target work runs with bounded concurrency
+- real per-target status and timing is recorded for monitoring
 """
 
+import asyncio
 import logging
-from typing import List, Optional
-
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.core.cache import refreshing_cache
+from app.core.cache_metrics import get_cache_metrics
 from app.database import AsyncSessionLocal
-from app.services.activity_service import ActivityService
+from app.redis_client import get_redis_client
 from app.services.analytics_service import AnalyticsService
+from app.services.child_service import ChildService
 
 logger = logging.getLogger(__name__)
 
+# Redis key namespace for warming leases and status
+WARMING_KEY_PREFIX = "cache_warm"
 
-async def warm_activity_catalog() -> bool:
-    """Warm the activity catalog cache.
+# Fraction of a target's TTL after which it is re-warmed
+DEFAULT_REFRESH_RATIO = 0.8
 
-    Preloads the activity catalog into Redis with 1-hour TTL.
-    This is beneficial as the catalog is frequently accessed and
-    relatively static.
+# Default number of hot entries warmed per target
+DEFAULT_TOP_N = settings.cache_warming_top_n
 
-    Returns:
-        bool: True if warming succeeded, False otherwise
-    """
-    try:
-        logger.info("Warming activity catalog cache...")
+# Default number of concurrent warm-up calls per scheduler
+DEFAULT_CONCURRENCY = settings.cache_warming_concurrency
 
-        async with AsyncSessionLocal() as db:
-            activity_service = ActivityService(db)
+# Seconds between scheduler ticks
+DEFAULT_TICK_SECONDS = 30.0
 
-            # Fetch all activities to populate cache
-            activities = await activity_service.get_activity_catalog()
 
-            logger.info(
-                f"Successfully warmed activity catalog cache "
-                f"({len(activities)} activities)"
-            )
-            return True
-
-    except Exception as e:
-        logger.error(f"Failed to warm activity catalog cache: {e}")
-        return False
-
-
-async def warm_analytics_dashboard() -> bool:
+async def warm_analytics_dashboard(facility_id: Optional[UUID] = None) -> bool:
     """Warm the analytics dashboard cache.
 
     Preloads the analytics dashboard into Redis with 15-minute TTL.
     This improves initial dashboard load times.
 
+    Args:
+        facility_id: Optional facility whose dashboard should be warmed
+            (the organization-wide dashboard if None)
+
     Returns:
         bool: True if warming succeeded, False otherwise
     """
@@ -60,7 +67,7 @@ async def warm_analytics_dashboard() -> bool:
             analytics_service = AnalyticsService(db)
 
             # Fetch dashboard data to populate cache
-            dashboard = await analytics_service.get_dashboard()
+            await analytics_service.get_dashboard(facility_id=facility_id)
 
             logger.info("Successfully warmed analytics dashboard cache")
             return True
@@ -70,30 +77,384 @@ async def warm_analytics_dashboard() -> bool:
         return False
 
 
+async def warm_child_profile(child_id: UUID) -> bool:
+    """Warm the cached profile of a single child.
+
+    Profiles are cached per caller credential, so the profile is fetched
+    with the Gibbon service credential and warms the entry read by callers
+    using that credential.
+
+    Args:
+        child_id: Unique identifier of the child
+
+    Returns:
+        bool: True if warming succeeded, False otherwise
+    """
+    if not settings.cache_warming_gibbon_token:
+        logger.error("No Gibbon service credential configured for warming child profiles")
+        return False
+
+    try:
+        await ChildService().get_child_profile(
+            child_id, settings.cache_warming_gibbon_token
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to warm child profile cache for {child_id}: {e}")
+        return False
+
+
+@dataclass
+class WarmingTarget:
+    """A cache that the scheduler keeps warm.
+
+    Attributes:
+        name: Target name, also used as the cache key prefix for access statistics
+        ttl: TTL of the cached entries in seconds
+        warm_default: Coroutine factory warming the target's default entry,
+            or None if the target has no default entry
+        warm_entry: Coroutine factory warming a single hot entry by identifier,
+            or None if the target is not keyed by entity
+        top_n: Number of hottest entries to warm
+        refresh_ratio: Fraction of the TTL after which entries are re-warmed
+    """
+
+    name: str
+    ttl: int
+    warm_default: Optional[Callable[[], Awaitable[bool]]] = None
+    warm_entry: Optional[Callable[[str], Awaitable[bool]]] = None
+    top_n: int = DEFAULT_TOP_N
+    refresh_ratio: float = DEFAULT_REFRESH_RATIO
+
+    @property
+    def refresh_interval(self) -> float:
+        """Seconds between successive warm-ups of this target."""
+        return self.ttl * self.refresh_ratio
+
+
+@dataclass
+class WarmingStatus:
+    """Outcome of the most recent warm-up of a target.
+
+    Attributes:
+        success: Whether every entry of the last run warmed successfully
+        last_run_at: When the last run started (ISO 8601)
+        duration_ms: Duration of the last run in milliseconds
+        warmed: Number of entries warmed successfully in the last run
+        failed: Number of entries that failed to warm in the last run
+        skipped_reason: Why the last run was skipped, if it was
+        worker: Identifier of the worker that performed the last run
+    """
+
+    success: bool = False
+    last_run_at: Optional[str] = None
+    duration_ms: float = 0.0
+    warmed: int = 0
+    failed: int = 0
+    skipped_reason: Optional[str] = None
+    worker: Optional[str] = None
+
+
+class CacheWarmingScheduler:
+    """Schedules concurrent, lease-coordinated cache warm-ups.
+
+    Attributes:
+        targets: Registered warming targets keyed by name
+        concurrency: Maximum number of concurrent warm-up calls
+        tick_seconds: Seconds between checks for due targets
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        tick_seconds: float = DEFAULT_TICK_SECONDS,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            concurrency: Maximum number of concurrent warm-up calls
+            tick_seconds: Seconds between checks for due targets
+        """
+        self.targets: Dict[str, WarmingTarget] = {}
+        self.concurrency = concurrency
+        self.tick_seconds = tick_seconds
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._status: Dict[str, WarmingStatus] = {}
+        self._next_due: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, target: WarmingTarget) -> None:
+        """Register a warming target.
+
+        Args:
+            target: Target to keep warm
+        """
+        self.targets[target.name] = target
+        self._status.setdefault(target.name, WarmingStatus())
+
+    async def _acquire_lease(self, target: WarmingTarget) -> Optional[bool]:
+        """Try to take the fleet-wide lease for warming a target.
+
+        Returns:
+            True if acquired, False if another worker holds it, or None if
+            Redis is unavailable (warming proceeds without coordination)
+        """
+        try:
+            redis = await get_redis_client()
+            lease_seconds = max(int(target.refresh_interval), 1)
+            acquired = await redis.set(
+                f"{WARMING_KEY_PREFIX}:lease:{target.name}",
+                self.worker_id,
+                nx=True,
+                ex=lease_seconds,
+            )
+            return bool(acquired)
+        except Exception as e:
+            logger.debug(f"Cache warming lease unavailable for {target.name}: {e}")
+            return None
+
+    async def _hot_entries(self, target: WarmingTarget) -> List[str]:
+        """Get the hottest identifiers for a target from access statistics."""
+        if target.warm_entry is None or target.top_n <= 0:
+            return []
+        metrics = get_cache_metrics()
+        try:
+            await metrics.flush()
+            hot = await metrics.get_hottest(target.name, target.top_n)
+            await metrics.decay_accesses(target.name)
+            return hot
+        except Exception as e:
+            logger.debug(f"No access statistics for {target.name}: {e}")
+            return []
+
+    async def _record_status(self, name: str, status: WarmingStatus) -> None:
+        """Store a target's status locally and, best effort, in Redis."""
+        self._status[name] = status
+        try:
+            redis = await get_redis_client()
+            await redis.hset(
+                f"{WARMING_KEY_PREFIX}:status:{name}",
+                mapping={k: "" if v is None else str(v) for k, v in asdict(status).items()},
+            )
+        except Exception:
+            pass
+
+    async def warm_target(
+        self,
+        target: WarmingTarget,
+        force: bool = False,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Optional[bool]:
+        """Warm a single target's default and hottest entries.
+
+        Args:
+            target: Target to warm
+            force: Warm even if another worker holds the target's lease
+            semaphore: Shared concurrency limit (a per-call one is created if None)
+
+        Returns:
+            bool: Whether every entry warmed successfully, or None if the
+                target was skipped
+        """
+        started_at = datetime.utcnow().isoformat()
+        started = time.perf_counter()
+        self._next_due[target.name] = time.monotonic() + target.refresh_interval
+
+        lease = await self._acquire_lease(target)
+        if lease is False and not force:
+            await self._record_status(
+                target.name,
+                WarmingStatus(
+                    success=self._status.get(target.name, WarmingStatus()).success,
+                    last_run_at=started_at,
+                    skipped_reason="lease held by another worker",
+                    worker=self.worker_id,
+                ),
+            )
+            return None
+
+        jobs: List[Callable[[], Awaitable[bool]]] = []
+        if target.warm_default is not None:
+            jobs.append(target.warm_default)
+        for identifier in await self._hot_entries(target):
+            jobs.append(lambda identifier=identifier: target.warm_entry(identifier))
+
+        if not jobs:
+            return None
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: Callable[[], Awaitable[bool]]) -> bool:
+            async with semaphore:
+                try:
+                    # Recompute rather than serve the entry that is about to expire
+                    with refreshing_cache():
+                        return bool(await job())
+                except Exception as e:
+                    logger.error(f"Cache warming job for {target.name} failed: {e}")
+                    return False
+
+        results = await asyncio.gather(*(run(job) for job in jobs))
+        warmed = sum(1 for result in results if result)
+
+        await self._record_status(
+            target.name,
+            WarmingStatus(
+                success=warmed == len(results),
+                last_run_at=started_at,
+                duration_ms=round((time.perf_counter() - started) * 1000, 2),
+                warmed=warmed,
+                failed=len(results) - warmed,
+                worker=self.worker_id,
+            ),
+        )
+        return warmed == len(results)
+
+    async def run_once(self, force: bool = False) -> Dict[str, bool]:
+        """Warm all targets that are due, concurrently.
+
+        Args:
+            force: Warm every target regardless of schedule and leases
+
+        Returns:
+            dict: Mapping of warmed target name to success status (targets
+                that were skipped or had nothing to warm are omitted)
+        """
+        now = time.monotonic()
+        due = [
+            target for target in self.targets.values()
+            if force or self._next_due.get(target.name, 0.0) <= now
+        ]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(
+            *(self.warm_target(target, force=force, semaphore=semaphore) for target in due)
+        )
+        return {
+            target.name: outcome
+            for target, outcome in zip(due, outcomes)
+            if outcome is not None
+        }
+
+    async def _run_forever(self) -> None:
+        """Scheduler loop re-warming targets as they become due."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Cache warming cycle failed: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    def start(self) -> None:
+        """Start the background warming loop if it is not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background warming loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict[str, WarmingStatus]:
+        """Get this worker's view of every target's warming status.
+
+        Returns:
+            dict: Mapping of target name to its last recorded status
+        """
+        return dict(self._status)
+
+    async def get_fleet_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get the last warming status of each target across all workers.
+
+        Falls back to this worker's status when Redis is unavailable.
+
+        Returns:
+            dict: Mapping of target name to its last recorded status fields
+        """
+        report = {name: asdict(status) for name, status in self._status.items()}
+        try:
+            redis = await get_redis_client()
+            for name in self.targets:
+                stored = await redis.hgetall(f"{WARMING_KEY_PREFIX}:status:{name}")
+                if stored:
+                    report[name] = {k: (v if v != "" else None) for k, v in stored.items()}
+        except Exception:
+            pass
+        return report
+
+
+def _default_targets() -> List[WarmingTarget]:
+    """Build the application's default warming targets.
+
+    Only ``@cache`` decorated methods are warmed, called the way requests
+    call them, so the warmed entries are the ones requests read. Child
+    profiles are only warmed when a Gibbon service credential is configured.
+    Warm-up functions are looked up at call time so they can be replaced
+    (e.g. patched in tests) after the scheduler is created.
+    """
+    targets = [
+        WarmingTarget(
+            name="analytics_dashboard",
+            ttl=900,
+            warm_default=lambda: warm_analytics_dashboard(),
+            warm_entry=lambda facility_id: warm_analytics_dashboard(UUID(facility_id)),
+        ),
+    ]
+    if settings.cache_warming_gibbon_token:
+        targets.append(
+            WarmingTarget(
+                name="child_profile",
+                ttl=300,
+                warm_entry=lambda child_id: warm_child_profile(UUID(child_id)),
+            )
+        )
+    return targets
+
+
+# Global scheduler instance
+_scheduler: Optional[CacheWarmingScheduler] = None
+
+
+def get_warming_scheduler() -> CacheWarmingScheduler:
+    """Get or create the global cache warming scheduler.
+
+    Returns:
+        CacheWarmingScheduler: Scheduler with the default targets registered
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        _scheduler = CacheWarmingScheduler()
+        for target in _default_targets():
+            _scheduler.register(target)
+
+    return _scheduler
+
+
 async def warm_all_caches() -> dict[str, bool]:
     """Warm all frequently accessed caches.
 
-    Attempts to warm all configured caches. Individual cache warming
-    failures are logged but don't prevent other caches from being warmed.
+    Attempts to warm all configured caches concurrently. Individual cache
+    warming failures are logged but don't prevent other caches from being
+    warmed.
 
     Returns:
         dict: Mapping of cache name to warming success status
 
     Example:
         {
-            "activity_catalog": True,
             "analytics_dashboard": True
         }
     """
     logger.info("Starting cache warming on application startup...")
 
-    results = {}
-
-    # Warm activity catalog (1hr TTL - most beneficial to preload)
-    results["activity_catalog"] = await warm_activity_catalog()
-
-    # Warm analytics dashboard (15min TTL)
-    results["analytics_dashboard"] = await warm_analytics_dashboard()
+    results = await get_warming_scheduler().run_once(force=True)
 
     # Log summary
     successful = sum(1 for success in results.values() if success)
@@ -108,15 +469,14 @@ async def warm_all_caches() -> dict[str, bool]:
 async def get_warming_status() -> dict[str, bool]:
     """Get the status of cache warming operations.
 
-    This function can be used to check which caches were successfully
-    warmed during startup.
+    Reports whether the most recent warm-up of each target succeeded in
+    this worker. Targets that have not been warmed yet report False. Use
+    ``get_warming_scheduler().get_fleet_status()`` for timing details.
 
     Returns:
         dict: Mapping of cache name to warming success status
     """
-    # This is a simple implementation - in production, you might want to
-    # store warming status in Redis or a state management system
     return {
-        "activity_catalog": True,
-        "analytics_dashboard": True,
+        name: status.success
+        for name, status in get_warming_scheduler().get_status().items()
     }
@@ -0,0 +1,340 @@
+"""Row counting strategies for paginated listings.
+
+Paginated endpoints report how many rows match their filters. Running the
+filter a second time as ``SELECT COUNT(*)`` doubles the work of every page,
+so callers pick how the total is obtained:
+
+- ``exact``: ``COUNT(*) OVER ()`` is added to the page query, so rows and
+  total come back in one round trip.
+- ``cached``: the total is counted once and cached in Redis under a hash of
+  the filtered query for ``db_count_cache_ttl`` seconds. Committed writes to
+  a counted table invalidate its cached totals (see
+  ``install_count_invalidation``).
+- ``estimated``: the PostgreSQL planner's row estimate (``pg_class.reltuples``
+  for unfiltered tables, ``EXPLAIN`` otherwise) is returned and flagged as
+  approximate. Estimates below ``db_count_estimate_threshold`` are replaced
+  by an exact count, which is cheap at that size. Other databases always
+  count exactly.
+
+Example:
+    page = await fetch_page(db, query, skip=40, limit=20, strategy=CountStrategy.CACHED)
+    return build_paginated_response(page.items, page.total, ..., approximate=page.approximate)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import chain
+from typing import Any, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import Select, event, func, select, text
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+from app.config import settings
+from app.core.cache_metrics import get_cache_metrics
+from app.core.cache_tags import entity_tag, invalidate_tags, tag_keys
+from app.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Redis key prefix of cached totals
+COUNT_CACHE_PREFIX = "row_count"
+
+# Label of the windowed total added to page queries
+_TOTAL_LABEL = "_window_total"
+
+# Session.info key collecting the counted tables written in a transaction
+_WRITTEN_TABLES = "counted_tables_written"
+
+# Tables whose cached totals are invalidated on write
+_counted_tables: Set[str] = set()
+
+# Invalidations started after commits, referenced until they finish
+_pending_invalidations: Set["asyncio.Task[None]"] = set()
+
+# Planner estimate of a table's size; negative if never analyzed
+RELTUPLES_QUERY = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"
+)
+
+
+class CountStrategy(str, Enum):
+    """How a listing's total is obtained.
+
+    Attributes:
+        EXACT: Windowed ``COUNT(*) OVER ()`` in the page query
+        CACHED: Exact count cached per filter, invalidated on write
+        ESTIMATED: Planner row estimate, flagged as approximate
+    """
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+@dataclass
+class CountedPage(Generic[T]):
+    """One page of a listing with its total.
+
+    Attributes:
+        items: Rows of the page (entities, or tuples for multi-column queries)
+        total: Number of rows matching the filters
+        approximate: Whether ``total`` is an estimate
+    """
+
+    items: List[T] = field(default_factory=list)
+    total: int = 0
+    approximate: bool = False
+
+
+def count_tag(table_name: str) -> str:
+    """Build the cache tag shared by the cached totals of a table.
+
+    Args:
+        table_name: Name of the counted table
+
+    Returns:
+        str: Tag such as ``"row_count:activities"``
+    """
+    return entity_tag(COUNT_CACHE_PREFIX, table_name)
+
+
+def track_counts(*models: Any) -> None:
+    """Invalidate the cached totals of these models' tables on write.
+
+    Called at import time by services using ``CountStrategy.CACHED`` so that
+    every worker invalidates, whichever of them cached the total.
+
+    Args:
+        *models: SQLAlchemy models (or tables) whose totals are cached
+    """
+    for model in models:
+        _counted_tables.add(getattr(model, "__tablename__", None) or model.name)
+
+
+def _count_source(query: Select) -> Select:
+    """Strip ordering and paging from a listing query."""
+    return query.order_by(None).limit(None).offset(None)
+
+
+def _exact_count_query(query: Select) -> Select:
+    """Build ``SELECT COUNT(*)`` over a listing's filters."""
+    return select(func.count()).select_from(_count_source(query).subquery())
+
+
+def _tables(query: Select) -> List[str]:
+    """Names of the tables a query reads from, including joins and subqueries."""
+    return sorted({table.name for table in find_tables(query)})
+
+
+async def _exact_count(db: AsyncSession, query: Select) -> int:
+    """Count a listing's rows with ``SELECT COUNT(*)``."""
+    return (await db.execute(_exact_count_query(query))).scalar() or 0
+
+
+async def _cached_count(db: AsyncSession, query: Select, ttl: Optional[int]) -> int:
+    """Count a listing's rows through the Redis count cache."""
+    ttl = ttl or settings.db_count_cache_ttl
+    count_query = _exact_count_query(query)
+    compiled = count_query.compile(dialect=db.bind.dialect)
+    digest = hashlib.sha256(
+        (str(compiled) + json.dumps(compiled.params, sort_keys=True, default=str)).encode("utf-8")
+    ).hexdigest()[:32]
+    cache_key = f"{COUNT_CACHE_PREFIX}:{digest}"
+    metrics = get_cache_metrics()
+
+    try:
+        redis = await get_redis_client()
+        cached = await redis.get(cache_key)
+        if cached is not None:
+            metrics.record_hit(COUNT_CACHE_PREFIX, len(cached))
+            return int(cached)
+    except Exception as e:
+        logger.warning(f"Count cache read failed, counting rows: {e}")
+        return (await db.execute(count_query)).scalar() or 0
+
+    metrics.record_miss(COUNT_CACHE_PREFIX)
+    total = (await db.execute(count_query)).scalar() or 0
+    try:
+        await redis.setex(cache_key, ttl, total)
+        metrics.record_set(COUNT_CACHE_PREFIX, cache_key, len(str(total)), ttl)
+        await tag_keys(cache_key, [count_tag(table) for table in _tables(query)], ttl)
+    except Exception as e:
+        logger.warning(f"Count cache write failed: {e}")
+    return total
+
+
+async def _planner_estimate(db: AsyncSession, query: Select) -> Optional[int]:
+    """Ask PostgreSQL how many rows a listing should return.
+
+    Returns:
+        Optional[int]: Estimated rows, or None if no estimate is available
+    """
+    source = _count_source(query)
+    froms = query.get_final_froms()
+    if source.whereclause is None and len(froms) == 1 and hasattr(froms[0], "name"):
+        estimate = (
+            await db.execute(RELTUPLES_QUERY, {"table_name": froms[0].name})
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+
+    try:
+        sql = str(
+            source.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+        )
+    except (CompileError, NotImplementedError) as e:
+        logger.debug(f"Cannot render query for EXPLAIN, counting rows: {e}")
+        return None
+    # Driver-level execution: the rendered literals must not be parsed as
+    # bind parameters
+    connection = await db.connection()
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    strategy: CountStrategy = CountStrategy.EXACT,
+    ttl: Optional[int] = None,
+) -> Tuple[int, bool]:
+    """Count the rows matching a listing query on its own.
+
+    For ``EXACT`` prefer ``fetch_page``, which counts in the page query.
+
+    Args:
+        db: Async database session
+        query: Listing query (ordering and paging are ignored)
+        strategy: Counting strategy
+        ttl: Cache TTL in seconds for ``CACHED`` (uses config default if None)
+
+    Returns:
+        Tuple[int, bool]: Total and whether it is approximate
+    """
+    if strategy == CountStrategy.CACHED:
+        return await _cached_count(db, query, ttl), False
+
+    if strategy == CountStrategy.ESTIMATED and db.bind.dialect.name == "postgresql":
+        estimate = await _planner_estimate(db, query)
+        if estimate is not None and estimate >= settings.db_count_estimate_threshold:
+            return estimate, True
+
+    return await _exact_count(db, query), False
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    skip: int,
+    limit: int,
+    strategy: CountStrategy = CountStrategy.EXACT,
+    ttl: Optional[int] = None,
+) -> CountedPage[Any]:
+    """Fetch one page of a listing together with its total.
+
+    Args:
+        db: Async database session
+        query: Ordered listing query without offset or limit
+        skip: Number of rows to skip
+        limit: Maximum number of rows to return
+        strategy: Counting strategy
+        ttl: Cache TTL in seconds for ``CACHED`` (uses config default if None)
+
+    Returns:
+        CountedPage[Any]: Page rows (the entity for single-entity queries,
+        tuples otherwise) with the total
+    """
+    single = len(query.column_descriptions) == 1
+
+    if strategy != CountStrategy.EXACT:
+        result = await db.execute(query.offset(skip).limit(limit))
+        items = list(result.scalars().all()) if single else [tuple(row) for row in result.all()]
+        total, approximate = await count_rows(db, query, strategy, ttl)
+        return CountedPage(items=items, total=total, approximate=approximate)
+
+    windowed = query.add_columns(func.count().over().label(_TOTAL_LABEL))
+    rows = (await db.execute(windowed.offset(skip).limit(limit))).all()
+    if rows:
+        total = rows[0][-1]
+    elif skip:
+        # Past the last page the window has no row to report the total on
+        total = await _exact_count(db, query)
+    else:
+        total = 0
+    items = [row[0] if single else tuple(row[:-1]) for row in rows]
+    return CountedPage(items=items, total=total)
+
+
+def _written_tables(session: Session) -> Set[str]:
+    """Counted tables written in the session's current transaction."""
+    return session.info.setdefault(_WRITTEN_TABLES, set())
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    """Remember the counted tables a flush wrote to."""
+    if not _counted_tables:
+        return
+    for instance in chain(session.new, session.dirty, session.deleted):
+        table = getattr(type(instance), "__tablename__", None)
+        if table in _counted_tables:
+            _written_tables(session).add(table)
+
+
+def _do_orm_execute(state: Any) -> None:
+    """Remember the counted tables written by bulk INSERT/UPDATE/DELETE."""
+    if _counted_tables and (state.is_insert or state.is_update or state.is_delete):
+        table = getattr(getattr(state.statement, "table", None), "name", None)
+        if table in _counted_tables:
+            _written_tables(state.session).add(table)
+
+
+def _after_commit(session: Session) -> None:
+    """Invalidate the cached totals of the tables a transaction wrote."""
+    tables = session.info.pop(_WRITTEN_TABLES, None)
+    if not tables:
+        return
+    try:
+        task = asyncio.get_running_loop().create_task(
+            invalidate_tags(*(count_tag(table) for table in sorted(tables)))
+        )
+    except RuntimeError:
+        # No running loop (sync session); cached totals expire with their TTL
+        return
+    _pending_invalidations.add(task)
+    task.add_done_callback(_invalidation_done)
+
+
+def _invalidation_done(task: "asyncio.Task[None]") -> None:
+    """Release a finished invalidation and log its failure, if any."""
+    _pending_invalidations.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Count cache invalidation failed: {task.exception()}")
+
+
+def _after_rollback(session: Session) -> None:
+    """Forget writes that were rolled back."""
+    session.info.pop(_WRITTEN_TABLES, None)
+
+
+def install_count_invalidation() -> None:
+    """Attach the session events invalidating cached totals on commit."""
+    listeners: Iterable[Tuple[str, Any]] = (
+        ("after_flush", _after_flush),
+        ("do_orm_execute", _do_orm_execute),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    )
+    for name, listener in listeners:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
@@ -0,0 +1,137 @@
+"""Hot-query registry for LAYA AI Service.
+
+Queries that run on most requests (role lookups, activity by ID, LLM cache
+reads, token blacklist checks) used to build a new ``select(...)`` tree on
+every call, which SQLAlchemy then had to walk to compute its cache key
+before it could find the compiled SQL. A ``HotQuery`` builds its statement
+once, with bind parameters in place of the values, and reuses the same
+statement object for every execution:
+
+- SQLAlchemy memoizes the cache key of a statement object, so reuse skips
+  both building the tree and computing the key, and the compiled form is
+  always found in the engine's compiled cache (``DB_COMPILED_CACHE_SIZE``).
+- On PostgreSQL the SQL text is identical across calls, so the asyncpg
+  prepared statement cache (``DB_PREPARED_STATEMENT_CACHE_SIZE``) reuses the
+  server-side prepared statement too.
+
+Queries with optional filters register one variant per combination of
+filters; the builder receives the variant flags as keyword arguments.
+Statements are built on first use, so importing a module does not build
+its queries.
+
+Example:
+    ACTIVITY_BY_ID = HotQuery(
+        "activities.by_id",
+        lambda: select(Activity).where(Activity.id == bindparam("activity_id")),
+    )
+
+    result = await ACTIVITY_BY_ID.execute(db, {"activity_id": activity_id})
+"""
+
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+# Registered hot queries by name
+_registry: Dict[str, "HotQuery"] = {}
+
+
+class HotQuery:
+    """Prebuilt, parameterized statement reused across executions.
+
+    Attributes:
+        name: Registry name, e.g. ``"rbac.user_roles"``
+        build: Function building the statement of a variant
+        executions: Number of executions through ``execute``
+    """
+
+    def __init__(self, name: str, build: Callable[..., Executable]) -> None:
+        """Register a hot query.
+
+        Args:
+            name: Registry name; registering a name again replaces the query
+            build: Function building the statement, called once per variant
+                with the variant flags as keyword arguments
+        """
+        self.name = name
+        self.executions = 0
+        self.build = build
+        self._statements: Dict[Tuple[Tuple[str, Any], ...], Executable] = {}
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def statement(self, **variant: Any) -> Executable:
+        """Get the statement of a variant, building it on first use.
+
+        Args:
+            **variant: Variant flags passed to the builder
+
+        Returns:
+            Executable: The shared statement; execute it with its bind
+            parameters instead of modifying it
+        """
+        key = tuple(sorted(variant.items()))
+        statement = self._statements.get(key)
+        if statement is None:
+            with self._lock:
+                statement = self._statements.get(key)
+                if statement is None:
+                    statement = self.build(**variant)
+                    # Computed once here, then memoized on the statement
+                    statement._generate_cache_key()
+                    self._statements[key] = statement
+        return statement
+
+    async def execute(
+        self,
+        session: AsyncSession,
+        params: Optional[Mapping[str, Any]] = None,
+        **variant: Any,
+    ) -> Result:
+        """Execute a variant of the query.
+
+        Args:
+            session: Database session
+            params: Values of the bind parameters
+            **variant: Variant flags passed to the builder
+
+        Returns:
+            Result: Result of the execution
+        """
+        self.executions += 1
+        return await session.execute(self.statement(**variant), dict(params or {}))
+
+    def stats(self) -> Dict[str, int]:
+        """Get execution statistics.
+
+        Returns:
+            Dict[str, int]: Executions and number of variants built
+        """
+        return {"executions": self.executions, "variants": len(self._statements)}
+
+
+def get_hot_query(name: str) -> HotQuery:
+    """Get a registered hot query.
+
+    Args:
+        name: Registry name
+
+    Returns:
+        HotQuery: The registered query
+
+    Raises:
+        KeyError: If no query is registered under the name
+    """
+    return _registry[name]
+
+
+def hot_query_stats() -> Dict[str, Dict[str, int]]:
+    """Get statistics of every registered hot query.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Executions and variants built, by name
+    """
+    return {name: query.stats() for name, query in sorted(_registry.items())}
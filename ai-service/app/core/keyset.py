@@ -0,0 +1,284 @@
+"""Keyset pagination for LAYA AI Service.
+
+``OFFSET`` pagination makes the database read and discard every skipped
+row, so deep pages of large listings (audit trails, message history) get
+linearly slower. Keyset pagination instead remembers the sort key of the
+last row served and seeks past it with a predicate the index can satisfy,
+so every page costs the same.
+
+``KeysetPaginator`` works with the sort specs of ``core.sorting``: the
+listing is ordered by ``apply_multi_sort`` with a unique tiebreaker column
+appended, and cursors are the sort key of a boundary row, signed with
+``encode_signed_cursor`` so clients cannot forge them. Cursors page forward
+(``next_cursor``) or backward (``previous_cursor``) and are bound to the
+sort spec that produced them.
+
+Sort columns must be NOT NULL (or always populated): a NULL sort key
+cannot be sought past.
+
+Example:
+    paginator = KeysetPaginator(Message, [("created_at", SortOrder.ASC)])
+    page = await paginator.paginate(db, select(Message).where(...), limit=50)
+    # Next request
+    page = await paginator.paginate(db, query, limit=50, cursor=page.next_cursor)
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+
+from app.core.pagination import decode_signed_cursor, encode_signed_cursor
+from app.core.sorting import apply_multi_sort
+from app.schemas.pagination import SortOrder
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Cursor directions
+FORWARD = "next"
+BACKWARD = "prev"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed, tampered with or from another sort."""
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """One page of a keyset-paginated listing.
+
+    Attributes:
+        items: Items of the page, in listing order
+        next_cursor: Cursor for the following page (None on the last page)
+        previous_cursor: Cursor for the preceding page (None on the first page)
+    """
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        """Whether a following page exists."""
+        return self.next_cursor is not None
+
+    def map(self, func: Callable[[T], R]) -> "KeysetPage[R]":
+        """Convert the items of the page, keeping its cursors.
+
+        Args:
+            func: Conversion applied to each item
+
+        Returns:
+            KeysetPage[R]: Page with the converted items
+        """
+        return KeysetPage(
+            items=[func(item) for item in self.items],
+            next_cursor=self.next_cursor,
+            previous_cursor=self.previous_cursor,
+        )
+
+
+def _dump_value(value: Any) -> Any:
+    """Convert a sort key value to its JSON form."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _load_value(column: Any, value: Any) -> Any:
+    """Convert a sort key value from its JSON form to the column's type."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type in (UUID, Decimal):
+        return python_type(value)
+    return value
+
+
+class KeysetPaginator:
+    """Paginate ``select(model)`` queries by seeking on their sort key.
+
+    Attributes:
+        model: SQLAlchemy model being listed
+        sorts: Sort spec as accepted by ``apply_multi_sort``, followed by the
+            tiebreaker
+        allowed_fields: Fields the sort spec may use
+    """
+
+    def __init__(
+        self,
+        model: type[DeclarativeBase],
+        sorts: Sequence[Tuple[str, SortOrder]],
+        tiebreaker: str = "id",
+        allowed_fields: Optional[List[str]] = None,
+    ) -> None:
+        """Initialize the paginator.
+
+        Args:
+            model: SQLAlchemy model being listed
+            sorts: Sort spec (field name, order) pairs
+            tiebreaker: Unique column appended to the sort spec so the order
+                is total; it sorts in the direction of the last sort field
+            allowed_fields: Optional allow list for the sort fields (the
+                tiebreaker is always allowed)
+
+        Raises:
+            ValueError: If a sort field doesn't exist on the model or isn't allowed
+        """
+        self.model = model
+        sorts = [(name, order) for name, order in sorts if name != tiebreaker]
+        last_order = sorts[-1][1] if sorts else SortOrder.ASC
+        self.sorts: List[Tuple[str, SortOrder]] = sorts + [(tiebreaker, last_order)]
+        self.allowed_fields = (
+            list(allowed_fields) + [tiebreaker] if allowed_fields is not None else None
+        )
+        # Validate the spec now rather than on the first request
+        apply_multi_sort(select(model), model, self.sorts, self.allowed_fields)
+        self._columns = [getattr(model, name) for name, _ in self.sorts]
+        self._signature = hashlib.sha256(
+            ",".join(f"{name}:{order.value}" for name, order in self.sorts).encode("utf-8")
+        ).hexdigest()[:12]
+
+    def encode_cursor(self, item: Any, direction: str = FORWARD) -> str:
+        """Build the cursor positioned on an item.
+
+        Args:
+            item: Model instance at the page boundary
+            direction: ``"next"`` to seek after the item, ``"prev"`` before it
+
+        Returns:
+            str: Signed cursor
+        """
+        key = [_dump_value(getattr(item, name)) for name, _ in self.sorts]
+        return encode_signed_cursor({"k": key, "d": direction, "s": self._signature})
+
+    def decode_cursor(self, cursor: str) -> Tuple[List[Any], str]:
+        """Read the sort key and direction of a cursor.
+
+        Args:
+            cursor: Cursor created by ``encode_cursor``
+
+        Returns:
+            Tuple[List[Any], str]: Sort key values and direction
+
+        Raises:
+            InvalidCursorError: If the cursor is invalid or from another sort
+        """
+        try:
+            data = decode_signed_cursor(cursor)
+        except ValueError as e:
+            raise InvalidCursorError(str(e)) from e
+        if (
+            not isinstance(data, dict)
+            or data.get("s") != self._signature
+            or data.get("d") not in (FORWARD, BACKWARD)
+            or not isinstance(data.get("k"), list)
+            or len(data["k"]) != len(self._columns)
+        ):
+            raise InvalidCursorError("Cursor does not belong to this listing")
+        try:
+            key = [_load_value(column, value) for column, value in zip(self._columns, data["k"])]
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError(f"Invalid cursor value: {e}") from e
+        return key, data["d"]
+
+    def _seek(self, key: List[Any], forward: bool) -> Any:
+        """Build the predicate selecting rows past a sort key.
+
+        When every column sorts the same way a row-value comparison is used,
+        which the database matches against a composite index directly.
+        Mixed directions expand to ``a > x OR (a = x AND b < y) ...``.
+        """
+        ascending = [order == SortOrder.ASC for _, order in self.sorts]
+        if all(ascending) or not any(ascending):
+            after = ascending[0] == forward
+            left, right = tuple_(*self._columns), tuple(key)
+            return left > right if after else left < right
+
+        clauses = []
+        for index, (column, value) in enumerate(zip(self._columns, key)):
+            equal = [c == v for c, v in zip(self._columns[:index], key[:index])]
+            step = column > value if ascending[index] == forward else column < value
+            clauses.append(and_(*equal, step))
+        return or_(*clauses)
+
+    def _order(self, query: Select, forward: bool) -> Select:
+        """Order a query by the sort spec, reversed when paging backward."""
+        sorts = self.sorts
+        if not forward:
+            sorts = [
+                (name, SortOrder.ASC if order == SortOrder.DESC else SortOrder.DESC)
+                for name, order in sorts
+            ]
+        return apply_multi_sort(query, self.model, sorts, self.allowed_fields)
+
+    async def paginate(
+        self,
+        db: AsyncSession,
+        query: Select,
+        limit: int,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+    ) -> KeysetPage[Any]:
+        """Fetch one page of a listing.
+
+        Args:
+            db: Async database session
+            query: ``select(model)`` with the listing's filters and no ordering
+            limit: Maximum number of items in the page
+            cursor: Cursor from a previous page (starts at the beginning if None)
+            offset: Rows to skip when no cursor is given, for clients still
+                paging by offset; the page still carries cursors
+
+        Returns:
+            KeysetPage[Any]: Model instances of the page with its cursors
+
+        Raises:
+            InvalidCursorError: If the cursor is invalid or from another sort
+        """
+        forward = True
+        if cursor is not None:
+            key, direction = self.decode_cursor(cursor)
+            forward = direction == FORWARD
+            query = query.where(self._seek(key, forward))
+        elif offset:
+            query = query.offset(offset)
+
+        result = await db.execute(self._order(query, forward).limit(limit + 1))
+        rows = list(result.scalars().all())
+        overflow = len(rows) > limit
+        rows = rows[:limit]
+        if not forward:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage()
+
+        # Going forward, a previous page exists if we started past the first
+        # row; going backward, a following page always exists
+        has_next = overflow if forward else True
+        has_previous = (cursor is not None or offset > 0) if forward else overflow
+        return KeysetPage(
+            items=rows,
+            next_cursor=self.encode_cursor(rows[-1], FORWARD) if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], BACKWARD) if has_previous else None,
+        )
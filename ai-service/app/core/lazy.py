@@ -0,0 +1,90 @@
+"""Lazy loading helpers for LAYA AI Service.
+
+Importing ``app.main`` used to pull in every optional subsystem (the AWS
+SDK, Pillow, LLM providers, alerting over aiohttp) whether or not a worker
+ever used it. Heavy dependencies are now imported where they are used, and
+package ``__init__`` modules re-export their public names lazily with
+``lazy_exports`` (PEP 562), so importing one submodule no longer imports its
+siblings.
+
+Workers that prefer paying the import cost at startup rather than on the
+first request set ``PRELOAD_SUBSYSTEMS=true``; ``preload_subsystems`` then
+imports them before traffic is served.
+
+Example:
+    # app/services/__init__.py
+    __getattr__, __dir__ = lazy_exports(
+        __name__, {"AlertManager": "app.services.alert_manager"}
+    )
+"""
+
+import importlib
+import logging
+import sys
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional subsystems imported on first use, preloaded on request
+HEAVY_SUBSYSTEMS: Tuple[str, ...] = (
+    "boto3",
+    "botocore.exceptions",
+    "PIL.Image",
+    "app.llm.providers.anthropic_provider",
+    "app.llm.providers.openai_provider",
+    "app.services.alert_manager",
+)
+
+
+def lazy_exports(
+    package: str, exports: Mapping[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build the module ``__getattr__`` and ``__dir__`` of a lazy package.
+
+    Args:
+        package: ``__name__`` of the package
+        exports: Exported name -> module defining it, or
+            ``"module:attribute"`` when it is exported under another name
+
+    Returns:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: Module-level
+        ``__getattr__`` and ``__dir__``
+    """
+    exports = dict(exports)
+
+    def __getattr__(name: str) -> Any:  # noqa: N807
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, _, attribute = target.partition(":")
+        value = getattr(importlib.import_module(module_name), attribute or name)
+        # Later lookups find the attribute without calling __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:  # noqa: N807
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+def preload_subsystems(modules: Sequence[str] = HEAVY_SUBSYSTEMS) -> Dict[str, bool]:
+    """Import lazily loaded subsystems ahead of the first request.
+
+    Missing optional dependencies are logged and skipped.
+
+    Args:
+        modules: Modules to import
+
+    Returns:
+        Dict[str, bool]: Whether each module could be imported
+    """
+    loaded = {}
+    for module_name in modules:
+        try:
+            importlib.import_module(module_name)
+            loaded[module_name] = True
+        except ImportError as e:
+            logger.warning(f"Cannot preload {module_name}: {e}")
+            loaded[module_name] = False
+    return loaded
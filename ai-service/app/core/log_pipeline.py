@@ -0,0 +1,291 @@
+"""Queued log pipeline for LAYA AI Service.
+
+Keeps log I/O off the event loop. Loggers only put records on a bounded
+in-memory queue; a background listener thread renders them and writes them
+to the real handlers (stdout, rotating files).
+
+- When the queue is full, records are dropped and counted instead of
+  blocking the caller.
+- High-volume events can be sampled (keep a fraction of them) and rate
+  limited (keep at most N per second) per event type. The event type of a
+  record is its ``event_type`` extra (as set by ``TokenAuditLogger``), or
+  else its message. Events without a rule are always kept.
+- ``LogPipeline.stop`` drains the queue, so records logged before shutdown
+  are written.
+
+Example:
+    pipeline = LogPipeline(
+        [logging.StreamHandler()],
+        sampling=parse_sampling_rules("verify_success=0.01,Outbound request=1/50"),
+    )
+    pipeline.start()
+    logging.root.addHandler(pipeline.handler)
+"""
+
+import copy
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+@dataclass
+class SamplingRule:
+    """How many records of one event type to keep.
+
+    Attributes:
+        rate: Fraction of records kept (1.0 keeps all, 0.01 keeps 1 in 100)
+        per_second: Maximum records kept per second, None for no limit
+    """
+
+    rate: float = 1.0
+    per_second: Optional[float] = None
+
+
+def parse_sampling_rules(spec: str) -> Dict[str, SamplingRule]:
+    """Parse sampling rules from comma-separated ``event=rate[/per_second]`` pairs.
+
+    Example: ``"verify_success=0.01,Outbound request=1/50"`` keeps 1% of
+    successful token verifications and at most 50 outbound request records
+    per second.
+
+    Args:
+        spec: Rules to parse
+
+    Returns:
+        Dict[str, SamplingRule]: Rules by event type
+
+    Raises:
+        ValueError: If a rate is not between 0 and 1 or a limit is not positive
+    """
+    rules = {}
+    for entry in spec.split(","):
+        event, _, value = entry.partition("=")
+        if not event.strip() or not value.strip():
+            continue
+        rate, _, per_second = value.partition("/")
+        rule = SamplingRule(
+            rate=float(rate),
+            per_second=float(per_second) if per_second.strip() else None,
+        )
+        if not 0.0 <= rule.rate <= 1.0:
+            raise ValueError(f"Sampling rate for '{event.strip()}' must be between 0 and 1")
+        if rule.per_second is not None and rule.per_second <= 0:
+            raise ValueError(f"Rate limit for '{event.strip()}' must be positive")
+        rules[event.strip()] = rule
+    return rules
+
+
+def record_event_type(record: logging.LogRecord) -> Optional[str]:
+    """Get the event type sampling rules are matched against.
+
+    Args:
+        record: Log record, from structlog or the standard library
+
+    Returns:
+        Optional[str]: The ``event_type`` of the record if set, else its message
+    """
+    explicit = getattr(record, "event_type", None)
+    if explicit:
+        return str(explicit)
+    if isinstance(record.msg, dict):
+        # structlog event dict, not rendered yet
+        event = record.msg.get("event_type") or record.msg.get("event")
+        return str(event) if event is not None else None
+    return record.msg if isinstance(record.msg, str) else None
+
+
+class LogSampler(logging.Filter):
+    """Filter applying per-event-type sampling and rate limits.
+
+    Sampling is deterministic: with a rate of 0.01 the first record of an
+    event type is kept, then every hundredth. Rate limits use a token
+    bucket holding one second of records.
+
+    Attributes:
+        rules: Sampling rules by event type
+        sampled_out: Number of records filtered out, by event type
+    """
+
+    def __init__(self, rules: Optional[Dict[str, SamplingRule]] = None) -> None:
+        """Initialize the sampler.
+
+        Args:
+            rules: Sampling rules by event type
+        """
+        super().__init__()
+        self.rules = dict(rules or {})
+        self.sampled_out: Dict[str, int] = defaultdict(int)
+        self._credit: Dict[str, float] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether to keep a record.
+
+        Args:
+            record: Log record
+
+        Returns:
+            bool: True to keep the record
+        """
+        if not self.rules:
+            return True
+        event = record_event_type(record)
+        rule = self.rules.get(event) if event is not None else None
+        if rule is None:
+            return True
+
+        with self._lock:
+            keep = self._sample(event, rule) and self._allow(event, rule, time.monotonic())
+            if not keep:
+                self.sampled_out[event] += 1
+        return keep
+
+    def _sample(self, event: str, rule: SamplingRule) -> bool:
+        """Keep ``rule.rate`` of the records, starting with the first one."""
+        if rule.rate >= 1.0:
+            return True
+        credit = self._credit.get(event, 1.0 - rule.rate) + rule.rate
+        # Tolerate float error so that 100 x 0.01 adds up to a whole record
+        keep = credit >= 1.0 - 1e-9
+        self._credit[event] = credit - 1.0 if keep else credit
+        return keep
+
+    def _allow(self, event: str, rule: SamplingRule, now: float) -> bool:
+        """Keep at most ``rule.per_second`` records per second."""
+        if rule.per_second is None:
+            return True
+        tokens, updated = self._buckets.get(event, (rule.per_second, now))
+        tokens = min(rule.per_second, tokens + (now - updated) * rule.per_second)
+        if tokens < 1.0:
+            self._buckets[event] = (tokens, now)
+            return False
+        self._buckets[event] = (tokens - 1.0, now)
+        return True
+
+
+class QueuedLogHandler(QueueHandler):
+    """Queue handler that never blocks and leaves rendering to the listener.
+
+    Attributes:
+        dropped: Number of records dropped because the queue was full
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        """Initialize the handler.
+
+        Args:
+            log_queue: Bounded queue drained by the listener thread
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Prepare a record for the queue without formatting it.
+
+        The default implementation renders the record in the calling thread,
+        which is the work this handler exists to move off the event loop.
+        Only %-style arguments are merged now, since the caller may mutate
+        them after logging.
+
+        Args:
+            record: Log record
+
+        Returns:
+            logging.LogRecord: Copy of the record to enqueue
+        """
+        record = copy.copy(record)
+        if record.args and not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, dropping it if the queue is full.
+
+        Args:
+            record: Prepared log record
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Called under the handler lock
+            self.dropped += 1
+
+
+class _LogListener(QueueListener):
+    """Queue listener whose stop waits for room in a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        """Enqueue the stop marker, waiting while the queue drains."""
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """Bounded log queue drained by a background thread.
+
+    Attributes:
+        handlers: Handlers writing the records, run on the listener thread
+        handler: Handler to install on loggers; enqueues records
+        sampler: Sampling filter applied before records are enqueued
+    """
+
+    def __init__(
+        self,
+        handlers: Sequence[logging.Handler],
+        queue_size: int = 10000,
+        sampling: Optional[Dict[str, SamplingRule]] = None,
+    ) -> None:
+        """Initialize the pipeline without starting the listener.
+
+        Args:
+            handlers: Handlers writing the records
+            queue_size: Maximum records waiting to be written
+            sampling: Sampling rules by event type
+        """
+        self.handlers = list(handlers)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.sampler = LogSampler(sampling)
+        self.handler = QueuedLogHandler(self._queue)
+        self.handler.addFilter(self.sampler)
+        self._listener = _LogListener(self._queue, *self.handlers, respect_handler_level=True)
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the listener thread is running."""
+        return self._running
+
+    def start(self) -> None:
+        """Start the listener thread."""
+        if not self._running:
+            self._listener.start()
+            self._running = True
+
+    def stop(self) -> None:
+        """Write every queued record, then stop the listener thread."""
+        if self._running:
+            self._listener.stop()
+            self._running = False
+        for handler in self.handlers:
+            handler.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pipeline statistics.
+
+        Returns:
+            Dict[str, Any]: Queue depth and capacity, records dropped because
+            the queue was full, and records sampled out by event type
+        """
+        return {
+            "running": self._running,
+            "queued": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "dropped": self.handler.dropped,
+            "sampled_out": dict(self.sampler.sampled_out),
+        }
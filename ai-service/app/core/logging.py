@@ -2,16 +2,25 @@
 
 This module provides structured JSON logging with request ID correlation,
 log levels, log rotation, and both development and production configurations.
+Logs can be written synchronously or through a queued pipeline that keeps
+log I/O off the event loop.
 """
 
+import atexit
 import logging
 import sys
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 import structlog
 from structlog.types import EventDict, Processor
 
+from app.core.log_pipeline import LogPipeline, SamplingRule
+
+# Queued log pipeline, when logging is configured with queued=True
+_pipeline: Optional[LogPipeline] = None
+_shutdown_registered = False
+
 
 def add_request_id(
     logger: logging.Logger, method_name: str, event_dict: EventDict
@@ -65,6 +74,9 @@ def configure_logging(
     backup_count: int = 5,
     when: str = "midnight",
     interval: int = 1,
+    queued: bool = False,
+    queue_size: int = 10000,
+    sampling: Optional[Dict[str, SamplingRule]] = None,
 ) -> None:
     """Configure structured logging for the application.
 
@@ -72,6 +84,11 @@ def configure_logging(
     JSON output (production) or human-readable output (development).
     Supports log rotation for file-based logging.
 
+    With ``queued=True``, loggers only enqueue records and a background
+    thread renders and writes them (see ``app.core.log_pipeline``), so log
+    I/O never blocks the event loop. Call ``shutdown_logging`` on shutdown to
+    write the records still queued.
+
     Args:
         log_level: The minimum log level to capture (DEBUG/INFO/WARNING/ERROR/CRITICAL)
         json_logs: Whether to output logs in JSON format (True for production)
@@ -83,21 +100,22 @@ def configure_logging(
         backup_count: Number of backup files to keep
         when: When to rotate (for time-based rotation: "S", "M", "H", "D", "midnight")
         interval: Interval for time-based rotation
+        queued: Render and write records on a background thread
+        queue_size: Maximum records waiting to be written (queued mode only);
+            records logged while the queue is full are dropped and counted
+        sampling: Sampling rules by event type (queued mode only)
     """
+    global _pipeline
+
+    # Records queued under the previous configuration are written with it
+    shutdown_logging()
+
     # Convert log level string to logging constant
     log_level_value = getattr(logging, log_level.upper(), logging.INFO)
 
     # Use provided stream or default to stdout
     output_stream = stream if stream is not None else sys.stdout
 
-    # Configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=output_stream,
-        level=log_level_value,
-        force=True,  # Force reconfiguration
-    )
-
     # Define processors for structlog
     processors: list[Processor] = [
         # Add log level
@@ -116,57 +134,169 @@ def configure_logging(
         add_log_level,
     ]
 
+    renderer: Processor
     if json_logs:
         # Production: JSON output
-        processors.append(structlog.processors.JSONRenderer())
+        renderer = structlog.processors.JSONRenderer()
     else:
         # Development: Human-readable output with colors
-        processors.extend([
-            structlog.dev.ConsoleRenderer(colors=True),
-        ])
+        renderer = structlog.dev.ConsoleRenderer(colors=True)
+
+    file_handler = (
+        _create_file_handler(
+            log_file, rotation_enabled, rotation_type, max_bytes, backup_count, when, interval
+        )
+        if log_file
+        else None
+    )
+
+    if queued:
+        # Loggers hand the event dict over unrendered; the listener thread
+        # renders it, along with records from standard library loggers
+        formatter = structlog.stdlib.ProcessorFormatter(
+            processors=[structlog.stdlib.ProcessorFormatter.remove_processors_meta, renderer],
+            foreign_pre_chain=list(processors),
+        )
+        handlers: list[logging.Handler] = [logging.StreamHandler(output_stream)]
+        if file_handler is not None:
+            handlers.append(file_handler)
+        for handler in handlers:
+            handler.setLevel(log_level_value)
+            handler.setFormatter(formatter)
+
+        _pipeline = LogPipeline(handlers, queue_size=queue_size, sampling=sampling)
+        _pipeline.start()
+        for handler in logging.root.handlers[:]:
+            logging.root.removeHandler(handler)
+            handler.close()
+        logging.root.addHandler(_pipeline.handler)
+        logging.root.setLevel(log_level_value)
+        _register_shutdown()
+
+        # Skip building events the level filter would discard anyway
+        structlog_processors = [structlog.stdlib.filter_by_level, *processors]
+        structlog_processors.append(structlog.stdlib.ProcessorFormatter.wrap_for_formatter)
+    else:
+        # Configure standard library logging
+        logging.basicConfig(
+            format="%(message)s",
+            stream=output_stream,
+            level=log_level_value,
+            force=True,  # Force reconfiguration
+        )
+        structlog_processors = [*processors, renderer]
+
+        if file_handler is not None:
+            file_handler.setLevel(log_level_value)
+            file_handler.setFormatter(
+                logging.Formatter("%(message)s")
+            )
+            logging.root.addHandler(file_handler)
 
     # Configure structlog
     structlog.configure(
-        processors=processors,
+        processors=structlog_processors,
         wrapper_class=structlog.stdlib.BoundLogger,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
-    # Add file handler if log_file is specified
-    if log_file:
-        file_handler: logging.Handler
-
-        if rotation_enabled:
-            if rotation_type == "size":
-                # Size-based rotation
-                file_handler = RotatingFileHandler(
-                    filename=log_file,
-                    maxBytes=max_bytes,
-                    backupCount=backup_count,
-                )
-            elif rotation_type == "time":
-                # Time-based rotation
-                file_handler = TimedRotatingFileHandler(
-                    filename=log_file,
-                    when=when,
-                    interval=interval,
-                    backupCount=backup_count,
-                )
-            else:
-                raise ValueError(
-                    f"Invalid rotation_type: {rotation_type}. Must be 'size' or 'time'"
-                )
-        else:
-            # No rotation
-            file_handler = logging.FileHandler(log_file)
-
-        file_handler.setLevel(log_level_value)
-        file_handler.setFormatter(
-            logging.Formatter("%(message)s")
+
+def _create_file_handler(
+    log_file: str,
+    rotation_enabled: bool,
+    rotation_type: str,
+    max_bytes: int,
+    backup_count: int,
+    when: str,
+    interval: int,
+) -> logging.Handler:
+    """Create the handler writing logs to a file.
+
+    Args:
+        log_file: Path to the log file
+        rotation_enabled: Enable log rotation
+        rotation_type: Type of rotation ("size" or "time")
+        max_bytes: Maximum size of log file before rotation
+        backup_count: Number of backup files to keep
+        when: When to rotate (for time-based rotation)
+        interval: Interval for time-based rotation
+
+    Returns:
+        logging.Handler: File handler, rotating if enabled
+
+    Raises:
+        ValueError: If the rotation type is invalid
+    """
+    if not rotation_enabled:
+        # No rotation
+        return logging.FileHandler(log_file)
+
+    if rotation_type == "size":
+        # Size-based rotation
+        return RotatingFileHandler(
+            filename=log_file,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
         )
-        logging.root.addHandler(file_handler)
+    if rotation_type == "time":
+        # Time-based rotation
+        return TimedRotatingFileHandler(
+            filename=log_file,
+            when=when,
+            interval=interval,
+            backupCount=backup_count,
+        )
+    raise ValueError(
+        f"Invalid rotation_type: {rotation_type}. Must be 'size' or 'time'"
+    )
+
+
+def shutdown_logging() -> None:
+    """Write queued log records and stop the background log thread.
+
+    The pipeline's handlers are then attached to the root logger directly,
+    so records logged later during shutdown are still written. Does
+    nothing unless logging was configured with ``queued=True``.
+    """
+    global _pipeline
+
+    pipeline, _pipeline = _pipeline, None
+    if pipeline is None:
+        return
+
+    if pipeline.handler in logging.root.handlers:
+        logging.root.removeHandler(pipeline.handler)
+    pipeline.stop()
+    for handler in pipeline.handlers:
+        logging.root.addHandler(handler)
+
+    stats = pipeline.stats()
+    if stats["dropped"] or stats["sampled_out"]:
+        logging.getLogger(__name__).info(
+            "Log pipeline stopped: %d records dropped, %d sampled out",
+            stats["dropped"],
+            sum(stats["sampled_out"].values()),
+        )
+
+
+def get_log_pipeline_stats() -> Optional[Dict[str, Any]]:
+    """Get statistics of the queued log pipeline.
+
+    Returns:
+        Optional[Dict[str, Any]]: Pipeline statistics (see
+        ``LogPipeline.stats``), or None if logging is not queued
+    """
+    return _pipeline.stats() if _pipeline is not None else None
+
+
+def _register_shutdown() -> None:
+    """Flush the log queue at interpreter exit if the app did not."""
+    global _shutdown_registered
+    if not _shutdown_registered:
+        atexit.register(shutdown_logging)
+        _shutdown_registered = True
 
 
 def get_logger(name: Optional[str] = None, **initial_values: Any) -> structlog.BoundLogger:
@@ -5,10 +5,13 @@ pagination metadata, and building paginated responses.
 """
 
 import base64
+import hashlib
+import hmac
 import json
 from typing import Any, Generic, Optional, TypeVar
 from uuid import UUID
 
+from app.config import settings
 from app.schemas.pagination import (
     CursorPaginatedResponse,
     PaginatedResponse,
@@ -65,6 +68,58 @@ def decode_cursor(cursor: str) -> Any:
         raise ValueError(f"Invalid cursor format: {e}") from e
 
 
+def _cursor_signature(payload: str) -> str:
+    """Sign a cursor payload with a key derived from the application secret."""
+    key = hmac.new(
+        settings.jwt_secret_key.encode("utf-8"), b"pagination-cursor", hashlib.sha256
+    ).digest()
+    digest = hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def encode_signed_cursor(value: Any) -> str:
+    """Encode a value into an opaque, tamper-proof cursor string.
+
+    The cursor carries an HMAC of its payload, so clients cannot forge
+    positions by editing it.
+
+    Args:
+        value: JSON-serializable value to encode
+
+    Returns:
+        URL-safe cursor string of the form ``<payload>.<signature>``
+
+    Examples:
+        >>> decode_signed_cursor(encode_signed_cursor({"k": [1]}))
+        {'k': [1]}
+    """
+    json_str = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    payload = base64.urlsafe_b64encode(json_str.encode("utf-8")).rstrip(b"=").decode("ascii")
+    return f"{payload}.{_cursor_signature(payload)}"
+
+
+def decode_signed_cursor(cursor: str) -> Any:
+    """Decode a cursor created by ``encode_signed_cursor``.
+
+    Args:
+        cursor: Signed cursor string
+
+    Returns:
+        Decoded value
+
+    Raises:
+        ValueError: If the cursor is malformed or its signature does not match
+    """
+    payload, _, signature = cursor.partition(".")
+    try:
+        if not payload or not hmac.compare_digest(_cursor_signature(payload), signature):
+            raise ValueError("signature mismatch")
+        decoded = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        return json.loads(decoded.decode("utf-8"))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+
 def calculate_total_pages(total: int, per_page: int) -> int:
     """Calculate total number of pages for pagination.
 
@@ -93,6 +148,7 @@ def build_paginated_response(
     total: int,
     page: int,
     per_page: int,
+    approximate: bool = False,
 ) -> PaginatedResponse[T]:
     """Build a standardized paginated response.
 
@@ -101,6 +157,7 @@ def build_paginated_response(
         total: Total number of items matching the query
         page: Current page number (1-indexed)
         per_page: Number of items per page
+        approximate: Whether total is an estimate
 
     Returns:
         PaginatedResponse with items and metadata
@@ -115,6 +172,7 @@ def build_paginated_response(
     return PaginatedResponse[T](
         items=items,
         total=total,
+        total_approximate=approximate,
         page=page,
         per_page=per_page,
         total_pages=total_pages,
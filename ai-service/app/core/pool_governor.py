@@ -0,0 +1,373 @@
+"""Connection pool governor for LAYA AI Service.
+
+The pool size is fixed at startup, but how much overflow the database
+should absorb depends on the load. ``GovernedQueuePool`` records how long
+every checkout waits for a connection in a ``WaitHistogram``, and the
+``PoolGovernor`` periodically reads the waits of the last interval:
+
+- When the 95th percentile wait exceeds ``db_pool_wait_target`` or a
+  checkout timed out, ``max_overflow`` grows by ``OVERFLOW_STEP``.
+- When waits stay well under target and the overflow actually used left
+  headroom, ``max_overflow`` shrinks by one connection.
+
+``max_overflow`` always stays within ``db_pool_overflow_min`` and
+``db_pool_overflow_max``. Shrinking never closes a connection in use:
+overflow connections are discarded as they are returned to the pool.
+
+Example:
+    engine = create_async_engine(url, poolclass=GovernedQueuePool, ...)
+    governor = PoolGovernor(engine)
+    governor.start()
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the wait histogram buckets; slower waits land in
+# a final unbounded bucket
+WAIT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Connections added to max_overflow when checkouts wait too long
+OVERFLOW_STEP = 2
+
+# Waits below this fraction of the target allow shrinking the overflow
+SHRINK_RATIO = 0.25
+
+# Checkouts needed in an interval before its percentiles are trusted
+MIN_SAMPLES = 20
+
+# Adjustments kept for pool health reports
+MAX_ADJUSTMENTS = 20
+
+
+@dataclass
+class WaitHistogram:
+    """Histogram of connection checkout waits.
+
+    Attributes:
+        counts: Checkouts per bucket of ``WAIT_BUCKETS`` plus the unbounded bucket
+        total_seconds: Sum of all waits
+        timeouts: Checkouts that gave up waiting
+    """
+
+    counts: List[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+    total_seconds: float = 0.0
+    timeouts: int = 0
+
+    @property
+    def count(self) -> int:
+        """Number of checkouts observed."""
+        return sum(self.counts)
+
+    def observe(self, seconds: float, timed_out: bool = False) -> None:
+        """Record one checkout.
+
+        Args:
+            seconds: Time spent waiting for the connection
+            timed_out: Whether the checkout gave up with a timeout
+        """
+        self.counts[bisect_left(WAIT_BUCKETS, seconds)] += 1
+        self.total_seconds += seconds
+        if timed_out:
+            self.timeouts += 1
+
+    def copy(self) -> "WaitHistogram":
+        """Snapshot the histogram.
+
+        Returns:
+            WaitHistogram: Independent copy
+        """
+        return WaitHistogram(list(self.counts), self.total_seconds, self.timeouts)
+
+    def since(self, earlier: "WaitHistogram") -> "WaitHistogram":
+        """Checkouts observed after an earlier snapshot.
+
+        Args:
+            earlier: Snapshot taken with ``copy``
+
+        Returns:
+            WaitHistogram: Histogram of the checkouts in between
+        """
+        return WaitHistogram(
+            [now - then for now, then in zip(self.counts, earlier.counts)],
+            self.total_seconds - earlier.total_seconds,
+            self.timeouts - earlier.timeouts,
+        )
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a wait percentile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Optional[float]: Upper bound (seconds) of the bucket holding the
+            quantile, or None if nothing was observed
+        """
+        total = self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return WAIT_BUCKETS[min(index, len(WAIT_BUCKETS) - 1)]
+        return WAIT_BUCKETS[-1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Export the histogram for pool health reports.
+
+        Returns:
+            Dict[str, Any]: Count, sum, timeouts, percentiles in milliseconds
+            and cumulative bucket counts keyed by upper bound
+        """
+        buckets: Dict[str, int] = {}
+        cumulative = 0
+        for bound, bucket_count in zip(WAIT_BUCKETS + (float("inf"),), self.counts):
+            cumulative += bucket_count
+            buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+
+        def to_ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else seconds * 1000
+
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total_seconds, 6),
+            "timeouts": self.timeouts,
+            "p50_ms": to_ms(self.quantile(0.5)),
+            "p95_ms": to_ms(self.quantile(0.95)),
+            "p99_ms": to_ms(self.quantile(0.99)),
+            "buckets": buckets,
+        }
+
+
+class GovernedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording checkout waits, with adjustable overflow.
+
+    Attributes:
+        wait_times: Histogram of checkout waits since the pool was created
+        peak_overflow: Highest overflow in use since the last ``reset_peak``
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the pool; accepts the arguments of ``QueuePool``."""
+        super().__init__(*args, **kwargs)
+        self.wait_times = WaitHistogram()
+        self.peak_overflow = self.overflow()
+
+    @property
+    def max_overflow(self) -> int:
+        """Connections the pool may open beyond its size."""
+        return self._max_overflow
+
+    def set_max_overflow(self, max_overflow: int) -> None:
+        """Change how many connections the pool may open beyond its size.
+
+        Args:
+            max_overflow: New overflow limit
+        """
+        # A pool of size 0 is unbounded and stays so
+        if self._max_overflow > -1:
+            self._max_overflow = max(0, max_overflow)
+
+    def reset_peak(self) -> int:
+        """Start a new peak overflow measurement.
+
+        Returns:
+            int: Peak overflow since the previous reset
+        """
+        peak, self.peak_overflow = self.peak_overflow, self.overflow()
+        return peak
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out a connection, recording how long it took."""
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.wait_times.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_times.observe(time.perf_counter() - started)
+        self.peak_overflow = max(self.peak_overflow, self.overflow())
+        return connection
+
+    def recreate(self) -> "GovernedQueuePool":
+        """Recreate the pool (after ``dispose``), keeping its wait history."""
+        pool = super().recreate()
+        pool.wait_times = self.wait_times
+        return pool
+
+
+class PoolGovernor:
+    """Adjust an engine's pool overflow from observed checkout waits.
+
+    Attributes:
+        engine: Engine whose pool is governed (a ``GovernedQueuePool``)
+        min_overflow: Lowest overflow the governor sets
+        max_overflow: Highest overflow the governor sets
+        wait_target: 95th percentile checkout wait (seconds) to stay under
+        interval: Seconds between adjustments
+        last_p95: 95th percentile wait of the last interval, if any
+        adjustments: Recent overflow changes, oldest first
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        min_overflow: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        wait_target: Optional[float] = None,
+        interval: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ) -> None:
+        """Initialize the governor.
+
+        Args:
+            engine: Engine whose pool is governed
+            min_overflow: Lower overflow bound (uses config default if None)
+            max_overflow: Upper overflow bound (uses config default if None)
+            wait_target: Wait target in seconds (uses config default if None)
+            interval: Adjustment interval (uses config default if None)
+            enabled: Whether adjustments run (uses config default if None)
+        """
+        self.engine = engine
+        self.min_overflow = (
+            min_overflow if min_overflow is not None else settings.db_pool_overflow_min
+        )
+        self.max_overflow = max(
+            self.min_overflow,
+            max_overflow if max_overflow is not None else settings.db_pool_overflow_max,
+        )
+        self.wait_target = wait_target or settings.db_pool_wait_target
+        self.interval = interval or settings.db_pool_governor_interval
+        self.enabled = enabled if enabled is not None else settings.db_pool_governor_enabled
+        self.last_p95: Optional[float] = None
+        self.adjustments: Deque[Dict[str, Any]] = deque(maxlen=MAX_ADJUSTMENTS)
+        self._snapshot: Optional[WaitHistogram] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _pool(self) -> Optional[GovernedQueuePool]:
+        """The governed pool, looked up again as ``dispose`` replaces it."""
+        pool = self.engine.pool
+        return pool if isinstance(pool, GovernedQueuePool) else None
+
+    def adjust(self) -> Optional[int]:
+        """Read the waits of the last interval and adjust the overflow.
+
+        Returns:
+            Optional[int]: New max overflow, or None if it was left unchanged
+        """
+        pool = self._pool()
+        if pool is None:
+            return None
+
+        current = pool.max_overflow
+        snapshot = pool.wait_times.copy()
+        window = snapshot.since(self._snapshot) if self._snapshot else snapshot
+        self._snapshot = snapshot
+        peak = pool.reset_peak()
+        self.last_p95 = window.quantile(0.95)
+
+        slow = window.timeouts > 0 or (
+            window.count >= MIN_SAMPLES
+            and self.last_p95 is not None
+            and self.last_p95 > self.wait_target
+        )
+        quiet = self.last_p95 is None or self.last_p95 <= self.wait_target * SHRINK_RATIO
+
+        if slow:
+            target, reason = current + OVERFLOW_STEP, "checkout waits above target"
+        elif quiet and peak < current - OVERFLOW_STEP:
+            target, reason = current - 1, "overflow headroom unused"
+        else:
+            target, reason = current, "out of bounds"
+        target = min(self.max_overflow, max(self.min_overflow, target))
+        if target == current:
+            return None
+
+        pool.set_max_overflow(target)
+        self.adjustments.append(
+            {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "from": current,
+                "to": target,
+                "p95_ms": None if self.last_p95 is None else self.last_p95 * 1000,
+                "timeouts": window.timeouts,
+                "reason": reason,
+            }
+        )
+        logger.info(f"Pool max_overflow {current} -> {target}: {reason}")
+        return target
+
+    async def _run_forever(self) -> None:
+        """Background loop adjusting the pool."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.adjust()
+            except Exception as e:
+                logger.error(f"Pool governor adjustment failed: {e}")
+
+    def start(self) -> None:
+        """Start adjusting the pool in the background if enabled."""
+        if self.enabled and self._pool() is not None and (
+            self._task is None or self._task.done()
+        ):
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background adjustments."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def state(self) -> Dict[str, Any]:
+        """Governor state for pool health reports.
+
+        Returns:
+            Dict[str, Any]: Bounds, current overflow, wait target and recent
+            adjustments
+        """
+        pool = self._pool()
+        return {
+            "enabled": self.enabled,
+            "max_overflow": pool.max_overflow if pool is not None else None,
+            "min_overflow_bound": self.min_overflow,
+            "max_overflow_bound": self.max_overflow,
+            "wait_target_ms": self.wait_target * 1000,
+            "last_p95_ms": None if self.last_p95 is None else self.last_p95 * 1000,
+            "adjustments": list(self.adjustments),
+        }
@@ -0,0 +1,213 @@
+"""Per-request SQL instrumentation for LAYA AI Service.
+
+SQLAlchemy cursor events on the engine record every statement executed
+while a tracker is active: how many queries ran, how long the database
+took and how often each statement shape (its fingerprint) repeated. The
+same fingerprint running many times in one request is the signature of an
+N+1 pattern, e.g. loading a relationship once per row of a listing.
+
+Trackers are held in a context variable, so queries are attributed to the
+request (or test) that issued them even when many run concurrently.
+Trackers nest: a query is recorded by every active tracker, which lets a
+test budget span several requests that are each tracked on their own.
+
+Example:
+    with track_queries() as stats:
+        await service.list_threads(user_id)
+    print(stats.count, stats.total_time_ms, stats.suspected_n_plus_one())
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.core.context import get_correlation_id
+
+# Attribute storing the start time of a statement on its execution context
+_START_ATTRIBUTE = "_query_stats_started_at"
+
+# Literal values and bind parameters, replaced so that statements differing
+# only by their parameters share a fingerprint
+_FINGERPRINT_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):(?!:)\w+"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),
+    (re.compile(r"\s+"), " "),
+)
+
+_active_stats: ContextVar[Tuple["QueryStats", ...]] = ContextVar(
+    "query_stats", default=()
+)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Reduce a SQL statement to its shape.
+
+    Literals and bind parameters are replaced by ``?`` and ``IN`` lists are
+    collapsed, so the same query issued for different rows maps to the same
+    fingerprint.
+
+    Args:
+        statement: SQL statement as sent to the driver
+
+    Returns:
+        str: Normalized statement
+    """
+    normalized = statement
+    for pattern, replacement in _FINGERPRINT_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized.strip()
+
+
+@dataclass
+class QueryStats:
+    """Queries recorded by one tracker.
+
+    Attributes:
+        correlation_id: Correlation ID of the request being tracked
+        count: Number of statements executed
+        total_time: Seconds spent executing statements
+        fingerprints: Executions per statement fingerprint
+    """
+
+    correlation_id: Optional[str] = None
+    count: int = 0
+    total_time: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    @property
+    def total_time_ms(self) -> float:
+        """Milliseconds spent executing statements."""
+        return self.total_time * 1000
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record one executed statement.
+
+        Args:
+            statement: SQL statement
+            duration: Execution time in seconds
+        """
+        self.count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def suspected_n_plus_one(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """Find statements repeated often enough to suggest an N+1 pattern.
+
+        Args:
+            threshold: Executions of one fingerprint that flag it (uses
+                config default if None)
+
+        Returns:
+            Dict[str, int]: Executions by suspicious fingerprint
+        """
+        threshold = threshold or settings.db_n_plus_one_threshold
+        return {
+            statement: executions
+            for statement, executions in self.fingerprints.most_common()
+            if executions >= threshold
+        }
+
+    def server_timing(self) -> str:
+        """Format the stats as a ``Server-Timing`` header value.
+
+        Returns:
+            str: Server-Timing metric for the database
+        """
+        return f'db;dur={self.total_time_ms:.1f};desc="{self.count} queries"'
+
+    def log_fields(self) -> Dict[str, Any]:
+        """Structured log fields describing the stats.
+
+        Returns:
+            Dict[str, Any]: Log fields
+        """
+        return {
+            "correlation_id": self.correlation_id,
+            "query_count": self.count,
+            "db_time_ms": round(self.total_time_ms, 2),
+            "distinct_queries": len(self.fingerprints),
+        }
+
+
+def start_tracking(correlation_id: Optional[str] = None) -> Tuple[QueryStats, Any]:
+    """Start recording queries in the current context.
+
+    Args:
+        correlation_id: Correlation ID to bind the stats to (defaults to the
+            one in the current request context)
+
+    Returns:
+        Tuple[QueryStats, Any]: The new stats and a token for ``stop_tracking``
+    """
+    stats = QueryStats(correlation_id=correlation_id or get_correlation_id())
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    return stats, token
+
+
+def stop_tracking(token: Any) -> None:
+    """Stop the tracker started with ``token``.
+
+    Args:
+        token: Token returned by ``start_tracking``
+    """
+    _active_stats.reset(token)
+
+
+@contextmanager
+def track_queries(correlation_id: Optional[str] = None) -> Iterator[QueryStats]:
+    """Record the queries executed within a block.
+
+    Args:
+        correlation_id: Correlation ID to bind the stats to
+
+    Yields:
+        QueryStats: Stats filled in as queries run
+    """
+    stats, token = start_tracking(correlation_id)
+    try:
+        yield stats
+    finally:
+        stop_tracking(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Remember when a statement started, if anything is tracking."""
+    if context is not None and _active_stats.get():
+        setattr(context, _START_ATTRIBUTE, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Record a finished statement with every active tracker."""
+    started_at = getattr(context, _START_ATTRIBUTE, None)
+    if started_at is None:
+        return
+    duration = time.perf_counter() - started_at
+    for stats in _active_stats.get():
+        stats.record(statement, duration)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the query tracking events to an engine.
+
+    Statements run while no tracker is active cost a single context
+    variable lookup.
+
+    Args:
+        engine: Async engine to instrument
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
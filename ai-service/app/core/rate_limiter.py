@@ -0,0 +1,380 @@
+"""Distributed rate limiting using the generic cell rate algorithm (GCRA).
+
+Every bucket is a single Redis key holding its theoretical arrival time
+(TAT). A Lua script checks and updates all the buckets a request draws on
+(e.g. its IP, user and organization) in one atomic step, using the Redis
+server clock so workers never disagree about time.
+
+To avoid a Redis round trip per request, each worker leases a small batch
+of tokens for a bucket and spends them locally until they run out or the
+lease expires. Leases start at the cost of a single request and grow only
+while a client keeps exhausting them, so idle clients never hold tokens
+they will not use. Leased tokens are already deducted from the shared
+bucket, which means leasing can only make limits stricter, never looser.
+
+When Redis is unavailable the limiter degrades to the same algorithm kept
+in process memory, so limits still apply per worker.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key namespace for rate limit buckets
+BUCKET_KEY_PREFIX = "rate_limit"
+
+# Seconds to skip Redis after a failure before trying it again
+REDIS_RETRY_INTERVAL = 5.0
+
+# Maximum number of buckets kept in process memory before pruning
+MAX_LOCAL_BUCKETS = 10000
+
+# KEYS: bucket keys
+# ARGV: tokens wanted, minimum tokens, then (interval_ms, tolerance_ms) per key
+# Returns: {granted, retry_after_ms, limiting key index (1-based),
+#          tokens left in the limiting bucket}
+GCRA_LEASE_SCRIPT = """
+if redis.replicate_commands then
+  pcall(redis.replicate_commands)
+end
+local wanted = tonumber(ARGV[1])
+local minimum = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local tats = {}
+local available = nil
+local limiting = 1
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+  local interval = tonumber(ARGV[1 + i * 2])
+  local tolerance = tonumber(ARGV[2 + i * 2])
+  local tat = tonumber(redis.call('GET', key) or now)
+  if tat < now then
+    tat = now
+  end
+  tats[i] = tat
+  local tokens = math.floor((now + tolerance - tat) / interval)
+  if tokens < minimum then
+    local wait = tat + minimum * interval - tolerance - now
+    if wait > retry_after then
+      retry_after = wait
+      limiting = i
+    end
+  end
+  if available == nil or tokens < available then
+    available = tokens
+    if retry_after == 0 then
+      limiting = i
+    end
+  end
+end
+
+if retry_after > 0 then
+  return {0, retry_after, limiting, math.max(available, 0)}
+end
+
+local granted = math.min(wanted, available)
+for i, key in ipairs(KEYS) do
+  local interval = tonumber(ARGV[1 + i * 2])
+  local new_tat = tats[i] + granted * interval
+  redis.call('SET', key, new_tat, 'PX', math.ceil(new_tat - now))
+end
+return {granted, 0, limiting, available - granted}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """A limit applied to one bucket.
+
+    Attributes:
+        scope: What the bucket is keyed by (e.g. "ip", "user", "org")
+        identifier: Identity of the client within the scope
+        limit: Tokens replenished per period
+        period: Replenishment period in seconds
+    """
+
+    scope: str
+    identifier: str
+    limit: int
+    period: int = 60
+
+    @property
+    def key(self) -> str:
+        """Redis key of the bucket."""
+        return f"{BUCKET_KEY_PREFIX}:{self.scope}:{self.identifier}"
+
+    @property
+    def interval_ms(self) -> float:
+        """Milliseconds needed to replenish one token."""
+        return self.period * 1000 / max(self.limit, 1)
+
+    @property
+    def tolerance_ms(self) -> float:
+        """Burst tolerance in milliseconds (a full bucket)."""
+        return self.interval_ms * max(self.limit, 1)
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate limit check.
+
+    Attributes:
+        allowed: Whether the request may proceed
+        limit: Limit of the most restrictive bucket
+        remaining: Approximate tokens left in the most restrictive bucket
+        retry_after: Seconds until the request would be allowed
+        scope: Scope of the most restrictive bucket
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+    scope: str = ""
+
+
+@dataclass
+class _Lease:
+    """Tokens a worker holds for a set of buckets."""
+
+    tokens: int
+    expires_at: float
+    batch: int
+    limiting: int
+    remaining: int
+
+
+class LocalGCRA:
+    """In-process implementation of the lease script.
+
+    Used when Redis is unavailable. It mirrors ``GCRA_LEASE_SCRIPT`` so that
+    limits behave the same, only scoped to the current worker.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no buckets."""
+        self._tats: Dict[str, float] = {}
+
+    def acquire(
+        self,
+        policies: Sequence[RateLimitPolicy],
+        wanted: int,
+        minimum: int,
+        now_ms: Optional[float] = None,
+    ) -> Tuple[int, float, int, int]:
+        """Take up to ``wanted`` tokens from every bucket at once.
+
+        Args:
+            policies: Buckets to draw on
+            wanted: Tokens requested
+            minimum: Fewest tokens worth granting
+            now_ms: Current time in milliseconds (defaults to monotonic clock)
+
+        Returns:
+            Tuple[int, float, int, int]: Tokens granted, milliseconds to wait
+            when nothing was granted, index of the limiting bucket and tokens
+            left in it
+        """
+        now = time.monotonic() * 1000 if now_ms is None else now_ms
+        if len(self._tats) > MAX_LOCAL_BUCKETS:
+            self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+
+        tats: List[float] = []
+        available: Optional[int] = None
+        limiting = 0
+        retry_after = 0.0
+        for index, policy in enumerate(policies):
+            tat = max(self._tats.get(policy.key, now), now)
+            tats.append(tat)
+            tokens = math.floor((now + policy.tolerance_ms - tat) / policy.interval_ms)
+            if tokens < minimum:
+                wait = tat + minimum * policy.interval_ms - policy.tolerance_ms - now
+                if wait > retry_after:
+                    retry_after = wait
+                    limiting = index
+            if available is None or tokens < available:
+                available = tokens
+                if retry_after == 0:
+                    limiting = index
+
+        if retry_after > 0:
+            return 0, retry_after, limiting, max(available or 0, 0)
+
+        granted = min(wanted, available or 0)
+        for policy, tat in zip(policies, tats):
+            self._tats[policy.key] = tat + granted * policy.interval_ms
+        return granted, 0.0, limiting, (available or 0) - granted
+
+    def reset(self) -> None:
+        """Forget every bucket."""
+        self._tats.clear()
+
+
+class RateLimiter:
+    """Rate limiter sharing GCRA buckets across workers through Redis.
+
+    Attributes:
+        lease_max: Largest batch of tokens a worker leases at once
+        lease_ttl: Seconds a leased batch stays valid
+    """
+
+    def __init__(
+        self,
+        lease_max: Optional[int] = None,
+        lease_ttl: Optional[float] = None,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            lease_max: Largest lease batch (uses config default if None)
+            lease_ttl: Lease lifetime in seconds (uses config default if None)
+        """
+        self.lease_max = lease_max or settings.rate_limit_lease_max
+        self.lease_ttl = lease_ttl or settings.rate_limit_lease_ttl
+        self._leases: Dict[Tuple[str, ...], _Lease] = {}
+        self._local = LocalGCRA()
+        self._script = None
+        self._redis_down_until = 0.0
+
+    async def check(
+        self,
+        policies: Sequence[RateLimitPolicy],
+        cost: int = 1,
+    ) -> RateLimitDecision:
+        """Consume ``cost`` tokens from every bucket if all can afford it.
+
+        Args:
+            policies: Buckets the request draws on
+            cost: Weight of the request
+
+        Returns:
+            RateLimitDecision: Whether the request is allowed
+        """
+        if not policies:
+            return RateLimitDecision(allowed=True, limit=0, remaining=0)
+
+        # A request can never cost more than a full bucket
+        cost = max(1, min(cost, min(policy.limit for policy in policies)))
+        lease_key = tuple(policy.key for policy in policies)
+        now = time.monotonic()
+
+        lease = self._leases.get(lease_key)
+        if lease is not None and lease.expires_at > now and lease.tokens >= cost:
+            lease.tokens -= cost
+            policy = policies[lease.limiting]
+            return RateLimitDecision(
+                allowed=True,
+                limit=policy.limit,
+                remaining=lease.remaining + lease.tokens,
+                scope=policy.scope,
+            )
+
+        batch = self._next_batch(lease, now, policies)
+        granted, retry_after_ms, limiting, remaining = await self._acquire(
+            policies, cost + batch, cost
+        )
+        policy = policies[limiting]
+
+        if granted < cost:
+            self._leases.pop(lease_key, None)
+            return RateLimitDecision(
+                allowed=False,
+                limit=policy.limit,
+                remaining=remaining,
+                retry_after=retry_after_ms / 1000,
+                scope=policy.scope,
+            )
+
+        if len(self._leases) > MAX_LOCAL_BUCKETS:
+            self._leases = {
+                key: held for key, held in self._leases.items() if held.expires_at > now
+            }
+        self._leases[lease_key] = _Lease(
+            tokens=granted - cost,
+            expires_at=now + self.lease_ttl,
+            batch=batch,
+            limiting=limiting,
+            remaining=remaining,
+        )
+        return RateLimitDecision(
+            allowed=True,
+            limit=policy.limit,
+            remaining=remaining + granted - cost,
+            scope=policy.scope,
+        )
+
+    def _next_batch(
+        self,
+        lease: Optional[_Lease],
+        now: float,
+        policies: Sequence[RateLimitPolicy],
+    ) -> int:
+        """Decide how many extra tokens to lease beyond the current request.
+
+        The batch doubles while a client exhausts its lease before expiry and
+        falls back to zero once it goes quiet. It never exceeds a tenth of the
+        smallest limit, so strict limits (e.g. login attempts) stay exact.
+        """
+        ceiling = min(self.lease_max, min(policy.limit for policy in policies) // 10)
+        if lease is None or lease.expires_at <= now or ceiling <= 0:
+            return 0
+        return min(max(lease.batch * 2, 1), ceiling)
+
+    async def _acquire(
+        self,
+        policies: Sequence[RateLimitPolicy],
+        wanted: int,
+        minimum: int,
+    ) -> Tuple[int, float, int, int]:
+        """Run the lease script in Redis, falling back to local buckets."""
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                if self._script is None:
+                    redis = await get_redis_client()
+                    self._script = redis.register_script(GCRA_LEASE_SCRIPT)
+                args: List[float] = [wanted, minimum]
+                for policy in policies:
+                    args.extend((policy.interval_ms, policy.tolerance_ms))
+                granted, retry_after, limiting, remaining = await self._script(
+                    keys=[policy.key for policy in policies], args=args
+                )
+                return int(granted), float(retry_after), int(limiting) - 1, int(remaining)
+            except Exception as e:
+                logger.warning(f"Rate limiter falling back to local buckets: {e}")
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+                self._script = None
+
+        return self._local.acquire(policies, wanted, minimum)
+
+    def reset(self) -> None:
+        """Drop all leases and local buckets."""
+        self._leases.clear()
+        self._local.reset()
+        self._redis_down_until = 0.0
+
+
+# Global rate limiter instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the global rate limiter.
+
+    Returns:
+        RateLimiter: Rate limiter instance
+    """
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+
+    return _rate_limiter
@@ -0,0 +1,277 @@
+"""Read-replica routing for LAYA AI Service.
+
+Read-only work (dashboards, search, history listings) can be served by one
+or more replica databases to keep it from competing with writes on the
+primary. The ``ReplicaRouter`` decides, per request, whether a replica may
+serve a read:
+
+- Replicas are used round-robin, skipping any that are unreachable or lag
+  behind the primary by more than ``db_replica_max_lag`` seconds. Lag is
+  measured in the background every ``db_replica_lag_check_interval``.
+- After a user writes, their reads stick to the primary for
+  ``db_read_your_writes_window`` seconds so they always see their own
+  changes. Recent writers are remembered in process and in Redis, so the
+  stickiness holds across workers.
+
+When no healthy replica is available every read goes to the primary.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix marking users whose reads must go to the primary
+STICKY_KEY_PREFIX = "db_primary_sticky"
+
+# Maximum number of recent writers remembered per worker before pruning
+MAX_RECENT_WRITERS = 10000
+
+# Replication lag of a PostgreSQL standby in seconds. A standby that has
+# replayed everything it received is current, however old its last
+# transaction is.
+POSTGRES_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+@dataclass
+class Replica:
+    """A replica database and its last known state.
+
+    Attributes:
+        name: Name used in logs and pool health
+        engine: Async engine connected to the replica
+        session_factory: Session factory bound to the engine
+        lag: Replication lag in seconds at the last check
+        healthy: Whether the replica answered the last check
+        checked_at: Monotonic time of the last check (0 if never checked)
+    """
+
+    name: str
+    engine: AsyncEngine
+    session_factory: sessionmaker = field(repr=False)
+    lag: float = 0.0
+    healthy: bool = True
+    checked_at: float = 0.0
+
+
+class ReplicaRouter:
+    """Route read-only sessions to replicas with read-your-writes stickiness.
+
+    Attributes:
+        replicas: Replicas available for reads
+        max_lag: Largest replication lag (seconds) a replica may serve at
+        sticky_window: Seconds a user's reads stay on the primary after a write
+        check_interval: Seconds between replica lag checks
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine] = (),
+        max_lag: Optional[float] = None,
+        sticky_window: Optional[float] = None,
+        check_interval: Optional[float] = None,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            engines: Replica engines (no replicas disables routing)
+            max_lag: Maximum replica lag (uses config default if None)
+            sticky_window: Read-your-writes window (uses config default if None)
+            check_interval: Lag check interval (uses config default if None)
+        """
+        self.replicas: List[Replica] = [
+            Replica(
+                name=f"replica-{index}",
+                engine=engine,
+                session_factory=sessionmaker(
+                    engine,
+                    class_=AsyncSession,
+                    expire_on_commit=False,
+                    autocommit=False,
+                    autoflush=False,
+                ),
+            )
+            for index, engine in enumerate(engines, start=1)
+        ]
+        self.max_lag = max_lag if max_lag is not None else settings.db_replica_max_lag
+        self.sticky_window = (
+            sticky_window if sticky_window is not None else settings.db_read_your_writes_window
+        )
+        self.check_interval = check_interval or settings.db_replica_lag_check_interval
+        self._cursor = count()
+        self._recent_writers: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any replica is configured."""
+        return bool(self.replicas)
+
+    def available(self) -> List[Replica]:
+        """Replicas currently fit to serve reads.
+
+        Returns:
+            List[Replica]: Healthy replicas within the lag limit
+        """
+        return [
+            replica
+            for replica in self.replicas
+            if replica.healthy and replica.lag <= self.max_lag
+        ]
+
+    async def choose(self, user_key: Optional[str] = None) -> Optional[Replica]:
+        """Pick the replica to serve a read.
+
+        Args:
+            user_key: Identity of the caller, for read-your-writes stickiness
+
+        Returns:
+            Optional[Replica]: Replica to read from, or None to use the primary
+        """
+        candidates = self.available()
+        if not candidates:
+            return None
+        if user_key is not None and await self.is_sticky(user_key):
+            return None
+        return candidates[next(self._cursor) % len(candidates)]
+
+    async def mark_write(self, user_key: str) -> None:
+        """Pin a user's reads to the primary after they wrote.
+
+        The worker that handled the write remembers it immediately, and the
+        write is published to the other workers through Redis before this
+        returns, so the user's next read sees it whichever worker serves it.
+
+        Args:
+            user_key: Identity of the user who wrote
+        """
+        if not self.enabled or self.sticky_window <= 0:
+            return
+
+        now = time.monotonic()
+        if len(self._recent_writers) > MAX_RECENT_WRITERS:
+            self._recent_writers = {
+                key: until for key, until in self._recent_writers.items() if until > now
+            }
+        self._recent_writers[user_key] = now + self.sticky_window
+        await self._share_write(user_key)
+
+    async def is_sticky(self, user_key: str) -> bool:
+        """Check whether a user's reads must go to the primary.
+
+        Args:
+            user_key: Identity of the caller
+
+        Returns:
+            bool: True if the user wrote within the read-your-writes window
+        """
+        if self._recent_writers.get(user_key, 0.0) > time.monotonic():
+            return True
+        try:
+            redis = await get_redis_client()
+            return bool(await redis.exists(f"{STICKY_KEY_PREFIX}:{user_key}"))
+        except Exception as e:
+            # Without Redis a write on another worker cannot be ruled out
+            logger.warning(f"Read-your-writes check failed, reading from primary: {e}")
+            return True
+
+    async def _share_write(self, user_key: str) -> None:
+        """Publish a recent write to the other workers through Redis."""
+        try:
+            redis = await get_redis_client()
+            await redis.set(
+                f"{STICKY_KEY_PREFIX}:{user_key}",
+                "1",
+                px=int(self.sticky_window * 1000),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to share recent write of {user_key}: {e}")
+
+    async def check_replicas(self) -> None:
+        """Measure the health and replication lag of every replica."""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    if replica.engine.dialect.name == "postgresql":
+                        lag = float((await conn.execute(POSTGRES_LAG_QUERY)).scalar() or 0.0)
+                    else:
+                        await conn.execute(text("SELECT 1"))
+                        lag = 0.0
+                if not replica.healthy or lag > self.max_lag:
+                    logger.info(f"Replica {replica.name} lag is {lag:.1f}s")
+                replica.lag = lag
+                replica.healthy = True
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning(f"Replica {replica.name} is unavailable: {e}")
+                replica.healthy = False
+            replica.checked_at = time.monotonic()
+
+    async def _run_forever(self) -> None:
+        """Background loop checking replicas."""
+        while True:
+            try:
+                await self.check_replicas()
+            except Exception as e:
+                logger.error(f"Replica check failed: {e}")
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Start checking replicas in the background if any are configured."""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background replica checks."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def pool_health(self) -> List[Dict[str, Any]]:
+        """Pool statistics and replication state of every replica.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per replica
+        """
+        health = []
+        for replica in self.replicas:
+            pool = replica.engine.pool
+            entry: Dict[str, Any] = {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag,
+                "serving_reads": replica.healthy and replica.lag <= self.max_lag,
+            }
+            # Not every pool class (e.g. StaticPool) tracks sizes
+            if hasattr(pool, "checkedout"):
+                entry.update(
+                    pool_size=pool.size(),
+                    checked_out=pool.checkedout(),
+                    overflow=pool.overflow(),
+                    total_connections=pool.size() + pool.overflow(),
+                )
+            health.append(entry)
+        return health
@@ -2,23 +2,77 @@
 
 Provides async SQLAlchemy engine and session factory for PostgreSQL.
 Includes connection pooling optimization and query performance utilities.
+
+Read-only endpoints can use ``get_read_db`` to be served by read replicas
+(``DATABASE_REPLICA_URLS``) when any are configured.
+
+The primary pool's overflow is tuned at runtime by a ``PoolGovernor``, and
+route groups can be isolated from each other with ``db_bulkhead``.
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.core.bulkheads import (
+    BulkheadFullError,
+    bulkhead_stats,
+    get_bulkhead,
+    install_statement_timeouts,
+    reset_statement_timeout,
+    set_statement_timeout,
+)
+from app.core.counting import install_count_invalidation
+from app.core.pool_governor import GovernedQueuePool, PoolGovernor
+from app.core.query_stats import instrument_engine
+from app.core.read_replicas import ReplicaRouter
+
+
+def create_pooled_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the configured connection pooling.
+
+    Args:
+        url: Async database URL
+
+    Returns:
+        AsyncEngine: The engine, instrumented for query tracking if enabled
+    """
+    connect_args = {}
+    if "+asyncpg" in url:
+        # Prepared statements reused per connection for repeated SQL
+        connect_args["prepared_statement_cache_size"] = settings.db_prepared_statement_cache_size
+
+    pooled_engine = create_async_engine(
+        url,
+        connect_args=connect_args,
+        query_cache_size=settings.db_compiled_cache_size,  # Compiled SQL reused across sessions
+        poolclass=GovernedQueuePool,  # Records checkout waits for the pool governor
+        echo=settings.db_echo,  # SQL logging controlled by configuration
+        pool_pre_ping=settings.db_pool_pre_ping,  # Enable connection health checks
+        pool_size=settings.db_pool_size,  # Number of permanent connections in the pool
+        max_overflow=settings.db_max_overflow,  # Maximum overflow connections beyond pool_size
+        pool_timeout=settings.db_pool_timeout,  # Timeout for getting a connection from the pool (seconds)
+        pool_recycle=settings.db_pool_recycle,  # Recycle connections after 1 hour to prevent stale connections
+    )
+
+    # Record per-request query counts, timings and repeated statements
+    if settings.db_query_tracking_enabled:
+        instrument_engine(pooled_engine)
+
+    return pooled_engine
+
 
 # Create async engine with asyncpg driver and optimized connection pooling
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.db_echo,  # SQL logging controlled by configuration
-    pool_pre_ping=settings.db_pool_pre_ping,  # Enable connection health checks
-    pool_size=settings.db_pool_size,  # Number of permanent connections in the pool
-    max_overflow=settings.db_max_overflow,  # Maximum overflow connections beyond pool_size
-    pool_timeout=settings.db_pool_timeout,  # Timeout for getting a connection from the pool (seconds)
-    pool_recycle=settings.db_pool_recycle,  # Recycle connections after 1 hour to prevent stale connections
-)
+engine = create_pooled_engine(settings.database_url)
+
+# Adjusts the primary pool's overflow from observed checkout waits
+pool_governor = PoolGovernor(engine)
+
+# Read replicas serving get_read_db sessions (none unless configured)
+replica_router = ReplicaRouter([create_pooled_engine(url) for url in settings.replica_urls])
 
 # Session factory for creating async database sessions
 AsyncSessionLocal = sessionmaker(
@@ -29,6 +83,12 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False,
 )
 
+# Committed writes invalidate the cached totals of paginated listings
+install_count_invalidation()
+
+# Transactions honour the statement timeout of the route that opened them
+install_statement_timeouts()
+
 
 async def get_db() -> AsyncSession:
     """Dependency for getting async database sessions.
@@ -49,6 +109,144 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+def get_replica_router() -> ReplicaRouter:
+    """Get the global read replica router.
+
+    Returns:
+        ReplicaRouter: Router over the configured replicas
+    """
+    return replica_router
+
+
+def get_pool_governor() -> PoolGovernor:
+    """Get the global pool governor.
+
+    Returns:
+        PoolGovernor: Governor of the primary engine's pool
+    """
+    return pool_governor
+
+
+def db_statement_timeout(seconds: float) -> Callable[[], AsyncIterator[None]]:
+    """Build a dependency bounding how long a route's SQL statements run.
+
+    Applies to the sessions the route opens; PostgreSQL cancels statements
+    running longer with a ``QueryCanceledError``.
+
+    Args:
+        seconds: Statement timeout
+
+    Returns:
+        Callable[[], AsyncIterator[None]]: FastAPI dependency
+
+    Example:
+        @router.get("/report", dependencies=[Depends(db_statement_timeout(10))])
+        async def report(db: AsyncSession = Depends(get_db)):
+            ...
+    """
+
+    async def statement_timeout() -> AsyncIterator[None]:
+        token = set_statement_timeout(seconds)
+        try:
+            yield
+        finally:
+            reset_statement_timeout(token)
+
+    return statement_timeout
+
+
+def db_bulkhead(
+    group: str, statement_timeout: Optional[float] = None
+) -> Callable[[], AsyncIterator[None]]:
+    """Build a dependency admitting a route group's requests through its bulkhead.
+
+    Requests beyond the group's concurrency limit wait in its queue; when
+    the queue is full or the wait times out they are rejected with 503 and
+    a ``Retry-After`` header, leaving the pool to other route groups.
+
+    Args:
+        group: Route group sharing the bulkhead
+        statement_timeout: Optional statement timeout in seconds for the
+            group's requests (a route's own ``db_statement_timeout`` wins)
+
+    Returns:
+        Callable[[], AsyncIterator[None]]: FastAPI dependency
+
+    Example:
+        router = APIRouter(dependencies=[Depends(db_bulkhead("analytics", 20))])
+    """
+    bulkhead = get_bulkhead(group)
+
+    async def admit() -> AsyncIterator[None]:
+        try:
+            await bulkhead.acquire()
+        except BulkheadFullError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, round(e.retry_after)))},
+            ) from e
+        token = set_statement_timeout(statement_timeout)
+        try:
+            yield
+        finally:
+            reset_statement_timeout(token)
+            bulkhead.release()
+
+    return admit
+
+
+def _user_key(request: Request) -> Optional[str]:
+    """Identify the caller for read-your-writes stickiness."""
+    # Imported here because app.auth depends on this module
+    from app.auth.jwt import get_request_token_payload
+
+    payload = get_request_token_payload(request.scope)
+    if payload is None or payload.get("sub") is None:
+        return None
+    return str(payload["sub"])
+
+
+async def get_read_db(
+    request: Request,
+    primary: AsyncSession = Depends(get_db),
+) -> AsyncIterator[AsyncSession]:
+    """Dependency for read-only async database sessions.
+
+    Serves the request from a read replica when one is healthy, caught up
+    and the caller has not written recently; otherwise the primary session
+    is used. Requests with unsafe methods (POST, PUT, ...) always use the
+    primary. The primary session is lazy and opens no connection unless it
+    is used.
+
+    Args:
+        request: The incoming request
+        primary: Session on the primary database
+
+    Yields:
+        AsyncSession: Session on a replica or on the primary
+
+    Example:
+        @app.get("/reports")
+        async def list_reports(db: AsyncSession = Depends(get_read_db)):
+            result = await db.execute(select(Report))
+            return result.scalars().all()
+    """
+    replica = None
+    if replica_router.enabled and request.method in ("GET", "HEAD"):
+        replica = await replica_router.choose(_user_key(request))
+
+    if replica is None:
+        yield primary
+        return
+
+    async with replica.session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def explain_query(session: AsyncSession, query: str) -> dict:
     """Execute EXPLAIN ANALYZE on a query for performance analysis.
 
@@ -92,7 +290,11 @@ async def get_pool_health() -> dict:
     """Get comprehensive database connection pool health metrics.
 
     Returns:
-        dict: Detailed pool health information including utilization and recommendations
+        dict: Detailed pool health information including utilization and
+        recommendations, with the pool and replication state of every read
+        replica under ``replicas``, the checkout wait histogram under
+        ``wait_times``, the pool governor under ``governor`` and bulkhead
+        usage under ``bulkheads``
 
     Example:
         health = await get_pool_health()
@@ -107,8 +309,12 @@ async def get_pool_health() -> dict:
     overflow = pool.overflow()
     total_connections = pool_size + overflow
 
+    # The governor may have moved max_overflow away from its configured value
+    governed = isinstance(pool, GovernedQueuePool)
+    max_overflow = pool.max_overflow if governed else settings.db_max_overflow
+
     # Calculate utilization percentage
-    max_connections = settings.db_pool_size + settings.db_max_overflow
+    max_connections = settings.db_pool_size + max_overflow
     utilization_pct = (total_connections / max_connections * 100) if max_connections > 0 else 0
 
     # Generate warnings and recommendations
@@ -119,13 +325,43 @@ async def get_pool_health() -> dict:
         warnings.append("Pool utilization is above 80%. Consider increasing pool_size or max_overflow.")
         recommendations.append("Increase db_pool_size or db_max_overflow in configuration")
 
-    if overflow > settings.db_max_overflow * 0.8:
+    if overflow > max_overflow * 0.8:
         warnings.append("High overflow usage detected. Pool may be undersized.")
         recommendations.append("Increase db_pool_size to reduce overflow reliance")
 
     if checked_out == pool_size:
         warnings.append("All permanent connections are checked out. Overflow is being used.")
 
+    wait_times = pool.wait_times.as_dict() if governed else None
+    governor = pool_governor.state()
+    if wait_times is not None and wait_times["timeouts"]:
+        warnings.append(
+            f"{wait_times['timeouts']} connection checkouts timed out waiting for the pool."
+        )
+    if governor["adjustments"] and governor["max_overflow"] == governor["max_overflow_bound"]:
+        recommendations.append(
+            "The pool governor reached its upper bound. Increase db_pool_overflow_max "
+            "or db_pool_size, or restrict slow route groups with bulkheads"
+        )
+
+    bulkheads = bulkhead_stats()
+    for group, stats in bulkheads.items():
+        if stats["rejected"]:
+            warnings.append(
+                f"Bulkhead '{group}' rejected {stats['rejected']} requests at its "
+                f"limit of {stats['limit']} concurrent requests."
+            )
+
+    replicas = replica_router.pool_health()
+    for replica in replicas:
+        if not replica["healthy"]:
+            warnings.append(f"Read replica {replica['name']} is unavailable. Reads use the primary.")
+        elif not replica["serving_reads"]:
+            warnings.append(
+                f"Read replica {replica['name']} lags {replica['lag_seconds']:.1f}s behind "
+                "the primary. Reads use other replicas or the primary."
+            )
+
     return {
         "pool_size": pool_size,
         "checked_out": checked_out,
@@ -140,6 +376,10 @@ async def get_pool_health() -> dict:
             "pool_recycle": settings.db_pool_recycle,
             "pool_pre_ping": settings.db_pool_pre_ping,
         },
+        "wait_times": wait_times,
+        "governor": governor,
+        "bulkheads": bulkheads,
+        "replicas": replicas,
         "warnings": warnings,
         "recommendations": recommendations,
     }
@@ -225,6 +465,8 @@ async def optimize_pool_settings(session: AsyncSession) -> dict:
         },
         "recommended_pool_size": recommended_pool_size,
         "recommended_max_overflow": recommended_overflow,
+        "governor": pool_health["governor"],
+        "wait_times": pool_health["wait_times"],
         "recommendations": [],
     }
 
@@ -245,6 +487,15 @@ async def optimize_pool_settings(session: AsyncSession) -> dict:
             "Pool utilization is high. Increase pool_size or max_overflow to prevent connection timeouts"
         )
 
+    # The governor already tunes max_overflow at runtime; only its bounds
+    # need attention
+    governor = pool_health["governor"]
+    if governor["adjustments"] and governor["max_overflow"] == governor["max_overflow_bound"]:
+        analysis["recommendations"].append(
+            f"Pool governor is pinned at its upper bound of {governor['max_overflow_bound']} "
+            "overflow connections. Increase db_pool_overflow_max or db_pool_size"
+        )
+
     if conn_info["idle_in_transaction"] > 0:
         analysis["recommendations"].append(
             f"Found {conn_info['idle_in_transaction']} idle-in-transaction connections. "
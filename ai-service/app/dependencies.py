@@ -9,7 +9,7 @@ from __future__ import annotations
 from typing import Any, Callable, Sequence
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,6 +22,7 @@ from app.services.rbac_service import RBACService
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
+    request: Request = None,
 ) -> dict[str, Any]:
     """Dependency to get the current authenticated user from JWT token.
 
@@ -35,6 +36,8 @@ async def get_current_user(
     Args:
         credentials: HTTP Authorization credentials injected by FastAPI
         db: Async database session for blacklist lookup
+        request: The current request, injected by FastAPI; the token payload
+            decoded for it by the middlewares is reused
 
     Returns:
         dict[str, Any]: Decoded token payload containing user information
@@ -47,7 +50,7 @@ async def get_current_user(
         async def protected_route(current_user: dict = Depends(get_current_user)):
             return {"user": current_user["sub"]}
     """
-    return await verify_token(credentials, db)
+    return await verify_token(credentials, db, request)
 
 
 async def get_optional_user(
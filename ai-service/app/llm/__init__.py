@@ -30,16 +30,21 @@ Usage:
     anthropic = factory.get_provider("anthropic")
 """
 
-from app.llm.base import BaseLLMProvider
-from app.llm.client import (
-    CompletionFailedError,
-    LLMClient,
-    LLMClientError,
-    NoProvidersAvailableError,
-)
-from app.llm.factory import LLMProviderFactory
-from app.llm.providers import AnthropicProvider, OpenAIProvider
-from app.llm.types import LLMConfig, LLMMessage, LLMResponse, LLMRole, LLMUsage
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.llm.base import BaseLLMProvider
+    from app.llm.client import (
+        CompletionFailedError,
+        LLMClient,
+        LLMClientError,
+        NoProvidersAvailableError,
+    )
+    from app.llm.factory import LLMProviderFactory
+    from app.llm.providers import AnthropicProvider, OpenAIProvider
+    from app.llm.types import LLMConfig, LLMMessage, LLMResponse, LLMRole, LLMUsage
 
 __all__ = [
     "AnthropicProvider",
@@ -56,3 +61,22 @@ __all__ = [
     "NoProvidersAvailableError",
     "OpenAIProvider",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AnthropicProvider": "app.llm.providers.anthropic_provider",
+        "BaseLLMProvider": "app.llm.base",
+        "CompletionFailedError": "app.llm.client",
+        "LLMClient": "app.llm.client",
+        "LLMClientError": "app.llm.client",
+        "LLMConfig": "app.llm.types",
+        "LLMMessage": "app.llm.types",
+        "LLMProviderFactory": "app.llm.factory",
+        "LLMResponse": "app.llm.types",
+        "LLMRole": "app.llm.types",
+        "LLMUsage": "app.llm.types",
+        "NoProvidersAvailableError": "app.llm.client",
+        "OpenAIProvider": "app.llm.providers.openai_provider",
+    },
+)
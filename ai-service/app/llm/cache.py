@@ -7,17 +7,59 @@ and hit count tracking for monitoring cache effectiveness.
 
 import hashlib
 import json
+import weakref
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import bindparam, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from app.core.cache_tags import register_tag_listener, tag_keys
+from app.core.hot_queries import HotQuery
 from app.llm.models import LLMCacheEntry
 from app.llm.types import LLMMessage, LLMResponse, LLMUsage
 
 
+def _cache_entry_query(provider: bool = False, model: bool = False) -> Select:
+    """Build the lookup of an unexpired cache entry.
+
+    Args:
+        provider: Filter on the ``provider`` parameter
+        model: Filter on the ``model`` parameter
+
+    Returns:
+        Select: Query with ``cache_key`` and ``now`` parameters, plus the
+        enabled filter parameters
+    """
+    query = select(LLMCacheEntry).where(
+        LLMCacheEntry.cache_key == bindparam("cache_key"),
+        LLMCacheEntry.expires_at > bindparam("now"),
+    )
+    if provider:
+        query = query.where(LLMCacheEntry.provider == bindparam("provider"))
+    if model:
+        query = query.where(LLMCacheEntry.model == bindparam("model"))
+    return query
+
+
+# Every cached completion runs a lookup, and every hit a hit count update.
+# The update does not synchronize the session: in-Python evaluation cannot
+# see bind parameter values, and the entry is only read for its response.
+CACHE_ENTRY_QUERY = HotQuery("llm_cache.entry", _cache_entry_query)
+CACHE_HIT_UPDATE = HotQuery(
+    "llm_cache.record_hit",
+    lambda: update(LLMCacheEntry)
+    .where(LLMCacheEntry.id == bindparam("entry_id"))
+    .values(
+        hit_count=LLMCacheEntry.hit_count + 1,
+        last_accessed_at=bindparam("now"),
+    )
+    .execution_options(synchronize_session=False),
+)
+
+
 class CacheError(Exception):
     """Base exception for cache-related errors."""
 
@@ -41,6 +83,12 @@ DEFAULT_TTL_SECONDS = 3600  # 1 hour
 SHORT_TTL_SECONDS = 300  # 5 minutes
 LONG_TTL_SECONDS = 86400  # 24 hours
 
+# Key namespace under which LLM cache keys are registered with cache tags
+TAG_NAMESPACE = "llm_cache"
+
+# Live caches, so tag invalidation can reach in-memory entries
+_live_caches: "weakref.WeakSet[LLMCache]" = weakref.WeakSet()
+
 
 class LLMCache:
     """Service for caching LLM responses with TTL and invalidation.
@@ -70,6 +118,7 @@ class LLMCache:
         self.default_ttl = default_ttl
         # In-memory cache for when no database is available
         self._memory_cache: dict[str, dict] = {}
+        _live_caches.add(self)
 
     def generate_cache_key(
         self,
@@ -207,32 +256,23 @@ class LLMCache:
         Returns:
             LLMResponse if found and valid, None otherwise
         """
-        # Build query
-        query = select(LLMCacheEntry).where(
-            LLMCacheEntry.cache_key == cache_key,
-            LLMCacheEntry.expires_at > datetime.utcnow(),
-        )
-
+        now = datetime.utcnow()
+        params = {"cache_key": cache_key, "now": now}
         if provider:
-            query = query.where(LLMCacheEntry.provider == provider)
+            params["provider"] = provider
         if model:
-            query = query.where(LLMCacheEntry.model == model)
+            params["model"] = model
 
-        result = await self.db.execute(query)
+        result = await CACHE_ENTRY_QUERY.execute(
+            self.db, params, provider=bool(provider), model=bool(model)
+        )
         entry = result.scalar_one_or_none()
 
         if entry is None:
             return None
 
         # Update hit count and last accessed timestamp
-        await self.db.execute(
-            update(LLMCacheEntry)
-            .where(LLMCacheEntry.id == entry.id)
-            .values(
-                hit_count=LLMCacheEntry.hit_count + 1,
-                last_accessed_at=datetime.utcnow(),
-            )
-        )
+        await CACHE_HIT_UPDATE.execute(self.db, {"entry_id": entry.id, "now": now})
         await self.db.commit()
 
         return self._db_entry_to_response(entry)
@@ -243,6 +283,7 @@ class LLMCache:
         response: LLMResponse,
         messages: list[LLMMessage],
         ttl_seconds: Optional[int] = None,
+        tags: Optional[list[str]] = None,
     ) -> None:
         """Store a response in the cache.
 
@@ -254,6 +295,8 @@ class LLMCache:
             response: The LLM response to cache
             messages: Original messages for prompt hash verification
             ttl_seconds: Optional TTL in seconds (uses default if not specified)
+            tags: Optional entity tags the response was derived from; the
+                entry is removed when any of them is invalidated
         """
         ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl
         expires_at = datetime.utcnow() + timedelta(seconds=ttl)
@@ -264,6 +307,9 @@ class LLMCache:
         else:
             await self._set_in_database(cache_key, response, prompt_hash, expires_at)
 
+        if tags:
+            await tag_keys(f"{TAG_NAMESPACE}:{cache_key}", tags, ttl)
+
     def _set_in_memory(
         self,
         cache_key: str,
@@ -690,3 +736,37 @@ class LLMCache:
             Number of entries currently in memory
         """
         return len(self._memory_cache)
+
+
+async def _invalidate_tagged_entries(
+    cache_keys: list[str], db: Optional[AsyncSession] = None
+) -> int:
+    """Remove LLM cache entries whose tags were invalidated.
+
+    Drops matching entries from every live in-memory cache and, when a
+    database session is available, from the persistent cache table.
+
+    Args:
+        cache_keys: Keys of the entries to remove
+        db: Optional async database session
+
+    Returns:
+        Number of entries removed
+    """
+    removed = 0
+    for llm_cache in list(_live_caches):
+        for cache_key in cache_keys:
+            if llm_cache._memory_cache.pop(cache_key, None) is not None:
+                removed += 1
+
+    if db is not None and cache_keys:
+        result = await db.execute(
+            delete(LLMCacheEntry).where(LLMCacheEntry.cache_key.in_(cache_keys))
+        )
+        await db.commit()
+        removed += result.rowcount or 0
+
+    return removed
+
+
+register_tag_listener(TAG_NAMESPACE, _invalidate_tagged_entries)
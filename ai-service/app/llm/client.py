@@ -236,6 +236,7 @@ class LLMClient:
         user_id: Optional[UUID] = None,
         session_id: Optional[UUID] = None,
         cache_ttl: Optional[int] = None,
+        cache_tags: Optional[list[str]] = None,
     ) -> LLMResponse:
         """Generate an LLM completion with full feature support.
 
@@ -252,6 +253,9 @@ class LLMClient:
             user_id: Optional user ID for usage tracking
             session_id: Optional session ID for usage tracking
             cache_ttl: Optional custom TTL for caching this response
+            cache_tags: Optional entity tags (see ``app.core.cache_tags``) the
+                response was derived from, so writes to those entities
+                invalidate it
 
         Returns:
             LLMResponse containing the generated content and metadata
@@ -368,6 +372,7 @@ class LLMClient:
                 messages=messages,
                 response=response,
                 ttl_seconds=cache_ttl,
+                tags=cache_tags,
             )
 
         # Track usage if enabled
@@ -491,6 +496,7 @@ class LLMClient:
         messages: list[LLMMessage],
         response: LLMResponse,
         ttl_seconds: Optional[int] = None,
+        tags: Optional[list[str]] = None,
     ) -> None:
         """Store a response in the cache.
 
@@ -498,6 +504,7 @@ class LLMClient:
             messages: Original messages
             response: Response to cache
             ttl_seconds: Optional TTL override
+            tags: Optional entity tags the response was derived from
         """
         try:
             cache_key = self.cache.generate_cache_key(
@@ -510,6 +517,7 @@ class LLMClient:
                 response=response,
                 messages=messages,
                 ttl_seconds=ttl_seconds,
+                tags=tags,
             )
             logger.debug(f"Response cached with key={cache_key[:16]}...")
         except Exception as e:
@@ -3,14 +3,23 @@
 Provides a factory pattern implementation for creating and managing LLM
 providers. Supports dynamic provider selection, registration, and
 configuration-based default provider resolution.
+
+Built-in providers are registered by import path and imported the first
+time they are requested.
 """
 
-from typing import Optional
+import importlib
+from typing import Optional, Union
 
 from app.config import settings
 from app.llm.base import BaseLLMProvider
 from app.llm.exceptions import LLMProviderError
-from app.llm.providers import AnthropicProvider, OpenAIProvider
+
+# Built-in providers as "module:class" import paths
+BUILTIN_PROVIDERS = {
+    "openai": "app.llm.providers.openai_provider:OpenAIProvider",
+    "anthropic": "app.llm.providers.anthropic_provider:AnthropicProvider",
+}
 
 
 class LLMProviderFactory:
@@ -21,7 +30,8 @@ class LLMProviderFactory:
     configuration settings.
 
     Attributes:
-        _providers: Registry of available provider classes by name
+        _providers: Registry of available provider classes (or their import
+            paths, until first use) by name
         _instances: Cache of instantiated provider instances
 
     Example:
@@ -40,7 +50,7 @@ class LLMProviderFactory:
 
     def __init__(self) -> None:
         """Initialize the provider factory with registered providers."""
-        self._providers: dict[str, type[BaseLLMProvider]] = {}
+        self._providers: dict[str, Union[type[BaseLLMProvider], str]] = {}
         self._instances: dict[str, BaseLLMProvider] = {}
 
         # Register built-in providers
@@ -50,21 +60,22 @@ class LLMProviderFactory:
         """Register the built-in LLM providers.
 
         Registers OpenAI and Anthropic providers as the default
-        available providers.
+        available providers. Their modules are imported on first use.
         """
-        self.register_provider("openai", OpenAIProvider)
-        self.register_provider("anthropic", AnthropicProvider)
+        for name, import_path in BUILTIN_PROVIDERS.items():
+            self.register_provider(name, import_path)
 
     def register_provider(
         self,
         name: str,
-        provider_class: type[BaseLLMProvider],
+        provider_class: Union[type[BaseLLMProvider], str],
     ) -> None:
         """Register a new LLM provider with the factory.
 
         Args:
             name: Unique identifier for the provider
-            provider_class: The provider class to register
+            provider_class: The provider class to register, or its
+                            ``"module:class"`` import path to import it lazily
 
         Raises:
             ValueError: If name is empty or provider_class is not a valid
@@ -73,6 +84,14 @@ class LLMProviderFactory:
         if not name:
             raise ValueError("Provider name cannot be empty")
 
+        if isinstance(provider_class, str):
+            if ":" not in provider_class:
+                raise ValueError(
+                    f"Provider import path must be 'module:class', got {provider_class!r}"
+                )
+            self._providers[name] = provider_class
+            return
+
         if not issubclass(provider_class, BaseLLMProvider):
             raise ValueError(
                 f"Provider class must be a subclass of BaseLLMProvider, "
@@ -81,6 +100,31 @@ class LLMProviderFactory:
 
         self._providers[name] = provider_class
 
+    def _provider_class(self, name: str) -> type[BaseLLMProvider]:
+        """Get a registered provider class, importing it on first use.
+
+        Args:
+            name: Registered provider name
+
+        Returns:
+            The provider class
+
+        Raises:
+            LLMProviderError: If the provider's module cannot be imported
+        """
+        provider_class = self._providers[name]
+        if isinstance(provider_class, str):
+            module_name, _, class_name = provider_class.partition(":")
+            try:
+                provider_class = getattr(importlib.import_module(module_name), class_name)
+            except (ImportError, AttributeError) as e:
+                raise LLMProviderError(
+                    message=f"Cannot load provider '{name}': {e}",
+                    provider=name,
+                ) from e
+            self.register_provider(name, provider_class)
+        return provider_class
+
     def get_provider(
         self,
         name: Optional[str] = None,
@@ -129,12 +173,12 @@ class LLMProviderFactory:
 
         # If custom API key provided, create new instance (don't cache)
         if api_key is not None:
-            provider_class = self._providers[provider_name]
+            provider_class = self._provider_class(provider_name)
             return provider_class(api_key=api_key)
 
         # Return cached instance or create new one
         if provider_name not in self._instances:
-            provider_class = self._providers[provider_name]
+            provider_class = self._provider_class(provider_name)
             self._instances[provider_name] = provider_class()
 
         return self._instances[provider_name]
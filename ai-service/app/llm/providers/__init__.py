@@ -7,12 +7,27 @@ error mapping for its respective service.
 Available Providers:
     - OpenAIProvider: OpenAI GPT models (GPT-4o, GPT-4, GPT-3.5, etc.)
     - AnthropicProvider: Anthropic Claude models (Claude 3.5, Claude 3, etc.)
+
+Providers are imported on first access.
 """
 
-from app.llm.providers.anthropic_provider import AnthropicProvider
-from app.llm.providers.openai_provider import OpenAIProvider
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.llm.providers.anthropic_provider import AnthropicProvider
+    from app.llm.providers.openai_provider import OpenAIProvider
 
 __all__ = [
     "AnthropicProvider",
     "OpenAIProvider",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AnthropicProvider": "app.llm.providers.anthropic_provider",
+        "OpenAIProvider": "app.llm.providers.openai_provider",
+    },
+)
@@ -1,11 +1,33 @@
 """FastAPI application entry point for LAYA AI Service."""
 
-from typing import Any
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from fastapi import Depends, FastAPI
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 
+from app.config import settings
+from app.core.cache_warming import get_warming_scheduler
+from app.core.lazy import preload_subsystems
+from app.core.log_pipeline import parse_sampling_rules
+from app.core.logging import configure_logging, shutdown_logging
+from app.database import get_pool_governor, get_replica_router
 from app.dependencies import get_current_user
+from app.middleware.cache_headers import CacheHeadersHook
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.correlation import CorrelationHook
+from app.middleware.pipeline import PipelineMiddleware
+from app.middleware.query_stats import QueryStatsHook
+from app.middleware.read_replicas import ReadYourWritesHook
+from app.middleware.rate_limit import RateLimitMiddleware, limiter
+from app.middleware.response_cache import ResponseCacheMiddleware
+from app.middleware.security import HTTPSRedirectHook, SecurityHeadersHook
+from app.middleware.validation import validation_exception_handler
 from app.routers import coaching
 from app.routers.activities import router as activities_router
 from app.routers.analytics import router as analytics_router
@@ -18,13 +40,80 @@ from app.routers.mfa import router as mfa_router
 from app.routers.qa_diagnostics import router as qa_diagnostics_router
 from app.routers.storage import router as storage_router
 from app.routers.webhooks import router as webhooks_router
+from app.services.audit_writer import get_audit_writer
+from app.services.blob_collector import get_blob_collector
+from app.services.image_processing import shutdown_image_workers
+from app.services.quota_reconciler import get_quota_reconciler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background services on startup and stop them on shutdown.
+
+    Cache warming, read replica lag checks, pool governor adjustments,
+    garbage collection of unreferenced file content, storage quota
+    reconciliation and audit log writes run in the background so startup
+    is never blocked on them. Heavy optional subsystems load on
+    first use unless PRELOAD_SUBSYSTEMS is set.
+    Logs are written by a background thread, flushed on shutdown, and the
+    image worker processes started by thumbnail generation are stopped.
+    """
+    configure_logging(
+        log_level=settings.log_level,
+        json_logs=settings.log_json,
+        queued=settings.log_queue_enabled,
+        queue_size=settings.log_queue_size,
+        sampling=parse_sampling_rules(settings.log_sampling),
+    )
+    if settings.preload_subsystems:
+        await asyncio.to_thread(preload_subsystems)
+    scheduler = get_warming_scheduler()
+    if settings.cache_warming_enabled:
+        scheduler.start()
+    replica_router = get_replica_router()
+    replica_router.start()
+    pool_governor = get_pool_governor()
+    pool_governor.start()
+    blob_collector = get_blob_collector()
+    if settings.blob_gc_enabled:
+        blob_collector.start()
+    quota_reconciler = get_quota_reconciler()
+    if settings.quota_reconcile_enabled:
+        quota_reconciler.start()
+    audit_writer = get_audit_writer()
+    if settings.audit_writer_enabled:
+        audit_writer.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop()
+        await replica_router.stop()
+        await pool_governor.stop()
+        await blob_collector.stop()
+        await quota_reconciler.stop()
+        await audit_writer.stop()
+        shutdown_image_workers()
+        shutdown_logging()
+
 
 app = FastAPI(
     title="LAYA AI Service",
     description="AI-powered features for LAYA platform including activity recommendations, coaching guidance, and analytics",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Shared response cache for routes opted in with @cache_response
+app.add_middleware(ResponseCacheMiddleware)
+
+# Per-route slowapi limits and distributed per-IP/user/org rate limiting
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_middleware(RateLimitMiddleware)
+
+# Compress responses with the best coding each client accepts
+app.add_middleware(CompressionMiddleware)
+
 # Configure CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +123,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# HTTPS redirect, correlation IDs, query stats, read-your-writes tracking,
+# security and cache headers run as hooks of a single pure ASGI middleware,
+# outermost so every response gets them
+app.add_middleware(
+    PipelineMiddleware,
+    hooks=[
+        HTTPSRedirectHook(),
+        CorrelationHook(),
+        QueryStatsHook(),
+        ReadYourWritesHook(),
+        SecurityHeadersHook(),
+        CacheHeadersHook(),
+    ],
+)
+
+# Validation errors are handled by exception handlers rather than a middleware
+app.add_exception_handler(RequestValidationError, validation_exception_handler)
+app.add_exception_handler(ValidationError, validation_exception_handler)
+
 # Register API routers
 app.include_router(coaching.router, prefix="/api/v1/coaching", tags=["coaching"])
 app.include_router(activities_router)
@@ -5,18 +5,18 @@ content type and file patterns to optimize browser caching behavior.
 """
 
 import re
-from typing import Callable, Dict, Optional, Pattern
+from typing import Dict, Optional, Pattern
 
-from starlette.datastructures import Headers
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope
 
+from app.middleware.pipeline import HookState, PipelineHook, PipelineMiddleware
 
-class CacheHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add cache control headers to static assets.
 
-    This middleware automatically adds appropriate Cache-Control headers
+class CacheHeadersHook(PipelineHook):
+    """Pipeline hook adding cache control headers to responses.
+
+    This hook automatically adds appropriate Cache-Control headers
     to responses based on the requested path and content type. It supports:
 
     - Immutable assets (versioned files with hash): 1 year cache
@@ -75,21 +75,17 @@ class CacheHeadersMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
         static_paths: Optional[list[str]] = None,
         immutable_pattern: Optional[str] = None,
         cache_rules: Optional[Dict[str, str]] = None,
     ):
-        """Initialize the cache headers middleware.
+        """Initialize the cache headers hook.
 
         Args:
-            app: The ASGI application
             static_paths: List of path prefixes for static files (default: ["/static", "/assets", "/media"])
             immutable_pattern: Regex pattern for immutable files (default: files with hashes like .abc123.js)
             cache_rules: Custom cache control rules by content type (merged with defaults)
         """
-        super().__init__(app)
-
         self.static_paths = static_paths or ["/static", "/assets", "/media", "/uploads"]
 
         # Pattern for versioned/hashed files (e.g., main.abc123.js, style.abc123.css)
@@ -147,41 +143,93 @@ class CacheHeadersMiddleware(BaseHTTPMiddleware):
             self.cache_rules.get("application/json")  # Default to no-cache
         )
 
-    async def dispatch(
-        self, request: Request, call_next: Callable
-    ) -> Response:
-        """Process the request and add cache headers to the response.
+    def on_response_start(
+        self, scope: Scope, status: int, headers: MutableHeaders, state: HookState
+    ) -> None:
+        """Add cache headers to the response.
 
         Args:
-            request: The incoming request
-            call_next: The next middleware/handler in the chain
+            scope: ASGI scope of the request
+            status: Response status code
+            headers: Mutable view of the response headers
+            state: Storage shared with the other hooks for this request
+        """
+        # Only add cache headers if not already set
+        if "cache-control" in headers:
+            return
 
-        Returns:
-            Response: The response with cache headers added
+        path = scope["path"]
+        content_type = headers.get("content-type", "")
+        headers["Cache-Control"] = self._get_cache_control(path, content_type)
+
+        # Add Vary header for JSON responses (may vary by Accept header)
+        if "application/json" in content_type:
+            headers.add_vary_header("Accept, Authorization")
+
+        # Add ETag support for static assets
+        if self._is_static_path(path) and status == 200 and "etag" not in headers:
+            # Generate a simple ETag based on path (weak validator)
+            # In production, use a proper ETag generator based on file content/hash
+            headers["ETag"] = f'W/"{hash(path)}"'
+
+
+class CacheHeadersMiddleware(PipelineMiddleware):
+    """Middleware to add cache control headers to static assets.
+
+    Standalone pipeline running only the ``CacheHeadersHook``. Applications
+    that already use a ``PipelineMiddleware`` should add the hook to it
+    instead.
+
+    Attributes:
+        hook: The cache headers hook holding the configured rules
+    """
+
+    DEFAULT_CACHE_RULES: Dict[str, str] = CacheHeadersHook.DEFAULT_CACHE_RULES
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        static_paths: Optional[list[str]] = None,
+        immutable_pattern: Optional[str] = None,
+        cache_rules: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the cache headers middleware.
+
+        Args:
+            app: The ASGI application
+            static_paths: List of path prefixes for static files (default: ["/static", "/assets", "/media"])
+            immutable_pattern: Regex pattern for immutable files (default: files with hashes like .abc123.js)
+            cache_rules: Custom cache control rules by content type (merged with defaults)
         """
-        # Process the request
-        response = await call_next(request)
+        self.hook = CacheHeadersHook(static_paths, immutable_pattern, cache_rules)
+        super().__init__(app, [self.hook])
 
-        # Get the content type from the response
-        content_type = response.headers.get("content-type", "")
+    @property
+    def static_paths(self) -> list[str]:
+        """Path prefixes treated as static assets."""
+        return self.hook.static_paths
 
-        # Only add cache headers if not already set
-        if "cache-control" not in response.headers:
-            cache_control = self._get_cache_control(request.url.path, content_type)
-            response.headers["Cache-Control"] = cache_control
-
-            # Add Vary header for JSON responses (may vary by Accept header)
-            if "application/json" in content_type:
-                response.headers["Vary"] = "Accept, Authorization"
-
-            # Add ETag support for static assets
-            if self._is_static_path(request.url.path) and response.status_code == 200:
-                # Generate a simple ETag based on path (weak validator)
-                # In production, use a proper ETag generator based on file content/hash
-                etag_value = hash(request.url.path)
-                response.headers.setdefault("ETag", f'W/"{etag_value}"')
-
-        return response
+    @property
+    def immutable_pattern(self) -> Pattern:
+        """Pattern of immutable versioned assets."""
+        return self.hook.immutable_pattern
+
+    @property
+    def cache_rules(self) -> Dict[str, str]:
+        """Cache control rules by content type."""
+        return self.hook.cache_rules
+
+    def _is_static_path(self, path: str) -> bool:
+        """Check if the request path is for a static asset."""
+        return self.hook._is_static_path(path)
+
+    def _is_immutable_asset(self, path: str) -> bool:
+        """Check if the asset is immutable (versioned/hashed)."""
+        return self.hook._is_immutable_asset(path)
+
+    def _get_cache_control(self, path: str, content_type: str) -> str:
+        """Determine the appropriate Cache-Control header value."""
+        return self.hook._get_cache_control(path, content_type)
 
 
 def create_cache_middleware(
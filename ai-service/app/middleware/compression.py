@@ -1,40 +1,302 @@
-"""Gzip compression middleware for API response optimization.
-
-This middleware adds gzip compression to responses to reduce bandwidth usage
-and improve response times. It intelligently compresses responses based on
-content type, size, and client capabilities.
+"""Multi-codec compression middleware for API response optimization.
+
+This middleware compresses responses with brotli, zstd or gzip to reduce
+bandwidth usage and improve response times, choosing the codec from the
+client's ``Accept-Encoding`` q-values. It intelligently compresses responses
+based on content type, size, and client capabilities:
+
+- Streaming bodies (including server-sent events from the LLM streaming
+  endpoint) are compressed incrementally and flushed chunk by chunk, so
+  nothing is buffered and clients still receive each event immediately
+- The compression level adapts to the payload size and current CPU load
+- Bodies identified by a strong ``ETag`` (e.g. from the response cache) are
+  compressed once at the highest level and the compressed bytes are reused
+
+Only complete ``200`` responses are compressed: partial content (``206`` or
+any response with ``Content-Range``) is sent as is, since its byte ranges
+refer to the uncompressed representation. A compressed response is a
+different byte sequence from the one its strong ``ETag`` names, so the ETag
+is sent weak (``W/"..."``); ``If-None-Match`` still matches it, while
+``If-Range`` (which needs a strong ETag) falls back to the full response.
+
+brotli and zstd are optional; without them only gzip is offered.
 """
 
-import gzip
-import io
-from typing import Callable, Optional, Set
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Protocol, Set, Tuple
 
 from starlette.datastructures import Headers, MutableHeaders
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, StreamingResponse
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Level range used for dynamic compression per codec. The upper ends are
+# below each codec's maximum, which is too slow for per-request use.
+ENCODING_LEVELS: Dict[str, Tuple[int, int]] = {
+    "br": (1, 9),
+    "zstd": (1, 12),
+    "gzip": (1, 9),
+}
+
+# Server preference when the client rates several codecs equally
+ENCODING_PREFERENCE: Tuple[str, ...] = ("br", "zstd", "gzip")
+
+# CPU load per core above which the fastest level is always used
+HIGH_CPU_LOAD = 0.8
+
+# Payloads at least this large are compressed at a reduced level
+LARGE_PAYLOAD_SIZE = 1024 * 1024
+
+# Seconds between CPU load samples
+CPU_LOAD_SAMPLE_INTERVAL = 1.0
+
+
+class Encoder(Protocol):
+    """Incremental compressor for one response body."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, returning any output ready so far."""
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far without ending the stream."""
+
+    def finish(self) -> bytes:
+        """End the stream and emit the remaining output."""
+
+
+class GzipEncoder:
+    """Incremental gzip encoder."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Incremental brotli encoder."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    """Incremental zstd encoder."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+ENCODERS = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+
+def negotiate_encoding(
+    accept_encoding: str,
+    available: Optional[Set[str]] = None,
+) -> Optional[str]:
+    """Choose a content coding from an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``"gzip;q=0.8, br"``
+        available: Codings the server can produce (default: installed codecs)
+
+    Returns:
+        Optional[str]: The coding with the highest q-value, ties broken by
+        server preference, or None if the client accepts none of them
+    """
+    available = set(ENCODERS) if available is None else available
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding not in available:
+            continue
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+_cpu_load = (0.0, 0.0)
+
+
+def current_cpu_load() -> float:
+    """Get the 1-minute load average per CPU core, sampled at most once a second.
+
+    Returns:
+        float: Load per core (0.0 where load averages are unavailable)
+    """
+    global _cpu_load
+
+    sampled_at, load = _cpu_load
+    now = time.monotonic()
+    if now - sampled_at >= CPU_LOAD_SAMPLE_INTERVAL:
+        try:
+            load = os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            load = 0.0
+        _cpu_load = (now, load)
+    return load
+
+
+def choose_level(
+    encoding: str,
+    compresslevel: int,
+    size: Optional[int] = None,
+    streaming: bool = False,
+    reusable: bool = False,
+) -> int:
+    """Choose a compression level for a response.
+
+    The configured gzip-scale level (1-9) is mapped onto the codec's range
+    and then adjusted: the fastest level is used when CPUs are busy, the
+    highest when the output will be reused, and reduced levels for streams
+    (latency matters more than ratio) and very large payloads.
+
+    Args:
+        encoding: Content coding ("br", "zstd" or "gzip")
+        compresslevel: Configured level on the gzip 1-9 scale
+        size: Body size in bytes, if known
+        streaming: Whether the body is sent in several chunks
+        reusable: Whether the compressed bytes will be cached and reused
+
+    Returns:
+        int: Level for the codec
+    """
+    low, high = ENCODING_LEVELS[encoding]
+    fraction = (compresslevel - 1) / 8
+
+    if current_cpu_load() >= HIGH_CPU_LOAD:
+        fraction = 0.0
+    elif reusable:
+        fraction = 1.0
+    elif streaming:
+        fraction = min(fraction, 0.25)
+    elif size is not None and size >= LARGE_PAYLOAD_SIZE:
+        fraction /= 2
+
+    return round(low + fraction * (high - low))
 
-class GzipCompressionMiddleware:
-    """ASGI middleware for gzip compression of responses.
 
-    This middleware compresses HTTP responses using gzip when the client
-    supports it (Accept-Encoding: gzip header). It provides:
+class PrecompressedCache:
+    """Per-worker LRU of compressed bodies keyed by strong ETag and coding.
+
+    Attributes:
+        max_bytes: Total size of compressed bodies kept
+        hits: Number of responses served from the cache
+        misses: Number of cacheable responses that had to be compressed
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Total size of compressed bodies kept (default: 8 MB)
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        """Get the compressed body for an ETag, if cached."""
+        body = self._entries.get((etag, encoding))
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((etag, encoding))
+        self.hits += 1
+        return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        """Cache the compressed body for an ETag."""
+        if len(body) > self.max_bytes or (etag, encoding) in self._entries:
+            return
+        self._entries[(etag, encoding)] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """ASGI middleware for brotli, zstd and gzip compression of responses.
+
+    This middleware compresses HTTP responses with the best coding the
+    client accepts. It provides:
 
     - Automatic compression for text-based content types
     - Configurable minimum response size threshold
-    - Configurable compression level (1-9)
+    - Configurable base compression level (1-9), adapted per response
     - Skip compression for already-compressed content
-    - Skip compression for streaming responses (optional)
+    - Incremental compression of streaming responses
+    - Reuse of compressed bodies for responses with a strong ETag
     - Proper Content-Encoding and Vary headers
 
     Attributes:
         app: The ASGI application
         minimum_size: Minimum response size in bytes to compress (default: 500)
-        compresslevel: Gzip compression level 1-9 (default: 6, balanced)
+        compresslevel: Base compression level 1-9 (default: 6, balanced)
         compressible_types: Set of content types that should be compressed
         excluded_types: Set of content types that should never be compressed
+        precompressed: Cache of compressed bodies keyed by ETag
     """
 
     # Default compressible content types (text-based formats)
@@ -45,6 +307,7 @@ class GzipCompressionMiddleware:
         "text/xml",
         "text/csv",
         "text/javascript",
+        "text/event-stream",  # Flushed per chunk, so events are not delayed
         "application/json",
         "application/javascript",
         "application/xml",
@@ -56,6 +319,7 @@ class GzipCompressionMiddleware:
         "application/geo+json",
         "application/manifest+json",
         "application/vnd.api+json",
+        "application/x-ndjson",
     }
 
     # Content types that should never be compressed (already compressed)
@@ -81,7 +345,6 @@ class GzipCompressionMiddleware:
         "application/x-rar-compressed",
         "application/pdf",
         "application/octet-stream",
-        "text/event-stream",  # Server-sent events should not be compressed
     }
 
     def __init__(
@@ -91,22 +354,25 @@ class GzipCompressionMiddleware:
         compresslevel: int = 6,
         compressible_types: Optional[Set[str]] = None,
         excluded_types: Optional[Set[str]] = None,
+        precompressed: Optional[PrecompressedCache] = None,
     ):
-        """Initialize the gzip compression middleware.
+        """Initialize the compression middleware.
 
         Args:
             app: The ASGI application
             minimum_size: Minimum response size in bytes to compress (default: 500)
                          Responses smaller than this won't be compressed
-            compresslevel: Gzip compression level 1-9 (default: 6)
+            compresslevel: Base compression level 1-9 (default: 6)
                           1 = fastest/least compression, 9 = slowest/most compression
                           6 provides good balance between speed and compression ratio
             compressible_types: Set of content types to compress (merged with defaults)
             excluded_types: Set of content types to never compress (merged with defaults)
+            precompressed: Cache of compressed bodies (default: a new 8 MB cache)
         """
         self.app = app
         self.minimum_size = minimum_size
         self.compresslevel = max(1, min(9, compresslevel))  # Clamp to 1-9
+        self.precompressed = precompressed or PrecompressedCache()
 
         # Merge custom types with defaults
         self.compressible_types = self.DEFAULT_COMPRESSIBLE_TYPES.copy()
@@ -130,28 +396,31 @@ class GzipCompressionMiddleware:
             return
 
         headers = Headers(scope=scope)
+        encoding = negotiate_encoding(headers.get("Accept-Encoding", ""))
 
-        # Check if client accepts gzip encoding
-        if "gzip" not in headers.get("Accept-Encoding", ""):
+        # Client accepts none of the codings we can produce
+        if encoding is None:
             await self.app(scope, receive, send)
             return
 
         # Use the responder to handle compression
-        responder = GzipResponder(
+        responder = CompressionResponder(
             self.app,
             self.minimum_size,
             self.compresslevel,
             self.compressible_types,
             self.excluded_types,
+            encoding=encoding,
+            precompressed=self.precompressed,
         )
         await responder(scope, receive, send)
 
 
-class GzipResponder:
-    """Handles gzip compression of HTTP responses.
+class CompressionResponder:
+    """Handles compression of a single HTTP response.
 
     This class wraps the ASGI send callable to intercept response messages
-    and apply gzip compression when appropriate.
+    and apply compression when appropriate.
     """
 
     def __init__(
@@ -161,27 +430,32 @@ class GzipResponder:
         compresslevel: int,
         compressible_types: Set[str],
         excluded_types: Set[str],
+        encoding: str = "gzip",
+        precompressed: Optional[PrecompressedCache] = None,
     ):
-        """Initialize the gzip responder.
+        """Initialize the compression responder.
 
         Args:
             app: The ASGI application
             minimum_size: Minimum response size to compress
-            compresslevel: Gzip compression level (1-9)
+            compresslevel: Base compression level (1-9)
             compressible_types: Set of compressible content types
             excluded_types: Set of excluded content types
+            encoding: Negotiated content coding (default: gzip)
+            precompressed: Cache of compressed bodies keyed by ETag
         """
         self.app = app
         self.minimum_size = minimum_size
         self.compresslevel = compresslevel
         self.compressible_types = compressible_types
         self.excluded_types = excluded_types
+        self.encoding = encoding
+        self.precompressed = precompressed
 
         self.send: Send = None  # type: ignore
         self.initial_message: Message = {}
         self.started = False
-        self.gzip_buffer = io.BytesIO()
-        self.gzip_file: Optional[gzip.GzipFile] = None
+        self.encoder: Optional[Encoder] = None
         self.should_compress = True
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
@@ -222,6 +496,62 @@ class GzipResponder:
         # Default to not compressing other types
         return False
 
+    def _should_compress_response(self, status: int, headers: Headers) -> bool:
+        """Determine if a response should be compressed.
+
+        Args:
+            status: Response status code
+            headers: Response headers
+
+        Returns:
+            bool: True for complete 200 responses of a compressible type
+        """
+        if status != 200 or "content-range" in headers:
+            return False
+        # Don't compress if Content-Encoding already set
+        if "content-encoding" in headers:
+            return False
+        return self._should_compress_content_type(headers.get("content-type", ""))
+
+    def _strong_etag(self) -> Optional[str]:
+        """Get the response's strong ETag, which identifies its exact bytes."""
+        etag = Headers(raw=self.initial_message["headers"]).get("etag")
+        if not etag or etag.startswith("W/"):
+            return None
+        return etag
+
+    def _compress_body(self, body: bytes) -> bytes:
+        """Compress a complete body, reusing cached output for strong ETags."""
+        etag = self._strong_etag() if self.precompressed is not None else None
+        if etag is not None:
+            cached = self.precompressed.get(etag, self.encoding)
+            if cached is not None:
+                return cached
+
+        level = choose_level(
+            self.encoding, self.compresslevel, size=len(body), reusable=etag is not None
+        )
+        encoder = ENCODERS[self.encoding](level)
+        compressed = encoder.compress(body) + encoder.finish()
+
+        if etag is not None:
+            self.precompressed.put(etag, self.encoding, compressed)
+        return compressed
+
+    def _set_encoding_headers(self, content_length: Optional[int]) -> None:
+        """Mark the held start message as compressed."""
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if content_length is None:
+            if "content-length" in headers:
+                del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        headers.add_vary_header("Accept-Encoding")
+
     async def send_with_compression(self, message: Message) -> None:
         """Intercept and potentially compress response messages.
 
@@ -234,26 +564,13 @@ class GzipResponder:
             # Store the initial message to modify headers later
             self.initial_message = message
             headers = Headers(raw=self.initial_message["headers"])
-
-            # Don't compress if Content-Encoding already set
-            if "content-encoding" in headers:
-                self.should_compress = False
-                return
-
-            # Check if content type should be compressed
-            content_type = headers.get("content-type", "")
-            if not self._should_compress_content_type(content_type):
+            if not self._should_compress_response(message["status"], headers):
                 self.should_compress = False
-                return
-
-            # Initialize gzip compressor
-            self.gzip_file = gzip.GzipFile(
-                mode="wb",
-                fileobj=self.gzip_buffer,
-                compresslevel=self.compresslevel,
-            )
 
         elif message_type == "http.response.body":
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
             if not self.should_compress:
                 # Send without compression
                 if not self.started:
@@ -262,57 +579,63 @@ class GzipResponder:
                 await self.send(message)
                 return
 
-            body = message.get("body", b"")
-            more_body = message.get("more_body", False)
-
-            # Compress the body
-            if self.gzip_file:
-                self.gzip_file.write(body)
+            if not self.started:
+                self.started = True
 
                 if not more_body:
-                    # Final chunk - close the gzip file
-                    self.gzip_file.close()
-
-                compressed_body = self.gzip_buffer.getvalue()
-
-                if not self.started:
-                    self.started = True
-
-                    # Check if compression is worthwhile
-                    original_size = len(body)
-                    compressed_size = len(compressed_body)
+                    # Complete body in one message
+                    if len(body) < self.minimum_size:
+                        await self.send(self.initial_message)
+                        await self.send(message)
+                        return
 
-                    if original_size < self.minimum_size or compressed_size >= original_size:
+                    compressed_body = self._compress_body(body)
+                    if len(compressed_body) >= len(body):
                         # Not worth compressing - send original
                         await self.send(self.initial_message)
                         await self.send(message)
                         return
 
-                    # Update headers for compressed response
-                    headers = MutableHeaders(raw=self.initial_message["headers"])
-                    headers["Content-Encoding"] = "gzip"
-                    headers["Content-Length"] = str(compressed_size)
-                    headers.add_vary_header("Accept-Encoding")
-
-                    # Send compressed response
+                    self._set_encoding_headers(len(compressed_body))
                     await self.send(self.initial_message)
                     await self.send({
                         "type": "http.response.body",
                         "body": compressed_body,
                         "more_body": False,
                     })
-                else:
-                    # Streaming response - send compressed chunk
-                    self.gzip_buffer.seek(0)
-                    chunk = self.gzip_buffer.read()
-                    self.gzip_buffer.seek(0)
-                    self.gzip_buffer.truncate()
+                    return
+
+                # Streaming response: compress incrementally from here on
+                declared_size = Headers(raw=self.initial_message["headers"]).get(
+                    "content-length"
+                )
+                if declared_size is not None and int(declared_size) < self.minimum_size:
+                    self.should_compress = False
+                    await self.send(self.initial_message)
+                    await self.send(message)
+                    return
 
-                    await self.send({
-                        "type": "http.response.body",
-                        "body": chunk,
-                        "more_body": more_body,
-                    })
+                level = choose_level(self.encoding, self.compresslevel, streaming=True)
+                self.encoder = ENCODERS[self.encoding](level)
+                self._set_encoding_headers(None)
+                await self.send(self.initial_message)
+
+            # Flush every chunk so streamed events reach the client immediately
+            chunk = self.encoder.compress(body)
+            chunk += self.encoder.flush() if more_body else self.encoder.finish()
+            await self.send({
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": more_body,
+            })
+
+        else:
+            await self.send(message)
+
+
+# Names used before brotli and zstd support was added
+GzipCompressionMiddleware = CompressionMiddleware
+GzipResponder = CompressionResponder
 
 
 def create_compression_middleware(
@@ -320,7 +643,7 @@ def create_compression_middleware(
     compresslevel: int = 6,
     compressible_types: Optional[Set[str]] = None,
     excluded_types: Optional[Set[str]] = None,
-) -> type[GzipCompressionMiddleware]:
+) -> type[CompressionMiddleware]:
     """Factory function to create a configured compression middleware.
 
     This factory allows you to create a middleware class with custom configuration
@@ -328,12 +651,12 @@ def create_compression_middleware(
 
     Args:
         minimum_size: Minimum response size in bytes to compress (default: 500)
-        compresslevel: Gzip compression level 1-9 (default: 6)
+        compresslevel: Base compression level 1-9 (default: 6)
         compressible_types: Set of content types to compress (merged with defaults)
         excluded_types: Set of content types to never compress (merged with defaults)
 
     Returns:
-        type[GzipCompressionMiddleware]: Configured middleware class
+        type[CompressionMiddleware]: Configured middleware class
 
     Example:
         ```python
@@ -351,7 +674,7 @@ def create_compression_middleware(
         app.add_middleware(CompressionMiddleware)
         ```
     """
-    class ConfiguredCompressionMiddleware(GzipCompressionMiddleware):
+    class ConfiguredCompressionMiddleware(CompressionMiddleware):
         def __init__(self, app: ASGIApp):
             super().__init__(
                 app,
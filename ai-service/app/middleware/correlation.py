@@ -5,26 +5,22 @@ enabling end-to-end request tracking in a microservices architecture.
 """
 
 import uuid
-from typing import Callable
+from typing import Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope
 
-from app.core.context import (
-    get_correlation_id,
-    get_request_id,
-    set_correlation_id,
-    set_request_id,
-)
+from app.core.context import set_correlation_id, set_request_id
 from app.core.logging import get_logger
+from app.middleware.pipeline import HookState, PipelineHook, PipelineMiddleware
 
 logger = get_logger(__name__)
 
 
-class CorrelationMiddleware(BaseHTTPMiddleware):
-    """Middleware for handling request and correlation ID propagation.
+class CorrelationHook(PipelineHook):
+    """Pipeline hook handling request and correlation ID propagation.
 
-    This middleware:
+    This hook:
     - Extracts or generates X-Request-ID header for the current request
     - Extracts or generates X-Correlation-ID header for distributed tracing
     - Stores both IDs in context variables for access throughout the request
@@ -35,31 +31,35 @@ class CorrelationMiddleware(BaseHTTPMiddleware):
     Correlation ID: Shared across multiple service calls in a transaction
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process the request and handle ID propagation.
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        """Resolve the request and correlation IDs of an incoming request.
 
         Args:
-            request: The incoming HTTP request
-            call_next: The next middleware or route handler
+            scope: ASGI scope of the request
+            headers: Request headers
+            state: Storage shared with the other hooks for this request
 
         Returns:
-            Response: The HTTP response with correlation headers
+            None: The request always continues
         """
         # Extract or generate request ID (unique per request)
-        request_id = request.headers.get("X-Request-ID")
+        request_id = headers.get("X-Request-ID")
         if not request_id:
             request_id = str(uuid.uuid4())
 
         # Extract or generate correlation ID (shared across related requests)
         # If a correlation ID is provided, use it (request is part of existing flow)
         # Otherwise, use the request ID as the correlation ID (start of new flow)
-        correlation_id = request.headers.get("X-Correlation-ID")
+        correlation_id = headers.get("X-Correlation-ID")
         if not correlation_id:
             correlation_id = request_id
 
         # Store in request state for backward compatibility
-        request.state.request_id = request_id
-        request.state.correlation_id = correlation_id
+        request_state = scope.setdefault("state", {})
+        request_state["request_id"] = request_id
+        request_state["correlation_id"] = correlation_id
 
         # Store in context variables for global access
         set_request_id(request_id)
@@ -70,29 +70,55 @@ class CorrelationMiddleware(BaseHTTPMiddleware):
             request_id=request_id,
             correlation_id=correlation_id,
         )
+        state["request_logger"] = request_logger
 
         # Log incoming request with both IDs
+        client = scope.get("client")
         request_logger.info(
             "Incoming request",
-            method=request.method,
-            path=request.url.path,
-            client=request.client.host if request.client else None,
+            method=scope["method"],
+            path=scope["path"],
+            client=client[0] if client else None,
         )
+        return None
 
-        # Process the request
-        response = await call_next(request)
+    def on_response_start(
+        self, scope: Scope, status: int, headers: MutableHeaders, state: HookState
+    ) -> None:
+        """Add both IDs to the response headers.
 
-        # Add both IDs to response headers
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Correlation-ID"] = correlation_id
+        Args:
+            scope: ASGI scope of the request
+            status: Response status code
+            headers: Mutable view of the response headers
+            state: Storage shared with the other hooks for this request
+        """
+        request_state = scope["state"]
+        headers["X-Request-ID"] = request_state["request_id"]
+        headers["X-Correlation-ID"] = request_state["correlation_id"]
 
         # Log response
-        request_logger.info(
+        state["request_logger"].info(
             "Request completed",
-            status_code=response.status_code,
+            status_code=status,
         )
 
-        return response
+
+class CorrelationMiddleware(PipelineMiddleware):
+    """Middleware for handling request and correlation ID propagation.
+
+    Standalone pipeline running only the ``CorrelationHook``. Applications
+    that already use a ``PipelineMiddleware`` should add the hook to it
+    instead.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the correlation middleware.
+
+        Args:
+            app: The ASGI application
+        """
+        super().__init__(app, [CorrelationHook()])
 
 
 def correlation_middleware(app):
@@ -0,0 +1,181 @@
+"""Fused pure-ASGI middleware pipeline for LAYA AI Service.
+
+Cross-cutting concerns that only inspect the request and decorate the
+response headers (correlation IDs, security headers, cache headers, HTTPS
+redirects) run as ordered hooks inside a single ASGI middleware instead of
+one ``BaseHTTPMiddleware`` layer each.
+
+Compared to stacking ``BaseHTTPMiddleware`` layers this:
+
+- Parses the request headers once and shares them between hooks
+- Edits headers in place on the ``http.response.start`` message, so bodies
+  are never copied or re-streamed
+- Runs the application in the caller's task, so context variables set by
+  hooks are visible to the route and streaming responses start immediately
+
+Example:
+    app.add_middleware(
+        PipelineMiddleware,
+        hooks=[HTTPSRedirectHook(), CorrelationHook(), SecurityHeadersHook()],
+    )
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Per-request storage shared by the hooks of one pipeline
+HookState = Dict[str, Any]
+
+
+class PipelineHook:
+    """Base class of pipeline hooks.
+
+    Subclasses override any of ``on_request``, ``on_response_start``,
+    ``before_response`` and ``on_complete``. Hooks that leave a method
+    untouched are skipped for that phase entirely.
+    """
+
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        """Inspect an incoming HTTP request.
+
+        Args:
+            scope: ASGI scope of the request
+            headers: Request headers (parsed once per request)
+            state: Storage shared with the other hooks for this request
+
+        Returns:
+            Optional[ASGIApp]: A response to send instead of calling the
+            application, or None to continue
+        """
+        return None
+
+    def on_response_start(
+        self, scope: Scope, status: int, headers: MutableHeaders, state: HookState
+    ) -> None:
+        """Decorate the response before its headers are sent.
+
+        Args:
+            scope: ASGI scope of the request
+            status: Response status code
+            headers: Mutable view of the response headers
+            state: Storage shared with the other hooks for this request
+        """
+
+    async def before_response(self, scope: Scope, status: int, state: HookState) -> None:
+        """Finish asynchronous work the response must wait for.
+
+        Awaited after the response hooks, before the response headers are
+        sent. Most hooks should not need it, as it delays every response it
+        runs for.
+
+        Args:
+            scope: ASGI scope of the request
+            status: Response status code
+            state: Storage shared with the other hooks for this request
+        """
+
+    def on_complete(self, scope: Scope, state: HookState) -> None:
+        """Clean up after the request, once the response has been sent.
+
+        Runs in the same context as ``on_request``, so context variables set
+        there can be reset here. It runs even when the application raised or
+        a request hook short-circuited, so hooks must only undo what their
+        own ``on_request`` stored in ``state``.
+
+        Args:
+            scope: ASGI scope of the request
+            state: Storage shared with the other hooks for this request
+        """
+
+
+class PipelineMiddleware:
+    """Pure ASGI middleware running an ordered list of hooks.
+
+    Request hooks run in order before the application; the first hook that
+    returns a response short-circuits the request and that response is sent
+    as is. Response hooks run in order on ``http.response.start``, then the
+    ``before_response`` hooks are awaited in order before it is sent, and
+    completion hooks run in reverse order once the application has returned.
+
+    Attributes:
+        hooks: Hooks of the pipeline, in execution order
+    """
+
+    def __init__(self, app: ASGIApp, hooks: Sequence[PipelineHook]) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            app: The ASGI application
+            hooks: Hooks to run, in order
+        """
+        self.app = app
+        self.hooks: List[PipelineHook] = list(hooks)
+        self._request_hooks = [
+            hook
+            for hook in self.hooks
+            if type(hook).on_request is not PipelineHook.on_request
+        ]
+        self._response_hooks = [
+            hook
+            for hook in self.hooks
+            if type(hook).on_response_start is not PipelineHook.on_response_start
+        ]
+        self._before_response_hooks = [
+            hook
+            for hook in self.hooks
+            if type(hook).before_response is not PipelineHook.before_response
+        ]
+        self._complete_hooks = [
+            hook
+            for hook in reversed(self.hooks)
+            if type(hook).on_complete is not PipelineHook.on_complete
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the hooks around the application.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive callable
+            send: ASGI send callable
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        state: HookState = {}
+
+        try:
+            for hook in self._request_hooks:
+                response = hook.on_request(scope, request_headers, state)
+                if response is not None:
+                    await response(scope, receive, send)
+                    return
+
+            if not self._response_hooks and not self._before_response_hooks:
+                await self.app(scope, receive, send)
+                return
+
+            response_hooks = self._response_hooks
+            before_response_hooks = self._before_response_hooks
+
+            async def send_with_hooks(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if response_hooks:
+                        headers = MutableHeaders(scope=message)
+                        for hook in response_hooks:
+                            hook.on_response_start(scope, status, headers, state)
+                    for hook in before_response_hooks:
+                        await hook.before_response(scope, status, state)
+                await send(message)
+
+            await self.app(scope, receive, send_with_hooks)
+        finally:
+            for hook in self._complete_hooks:
+                hook.on_complete(scope, state)
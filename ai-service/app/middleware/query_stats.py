@@ -0,0 +1,103 @@
+"""Per-request SQL instrumentation hook for LAYA AI Service.
+
+Tracks the queries each request runs and reports them:
+
+- As a ``Server-Timing`` header (``db;dur=<ms>;desc="<n> queries"``) so
+  database time shows up in browser dev tools
+- As structured log fields bound to the request's correlation ID
+- As a warning when one statement repeats often enough to suggest an N+1
+  pattern (``db_n_plus_one_threshold`` in the settings)
+"""
+
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.core.query_stats import start_tracking, stop_tracking
+from app.middleware.pipeline import HookState, PipelineHook
+
+logger = get_logger(__name__)
+
+
+class QueryStatsHook(PipelineHook):
+    """Pipeline hook recording the SQL queries of each request.
+
+    Must run after ``CorrelationHook`` so the stats are bound to the
+    request's correlation ID.
+
+    Attributes:
+        n_plus_one_threshold: Executions of one statement that flag a
+            suspected N+1 pattern
+    """
+
+    def __init__(self, n_plus_one_threshold: Optional[int] = None) -> None:
+        """Initialize the hook.
+
+        Args:
+            n_plus_one_threshold: N+1 threshold (uses config default if None)
+        """
+        self.n_plus_one_threshold = n_plus_one_threshold or settings.db_n_plus_one_threshold
+
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        """Start tracking the queries of the request.
+
+        Args:
+            scope: ASGI scope of the request
+            headers: Request headers
+            state: Storage shared with the other hooks for this request
+
+        Returns:
+            None: The request always continues
+        """
+        state["query_stats"], state["query_stats_token"] = start_tracking()
+        return None
+
+    def on_response_start(
+        self, scope: Scope, status: int, headers: MutableHeaders, state: HookState
+    ) -> None:
+        """Report the queries run before the response started.
+
+        Args:
+            scope: ASGI scope of the request
+            status: Response status code
+            headers: Mutable view of the response headers
+            state: Storage shared with the other hooks for this request
+        """
+        headers.append("Server-Timing", state["query_stats"].server_timing())
+
+    def on_complete(self, scope: Scope, state: HookState) -> None:
+        """Log the queries of the request and stop tracking.
+
+        Args:
+            scope: ASGI scope of the request
+            state: Storage shared with the other hooks for this request
+        """
+        token = state.pop("query_stats_token", None)
+        if token is None:
+            return
+        stop_tracking(token)
+
+        stats = state["query_stats"]
+        if not stats.count:
+            return
+
+        logger.info(
+            "Request queries",
+            method=scope["method"],
+            path=scope["path"],
+            **stats.log_fields(),
+        )
+        suspects = stats.suspected_n_plus_one(self.n_plus_one_threshold)
+        if suspects:
+            logger.warning(
+                "Suspected N+1 query pattern",
+                method=scope["method"],
+                path=scope["path"],
+                repeated_statements=suspects,
+                **stats.log_fields(),
+            )
@@ -1,19 +1,47 @@
 """Rate limiting middleware for LAYA AI Service.
 
-This module provides rate limiting using slowapi to prevent abuse and ensure
-fair resource usage across the API. Different rate limits apply to general
-endpoints vs authentication-sensitive endpoints.
+This module provides rate limiting to prevent abuse and ensure fair resource
+usage across the API. ``RateLimitMiddleware`` applies limits shared by all
+workers through Redis (see ``app.core.rate_limiter``) per client IP, per
+authenticated user and per organization. Different rate limits apply to
+general endpoints vs authentication-sensitive endpoints, and routes backed
+by LLM calls cost more than one token per request. The slowapi ``limiter``
+remains available for per-route decorators.
 
 Rate limits are configurable via environment variables:
-- RATE_LIMIT_GENERAL: requests per minute for general endpoints (default: 100)
-- RATE_LIMIT_AUTH: requests per minute for auth endpoints (default: 10)
-- RATE_LIMIT_STORAGE_URI: storage backend (default: memory://, production: redis://...)
+- RATE_LIMIT_GENERAL: requests per minute per IP for general endpoints (default: 100)
+- RATE_LIMIT_AUTH: requests per minute per IP for auth endpoints (default: 10)
+- RATE_LIMIT_USER: tokens per minute per authenticated user (default: 300)
+- RATE_LIMIT_ORGANIZATION: tokens per minute per organization (default: 3000)
+- RATE_LIMIT_STORAGE_URI: slowapi storage backend (default: memory://, production: redis://...)
 """
 
+import math
+from typing import List
+
+from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.auth.jwt import get_request_token_payload
 from app.config import settings
+from app.core.error_responses import rate_limit_error_response
+from app.core.rate_limiter import RateLimitPolicy, get_rate_limiter
+
+# Token cost per request by path prefix; the longest matching prefix wins.
+# Routes calling an LLM are far more expensive to serve than plain reads.
+ROUTE_COSTS = {
+    "/api/v1/coaching": 5,
+    "/api/v1/communication": 5,
+    "/api/v1/activities/recommendations": 3,
+    "/api/v1/message-quality": 3,
+    "/api/v1/storage": 2,
+}
+
+# Paths never rate limited (infrastructure probes and API docs)
+EXEMPT_PATHS = ("/health", "/docs", "/redoc", "/openapi.json")
 
 
 def get_rate_limit_key(request) -> str:
@@ -53,7 +81,7 @@ def get_rate_limit_key(request) -> str:
 # Storage URI from settings: memory:// for dev, redis:// for production
 # Default limits from settings: configurable per environment
 limiter = Limiter(
-    key_func=get_remote_address,
+    key_func=get_rate_limit_key,
     default_limits=[f"{settings.rate_limit_general} per minute"],
     storage_uri=settings.rate_limit_storage_uri,
 )
@@ -75,3 +103,122 @@ def get_general_limit() -> str:
         str: Rate limit specification from settings (default: 100 requests per minute)
     """
     return f"{settings.rate_limit_general} per minute"
+
+
+def get_route_cost(path: str) -> int:
+    """Get the token cost of a request to the given path.
+
+    Args:
+        path: Request URL path
+
+    Returns:
+        int: Number of tokens the request consumes (1 for unlisted routes)
+    """
+    matches = [prefix for prefix in ROUTE_COSTS if path.startswith(prefix)]
+    if not matches:
+        return 1
+    return ROUTE_COSTS[max(matches, key=len)]
+
+
+def get_rate_limit_policies(request: Request) -> List[RateLimitPolicy]:
+    """Build the buckets a request draws on.
+
+    Every request is limited per client IP (with the stricter auth limit on
+    auth endpoints). Requests carrying a valid bearer token are also limited
+    per user and, when the token names one, per organization. Invalid tokens
+    are ignored here and rejected later by the authentication dependencies.
+    The token is decoded once per request (see ``get_request_token_payload``).
+
+    Args:
+        request: The incoming request object
+
+    Returns:
+        List[RateLimitPolicy]: Policies to enforce for this request
+    """
+    ip_key = get_rate_limit_key(request)
+    ip_limit = (
+        settings.rate_limit_auth
+        if ip_key.startswith("auth:")
+        else settings.rate_limit_general
+    )
+    policies = [RateLimitPolicy(scope="ip", identifier=ip_key, limit=ip_limit)]
+
+    payload = get_request_token_payload(request.scope)
+    if payload is None:
+        return policies
+
+    policies.append(
+        RateLimitPolicy(
+            scope="user",
+            identifier=str(payload["sub"]),
+            limit=settings.rate_limit_user,
+        )
+    )
+    organization_id = payload.get("organization_id")
+    if organization_id:
+        policies.append(
+            RateLimitPolicy(
+                scope="org",
+                identifier=str(organization_id),
+                limit=settings.rate_limit_organization,
+            )
+        )
+    return policies
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware enforcing distributed per-IP, per-user and per-org limits.
+
+    Allowed responses carry ``X-RateLimit-Limit`` and ``X-RateLimit-Remaining``
+    headers for the most restrictive bucket. Rejected requests receive a 429
+    error response with a ``Retry-After`` header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the rate limit middleware.
+
+        Args:
+            app: The ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Check the request against its rate limits.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive callable
+            send: ASGI send callable
+        """
+        if (
+            scope["type"] != "http"
+            or not settings.rate_limit_enabled
+            or scope["path"].startswith(EXEMPT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        decision = await get_rate_limiter().check(
+            get_rate_limit_policies(Request(scope)),
+            cost=get_route_cost(scope["path"]),
+        )
+        limit_headers = {
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(max(decision.remaining, 0)),
+        }
+
+        if not decision.allowed:
+            response = rate_limit_error_response(
+                details=f"Rate limit exceeded for {decision.scope}",
+            )
+            response.headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+            response.headers.update(limit_headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_limits(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(limit_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_limits)
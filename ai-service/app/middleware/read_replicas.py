@@ -0,0 +1,69 @@
+"""Read-your-writes hook for read replica routing.
+
+Requests with unsafe methods (POST, PUT, PATCH, DELETE) that succeed are
+treated as writes: the caller's subsequent reads are pinned to the primary
+for ``db_read_your_writes_window`` seconds, so replication lag never hides
+their own changes from them. The write is recorded, in Redis too, before the
+response is sent, so the caller's next request finds it on any worker.
+"""
+
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Scope
+
+from app.auth.jwt import get_request_token_payload
+from app.core.read_replicas import ReplicaRouter
+from app.database import get_replica_router
+from app.middleware.pipeline import HookState, PipelineHook
+
+# Methods that never change data
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesHook(PipelineHook):
+    """Pipeline hook pinning a user's reads to the primary after a write.
+
+    Attributes:
+        router: Replica router to notify of writes
+    """
+
+    def __init__(self, router: Optional[ReplicaRouter] = None) -> None:
+        """Initialize the hook.
+
+        Args:
+            router: Replica router (uses the global router if None)
+        """
+        self.router = router or get_replica_router()
+
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        """Remember who is writing, for requests that may write.
+
+        Args:
+            scope: ASGI scope of the request
+            headers: Request headers
+            state: Storage shared with the other hooks for this request
+
+        Returns:
+            None: The request always continues
+        """
+        if not self.router.enabled or scope["method"] in SAFE_METHODS:
+            return None
+        payload = get_request_token_payload(scope)
+        if payload is not None and payload.get("sub") is not None:
+            state["writer"] = str(payload["sub"])
+        return None
+
+    async def before_response(self, scope: Scope, status: int, state: HookState) -> None:
+        """Pin the writer's reads to the primary after a successful write.
+
+        Args:
+            scope: ASGI scope of the request
+            status: Response status code
+            state: Storage shared with the other hooks for this request
+        """
+        writer = state.get("writer")
+        if writer is not None and status < 400:
+            await self.router.mark_write(writer)
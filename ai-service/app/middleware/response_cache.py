@@ -0,0 +1,395 @@
+"""Shared response cache with strong ETags for polled API routes.
+
+Routes opt in with the ``cache_response`` decorator. For those routes the
+``ResponseCacheMiddleware``:
+
+- Serves serialized response bodies from Redis for a short TTL, keyed by
+  path, query string and the caller's user (or role)
+- Sets a strong ``ETag`` computed from a hash of the body
+- Answers a matching ``If-None-Match`` with ``304 Not Modified`` without
+  running the route or re-serializing the body
+
+Cached bodies are served without running the route's dependencies, so the
+middleware checks the token blacklist itself before serving one: a revoked
+token falls through to the route, which rejects it. Route-level checks
+other than authentication do not run on a hit either, which is why routes
+authorizing per user (ownership, facility scoping, ...) must keep the
+default ``vary="user"``.
+
+Entries are stored under ``<key_prefix>:response:<hash>`` so the existing
+``invalidate_cache(key_prefix)`` calls drop them along with the function
+cache of the same prefix. Entries can also be tagged with entity tags and
+invalidated through ``invalidate_tags``.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.jwt import get_request_token_payload, is_token_blacklisted
+from app.core.cache_metrics import get_cache_metrics
+from app.core.cache_tags import tag_keys
+from app.database import AsyncSessionLocal
+from app.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Attribute set on endpoints that opted into the response cache
+POLICY_ATTRIBUTE = "__response_cache__"
+
+# Key segment separating response entries from function cache entries
+RESPONSE_KEY_SEGMENT = "response"
+
+# Cache-Control for cached responses: clients must revalidate with the ETag
+# and shared proxies must not store per-user payloads
+CACHE_CONTROL = "private, no-cache"
+
+# Maximum number of resolved paths remembered per worker
+MAX_ROUTE_CACHE = 1024
+
+ResponseTagFunc = Callable[[Dict[str, Any]], Iterable[str]]
+
+
+@dataclass(frozen=True)
+class ResponseCachePolicy:
+    """Caching policy of one route.
+
+    Attributes:
+        key_prefix: Cache prefix entries are stored (and invalidated) under
+        ttl: Time to live of cached bodies in seconds
+        vary: "user" to cache per user, "role" to share entries between
+            users of the same role (only for routes whose authorization
+            depends on nothing but the role)
+        tags: Optional function ``tags(params)`` returning entity tags for
+            an entry; ``params`` holds the path and query parameters plus
+            ``user_id`` and ``role`` of the caller
+    """
+
+    key_prefix: str
+    ttl: int = 10
+    vary: str = "user"
+    tags: Optional[ResponseTagFunc] = None
+
+
+def cache_response(
+    key_prefix: str,
+    ttl: int = 10,
+    vary: str = "user",
+    tags: Optional[ResponseTagFunc] = None,
+) -> Callable[[Callable], Callable]:
+    """Opt a route into the shared response cache.
+
+    The endpoint itself is returned unchanged, so FastAPI's dependency
+    injection is unaffected.
+
+    Args:
+        key_prefix: Cache prefix entries are stored (and invalidated) under
+        ttl: Time to live of cached bodies in seconds (default: 10)
+        vary: "user" (default) or "role"; "role" serves one user the body
+            rendered for another user of the same role, so it must not be
+            used on routes that authorize per user
+        tags: Optional function ``tags(params)`` returning entity tags
+
+    Returns:
+        Decorator marking the endpoint as cacheable
+
+    Example:
+        @router.get("/dashboard")
+        @cache_response(key_prefix="analytics_dashboard", ttl=15, vary="role")
+        async def get_dashboard(...):
+            ...
+    """
+    if vary not in ("user", "role"):
+        raise ValueError(f"Unsupported response cache vary: {vary}")
+
+    policy = ResponseCachePolicy(key_prefix=key_prefix, ttl=ttl, vary=vary, tags=tags)
+
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, POLICY_ATTRIBUTE, policy)
+        return endpoint
+
+    return decorator
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute a strong ETag from a response body.
+
+    Args:
+        body: Serialized response body
+
+    Returns:
+        str: Quoted ETag value
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an ETag.
+
+    Args:
+        if_none_match: Header value (one or more comma-separated ETags or ``*``)
+        etag: Current ETag of the resource
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return "*" in candidates or etag in (
+        candidate[2:] if candidate.startswith("W/") else candidate
+        for candidate in candidates
+    )
+
+
+def build_response_cache_key(key_prefix: str, request: Request, identity: str) -> str:
+    """Build the cache key of a response.
+
+    Args:
+        key_prefix: Cache prefix of the route
+        request: The incoming request
+        identity: User or role the response is varied by
+
+    Returns:
+        str: Cache key
+    """
+    query = "&".join(
+        f"{name}={value}" for name, value in sorted(request.query_params.multi_items())
+    )
+    digest = hashlib.md5(f"{request.url.path}?{query}|{identity}".encode()).hexdigest()
+    return f"{key_prefix}:{RESPONSE_KEY_SEGMENT}:{digest}"
+
+
+async def token_revoked(token: str) -> bool:
+    """Check the token blacklist outside of the route's dependencies.
+
+    Args:
+        token: Encoded JWT token of the request
+
+    Returns:
+        bool: True if the token is revoked, or if the blacklist could not be
+        checked (the request then falls through to the route)
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            return await is_token_blacklisted(db, token)
+    except Exception as e:
+        logger.warning(f"Response cache blacklist check failed: {e}")
+        return True
+
+
+class ResponseCacheMiddleware:
+    """Pure ASGI middleware serving opted-in GET routes from the shared response cache.
+
+    Only successful JSON responses to authenticated requests are cached.
+    Requests sent with ``Cache-Control: no-cache`` bypass cached bodies but
+    still refresh the entry.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the response cache middleware.
+
+        Args:
+            app: The ASGI application
+        """
+        self.app = app
+        self._routes: Dict[str, Optional[Tuple[ResponseCachePolicy, Dict[str, Any]]]] = {}
+
+    def _resolve(
+        self, scope: Scope
+    ) -> Optional[Tuple[ResponseCachePolicy, Dict[str, Any]]]:
+        """Find the cache policy and path parameters of the matching route."""
+        path = scope["path"]
+        if path in self._routes:
+            return self._routes[path]
+
+        resolved = None
+        for route in scope["app"].router.routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                policy = getattr(getattr(route, "endpoint", None), POLICY_ATTRIBUTE, None)
+                if policy is not None:
+                    resolved = (policy, dict(child_scope.get("path_params", {})))
+                break
+
+        if len(self._routes) >= MAX_ROUTE_CACHE:
+            self._routes.clear()
+        self._routes[path] = resolved
+        return resolved
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the request from the response cache when possible.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive callable
+            send: ASGI send callable
+        """
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        resolved = self._resolve(scope)
+        payload = get_request_token_payload(scope)
+        if resolved is None or payload is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        policy, path_params = resolved
+        user_id = str(payload.get("sub"))
+        role = str(payload.get("role") or "")
+        identity = f"user={user_id}" if policy.vary == "user" else f"role={role}"
+        cache_key = build_response_cache_key(policy.key_prefix, request, identity)
+        if_none_match = request.headers.get("if-none-match")
+        metrics = get_cache_metrics()
+
+        if "no-cache" not in request.headers.get("cache-control", ""):
+            cached = await self._read(cache_key, if_none_match)
+            if cached is not None:
+                token = request.headers["authorization"].partition(" ")[2]
+                if await token_revoked(token):
+                    # Let the route's authentication reject the request
+                    await self.app(scope, receive, send)
+                    return
+                etag, body, media_type = cached
+                metrics.record_hit(policy.key_prefix, len(body or ""))
+                await metrics.maybe_flush()
+                if body is None:
+                    response = self._not_modified(etag, "HIT")
+                else:
+                    response = Response(
+                        content=body,
+                        media_type=media_type,
+                        headers=self._cache_headers(etag, "HIT"),
+                    )
+                await response(scope, receive, send)
+                return
+            metrics.record_miss(policy.key_prefix)
+
+        params = {
+            **dict(request.query_params),
+            **path_params,
+            "user_id": user_id,
+            "role": role,
+        }
+        start: Optional[Message] = None
+        passthrough = False
+        chunks = []
+
+        async def send_cached(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or "application/json" not in headers.get("content-type", "")
+                    or "set-cookie" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            content_type = Headers(raw=start["headers"])["content-type"]
+            etag = compute_etag(body)
+            await self._store(cache_key, policy, body, etag, content_type, params)
+            await metrics.maybe_flush()
+
+            if if_none_match and etag_matches(if_none_match, etag):
+                await self._not_modified(etag, "MISS")(scope, receive, send)
+                return
+
+            headers = MutableHeaders(raw=list(start["headers"]))
+            headers["content-length"] = str(len(body))
+            headers.update(self._cache_headers(etag, "MISS"))
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_cached)
+
+    async def _read(
+        self, cache_key: str, if_none_match: Optional[str]
+    ) -> Optional[Tuple[str, Optional[str], str]]:
+        """Read a cached entry.
+
+        When the client's ETag is current only the ETag is fetched, so the
+        body is neither transferred from Redis nor sent to the client.
+
+        Returns:
+            Tuple of (etag, body, media type), with body None when the
+            client's copy is current, or None on a miss
+        """
+        try:
+            redis = await get_redis_client()
+            if if_none_match:
+                etag = await redis.hget(cache_key, "etag")
+                if etag is None:
+                    return None
+                if etag_matches(if_none_match, etag):
+                    return etag, None, ""
+            entry = await redis.hgetall(cache_key)
+            if not entry:
+                return None
+            return entry["etag"], entry["body"], entry["content_type"]
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {cache_key}: {e}")
+            return None
+
+    async def _store(
+        self,
+        cache_key: str,
+        policy: ResponseCachePolicy,
+        body: bytes,
+        etag: str,
+        content_type: str,
+        params: Dict[str, Any],
+    ) -> None:
+        """Store a rendered response body."""
+        try:
+            redis = await get_redis_client()
+            pipe = redis.pipeline(transaction=True)
+            pipe.hset(
+                cache_key,
+                mapping={
+                    "body": body.decode("utf-8"),
+                    "etag": etag,
+                    "content_type": content_type,
+                },
+            )
+            pipe.expire(cache_key, policy.ttl)
+            await pipe.execute()
+            get_cache_metrics().record_set(policy.key_prefix, cache_key, len(body), policy.ttl)
+            if policy.tags is not None:
+                await tag_keys(cache_key, policy.tags(params), policy.ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed for {cache_key}: {e}")
+
+    @staticmethod
+    def _cache_headers(etag: str, status: str) -> Dict[str, str]:
+        """Headers added to every response of a cached route."""
+        return {
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Authorization",
+            "X-Cache": status,
+        }
+
+    def _not_modified(self, etag: str, status: str) -> Response:
+        """Build a 304 response for a client whose copy is current."""
+        return Response(status_code=304, headers=self._cache_headers(etag, status))
@@ -4,14 +4,20 @@ This module provides security-related middleware including CORS configuration
 with environment-based origin whitelisting for production security, XSS
 protection headers to prevent cross-site scripting attacks, and HTTPS redirect
 for production deployments.
+
+The ``*Hook`` classes apply the same policies as pipeline hooks for the
+fused ``PipelineMiddleware``.
 """
 
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Mapping, Optional
 
 from fastapi import Request, Response
 from fastapi.responses import RedirectResponse
+from starlette.datastructures import URL, Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope
 
 from app.config import settings
+from app.middleware.pipeline import HookState, PipelineHook
 
 
 def get_cors_origins() -> List[str]:
@@ -37,6 +43,26 @@ def get_cors_origins() -> List[str]:
     ]
 
 
+def is_https_request(scheme: str, headers: Mapping[str, str]) -> bool:
+    """Check whether a request reached the service over HTTPS.
+
+    Handles both direct HTTPS connections and requests proxied by nginx or a
+    load balancer that terminated TLS.
+
+    Args:
+        scheme: URL scheme of the request
+        headers: Request headers
+
+    Returns:
+        bool: True if the client connection is encrypted
+    """
+    return (
+        scheme == "https"
+        or headers.get("X-Forwarded-Proto") == "https"
+        or headers.get("X-Forwarded-Ssl") == "on"
+    )
+
+
 def get_xss_protection_headers() -> Dict[str, str]:
     """Get XSS protection headers for HTTP responses.
 
@@ -146,11 +172,7 @@ def get_https_redirect_middleware() -> Callable:
 
         # Check if request is already HTTPS
         # Handle both direct HTTPS connections and proxied requests
-        is_https = (
-            request.url.scheme == "https"
-            or request.headers.get("X-Forwarded-Proto") == "https"
-            or request.headers.get("X-Forwarded-Ssl") == "on"
-        )
+        is_https = is_https_request(request.url.scheme, request.headers)
 
         # If request is HTTP and not proxied with HTTPS, redirect to HTTPS
         if not is_https:
@@ -212,11 +234,7 @@ def get_hsts_middleware() -> Callable:
 
         # Only add HSTS header to HTTPS responses
         # Check both direct HTTPS and proxied HTTPS connections
-        is_https = (
-            request.url.scheme == "https"
-            or request.headers.get("X-Forwarded-Proto") == "https"
-            or request.headers.get("X-Forwarded-Ssl") == "on"
-        )
+        is_https = is_https_request(request.url.scheme, request.headers)
 
         # Add HSTS header to HTTPS responses when enforcement is enabled
         if is_https and settings.enforce_https:
@@ -227,3 +245,80 @@ def get_hsts_middleware() -> Callable:
         return response
 
     return hsts_middleware
+
+
+class HTTPSRedirectHook(PipelineHook):
+    """Pipeline hook redirecting HTTP requests to HTTPS in production.
+
+    Pure ASGI counterpart of ``get_https_redirect_middleware``; it must be
+    the first hook of the pipeline so no other work is done for requests
+    that get redirected.
+    """
+
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        """Redirect the request if it did not arrive over HTTPS.
+
+        Args:
+            scope: ASGI scope of the request
+            headers: Request headers
+            state: Storage shared with the other hooks for this request
+
+        Returns:
+            Optional[ASGIApp]: 301 redirect to the HTTPS URL, or None
+        """
+        if not settings.enforce_https or is_https_request(scope["scheme"], headers):
+            return None
+
+        https_url = URL(scope=scope).replace(scheme="https")
+        return RedirectResponse(url=str(https_url), status_code=301)
+
+
+class SecurityHeadersHook(PipelineHook):
+    """Pipeline hook adding XSS protection and HSTS headers to responses.
+
+    Pure ASGI counterpart of ``get_xss_protection_middleware`` and
+    ``get_hsts_middleware``. The header values are computed once when the
+    hook is created.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the hook with the configured security headers."""
+        self.xss_headers = get_xss_protection_headers()
+        self.hsts_headers = get_hsts_headers()
+
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        """Remember whether the request arrived over HTTPS.
+
+        Args:
+            scope: ASGI scope of the request
+            headers: Request headers
+            state: Storage shared with the other hooks for this request
+
+        Returns:
+            None: The request always continues
+        """
+        state["is_https"] = is_https_request(scope["scheme"], headers)
+        return None
+
+    def on_response_start(
+        self, scope: Scope, status: int, headers: MutableHeaders, state: HookState
+    ) -> None:
+        """Add the security headers to the response.
+
+        Args:
+            scope: ASGI scope of the request
+            status: Response status code
+            headers: Mutable view of the response headers
+            state: Storage shared with the other hooks for this request
+        """
+        for header_name, header_value in self.xss_headers.items():
+            headers[header_name] = header_value
+
+        # Add HSTS header to HTTPS responses when enforcement is enabled
+        if state["is_https"] and settings.enforce_https:
+            for header_name, header_value in self.hsts_headers.items():
+                headers[header_name] = header_value
@@ -465,6 +465,8 @@ class DocumentAuditLog(Base):
 
     __tablename__ = "document_audit_logs"
 
+    # On PostgreSQL the table is partitioned by month on timestamp, and its
+    # primary key is (id, timestamp); id alone identifies an entry.
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
         primary_key=True,
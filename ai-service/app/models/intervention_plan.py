@@ -944,8 +944,9 @@ class InterventionProgress(Base):
 class InterventionVersion(Base):
     """Track version history of intervention plans.
 
-    Stores a snapshot of the plan at each version for audit trail
-    and historical reference.
+    Stores the plan at each version for audit trail and historical
+    reference, as a delta from the previous version plus a full snapshot
+    every few versions (see app.services.plan_versioning).
 
     Attributes:
         id: Unique identifier for the version record
@@ -953,7 +954,9 @@ class InterventionVersion(Base):
         version_number: Version number
         created_by: ID of the user who created this version
         change_summary: Summary of changes in this version
-        snapshot_data: JSON snapshot of the full plan at this version
+        snapshot_data: JSON snapshot of the full plan, for checkpoint versions
+        delta_data: JSON-patch operations from the previous version's snapshot
+        is_checkpoint: Whether the version stores a full snapshot
         created_at: Timestamp when the version was created
         plan: Reference to the parent intervention plan
     """
@@ -984,9 +987,18 @@ class InterventionVersion(Base):
         nullable=True,
     )
     snapshot_data: Mapped[Optional[dict]] = mapped_column(
-        JSONB,
+        JSONB(none_as_null=True),
+        nullable=True,
+    )
+    delta_data: Mapped[Optional[list]] = mapped_column(
+        JSONB(none_as_null=True),
         nullable=True,
     )
+    is_checkpoint: Mapped[bool] = mapped_column(
+        Boolean,
+        default=True,
+        nullable=False,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=datetime.utcnow,
@@ -282,6 +282,8 @@ class AuditLog(Base):
 
     __tablename__ = "audit_logs"
 
+    # On PostgreSQL the table is partitioned by month on created_at, and its
+    # primary key is (id, created_at); id alone identifies an entry.
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
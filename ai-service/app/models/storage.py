@@ -1,7 +1,9 @@
 """Storage SQLAlchemy models for LAYA AI Service.
 
 Defines database models for file storage, thumbnails, and quota management.
-Files represent uploaded files stored either locally or in S3.
+Files represent uploaded files stored either locally or in S3. Their content
+is stored once per distinct SHA-256 as a reference-counted blob shared by
+every file with that content.
 """
 
 from datetime import datetime
@@ -15,9 +17,11 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
@@ -52,6 +56,83 @@ class ThumbnailSize(str, PyEnum):
     LARGE = "large"
 
 
+class StorageBlob(Base):
+    """SQLAlchemy model for content-addressed file content.
+
+    Each distinct content is stored once per backend and shared by every
+    File record with that content. ``ref_count`` counts those records; a
+    blob whose count drops to zero is deleted, along with its thumbnails,
+    by the storage service or the blob garbage collector.
+
+    Attributes:
+        id: Unique identifier for the blob
+        checksum: SHA-256 checksum of the content
+        storage_backend: Storage backend type (local or S3)
+        storage_path: Path to the content in the storage backend
+        size_bytes: Content size in bytes
+        content_type: MIME type of the content when first stored
+        ref_count: Number of File records referencing the blob
+        orphaned_at: When ``ref_count`` last dropped to zero, if it is zero
+        created_at: Timestamp when the blob was stored
+    """
+
+    __tablename__ = "storage_blobs"
+
+    id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+    )
+    checksum: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    storage_backend: Mapped[StorageBackend] = mapped_column(
+        Enum(StorageBackend, name="storage_backend_enum", create_constraint=True),
+        nullable=False,
+    )
+    storage_path: Mapped[str] = mapped_column(
+        String(500),
+        nullable=False,
+    )
+    size_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    content_type: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+    )
+    ref_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    orphaned_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    __table_args__ = (
+        # One blob per content and backend; concurrent uploads race on it
+        UniqueConstraint("checksum", "storage_backend", name="uq_storage_blobs_checksum_backend"),
+        # Garbage collection scans unreferenced blobs by age
+        Index("ix_storage_blobs_orphaned_at", "orphaned_at"),
+    )
+
+    def __repr__(self) -> str:
+        """Return string representation of the StorageBlob."""
+        return (
+            f"<StorageBlob(id={self.id}, checksum='{self.checksum[:12]}', "
+            f"size={self.size_bytes}, refs={self.ref_count})>"
+        )
+
+
 class File(Base):
     """SQLAlchemy model for uploaded files.
 
@@ -68,6 +149,8 @@ class File(Base):
         storage_backend: Storage backend type (local or S3)
         storage_path: Path to the file in the storage backend
         checksum: SHA-256 checksum of the file content
+        blob_id: UUID of the shared blob holding the content (None for files
+            stored before deduplication, which own their storage path)
         is_public: Whether the file is publicly accessible
         description: Optional description of the file
         created_at: Timestamp when the file was uploaded
@@ -116,6 +199,12 @@ class File(Base):
         String(64),
         nullable=True,
     )
+    blob_id: Mapped[Optional[UUID]] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("storage_blobs.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
     is_public: Mapped[bool] = mapped_column(
         Boolean,
         nullable=False,
@@ -231,6 +320,8 @@ class StorageQuota(Base):
         quota_bytes: Maximum allowed storage in bytes
         used_bytes: Current storage usage in bytes
         file_count: Number of files stored
+        reconciled_at: When usage was last recounted from the files, None
+            if never; quotas updated since are due for reconciliation
         created_at: Timestamp when the quota record was created
         updated_at: Timestamp when the record was last updated
     """
@@ -263,6 +354,10 @@ class StorageQuota(Base):
         nullable=False,
         default=0,
     )
+    reconciled_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
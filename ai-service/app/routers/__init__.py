@@ -8,11 +8,29 @@ Modules:
     activities: Router for activity intelligence endpoints
     analytics: Router for business intelligence and analytics endpoints
     intervention_plans: Router for intervention plan endpoints
+
+The ``*_router`` exports are resolved on first access, so importing one
+router module does not import the others.
 """
 
-from app.routers.coaching import router as coaching_router
-from app.routers.activities import router as activities_router
-from app.routers.analytics import router as analytics_router
-from app.routers.intervention_plans import router as intervention_plans_router
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.routers.activities import router as activities_router
+    from app.routers.analytics import router as analytics_router
+    from app.routers.coaching import router as coaching_router
+    from app.routers.intervention_plans import router as intervention_plans_router
 
 __all__: list[str] = ["coaching_router", "activities_router", "analytics_router", "intervention_plans_router"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "coaching_router": "app.routers.coaching:router",
+        "activities_router": "app.routers.activities:router",
+        "analytics_router": "app.routers.analytics:router",
+        "intervention_plans_router": "app.routers.intervention_plans:router",
+    },
+)
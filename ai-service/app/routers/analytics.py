@@ -15,8 +15,10 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import AsyncSessionLocal
+from app.core.cache_tags import ORGANIZATION_DASHBOARD_TAG
+from app.database import AsyncSessionLocal, db_bulkhead, db_statement_timeout
 from app.dependencies import get_current_user
+from app.middleware.response_cache import cache_response
 from app.schemas.analytics import (
     ComplianceCheckResponse,
     ComplianceCheckType,
@@ -32,7 +34,16 @@ from app.schemas.analytics import (
 )
 from app.services.analytics_service import AnalyticsService
 
-router = APIRouter()
+# Analytics queries are slow aggregates: they share a bulkhead so a burst of
+# dashboard loads cannot take every pooled connection from other endpoints
+ANALYTICS_STATEMENT_TIMEOUT = 20.0
+
+# Forecasts aggregate the enrollment history and may run longer
+FORECAST_STATEMENT_TIMEOUT = 60.0
+
+router = APIRouter(
+    dependencies=[Depends(db_bulkhead("analytics", statement_timeout=ANALYTICS_STATEMENT_TIMEOUT))]
+)
 logger = logging.getLogger(__name__)
 
 
@@ -184,6 +195,12 @@ def get_placeholder_dashboard() -> DashboardResponse:
     summary="Get dashboard overview",
     description="Returns aggregated dashboard view with all key metrics for directors",
 )
+@cache_response(
+    key_prefix="analytics_dashboard",
+    ttl=15,
+    vary="role",
+    tags=lambda params: [ORGANIZATION_DASHBOARD_TAG],
+)
 async def get_dashboard(
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> DashboardResponse:
@@ -256,6 +273,7 @@ async def get_kpis(
 @router.get(
     "/enrollment-forecast",
     response_model=ForecastData,
+    dependencies=[Depends(db_statement_timeout(FORECAST_STATEMENT_TIMEOUT))],
     summary="Get enrollment forecast",
     description="Returns time-series enrollment predictions based on historical data",
 )
@@ -30,8 +30,10 @@ async def get_cache_stats(
     Returns statistics including:
     - Total number of cached keys
     - Memory usage by Redis
-    - Keys grouped by prefix (child_profile, activity_catalog, analytics_dashboard, llm_response)
-    - Sample TTL values
+    - Per-prefix counters (child_profile, activity_catalog, analytics_dashboard, llm_response)
+      including hits, misses, sets, evictions, invalidations and byte sizes
+    - Approximate key counts and configured TTL values
+    - Lifetime and sliding-window hit ratios
     - Server uptime and connected clients
 
     This endpoint is intended for administrators to monitor cache performance
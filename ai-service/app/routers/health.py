@@ -210,6 +210,22 @@ def check_database_pool() -> Dict[str, Any]:
         }
 
 
+def check_s3_cache() -> Dict[str, Any]:
+    """Check the local S3 object cache of this worker.
+
+    Returns:
+        Dict containing cache size and hit rate statistics
+    """
+    from app.config import settings
+
+    if not settings.s3_cache_enabled:
+        return {"status": "disabled"}
+
+    from app.services.s3_cache import get_s3_cache
+
+    return {"status": "healthy", **get_s3_cache().stats()}
+
+
 async def check_redis_pool() -> Dict[str, Any]:
     """Check Redis connection pool status.
 
@@ -555,7 +571,8 @@ async def connection_pools() -> Dict[str, Any]:
     """Connection pool monitoring endpoint.
 
     Provides detailed metrics about database and Redis connection pools,
-    including pool size, utilization, and capacity.
+    including pool size, utilization, and capacity, and the size and hit
+    rate of the local S3 object cache.
 
     Returns:
         Dict containing pool statistics for all services
@@ -579,6 +596,13 @@ async def connection_pools() -> Dict[str, Any]:
                     "status": "healthy",
                     "max_connections": 10,
                     "connected_clients": 3
+                },
+                "s3_cache": {
+                    "status": "healthy",
+                    "entries": 120,
+                    "size_bytes": 73400320,
+                    "hit_rate_percent": 91.5,
+                    ...
                 }
             }
         }
@@ -586,6 +610,7 @@ async def connection_pools() -> Dict[str, Any]:
     # Get pool statistics
     db_pool = check_database_pool()
     redis_pool = await check_redis_pool()
+    s3_cache = check_s3_cache()
 
     # Trigger alerts if pool status is critical or degraded
     if db_pool.get("status") in ["critical", "degraded"]:
@@ -596,6 +621,7 @@ async def connection_pools() -> Dict[str, Any]:
         "pools": {
             "database": db_pool,
             "redis": redis_pool,
+            "s3_cache": s3_cache,
         },
     }
 
@@ -11,8 +11,11 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.core.cache_tags import entity_tag
+from app.core.keyset import InvalidCursorError
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_user
+from app.middleware.response_cache import cache_response
 from app.schemas.messaging import (
     MarkAsReadRequest,
     MessageCreate,
@@ -124,6 +127,11 @@ async def create_thread(
 
 
 @router.get("/threads", response_model=ThreadListResponse)
+@cache_response(
+    key_prefix="message_threads",
+    ttl=10,
+    tags=lambda params: [entity_tag("message_threads", params["user_id"])],
+)
 async def list_threads(
     child_id: Optional[UUID] = Query(
         default=None,
@@ -148,7 +156,11 @@ async def list_threads(
         ge=0,
         description="Number of threads to skip for pagination",
     ),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Cursor from a previous page (takes precedence over offset)",
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> ThreadListResponse:
     """List message threads for the current user.
@@ -163,6 +175,7 @@ async def list_threads(
         include_archived: Whether to include archived threads (default: False)
         limit: Maximum number of threads to return (default: 50, max: 100)
         offset: Number of threads to skip for pagination (default: 0)
+        cursor: Cursor from a previous page's next_cursor or previous_cursor
         db: Async database session (injected)
         current_user: Authenticated user from JWT token (injected)
 
@@ -172,8 +185,10 @@ async def list_threads(
         - total: Total number of matching threads
         - limit: Number of items per page
         - offset: Current offset
+        - next_cursor / previous_cursor: Cursors of the adjacent pages
 
     Raises:
+        HTTPException 400: When the cursor is invalid
         HTTPException 401: When JWT token is missing or invalid
         HTTPException 500: When an unexpected error occurs
     """
@@ -182,20 +197,28 @@ async def list_threads(
     try:
         user_id = UUID(current_user["sub"])
 
-        threads = await service.list_threads_for_user(
+        page = await service.page_threads_for_user(
             user_id=user_id,
             child_id=child_id,
             thread_type=thread_type,
             include_archived=include_archived,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
         return ThreadListResponse(
-            threads=threads,
-            total=len(threads),
+            threads=page.items,
+            total=len(page.items),
             limit=limit,
             skip=offset,
+            next_cursor=page.next_cursor,
+            previous_cursor=page.previous_cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
     except MessagingServiceError as e:
         raise HTTPException(
@@ -211,7 +234,7 @@ async def get_thread(
         default=True,
         description="Include messages in the response",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> ThreadWithMessagesResponse:
     """Get a message thread by ID.
@@ -486,7 +509,11 @@ async def list_messages(
         ge=0,
         description="Number of messages to skip for pagination",
     ),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Cursor from a previous page (takes precedence over offset)",
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> MessageListResponse:
     """List messages in a thread.
@@ -498,6 +525,7 @@ async def list_messages(
         thread_id: Unique identifier of the thread
         limit: Maximum number of messages to return (default: 50, max: 100)
         offset: Number of messages to skip for pagination (default: 0)
+        cursor: Cursor from a previous page's next_cursor or previous_cursor
         db: Async database session (injected)
         current_user: Authenticated user from JWT token (injected)
 
@@ -507,8 +535,10 @@ async def list_messages(
         - total: Total number of messages in the thread
         - limit: Number of items per page
         - offset: Current offset
+        - next_cursor / previous_cursor: Cursors of the adjacent pages
 
     Raises:
+        HTTPException 400: When the cursor is invalid
         HTTPException 401: When JWT token is missing or invalid
         HTTPException 403: When user does not have access to the thread
         HTTPException 404: When thread is not found
@@ -519,18 +549,26 @@ async def list_messages(
     try:
         user_id = UUID(current_user["sub"])
 
-        messages = await service.list_messages(
+        page = await service.page_messages(
             thread_id=thread_id,
             user_id=user_id,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
         return MessageListResponse(
-            messages=messages,
-            total=len(messages),
+            messages=page.items,
+            total=len(page.items),
             limit=limit,
             skip=offset,
+            next_cursor=page.next_cursor,
+            previous_cursor=page.previous_cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
     except ThreadNotFoundError as e:
         raise HTTPException(
@@ -12,8 +12,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.core.cache_tags import entity_tag
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_user
+from app.middleware.response_cache import cache_response
 from app.schemas.portfolio import (
     MilestoneCreate,
     MilestoneListResponse,
@@ -87,7 +89,7 @@ async def create_portfolio_item(
 )
 async def get_portfolio_item(
     item_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> PortfolioItemResponse:
     """Get a single portfolio item by ID.
@@ -147,7 +149,7 @@ async def list_portfolio_items(
         default=False,
         description="Whether to include archived items",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> PortfolioItemListResponse:
     """List portfolio items for a child with optional filtering and pagination.
@@ -301,7 +303,7 @@ async def create_observation(
 )
 async def get_observation(
     observation_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> ObservationResponse:
     """Get a single observation by ID.
@@ -373,7 +375,7 @@ async def list_observations(
         default=False,
         description="Only return observations shared with family",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> ObservationListResponse:
     """List observations for a child with optional filtering and pagination.
@@ -535,7 +537,7 @@ async def create_milestone(
 )
 async def get_milestone(
     milestone_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> MilestoneResponse:
     """Get a single milestone by ID.
@@ -595,7 +597,7 @@ async def list_milestones(
         default=None,
         description="Filter by flagged status",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> MilestoneListResponse:
     """List milestones for a child with optional filtering and pagination.
@@ -644,7 +646,7 @@ async def list_milestones(
 )
 async def get_milestone_progress(
     child_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, dict[str, int]]:
     """Get milestone progress summary by category.
@@ -777,7 +779,7 @@ async def create_work_sample(
 )
 async def get_work_sample(
     work_sample_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> WorkSampleResponse:
     """Get a single work sample by ID.
@@ -845,7 +847,7 @@ async def list_work_samples(
         default=False,
         description="Only return work samples shared with family",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> WorkSampleListResponse:
     """List work samples for a child with optional filtering and pagination.
@@ -971,6 +973,11 @@ async def delete_work_sample(
     summary="Get portfolio summary for a child",
     description="Get a summary of a child's portfolio including counts and recent items.",
 )
+@cache_response(
+    key_prefix="portfolio_summary",
+    ttl=30,
+    tags=lambda params: [entity_tag("portfolio", params["child_id"])],
+)
 async def get_portfolio_summary(
     child_id: UUID,
     recent_count: int = Query(
@@ -979,7 +986,7 @@ async def get_portfolio_summary(
         le=20,
         description="Number of recent items to include",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> PortfolioSummary:
     """Get a summary of a child's portfolio.
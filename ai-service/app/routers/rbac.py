@@ -12,6 +12,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.counting import CountStrategy
+from app.core.keyset import InvalidCursorError
 from app.database import get_db
 from app.dependencies import get_current_user, require_role
 from app.models.rbac import RoleType
@@ -566,6 +568,14 @@ async def get_audit_logs(
         ge=0,
         description="Number of results to skip for pagination",
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Cursor from a previous page (takes precedence over offset)",
+    ),
+    count: CountStrategy = Query(
+        default=CountStrategy.EXACT,
+        description="How the total is computed: exact, cached or estimated",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: dict[str, Any] = Depends(
         require_role([RoleType.DIRECTOR]),
@@ -585,6 +595,8 @@ async def get_audit_logs(
         end_date: Filter events before this date
         limit: Maximum number of results (1-1000)
         offset: Number of results to skip
+        cursor: Cursor from a previous page's next_cursor or previous_cursor
+        count: Counting strategy for the total
         db: Async database session (injected)
         current_user: Authenticated user with Director role (injected)
 
@@ -592,6 +604,7 @@ async def get_audit_logs(
         AuditLogListResponse containing paginated audit log entries
 
     Raises:
+        HTTPException 400: When the cursor is invalid
         HTTPException 401: When JWT token is missing or invalid
         HTTPException 403: When the user doesn't have Director role
         HTTPException 500: When an unexpected error occurs
@@ -599,7 +612,7 @@ async def get_audit_logs(
     service = RBACService(db)
 
     try:
-        audit_logs, total = await service.get_audit_logs(
+        page, total, approximate = await service.get_audit_log_page(
             user_id=user_id,
             action=action,
             resource_type=resource_type,
@@ -607,13 +620,23 @@ async def get_audit_logs(
             end_date=end_date,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count_strategy=count,
         )
 
         return AuditLogListResponse(
-            items=audit_logs,
+            items=page.items,
             total=total,
+            total_approximate=approximate,
             skip=offset,
             limit=limit,
+            next_cursor=page.next_cursor,
+            previous_cursor=page.previous_cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
     except RBACServiceError as e:
         raise HTTPException(
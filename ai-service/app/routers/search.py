@@ -9,8 +9,9 @@ from typing import Any
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.counting import CountStrategy
 from app.core.pagination import build_paginated_response
-from app.database import get_db
+from app.database import get_read_db
 from app.dependencies import get_current_user
 from app.schemas.search import SearchResponse, SearchType
 from app.services.search_service import SearchService
@@ -47,7 +48,12 @@ async def search(
         le=100,
         description="Number of items per page (max 100)",
     ),
-    db: AsyncSession = Depends(get_db),
+    count: CountStrategy = Query(
+        default=CountStrategy.EXACT,
+        description="How the total is computed: exact, cached (may lag recent writes "
+        "by a few seconds) or estimated (approximate, for very large result sets)",
+    ),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> SearchResponse:
     """Search across multiple entity types using full-text search.
@@ -64,6 +70,7 @@ async def search(
         types: Entity types to search in (defaults to all)
         page: Page number to retrieve (1-indexed)
         per_page: Number of items per page (max 100)
+        count: Counting strategy for the total
         db: Async database session (injected)
         current_user: Authenticated user information (injected)
 
@@ -75,7 +82,7 @@ async def search(
         HTTPException: 422 if validation fails
 
     Example:
-        GET /api/v1/search?q=creative&types=activities&page=1&per_page=20
+        GET /api/v1/search?q=creative&types=activities&page=1&per_page=20&count=cached
     """
     service = SearchService(db)
 
@@ -83,25 +90,28 @@ async def search(
     skip = (page - 1) * per_page
 
     # Perform search
-    results, total = await service.search(
+    results = await service.search(
         query=q,
         types=types,
         skip=skip,
         limit=per_page,
+        count_strategy=count,
     )
 
     # Build paginated response
     paginated = build_paginated_response(
-        items=results,
-        total=total,
+        items=results.items,
+        total=results.total,
         page=page,
         per_page=per_page,
+        approximate=results.approximate,
     )
 
     # Add query to response
     return SearchResponse(
         items=paginated.items,
         total=paginated.total,
+        total_approximate=paginated.total_approximate,
         page=paginated.page,
         per_page=paginated.per_page,
         total_pages=paginated.total_pages,
@@ -5,11 +5,12 @@ Supports multipart file upload with local and S3 backend storage.
 All endpoints require JWT authentication.
 """
 
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Container, Optional
 from uuid import UUID
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     File,
     Form,
@@ -18,20 +19,29 @@ from fastapi import (
     Request,
     UploadFile,
 )
-from fastapi.responses import Response
+from fastapi.responses import FileResponse as FileContentResponse
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.schemas.storage import (
+    BatchDeleteResponse,
+    BatchFileRequest,
+    BatchFileResponse,
+    BatchSecureUrlRequest,
+    BatchSecureUrlResponse,
     FileDeleteResponse,
+    FileFromChecksumRequest,
     FileListResponse,
     FileResponse,
     FileUploadResponse,
     SecureUrlResponse,
     StorageQuotaResponse,
 )
+from app.models.storage import File as StoredFile
+from app.services.file_download import RangeNotSatisfiableError, etag_matches, strong_etag
 from app.services.storage_service import (
     FileTooLargeError,
     InvalidFileTypeError,
@@ -42,6 +52,7 @@ from app.services.storage_service import (
     StorageServiceError,
     UnauthorizedAccessError,
     FileNotFoundError as StorageFileNotFoundError,
+    generate_thumbnails_in_background,
 )
 
 router = APIRouter(prefix="/api/v1/storage", tags=["storage"])
@@ -57,6 +68,7 @@ router = APIRouter(prefix="/api/v1/storage", tags=["storage"])
 )
 async def upload_file(
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(
         ...,
         description="The file to upload",
@@ -82,13 +94,17 @@ async def upload_file(
     - Images: image/jpeg, image/png, image/gif, image/webp
     - Documents: application/pdf
 
-    The file is stored using the configured storage backend (local filesystem
-    or S3). For images, thumbnails can be generated via a separate endpoint.
+    The file is streamed to the configured storage backend (local filesystem
+    or S3 multipart upload) without being buffered in memory, and rejected
+    as soon as it passes the size limit or the quota. For images, every
+    thumbnail size is generated in the background once the response is sent
+    (unless THUMBNAIL_ON_UPLOAD is disabled).
 
     Args:
         file: The file to upload via multipart form data.
         description: Optional description of the file.
         is_public: Whether the file should be publicly accessible (default False).
+        background_tasks: Tasks run after the response is sent (injected).
         db: Async database session (injected).
         current_user: Authenticated user information (injected).
 
@@ -139,26 +155,6 @@ async def upload_file(
         except ValueError:
             pass  # Invalid Content-Length header, proceed with streaming check
 
-    # Read file content with size limit enforcement
-    file_content = bytearray()
-    chunk_size = 64 * 1024  # 64KB chunks
-    bytes_read = 0
-
-    while True:
-        chunk = await file.read(chunk_size)
-        if not chunk:
-            break
-        bytes_read += len(chunk)
-        if bytes_read > max_file_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds maximum allowed size "
-                f"({max_file_size_bytes} bytes)",
-            )
-        file_content.extend(chunk)
-
-    file_content = bytes(file_content)
-
     # Determine content type
     content_type = file.content_type or "application/octet-stream"
 
@@ -168,10 +164,19 @@ async def upload_file(
     # Initialize service and upload
     service = StorageService(db)
 
+    # Stream the file to storage chunk by chunk; the service enforces the
+    # size limit and quota as the chunks arrive
+    async def read_chunks() -> AsyncIterator[bytes]:
+        while True:
+            chunk = await file.read(settings.upload_chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
     try:
-        file_record = await service.upload_file(
+        file_record = await service.upload_stream(
             owner_id=owner_id,
-            file_content=file_content,
+            chunks=read_chunks(),
             original_filename=original_filename,
             content_type=content_type,
             description=description,
@@ -198,6 +203,9 @@ async def upload_file(
             detail=f"Storage error: {str(e)}",
         )
 
+    if settings.thumbnail_on_upload and service.is_image_file(file_record.content_type):
+        background_tasks.add_task(generate_thumbnails_in_background, file_record.id)
+
     # Convert to response
     file_response = service.file_to_response(file_record)
 
@@ -207,6 +215,77 @@ async def upload_file(
     )
 
 
+@router.post(
+    "/files/from-checksum",
+    response_model=FileUploadResponse,
+    status_code=201,
+    summary="Create file from stored content",
+    description="Create a file from content already stored among the user's files, "
+    "identified by its SHA-256 checksum, without uploading it again. "
+    "Returns 404 if the content must be uploaded.",
+    responses={
+        404: {"description": "Content not stored; upload the file instead"},
+    },
+)
+async def create_file_from_checksum(
+    request_data: FileFromChecksumRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> FileUploadResponse:
+    """Create a file from content the user has already uploaded.
+
+    Clients can send the SHA-256 checksum of a file before uploading it;
+    if the same content is stored among their files, the new file shares
+    it and no transfer is needed. Otherwise they upload as usual.
+
+    Args:
+        request_data: Checksum and metadata of the new file.
+        background_tasks: Tasks run after the response is sent (injected).
+        db: Async database session (injected).
+        current_user: Authenticated user information (injected).
+
+    Returns:
+        FileUploadResponse containing the created file details.
+
+    Raises:
+        HTTPException: 400 if the file type is not allowed.
+        HTTPException: 401 if not authenticated.
+        HTTPException: 404 if the content is not stored.
+    """
+    owner_id = UUID(current_user["sub"])
+    service = StorageService(db)
+
+    try:
+        file_record = await service.create_file_from_checksum(
+            owner_id=owner_id,
+            checksum=request_data.checksum,
+            original_filename=request_data.original_filename,
+            content_type=request_data.content_type,
+            description=request_data.description,
+            is_public=request_data.is_public,
+        )
+    except InvalidFileTypeError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e),
+        )
+
+    if file_record is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Content not stored; upload the file instead",
+        )
+
+    if settings.thumbnail_on_upload and service.is_image_file(file_record.content_type):
+        background_tasks.add_task(generate_thumbnails_in_background, file_record.id)
+
+    return FileUploadResponse(
+        file=service.file_to_response(file_record),
+        message="File created from stored content",
+    )
+
+
 @router.get(
     "/quota",
     response_model=StorageQuotaResponse,
@@ -376,10 +455,14 @@ async def get_file(
             "description": "File content",
             "content": {"application/octet-stream": {}},
         },
+        206: {"description": "Requested byte range of the file content"},
+        304: {"description": "File unchanged since the ETag in If-None-Match"},
         404: {"description": "File not found"},
+        416: {"description": "Requested range not satisfiable"},
     },
 )
 async def download_file(
+    request: Request,
     file_id: UUID,
     db: AsyncSession = Depends(get_db),
     current_user: dict[str, Any] = Depends(get_current_user),
@@ -389,7 +472,12 @@ async def download_file(
     Downloads the actual file content. The file must be owned by the
     current user or be marked as public.
 
+    The content is streamed from storage, and ``Range``, ``If-Range`` and
+    ``If-None-Match`` requests are supported for resumable downloads and
+    media seeking (see ``_download_response``).
+
     Args:
+        request: The incoming request, for its range and conditional headers.
         file_id: Unique identifier of the file.
         db: Async database session (injected).
         current_user: Authenticated user information (injected).
@@ -409,10 +497,11 @@ async def download_file(
     service = StorageService(db)
 
     try:
-        file_content, file_record = await service.download_file(
+        file_record = await service.get_downloadable_file(
             file_id=file_id,
             owner_id=owner_id,
         )
+        return await _download_response(request, service, file_record)
     except StorageFileNotFoundError:
         raise HTTPException(
             status_code=404,
@@ -429,16 +518,6 @@ async def download_file(
             detail=f"Storage error: {str(e)}",
         )
 
-    # Return file content with appropriate headers
-    return Response(
-        content=file_content,
-        media_type=file_record.content_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{file_record.original_filename}"',
-            "Content-Length": str(file_record.size_bytes),
-        },
-    )
-
 
 @router.delete(
     "/files/{file_id}",
@@ -554,23 +633,12 @@ async def generate_secure_url(
     owner_id = UUID(current_user["sub"])
     service = StorageService(db)
 
-    # Derive base_url from the request context
-    # Use X-Forwarded-Proto and X-Forwarded-Host headers if behind a proxy
-    forwarded_proto = request.headers.get("x-forwarded-proto")
-    forwarded_host = request.headers.get("x-forwarded-host")
-
-    if forwarded_proto and forwarded_host:
-        base_url = f"{forwarded_proto}://{forwarded_host}"
-    else:
-        # Fall back to request URL components
-        base_url = f"{request.url.scheme}://{request.url.netloc}"
-
     try:
         url, expires_at = await service.generate_secure_url(
             file_id=file_id,
             owner_id=owner_id,
             expires_in_seconds=expires_in_seconds,
-            base_url=base_url,
+            base_url=_request_base_url(request),
         )
     except StorageFileNotFoundError:
         raise HTTPException(
@@ -600,6 +668,170 @@ async def generate_secure_url(
     )
 
 
+@router.post(
+    "/files/batch/secure-urls",
+    response_model=BatchSecureUrlResponse,
+    summary="Generate secure URLs for several files",
+    description="Generate time-limited secure URLs for up to 100 files at once, "
+    "e.g. to display a photo gallery.",
+)
+async def generate_secure_urls(
+    request: Request,
+    batch: BatchSecureUrlRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> BatchSecureUrlResponse:
+    """Generate secure, time-limited URLs for several files.
+
+    Access to all files is checked in one query and S3 URLs are presigned
+    in one batch. Files that do not exist or are not accessible are listed
+    in ``not_found`` instead of failing the request.
+
+    Args:
+        batch: UUIDs of the files and URL expiration time.
+        db: Async database session (injected).
+        current_user: Authenticated user information (injected).
+
+    Returns:
+        BatchSecureUrlResponse with the URLs, in request order.
+
+    Raises:
+        HTTPException: 401 if not authenticated.
+        HTTPException: 500 if URL generation fails.
+    """
+    owner_id = UUID(current_user["sub"])
+    service = StorageService(db)
+
+    try:
+        urls, expires_at = await service.generate_secure_urls(
+            file_ids=batch.file_ids,
+            owner_id=owner_id,
+            expires_in_seconds=batch.expires_in_seconds,
+            base_url=_request_base_url(request),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e),
+        )
+    except StorageServiceError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate secure URLs: {str(e)}",
+        )
+
+    return BatchSecureUrlResponse(
+        urls=[
+            SecureUrlResponse(file_id=file_id, url=url, expires_at=expires_at)
+            for file_id, url in urls.items()
+        ],
+        not_found=_not_found(batch.file_ids, urls),
+    )
+
+
+@router.post(
+    "/files/batch/metadata",
+    response_model=BatchFileResponse,
+    summary="Get information on several files",
+    description="Retrieve the metadata of up to 100 files at once.",
+)
+async def get_files(
+    batch: BatchFileRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> BatchFileResponse:
+    """Get information on several files.
+
+    The files must be owned by the current user or be marked as public;
+    others are listed in ``not_found``.
+
+    Args:
+        batch: UUIDs of the files.
+        db: Async database session (injected).
+        current_user: Authenticated user information (injected).
+
+    Returns:
+        BatchFileResponse with the file details, in request order.
+
+    Raises:
+        HTTPException: 401 if not authenticated.
+    """
+    owner_id = UUID(current_user["sub"])
+    service = StorageService(db)
+
+    files = await service.get_accessible_files(batch.file_ids, owner_id, load_thumbnails=True)
+
+    return BatchFileResponse(
+        files=[service.file_to_response(file_record) for file_record in files.values()],
+        not_found=_not_found(batch.file_ids, files),
+    )
+
+
+@router.post(
+    "/files/batch/delete",
+    response_model=BatchDeleteResponse,
+    summary="Delete several files",
+    description="Delete up to 100 files at once. Only files owned by the user are deleted.",
+)
+async def delete_files(
+    batch: BatchFileRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> BatchDeleteResponse:
+    """Delete several files.
+
+    All records and the quota adjustment are written in one transaction.
+    Files that do not exist or are not owned by the user are listed in
+    ``not_found``.
+
+    Args:
+        batch: UUIDs of the files to delete.
+        db: Async database session (injected).
+        current_user: Authenticated user information (injected).
+
+    Returns:
+        BatchDeleteResponse with the deleted file IDs.
+
+    Raises:
+        HTTPException: 401 if not authenticated.
+        HTTPException: 500 if storage error occurs.
+    """
+    owner_id = UUID(current_user["sub"])
+    service = StorageService(db)
+
+    try:
+        deleted = await service.delete_files(batch.file_ids, owner_id)
+    except StorageServiceError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Storage error: {str(e)}",
+        )
+
+    return BatchDeleteResponse(
+        deleted=deleted,
+        not_found=_not_found(batch.file_ids, set(deleted)),
+    )
+
+
+def _request_base_url(request: Request) -> str:
+    """Derive the public base URL of the API from the request context.
+
+    Uses the X-Forwarded-Proto and X-Forwarded-Host headers if behind a proxy.
+    """
+    forwarded_proto = request.headers.get("x-forwarded-proto")
+    forwarded_host = request.headers.get("x-forwarded-host")
+
+    if forwarded_proto and forwarded_host:
+        return f"{forwarded_proto}://{forwarded_host}"
+    # Fall back to request URL components
+    return f"{request.url.scheme}://{request.url.netloc}"
+
+
+def _not_found(file_ids: list[UUID], found: Container[UUID]) -> list[UUID]:
+    """File IDs of a batch request that were not found, without duplicates."""
+    return [file_id for file_id in dict.fromkeys(file_ids) if file_id not in found]
+
+
 @router.get(
     "/files/{file_id}/signed-download",
     summary="Download file via signed URL",
@@ -614,11 +846,15 @@ async def generate_secure_url(
         },
         400: {"description": "Invalid or missing signature parameters"},
         401: {"description": "Signature expired"},
+        206: {"description": "Requested byte range of the file content"},
+        304: {"description": "File unchanged since the ETag in If-None-Match"},
         403: {"description": "Invalid signature"},
         404: {"description": "File not found"},
+        416: {"description": "Requested range not satisfiable"},
     },
 )
 async def download_file_signed(
+    request: Request,
     file_id: UUID,
     expires: int = Query(
         ...,
@@ -637,8 +873,10 @@ async def download_file_signed(
     (expires timestamp and HMAC signature).
 
     The signed URL should be generated using the /secure-url endpoint.
+    Range and conditional requests are supported as for ``download_file``.
 
     Args:
+        request: The incoming request, for its range and conditional headers.
         file_id: Unique identifier of the file.
         expires: Unix timestamp when the URL expires.
         signature: Base64-encoded HMAC signature.
@@ -660,11 +898,12 @@ async def download_file_signed(
     service = StorageService(db)
 
     try:
-        file_content, file_record = await service.download_file_with_signed_url(
+        file_record = await service.get_signed_downloadable_file(
             file_id=file_id,
             expires_timestamp=expires,
             signature=signature,
         )
+        return await _download_response(request, service, file_record)
     except SignedUrlExpiredError:
         raise HTTPException(
             status_code=401,
@@ -686,12 +925,70 @@ async def download_file_signed(
             detail=f"Storage error: {str(e)}",
         )
 
-    # Return file content with appropriate headers
-    return Response(
-        content=file_content,
+
+async def _download_response(
+    request: Request,
+    service: StorageService,
+    file_record: StoredFile,
+) -> Response:
+    """Build the streaming response of a file download.
+
+    Files carry a strong ETag built from their SHA-256 checksum, so
+    ``If-None-Match`` requests for an unchanged file get a 304 and
+    ``If-Range`` only resumes a download of the same content. Local files
+    are sent by ``FileResponse``, which handles the range itself (from
+    Starlette 0.39, the minimum in requirements.txt); S3 objects are
+    streamed from the requested range with a 206.
+
+    Args:
+        request: The incoming request.
+        service: Storage service of the request.
+        file_record: File to send.
+
+    Returns:
+        Response streaming the file or the requested range.
+
+    Raises:
+        StorageServiceError: If the file cannot be read from storage.
+    """
+    etag = strong_etag(file_record.checksum)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{file_record.original_filename}"',
+    }
+    if etag:
+        headers["ETag"] = etag
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    try:
+        download = await service.open_download(
+            file_record,
+            range_header=request.headers.get("range"),
+            if_range=request.headers.get("if-range"),
+        )
+    except RangeNotSatisfiableError as e:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{e.size}"})
+
+    if download.path is not None:
+        return FileContentResponse(
+            download.path,
+            media_type=file_record.content_type,
+            headers=headers,
+            stat_result=download.stat,
+        )
+
+    if download.byte_range is None:
+        status_code = 200
+        headers["Content-Length"] = str(file_record.size_bytes)
+    else:
+        status_code = 206
+        headers["Content-Length"] = str(download.byte_range.length)
+        headers["Content-Range"] = download.byte_range.content_range(file_record.size_bytes)
+    return StreamingResponse(
+        download.chunks,
+        status_code=status_code,
         media_type=file_record.content_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{file_record.original_filename}"',
-            "Content-Length": str(file_record.size_bytes),
-        },
+        headers=headers,
     )
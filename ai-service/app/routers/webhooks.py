@@ -14,6 +14,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.cache import invalidate_cache
+from app.core.cache_tags import ORGANIZATION_DASHBOARD_TAG, entity_tag, invalidate_tags
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.schemas.webhook import (
@@ -127,6 +128,8 @@ async def process_attendance_event(
 
     When attendance events occur (check-in/check-out), we need to invalidate
     the analytics dashboard cache since attendance affects KPI calculations.
+    When the payload names the facility, only that facility's dashboard and
+    the organization-wide dashboard are invalidated.
 
     Args:
         event_type: The type of attendance event (check-in or check-out)
@@ -141,7 +144,13 @@ async def process_attendance_event(
     action = "checked in" if event_type == WebhookEventType.ATTENDANCE_CHECKED_IN else "checked out"
 
     # Invalidate analytics dashboard cache since attendance affects metrics
-    await invalidate_cache("analytics_dashboard")
+    facility_id = payload.get("facility_id")
+    if facility_id:
+        await invalidate_tags(
+            entity_tag("facility", facility_id), ORGANIZATION_DASHBOARD_TAG, db=db
+        )
+    else:
+        await invalidate_cache("analytics_dashboard")
 
     return f"Child {child_id} {action}, attendance record ID {entity_id}, cache invalidated"
 
@@ -164,8 +173,8 @@ async def process_child_profile_event(
     Returns:
         Status message describing the processing result
     """
-    # Invalidate child profile cache for this specific child
-    await invalidate_cache("child_profile", f"*{entity_id}*")
+    # Invalidate cached entries derived from this specific child
+    await invalidate_tags(entity_tag("child", entity_id), db=db)
 
     return f"Child profile {entity_id} update acknowledged and cache invalidated"
 
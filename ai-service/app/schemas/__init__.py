@@ -10,75 +10,83 @@ Modules:
     coaching: Special needs coaching guidance schemas
     communication: Parent communication schemas
     child: Child profile schemas
+
+Exports are resolved on first access, so importing one schema module does
+not import the others.
 """
 
-from app.schemas.activity import (
-    ActivityBase,
-    ActivityDifficulty,
-    ActivityListResponse,
-    ActivityRecommendation,
-    ActivityRecommendationRequest,
-    ActivityRecommendationResponse,
-    ActivityRequest,
-    ActivityResponse,
-    ActivityType,
-    AgeRange,
-)
-from app.schemas.base import (
-    BaseResponse,
-    BaseSchema,
-    IDMixin,
-    PaginatedResponse,
-    PaginationParams,
-    TimestampMixin,
-)
-from app.schemas.analytics import (
-    ComplianceCheckResponse,
-    ComplianceCheckType,
-    ComplianceCheckWithID,
-    ComplianceListResponse,
-    ComplianceStatus,
-    DashboardResponse,
-    DashboardSummary,
-    ForecastData,
-    ForecastDataPoint,
-    KPIMetric,
-    KPIMetricResponse,
-    KPIMetricsListResponse,
-    MetricCategory,
-)
-from app.schemas.coaching import (
-    CoachingBase,
-    CoachingCategory,
-    CoachingGuidance,
-    CoachingGuidanceRequest,
-    CoachingGuidanceResponse,
-    CoachingListResponse,
-    CoachingPriority,
-    CoachingRequest,
-    CoachingResponse,
-    SpecialNeedType,
-)
-from app.schemas.communication import (
-    CommunicationPreferenceRequest,
-    CommunicationPreferenceResponse,
-    DevelopmentalArea,
-    GenerateReportRequest,
-    HomeActivitiesListResponse,
-    HomeActivitiesRequest,
-    HomeActivityBase,
-    HomeActivityResponse,
-    Language,
-    ParentReportListResponse,
-    ParentReportResponse,
-    ReportFrequency,
-)
-from app.schemas.child import (
-    ChildProfileSchema,
-    EmergencyContact,
-    Gender,
-    SpecialNeedInfo,
-)
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.schemas.activity import (
+        ActivityBase,
+        ActivityDifficulty,
+        ActivityListResponse,
+        ActivityRecommendation,
+        ActivityRecommendationRequest,
+        ActivityRecommendationResponse,
+        ActivityRequest,
+        ActivityResponse,
+        ActivityType,
+        AgeRange,
+    )
+    from app.schemas.base import (
+        BaseResponse,
+        BaseSchema,
+        IDMixin,
+        PaginatedResponse,
+        PaginationParams,
+        TimestampMixin,
+    )
+    from app.schemas.analytics import (
+        ComplianceCheckResponse,
+        ComplianceCheckType,
+        ComplianceCheckWithID,
+        ComplianceListResponse,
+        ComplianceStatus,
+        DashboardResponse,
+        DashboardSummary,
+        ForecastData,
+        ForecastDataPoint,
+        KPIMetric,
+        KPIMetricResponse,
+        KPIMetricsListResponse,
+        MetricCategory,
+    )
+    from app.schemas.coaching import (
+        CoachingBase,
+        CoachingCategory,
+        CoachingGuidance,
+        CoachingGuidanceRequest,
+        CoachingGuidanceResponse,
+        CoachingListResponse,
+        CoachingPriority,
+        CoachingRequest,
+        CoachingResponse,
+        SpecialNeedType,
+    )
+    from app.schemas.communication import (
+        CommunicationPreferenceRequest,
+        CommunicationPreferenceResponse,
+        DevelopmentalArea,
+        GenerateReportRequest,
+        HomeActivitiesListResponse,
+        HomeActivitiesRequest,
+        HomeActivityBase,
+        HomeActivityResponse,
+        Language,
+        ParentReportListResponse,
+        ParentReportResponse,
+        ReportFrequency,
+    )
+    from app.schemas.child import (
+        ChildProfileSchema,
+        EmergencyContact,
+        Gender,
+        SpecialNeedInfo,
+    )
 
 __all__ = [
     # Base schemas
@@ -143,3 +151,79 @@ __all__ = [
     "EmergencyContact",
     "ChildProfileSchema",
 ]
+
+# Module defining each export
+_EXPORT_MODULES = {
+    "app.schemas.activity": (
+        "ActivityBase",
+        "ActivityDifficulty",
+        "ActivityListResponse",
+        "ActivityRecommendation",
+        "ActivityRecommendationRequest",
+        "ActivityRecommendationResponse",
+        "ActivityRequest",
+        "ActivityResponse",
+        "ActivityType",
+        "AgeRange",
+    ),
+    "app.schemas.base": (
+        "BaseResponse",
+        "BaseSchema",
+        "IDMixin",
+        "PaginatedResponse",
+        "PaginationParams",
+        "TimestampMixin",
+    ),
+    "app.schemas.analytics": (
+        "ComplianceCheckResponse",
+        "ComplianceCheckType",
+        "ComplianceCheckWithID",
+        "ComplianceListResponse",
+        "ComplianceStatus",
+        "DashboardResponse",
+        "DashboardSummary",
+        "ForecastData",
+        "ForecastDataPoint",
+        "KPIMetric",
+        "KPIMetricResponse",
+        "KPIMetricsListResponse",
+        "MetricCategory",
+    ),
+    "app.schemas.coaching": (
+        "CoachingBase",
+        "CoachingCategory",
+        "CoachingGuidance",
+        "CoachingGuidanceRequest",
+        "CoachingGuidanceResponse",
+        "CoachingListResponse",
+        "CoachingPriority",
+        "CoachingRequest",
+        "CoachingResponse",
+        "SpecialNeedType",
+    ),
+    "app.schemas.communication": (
+        "CommunicationPreferenceRequest",
+        "CommunicationPreferenceResponse",
+        "DevelopmentalArea",
+        "GenerateReportRequest",
+        "HomeActivitiesListResponse",
+        "HomeActivitiesRequest",
+        "HomeActivityBase",
+        "HomeActivityResponse",
+        "Language",
+        "ParentReportListResponse",
+        "ParentReportResponse",
+        "ReportFrequency",
+    ),
+    "app.schemas.child": (
+        "ChildProfileSchema",
+        "EmergencyContact",
+        "Gender",
+        "SpecialNeedInfo",
+    ),
+}
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {name: module for module, names in _EXPORT_MODULES.items() for name in names},
+)
@@ -99,6 +99,7 @@ class PaginatedResponse(BaseSchema):
 
     Attributes:
         total: Total number of records matching the query
+        total_approximate: Whether total is a planner estimate
         skip: Number of records skipped
         limit: Maximum number of records returned
     """
@@ -108,6 +109,10 @@ class PaginatedResponse(BaseSchema):
         ge=0,
         description="Total number of records matching the query",
     )
+    total_approximate: bool = Field(
+        default=False,
+        description="Whether total is an estimate rather than an exact count",
+    )
     skip: int = Field(
         ...,
         ge=0,
@@ -118,3 +123,24 @@ class PaginatedResponse(BaseSchema):
         ge=1,
         description="Maximum number of records returned",
     )
+
+
+class KeysetPaginatedResponse(PaginatedResponse):
+    """Base schema for paginated responses that also support cursors.
+
+    Clients may keep paging by ``skip`` or pass ``next_cursor`` /
+    ``previous_cursor`` back as ``cursor``, which stays fast on deep pages.
+
+    Attributes:
+        next_cursor: Cursor for the following page (null on the last page)
+        previous_cursor: Cursor for the preceding page (null on the first page)
+    """
+
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the following page (null on the last page)",
+    )
+    previous_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the preceding page (null on the first page)",
+    )
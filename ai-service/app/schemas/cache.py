@@ -14,19 +14,84 @@ from app.schemas.base import BaseSchema
 class CachePrefixStats(BaseSchema):
     """Statistics for a specific cache prefix.
 
+    Counters are maintained incrementally by the cache layer and aggregated
+    across all workers, so they cover activity since the counters were
+    last reset rather than a point-in-time scan of the keyspace.
+
     Attributes:
-        key_count: Number of keys with this prefix
-        sample_ttl: Sample TTL (time to live) in seconds for keys with this prefix
+        key_count: Approximate number of keys currently cached with this prefix
+            (distinct keys written within the last TTL)
+        sample_ttl: TTL (time to live) in seconds configured for this prefix
+        hits: Number of cache hits
+        misses: Number of cache misses
+        sets: Number of cache writes
+        evictions: Number of keys written again before their TTL elapsed
+        invalidations: Number of keys removed by explicit invalidation
+        bytes_set: Total serialized bytes written to the cache
+        bytes_served: Total serialized bytes served from the cache
+        estimated_bytes: Estimated size of cached values for this prefix
+        hit_ratio: Lifetime hit ratio (None if there were no lookups)
+        hit_ratio_windows: Hit ratios over sliding windows (e.g. 1m, 5m, 15m)
     """
 
     key_count: int = Field(
         ...,
         ge=0,
-        description="Number of keys with this prefix",
+        description="Approximate number of keys currently cached with this prefix",
     )
     sample_ttl: Optional[int] = Field(
         default=None,
-        description="Sample TTL in seconds (None if no keys or key has no expiration)",
+        description="Configured TTL in seconds (None if unknown or no expiration)",
+    )
+    hits: int = Field(
+        default=0,
+        ge=0,
+        description="Number of cache hits",
+    )
+    misses: int = Field(
+        default=0,
+        ge=0,
+        description="Number of cache misses",
+    )
+    sets: int = Field(
+        default=0,
+        ge=0,
+        description="Number of cache writes",
+    )
+    evictions: int = Field(
+        default=0,
+        ge=0,
+        description="Number of keys evicted early and re-populated before their TTL elapsed",
+    )
+    invalidations: int = Field(
+        default=0,
+        ge=0,
+        description="Number of keys removed by explicit invalidation",
+    )
+    bytes_set: int = Field(
+        default=0,
+        ge=0,
+        description="Total serialized bytes written to the cache",
+    )
+    bytes_served: int = Field(
+        default=0,
+        ge=0,
+        description="Total serialized bytes served from the cache",
+    )
+    estimated_bytes: int = Field(
+        default=0,
+        ge=0,
+        description="Estimated size of cached values (key count x average entry size)",
+    )
+    hit_ratio: Optional[float] = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Lifetime hit ratio (None if there were no lookups)",
+    )
+    hit_ratio_windows: Dict[str, Optional[float]] = Field(
+        default_factory=dict,
+        description="Hit ratios over sliding windows keyed by window (e.g. '5m')",
     )
 
 
@@ -1225,6 +1225,7 @@ class VersionBase(BaseSchema):
         version_number: Version number
         change_summary: Summary of changes in this version
         snapshot_data: JSON snapshot of the full plan at this version
+            (omitted from plan history listings)
     """
 
     version_number: int = Field(
@@ -12,7 +12,7 @@ from uuid import UUID
 
 from pydantic import Field
 
-from app.schemas.base import BaseResponse, BaseSchema, PaginatedResponse
+from app.schemas.base import BaseResponse, BaseSchema, KeysetPaginatedResponse
 
 
 class SenderType(str, Enum):
@@ -501,7 +501,7 @@ class ThreadWithMessagesResponse(ThreadResponse):
     )
 
 
-class ThreadListResponse(PaginatedResponse):
+class ThreadListResponse(KeysetPaginatedResponse):
     """Response schema for a list of message threads.
 
     Contains paginated list of threads with metadata.
@@ -516,7 +516,7 @@ class ThreadListResponse(PaginatedResponse):
     )
 
 
-class MessageListResponse(PaginatedResponse):
+class MessageListResponse(KeysetPaginatedResponse):
     """Response schema for a list of messages.
 
     Contains paginated list of messages with metadata.
@@ -72,6 +72,7 @@ class PaginatedResponse(BaseSchema, Generic[T]):
     Attributes:
         items: List of items for the current page
         total: Total number of items matching the query
+        total_approximate: Whether total (and total_pages) is an estimate
         page: Current page number (1-indexed)
         per_page: Number of items per page
         total_pages: Total number of pages
@@ -86,6 +87,10 @@ class PaginatedResponse(BaseSchema, Generic[T]):
         ge=0,
         description="Total number of items matching the query",
     )
+    total_approximate: bool = Field(
+        default=False,
+        description="Whether total is an estimate rather than an exact count",
+    )
     page: int = Field(
         ...,
         ge=1,
@@ -12,7 +12,12 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from app.schemas.base import BaseResponse, BaseSchema, PaginatedResponse
+from app.schemas.base import (
+    BaseResponse,
+    BaseSchema,
+    KeysetPaginatedResponse,
+    PaginatedResponse,
+)
 
 
 class RoleType(str, Enum):
@@ -564,7 +569,7 @@ class AuditLogResponse(AuditLogBase):
     )
 
 
-class AuditLogListResponse(PaginatedResponse):
+class AuditLogListResponse(KeysetPaginatedResponse):
     """Paginated list of audit log entries.
 
     Attributes:
@@ -140,6 +140,23 @@ class FileUploadRequest(BaseSchema):
     )
 
 
+class FileFromChecksumRequest(FileBase):
+    """Request schema for creating a file from content already stored.
+
+    Lets a client that knows the SHA-256 of a file skip uploading it when
+    the same content is already stored among its own files.
+
+    Attributes:
+        checksum: SHA-256 checksum of the file content (hexadecimal)
+    """
+
+    checksum: str = Field(
+        ...,
+        pattern=r"^[0-9a-fA-F]{64}$",
+        description="SHA-256 checksum of the file content (hexadecimal)",
+    )
+
+
 class FileUpdateRequest(BaseSchema):
     """Request schema for updating file metadata.
 
@@ -362,3 +379,96 @@ class FileDeleteResponse(BaseSchema):
         default="File deleted successfully",
         description="Success message",
     )
+
+
+# Maximum number of files in one batch request
+MAX_BATCH_FILES = 100
+
+
+class BatchFileRequest(BaseSchema):
+    """Request schema for operations on several files at once.
+
+    Attributes:
+        file_ids: UUIDs of the files
+    """
+
+    file_ids: list[UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_FILES,
+        description=f"UUIDs of the files (at most {MAX_BATCH_FILES})",
+    )
+
+
+class BatchSecureUrlRequest(BatchFileRequest):
+    """Request schema for generating secure URLs for several files.
+
+    Attributes:
+        expires_in_seconds: URL expiration time in seconds
+    """
+
+    expires_in_seconds: int = Field(
+        default=3600,
+        ge=60,
+        le=86400,
+        description="URL expiration time in seconds (1 minute to 24 hours)",
+    )
+
+
+class BatchSecureUrlResponse(BaseSchema):
+    """Response schema for batch secure URL generation.
+
+    Attributes:
+        urls: Secure URLs of the accessible files, in request order
+        not_found: UUIDs of files that do not exist or are not accessible
+    """
+
+    urls: list[SecureUrlResponse] = Field(
+        ...,
+        description="Secure URLs of the accessible files, in request order",
+    )
+    not_found: list[UUID] = Field(
+        default_factory=list,
+        description="UUIDs of files that do not exist or are not accessible",
+    )
+
+
+class BatchFileResponse(BaseSchema):
+    """Response schema for batch file metadata retrieval.
+
+    Attributes:
+        files: Details of the accessible files, in request order
+        not_found: UUIDs of files that do not exist or are not accessible
+    """
+
+    files: list[FileResponse] = Field(
+        ...,
+        description="Details of the accessible files, in request order",
+    )
+    not_found: list[UUID] = Field(
+        default_factory=list,
+        description="UUIDs of files that do not exist or are not accessible",
+    )
+
+
+class BatchDeleteResponse(BaseSchema):
+    """Response schema for batch file deletion.
+
+    Attributes:
+        deleted: UUIDs of the deleted files
+        not_found: UUIDs of files that do not exist or are not owned by the user
+        message: Success message
+    """
+
+    deleted: list[UUID] = Field(
+        ...,
+        description="UUIDs of the deleted files",
+    )
+    not_found: list[UUID] = Field(
+        default_factory=list,
+        description="UUIDs of files that do not exist or are not owned by the user",
+    )
+    message: str = Field(
+        default="Files deleted successfully",
+        description="Success message",
+    )
@@ -2,15 +2,23 @@
 
 This package contains service layer components including the alert manager
 for health monitoring notifications.
+
+Exports are resolved on first access, so importing one service module does
+not import the alert manager (and aiohttp) with it.
 """
 
-from app.services.alert_manager import (
-    AlertChannel,
-    AlertConfig,
-    AlertManager,
-    AlertSeverity,
-    get_alert_manager,
-)
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.services.alert_manager import (
+        AlertChannel,
+        AlertConfig,
+        AlertManager,
+        AlertSeverity,
+        get_alert_manager,
+    )
 
 __all__ = [
     "AlertChannel",
@@ -19,3 +27,7 @@ __all__ = [
     "AlertSeverity",
     "get_alert_manager",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {name: "app.services.alert_manager" for name in __all__}
+)
@@ -8,9 +8,11 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import String, and_, bindparam, cast, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from app.core.hot_queries import HotQuery
 from app.models.activity import (
     Activity,
     ActivityParticipation,
@@ -29,6 +31,23 @@ from app.utils.query_optimization import (
 )
 
 
+def _activity_by_id_query(sqlite: bool = False) -> Select:
+    """Build the activity lookup by ``activity_id`` parameter.
+
+    Args:
+        sqlite: Compare as text, since SQLite stores UUIDs as TEXT
+
+    Returns:
+        Select: Query with an ``activity_id`` parameter
+    """
+    if sqlite:
+        return select(Activity).where(cast(Activity.id, String) == bindparam("activity_id"))
+    return select(Activity).where(Activity.id == bindparam("activity_id"))
+
+
+ACTIVITY_BY_ID_QUERY = HotQuery("activities.by_id", _activity_by_id_query)
+
+
 class ActivityService:
     """Service class for activity recommendation and management logic.
 
@@ -385,12 +404,11 @@ class ActivityService:
         dialect_name = self.db.bind.dialect.name if self.db.bind else 'postgresql'
 
         if dialect_name == 'sqlite':
-            from sqlalchemy import cast, String
-            query = select(Activity).where(cast(Activity.id, String) == str(activity_id))
+            result = await ACTIVITY_BY_ID_QUERY.execute(
+                self.db, {"activity_id": str(activity_id)}, sqlite=True
+            )
         else:
-            query = select(Activity).where(Activity.id == activity_id)
-
-        result = await self.db.execute(query)
+            result = await ACTIVITY_BY_ID_QUERY.execute(self.db, {"activity_id": activity_id})
         return result.scalar_one_or_none()
 
     async def list_activities(
@@ -17,6 +17,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.cache import cache, invalidate_cache
+from app.core.cache_tags import ORGANIZATION_DASHBOARD_TAG, entity_tag, invalidate_tags
 from app.models.analytics import (
     AnalyticsMetric,
     ComplianceCheck,
@@ -67,7 +68,16 @@ class AnalyticsService:
         """
         self.db = db
 
-    @cache(ttl=900, key_prefix="analytics_dashboard")
+    @cache(
+        ttl=900,
+        key_prefix="analytics_dashboard",
+        warm_arg="facility_id",
+        tags=lambda result, args: [
+            entity_tag("facility", args["facility_id"])
+            if args.get("facility_id")
+            else ORGANIZATION_DASHBOARD_TAG
+        ],
+    )
     async def get_dashboard(
         self,
         facility_id: Optional[UUID] = None,
@@ -899,13 +909,14 @@ class AnalyticsService:
             int: Number of cache entries deleted
         """
         if facility_id:
-            # Invalidate specific facility dashboard cache
-            pattern = f"*{facility_id}*"
-        else:
-            # Invalidate all dashboard caches
-            pattern = "*"
+            # Invalidate the facility's dashboard and the organization-wide
+            # dashboard that aggregates it
+            return await invalidate_tags(
+                entity_tag("facility", facility_id), ORGANIZATION_DASHBOARD_TAG
+            )
 
-        return await invalidate_cache("analytics_dashboard", pattern)
+        # Invalidate all dashboard caches
+        return await invalidate_cache("analytics_dashboard", "*")
 
     async def refresh_analytics_dashboard_cache(
         self,
@@ -0,0 +1,195 @@
+"""Monthly partitions of the audit log tables.
+
+On PostgreSQL the audit tables are range-partitioned by month on their
+event time (see the ``partition_audit_logs_by_month`` migration), so
+time-filtered audit queries only scan the months they cover and expired
+history is removed by dropping whole partitions rather than deleting rows.
+
+Partitions are created ahead of time; events for a month without one land
+in the table's default partition. On other databases the tables are not
+partitioned and these functions do nothing.
+"""
+
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Partitioned audit tables and the time column they are partitioned on
+AUDIT_PARTITIONS: dict[str, str] = {
+    "audit_logs": "created_at",
+    "document_audit_logs": "timestamp",
+}
+
+# Monthly partitions are named <table>_y<year>m<month>, e.g. audit_logs_y2026m10
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    """First day of the month ``offset`` months after the month of ``day``.
+
+    Args:
+        day: Any day of the base month
+        offset: Number of months to move, negative for earlier months
+
+    Returns:
+        date: First day of the resulting month
+    """
+    months = day.year * 12 + day.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of a table's partition for a month.
+
+    Args:
+        table: Partitioned table
+        month: Any day of the month
+
+    Returns:
+        str: Partition name
+    """
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Month held by a partition, from its name.
+
+    Args:
+        table: Partitioned table
+        name: Partition name
+
+    Returns:
+        Optional[date]: First day of the month, or None if ``name`` is not
+        a monthly partition of ``table`` (e.g. the default partition)
+    """
+    match = _PARTITION_SUFFIX.search(name)
+    if not name.startswith(f"{table}_") or match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """DDL creating a table's partition for a month if it does not exist.
+
+    Args:
+        table: Partitioned table
+        month: Any day of the month
+
+    Returns:
+        str: CREATE TABLE statement
+    """
+    start = month_start(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, start)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{month_start(start, 1).isoformat()}')"
+    )
+
+
+def _is_postgresql(db: AsyncSession) -> bool:
+    """Whether the session is bound to PostgreSQL."""
+    return db.bind is not None and db.bind.dialect.name == "postgresql"
+
+
+async def _partitions(db: AsyncSession, table: str) -> list[str]:
+    """Names of the partitions attached to a table."""
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return list(result.scalars().all())
+
+
+async def ensure_audit_partitions(
+    db: AsyncSession,
+    months_ahead: int,
+    today: Optional[date] = None,
+) -> list[str]:
+    """Create the monthly audit partitions from this month to ``months_ahead``.
+
+    A partition cannot be created for a month that already has events in
+    the default partition; such months are logged and skipped.
+
+    Args:
+        db: Async database session
+        months_ahead: Number of months after the current one to prepare
+        today: Current day (defaults to today, UTC)
+
+    Returns:
+        list[str]: Names of the partitions created
+    """
+    if not _is_postgresql(db):
+        return []
+
+    today = today or datetime.now(timezone.utc).date()
+    created = []
+    for table in AUDIT_PARTITIONS:
+        existing = set(await _partitions(db, table))
+        for offset in range(months_ahead + 1):
+            month = month_start(today, offset)
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+            try:
+                await db.execute(text(create_partition_sql(table, month)))
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Failed to create audit partition {name}: {e}")
+                continue
+            created.append(name)
+
+    if created:
+        logger.info(f"Created audit partitions: {', '.join(created)}")
+    return created
+
+
+async def drop_expired_audit_partitions(
+    db: AsyncSession,
+    retention_months: int,
+    today: Optional[date] = None,
+) -> list[str]:
+    """Drop the monthly audit partitions older than the retention period.
+
+    Only whole months entirely before the retention period are dropped;
+    the default partition is never dropped.
+
+    Args:
+        db: Async database session
+        retention_months: Number of months of history kept, besides the
+            current one. Zero or less keeps everything.
+        today: Current day (defaults to today, UTC)
+
+    Returns:
+        list[str]: Names of the partitions dropped
+    """
+    if retention_months <= 0 or not _is_postgresql(db):
+        return []
+
+    today = today or datetime.now(timezone.utc).date()
+    cutoff = month_start(today, -retention_months)
+    dropped = []
+    for table in AUDIT_PARTITIONS:
+        for name in await _partitions(db, table):
+            month = partition_month(table, name)
+            if month is None or month >= cutoff:
+                continue
+            await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            await db.execute(text(f"DROP TABLE {name}"))
+            await db.commit()
+            dropped.append(name)
+
+    if dropped:
+        logger.info(f"Dropped expired audit partitions: {', '.join(dropped)}")
+    return dropped
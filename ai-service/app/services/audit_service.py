@@ -7,18 +7,42 @@ querying, and retention management for compliance requirements.
 
 from datetime import datetime
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import and_, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.counting import track_counts
+from app.core.keyset import KeysetPage, KeysetPaginator
 from app.models.rbac import AuditLog
+from app.schemas.pagination import SortOrder
 from app.schemas.rbac import (
     AuditAction,
     AuditLogFilter,
     AuditLogRequest,
     AuditLogResponse,
 )
+from app.services.audit_writer import get_audit_writer
+
+# Keyset ordering of audit trails (newest first)
+AUDIT_LOG_PAGINATOR = KeysetPaginator(AuditLog, [("created_at", SortOrder.DESC)])
+
+# Cached audit trail totals are invalidated by new entries
+track_counts(AuditLog)
+
+# Actions committed before the audited request returns; other events are
+# queued and written in batches by the audit writer
+DURABLE_AUDIT_ACTIONS = frozenset(
+    action.value
+    for action in (
+        AuditAction.ROLE_ASSIGNED,
+        AuditAction.ROLE_REVOKED,
+        AuditAction.PERMISSION_GRANTED,
+        AuditAction.PERMISSION_REVOKED,
+        AuditAction.DATA_MODIFIED,
+        AuditAction.DATA_DELETED,
+    )
+)
 
 
 class AuditServiceError(Exception):
@@ -65,10 +89,14 @@ class AuditService:
         details: Optional[dict] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
+        durable: Optional[bool] = None,
     ) -> AuditLogResponse:
         """Log an audit event.
 
         Creates an audit log entry for tracking access and modifications.
+        The entry is written by the audit writer: durable entries are
+        committed before this returns, others are queued and written in
+        the background.
 
         Args:
             user_id: ID of the user who performed the action
@@ -78,24 +106,29 @@ class AuditService:
             details: Optional JSON details about the action
             ip_address: Optional IP address of the request
             user_agent: Optional user agent string of the request
+            durable: Whether to wait until the entry is committed. Defaults
+                to True for the actions in DURABLE_AUDIT_ACTIONS.
 
         Returns:
             AuditLogResponse with the created audit log entry
         """
-        audit_log = AuditLog(
-            user_id=user_id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent,
-        )
-        self.db.add(audit_log)
-        await self.db.commit()
-        await self.db.refresh(audit_log)
-
-        return self._build_audit_log_response(audit_log)
+        if durable is None:
+            durable = action in DURABLE_AUDIT_ACTIONS
+
+        row = {
+            "id": uuid4(),
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.utcnow(),
+        }
+        await get_audit_writer().write(AuditLog, row, self.db, durable=durable)
+
+        return AuditLogResponse(**row)
 
     async def log_access_granted(
         self,
@@ -373,6 +406,30 @@ class AuditService:
         Returns:
             List of audit log entries matching the filter
         """
+        page = await self.get_audit_log_page(filter_params, limit=limit, offset=offset)
+        return page.items
+
+    async def get_audit_log_page(
+        self,
+        filter_params: Optional[AuditLogFilter] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> KeysetPage[AuditLogResponse]:
+        """Get one page of audit logs, newest first.
+
+        Args:
+            filter_params: Optional filter parameters
+            limit: Maximum number of entries to return
+            offset: Number of entries to skip when no cursor is given
+            cursor: Cursor from a previous page
+
+        Returns:
+            Page of audit log entries with next/previous cursors
+
+        Raises:
+            InvalidCursorError: If the cursor is invalid
+        """
         query = select(AuditLog)
 
         if filter_params:
@@ -396,12 +453,10 @@ class AuditService:
             if conditions:
                 query = query.where(and_(*conditions))
 
-        query = query.order_by(desc(AuditLog.created_at)).limit(limit).offset(offset)
-
-        result = await self.db.execute(query)
-        audit_logs = result.scalars().all()
-
-        return [self._build_audit_log_response(log) for log in audit_logs]
+        page = await AUDIT_LOG_PAGINATOR.paginate(
+            self.db, query, limit=limit, cursor=cursor, offset=offset
+        )
+        return page.map(self._build_audit_log_response)
 
     async def get_audit_log_by_id(self, log_id: UUID) -> AuditLogResponse:
         """Get a single audit log entry by ID.
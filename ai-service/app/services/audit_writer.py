@@ -0,0 +1,346 @@
+"""Batched background writer for audit events.
+
+Writing each audit event in its own transaction costs a round trip and a
+commit inside the request being audited. The writer instead queues events
+and bulk-inserts them from a background task, one multi-row INSERT per
+table and one commit per batch.
+
+Events that must be durable before the request returns are written with
+``durable=True``: the caller waits until the batch holding the event is
+committed, and the writer stops waiting for a batch to fill as soon as
+such an event is queued, so concurrent durable events share one commit.
+
+A batch that fails is retried with backoff. If it still fails, its events
+are inserted one by one, so one bad row or a lasting error only loses the
+events it affects.
+
+When the writer is not running (e.g. in scripts and tests), events are
+added to the caller's session and committed straight away, as they were
+before the writer existed.
+
+The writer also maintains the monthly partitions of the audit tables (see
+``app.services.audit_partitions``).
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Optional, Type
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.audit_partitions import (
+    drop_expired_audit_partitions,
+    ensure_audit_partitions,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the audit partitions
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = 86400
+
+# Attempts at writing a batch before its events are written one by one
+BATCH_WRITE_ATTEMPTS = 3
+
+# Seconds before the first retry of a failed batch, doubled on each retry
+BATCH_RETRY_BACKOFF_SECONDS = 0.1
+
+# Queue entry telling the writer loop to write what it has and exit
+_STOP = object()
+
+# A queued event: target table, row values, and the future of a durable write
+QueuedEvent = tuple[Table, dict[str, Any], Optional["asyncio.Future[None]"]]
+
+
+class AuditWriter:
+    """Queues audit events and inserts them in batches from a background task.
+
+    Attributes:
+        batch_size: Maximum number of events inserted per batch
+        flush_interval_seconds: Longest time a batch waits to fill up
+        max_queue_size: Number of queued events beyond which writers wait
+        written: Number of events written by this worker
+        failed: Number of events this worker failed to write
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval_seconds: float,
+        max_queue_size: int,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            batch_size: Maximum number of events inserted per batch
+            flush_interval_seconds: Longest time a batch waits to fill up
+            max_queue_size: Number of queued events beyond which writers wait
+            session_factory: Factory of the sessions batches are written
+                with (defaults to the application's session factory)
+        """
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
+        self.written = 0
+        self.failed = 0
+        self._session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the background writer is accepting events."""
+        return self._accepting and self._task is not None and not self._task.done()
+
+    async def write(
+        self,
+        model: Type[Any],
+        row: dict[str, Any],
+        db: AsyncSession,
+        durable: bool = False,
+    ) -> None:
+        """Write an audit event.
+
+        Args:
+            model: Audit log model the event is stored as
+            row: Column values of the event, including its primary key and
+                time (they are not read back)
+            db: Session of the caller, used when the writer is not running
+            durable: Whether to wait until the event is committed
+
+        Raises:
+            Exception: If a durable event could not be written
+        """
+        if not self.running:
+            db.add(model(**row))
+            await db.commit()
+            return
+
+        future = asyncio.get_running_loop().create_future() if durable else None
+        await self._queue.put((model.__table__, row, future))
+        if future is not None:
+            await future
+
+    def _session(self) -> AsyncSession:
+        """Open a session of the writer's own."""
+        if self._session_factory is not None:
+            return self._session_factory()
+
+        from app.database import AsyncSessionLocal
+
+        return AsyncSessionLocal()
+
+    def stats(self) -> dict[str, Any]:
+        """Writer statistics for health checks.
+
+        Returns:
+            dict: Whether the writer runs, queued, written and failed events
+        """
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    async def _next_batch(self) -> tuple[list[QueuedEvent], bool]:
+        """Wait for the next batch of events.
+
+        Returns:
+            Tuple of (events, whether the writer was asked to stop)
+        """
+        loop = asyncio.get_running_loop()
+        first = await self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = loop.time() + self.flush_interval_seconds
+        durable = first[2] is not None
+        while len(batch) < self.batch_size:
+            if not durable and self._queue.empty():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            elif not self._queue.empty():
+                event = self._queue.get_nowait()
+            else:
+                # A durable event is waiting; write what is queued now
+                break
+            if event is _STOP:
+                return batch, True
+            batch.append(event)
+            durable = durable or event[2] is not None
+        return batch, False
+
+    async def _insert(self, batch: list[QueuedEvent]) -> None:
+        """Insert events in one transaction.
+
+        Args:
+            batch: Queued events
+        """
+        rows: dict[Table, list[dict[str, Any]]] = defaultdict(list)
+        for table, row, _ in batch:
+            rows[table].append(row)
+
+        async with self._session() as db:
+            for table, table_rows in rows.items():
+                await db.execute(insert(table), table_rows)
+            await db.commit()
+
+    async def _write_batch(self, batch: list[QueuedEvent]) -> None:
+        """Insert a batch of events, retrying and isolating failures.
+
+        The batch is inserted in one transaction, retried with backoff if
+        that fails. If every attempt fails, the events are inserted one by
+        one and only the events that still fail are counted as failed.
+
+        Args:
+            batch: Queued events
+        """
+        error: Optional[Exception] = None
+        for attempt in range(BATCH_WRITE_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(BATCH_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            try:
+                await self._insert(batch)
+            except Exception as e:
+                error = e
+                logger.warning(
+                    f"Failed to write {len(batch)} audit events "
+                    f"(attempt {attempt + 1}/{BATCH_WRITE_ATTEMPTS}): {e}"
+                )
+            else:
+                self._resolve(batch, None)
+                return
+
+        if len(batch) == 1:
+            self._resolve(batch, error)
+            return
+
+        for event in batch:
+            try:
+                await self._insert([event])
+            except Exception as e:
+                self._resolve([event], e)
+            else:
+                self._resolve([event], None)
+
+    def _resolve(self, events: list[QueuedEvent], error: Optional[Exception]) -> None:
+        """Count written or failed events and notify their durable writers.
+
+        Args:
+            events: Events whose write has finished
+            error: Why the events could not be written, or None if they were
+        """
+        if error is None:
+            self.written += len(events)
+        else:
+            self.failed += len(events)
+            for table, row, _ in events:
+                logger.error(
+                    f"Failed to write audit event {row.get('id')} to {table.name}: {error}"
+                )
+
+        for _, _, future in events:
+            if future is None or future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    async def _run_forever(self) -> None:
+        """Writer loop, until asked to stop."""
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._write_batch(batch)
+
+    async def maintain_partitions(self) -> None:
+        """Create upcoming audit partitions and drop expired ones."""
+        async with self._session() as db:
+            await ensure_audit_partitions(db, settings.audit_partition_months_ahead)
+            await drop_expired_audit_partitions(db, settings.audit_retention_months)
+
+    async def _maintain_forever(self) -> None:
+        """Partition maintenance loop."""
+        while True:
+            try:
+                await self.maintain_partitions()
+            except Exception as e:
+                logger.error(f"Audit partition maintenance failed: {e}")
+            await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+
+    def start(self, maintain_partitions: bool = True) -> None:
+        """Start the background writer if it is not already running.
+
+        Args:
+            maintain_partitions: Whether to also run partition maintenance
+        """
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run_forever())
+        self._accepting = True
+        if maintain_partitions:
+            self._maintenance_task = asyncio.create_task(self._maintain_forever())
+
+    async def stop(self) -> None:
+        """Write the queued events and stop the background writer."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+        if self._task is not None:
+            self._accepting = False
+            if not self._task.done():
+                await self._queue.put(_STOP)
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+            # Events queued while the writer was stopping
+            leftover = []
+            while not self._queue.empty():
+                event = self._queue.get_nowait()
+                if event is not _STOP:
+                    leftover.append(event)
+            if leftover:
+                await self._write_batch(leftover)
+
+
+# Global writer instance
+_writer: Optional[AuditWriter] = None
+
+
+def get_audit_writer() -> AuditWriter:
+    """Get or create the global audit writer.
+
+    Returns:
+        AuditWriter: Writer configured from the settings
+    """
+    global _writer
+    if _writer is None:
+        _writer = AuditWriter(
+            batch_size=settings.audit_writer_batch_size,
+            flush_interval_seconds=settings.audit_writer_flush_interval_seconds,
+            max_queue_size=settings.audit_writer_queue_size,
+        )
+    return _writer
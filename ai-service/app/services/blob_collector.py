@@ -0,0 +1,100 @@
+"""Background garbage collection of stored file content.
+
+File content is stored once per checksum as a reference-counted blob
+(see ``StorageBlob``). Deleting the last file referencing a blob deletes
+it straight away; this collector periodically deletes the blobs left
+behind when that did not happen, e.g. because the worker stopped or the
+storage backend failed in between.
+
+Collection is safe to run on every worker at once: a blob is only deleted
+by a conditional DELETE that loses to any concurrent new reference.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BlobGarbageCollector:
+    """Periodically deletes blobs unreferenced for longer than a grace period.
+
+    Attributes:
+        interval_seconds: Seconds between collection runs
+        grace_seconds: Minimum time a blob has been unreferenced
+        collected: Number of blobs deleted by this worker
+    """
+
+    def __init__(self, interval_seconds: float, grace_seconds: int) -> None:
+        """Initialize the collector.
+
+        Args:
+            interval_seconds: Seconds between collection runs
+            grace_seconds: Minimum time a blob has been unreferenced
+        """
+        self.interval_seconds = interval_seconds
+        self.grace_seconds = grace_seconds
+        self.collected = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """Delete the blobs currently due for collection.
+
+        Returns:
+            int: Number of blobs deleted
+        """
+        from app.database import AsyncSessionLocal
+        from app.services.storage_service import StorageService
+
+        async with AsyncSessionLocal() as db:
+            collected = await StorageService(db).collect_orphaned_blobs(self.grace_seconds)
+        self.collected += collected
+        if collected:
+            logger.info(f"Collected {collected} unreferenced storage blobs")
+        return collected
+
+    async def _run_forever(self) -> None:
+        """Collection loop."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Storage blob collection failed: {e}")
+
+    def start(self) -> None:
+        """Start the background collection loop if it is not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background collection loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global collector instance
+_collector: Optional[BlobGarbageCollector] = None
+
+
+def get_blob_collector() -> BlobGarbageCollector:
+    """Get or create the global blob garbage collector.
+
+    Returns:
+        BlobGarbageCollector: Collector configured from the settings
+    """
+    global _collector
+    if _collector is None:
+        _collector = BlobGarbageCollector(
+            interval_seconds=settings.blob_gc_interval_seconds,
+            grace_seconds=settings.blob_gc_grace_seconds,
+        )
+    return _collector
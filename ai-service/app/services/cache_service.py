@@ -1,12 +1,14 @@
 """Cache statistics service for LAYA AI Service.
 
-Provides functionality to gather and report cache statistics from Redis.
+Provides functionality to gather and report cache statistics from Redis
+using the counters maintained by ``app.core.cache_metrics``.
 """
 
 import logging
 from datetime import datetime
 from typing import Dict
 
+from app.core.cache_metrics import compute_hit_ratio, get_cache_metrics
 from app.redis_client import get_redis_client
 from app.schemas.cache import CachePrefixStats, CacheStatsResponse
 
@@ -18,6 +20,8 @@ CACHE_PREFIXES = [
     "activity_catalog",
     "analytics_dashboard",
     "llm_response",
+    "message_threads",
+    "portfolio_summary",
 ]
 
 
@@ -43,9 +47,13 @@ async def get_cache_statistics() -> CacheStatsResponse:
     Gathers statistics including:
     - Total number of keys
     - Memory usage
-    - Keys grouped by prefix
+    - Per-prefix hit, miss, set, eviction and invalidation counters
+    - Approximate key counts, byte sizes and sliding-window hit ratios
     - Server uptime and client connections
 
+    Per-prefix statistics are read from counters maintained by the cache
+    layer, so the cost of this call does not grow with the keyspace.
+
     Returns:
         CacheStatsResponse: Comprehensive cache statistics
 
@@ -68,33 +76,23 @@ async def get_cache_statistics() -> CacheStatsResponse:
     uptime_seconds = info.get("uptime_in_seconds", 0)
     connected_clients = info.get("connected_clients", 0)
 
+    # Make this worker's buffered counters visible before reading
+    metrics = get_cache_metrics()
+    await metrics.flush()
+    prefix_stats = await metrics.read_prefix_stats(CACHE_PREFIXES)
+
     # Gather statistics by prefix
     by_prefix: Dict[str, CachePrefixStats] = {}
 
-    for prefix in CACHE_PREFIXES:
-        # Count keys with this prefix
-        key_count = 0
-        sample_ttl = None
-
-        # Scan for keys with this prefix
-        pattern = f"{prefix}:*"
-        keys = []
-        async for key in redis.scan_iter(match=pattern, count=100):
-            keys.append(key)
-            key_count += 1
-
-            # Get sample TTL from first key
-            if sample_ttl is None and key:
-                try:
-                    ttl = await redis.ttl(key)
-                    # TTL returns -1 if key has no expiration, -2 if key doesn't exist
-                    sample_ttl = ttl if ttl > 0 else None
-                except Exception:
-                    pass
-
+    for prefix, (counters, key_count, windows) in prefix_stats.items():
+        average_entry_bytes = counters.bytes_set // counters.sets if counters.sets else 0
         by_prefix[prefix] = CachePrefixStats(
             key_count=key_count,
-            sample_ttl=sample_ttl,
+            sample_ttl=counters.ttl,
+            estimated_bytes=key_count * average_entry_bytes,
+            hit_ratio=compute_hit_ratio(counters.hits, counters.misses),
+            hit_ratio_windows=windows,
+            **counters.as_dict(),
         )
 
     return CacheStatsResponse(
@@ -13,6 +13,7 @@ from fastapi import HTTPException, status
 
 from app.config import settings
 from app.core.cache import cache, invalidate_cache
+from app.core.cache_tags import entity_tag, invalidate_tags
 from app.schemas.child import ChildProfileSchema
 
 
@@ -53,7 +54,12 @@ class ChildService:
         self.gibbon_api_url = gibbon_api_url or settings.gibbon_api_url
         self.timeout = timeout or settings.gibbon_api_timeout
 
-    @cache(ttl=300, key_prefix="child_profile")
+    @cache(
+        ttl=300,
+        key_prefix="child_profile",
+        warm_arg="child_id",
+        tags=lambda result, args: [entity_tag("child", args["child_id"])],
+    )
     async def get_child_profile(
         self,
         child_id: UUID,
@@ -155,13 +161,11 @@ class ChildService:
             int: Number of cache entries deleted
         """
         if child_id:
-            # Invalidate specific child profile cache
-            pattern = f"*{child_id}*"
-        else:
-            # Invalidate all child profile caches
-            pattern = "*"
+            # Invalidate only the entries derived from this child
+            return await invalidate_tags(entity_tag("child", child_id))
 
-        return await invalidate_cache("child_profile", pattern)
+        # Invalidate all child profile caches
+        return await invalidate_cache("child_profile", "*")
 
     async def refresh_child_profile_cache(
         self,
@@ -8,11 +8,13 @@ import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import and_, case, cast, func, or_, select, String
+from sqlalchemy import cast, func, or_, select, String
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache
+from app.core.cache_tags import SIGNATURE_DASHBOARD_TAG, entity_tag, invalidate_tags
 from app.models.document import (
     Document,
     DocumentAuditEventType,
@@ -38,9 +40,19 @@ from app.schemas.document import (
     SignatureRequestResponse,
     SignatureResponse,
 )
+from app.services.audit_writer import get_audit_writer
 
 logger = logging.getLogger(__name__)
 
+# Events committed before the audited request returns; other events are
+# queued and written in batches by the audit writer
+DURABLE_DOCUMENT_AUDIT_EVENTS = frozenset(
+    {
+        DocumentAuditEventType.SIGNATURE_CREATED,
+        DocumentAuditEventType.SIGNATURE_REQUEST_COMPLETED,
+    }
+)
+
 
 class DocumentService:
     """Service class for document and template management logic.
@@ -60,6 +72,21 @@ class DocumentService:
         """
         self.db = db
 
+    async def _invalidate_signature_dashboards(self, *user_ids: UUID) -> None:
+        """Drop cached signature dashboards after a document or signature changes.
+
+        The unfiltered dashboard is always dropped along with those of the
+        given users.
+
+        Args:
+            *user_ids: Creators of the changed documents and signers of the
+                changed signatures.
+        """
+        await invalidate_tags(
+            SIGNATURE_DASHBOARD_TAG,
+            *(entity_tag("signature_dashboard", user_id) for user_id in user_ids),
+        )
+
     # Document Template Methods
 
     async def create_template(
@@ -261,6 +288,7 @@ class DocumentService:
         self.db.add(document)
         await self.db.commit()
         await self.db.refresh(document)
+        await self._invalidate_signature_dashboards(document.created_by)
 
         # Create audit log entry
         await self.create_audit_log(
@@ -308,6 +336,7 @@ class DocumentService:
         self.db.add(document)
         await self.db.commit()
         await self.db.refresh(document)
+        await self._invalidate_signature_dashboards(document.created_by)
 
         # Create audit log entry
         await self.create_audit_log(
@@ -429,6 +458,7 @@ class DocumentService:
 
         await self.db.commit()
         await self.db.refresh(document)
+        await self._invalidate_signature_dashboards(document.created_by)
 
         # Create audit log entry
         event_type = DocumentAuditEventType.DOCUMENT_UPDATED
@@ -509,6 +539,9 @@ class DocumentService:
 
         await self.db.commit()
         await self.db.refresh(signature)
+        await self._invalidate_signature_dashboards(
+            document.created_by, signature.signer_id
+        )
 
         # Create audit log entry for signature
         await self.create_audit_log(
@@ -650,6 +683,7 @@ class DocumentService:
         self.db.add(signature_request)
         await self.db.commit()
         await self.db.refresh(signature_request)
+        await self._invalidate_signature_dashboards(document.created_by)
 
         logger.info(
             f"Signature request {signature_request.id} created for document "
@@ -942,6 +976,15 @@ class DocumentService:
             updated_at=signature_request.updated_at,
         )
 
+    @cache(
+        ttl=30,
+        key_prefix="signature_dashboard",
+        tags=lambda result, args: [
+            entity_tag("signature_dashboard", args["user_id"])
+            if args.get("user_id")
+            else SIGNATURE_DASHBOARD_TAG
+        ],
+    )
     async def get_signature_dashboard(
         self,
         user_id: Optional[UUID] = None,
@@ -955,6 +998,10 @@ class DocumentService:
         - Breakdown by document type
         - Recent signature activity
 
+        Document statistics come from a single pass over the documents, and
+        signature statistics from the recent activity query. Results are
+        cached briefly and invalidated when documents or signatures change.
+
         Args:
             user_id: Optional user ID to filter by (for user-specific dashboard)
             limit_recent: Maximum number of recent activities to return
@@ -965,24 +1012,40 @@ class DocumentService:
         now = datetime.now(timezone.utc)
         first_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-        # Base query for filtering by user if provided
-        base_filter = []
-        if user_id:
-            base_filter.append(Document.created_by == user_id)
-
-        # Get total counts by status
-        status_query = (
+        # Count documents by status and type in one scan; the status and type
+        # breakdowns are rolled up from these few rows
+        counts_query = (
             select(
                 Document.status,
+                Document.type,
                 func.count(Document.id).label("count"),
+                func.count(Document.id)
+                .filter(Document.created_at >= first_of_month)
+                .label("this_month"),
             )
-            .group_by(Document.status)
+            .group_by(Document.status, Document.type)
         )
-        if base_filter:
-            status_query = status_query.where(and_(*base_filter))
+        if user_id:
+            counts_query = counts_query.where(Document.created_by == user_id)
 
-        status_result = await self.db.execute(status_query)
-        status_counts = {row.status.value: row.count for row in status_result}
+        counts_result = await self.db.execute(counts_query)
+
+        status_counts: dict[str, int] = {}
+        type_counts: dict[str, dict[str, int]] = {}
+        documents_this_month = 0
+        for row in counts_result:
+            status_counts[row.status.value] = (
+                status_counts.get(row.status.value, 0) + row.count
+            )
+            type_count = type_counts.setdefault(
+                row.type.value, {"count": 0, "pending": 0, "signed": 0}
+            )
+            type_count["count"] += row.count
+            if row.status == DocumentStatus.PENDING:
+                type_count["pending"] += row.count
+            elif row.status == DocumentStatus.SIGNED:
+                type_count["signed"] += row.count
+            documents_this_month += row.this_month
 
         # Calculate summary statistics
         total_documents = sum(status_counts.values())
@@ -999,64 +1062,31 @@ class DocumentService:
             else 0.0
         )
 
-        # Get documents created this month
-        month_query = select(func.count(Document.id)).where(
-            Document.created_at >= first_of_month
-        )
-        if base_filter:
-            month_query = month_query.where(and_(*base_filter))
-        month_result = await self.db.execute(month_query)
-        documents_this_month = month_result.scalar() or 0
-
-        # Get signatures created this month
-        sig_month_query = select(func.count(Signature.id)).where(
-            Signature.created_at >= first_of_month
-        )
-        if user_id:
-            sig_month_query = sig_month_query.where(Signature.signer_id == user_id)
-        sig_month_result = await self.db.execute(sig_month_query)
-        signatures_this_month = sig_month_result.scalar() or 0
-
-        # Get breakdown by document type with status counts
-        # Use case() for correct SQL conditional aggregation
-        type_query = (
-            select(
-                Document.type,
-                func.count(Document.id).label("total"),
-                func.sum(
-                    case((Document.status == DocumentStatus.PENDING, 1), else_=0)
-                ).label("pending"),
-                func.sum(
-                    case((Document.status == DocumentStatus.SIGNED, 1), else_=0)
-                ).label("signed"),
-            )
-            .group_by(Document.type)
-        )
-        if base_filter:
-            type_query = type_query.where(and_(*base_filter))
-
-        type_result = await self.db.execute(type_query)
         type_breakdown = [
-            {
-                "type": row.type.value,
-                "count": row.total,
-                "pending": row.pending or 0,
-                "signed": row.signed or 0,
-            }
-            for row in type_result
+            {"type": document_type, **counts}
+            for document_type, counts in type_counts.items()
         ]
 
-        # Get recent signature activity
+        # Get recent signature activity, with the number of signatures this
+        # month alongside. No activity means there are no signatures to count.
+        signature_filter = []
+        if user_id:
+            signature_filter.append(Signature.signer_id == user_id)
+        signatures_this_month_query = (
+            select(func.count(Signature.id))
+            .where(Signature.created_at >= first_of_month, *signature_filter)
+            .scalar_subquery()
+        )
         activity_query = (
-            select(Signature, Document)
+            select(Signature, Document, signatures_this_month_query.label("this_month"))
             .join(Document, Signature.document_id == Document.id)
+            .where(*signature_filter)
             .order_by(Signature.created_at.desc())
-            .limit(limit_recent)
+            .limit(max(limit_recent, 1))
         )
-        if user_id:
-            activity_query = activity_query.where(Signature.signer_id == user_id)
 
-        activity_result = await self.db.execute(activity_query)
+        activity_result = (await self.db.execute(activity_query)).all()
+        signatures_this_month = activity_result[0].this_month if activity_result else 0
         recent_activity = [
             {
                 "document_id": str(signature.document_id),
@@ -1065,7 +1095,7 @@ class DocumentService:
                 "signed_at": signature.created_at.isoformat(),
                 "document_type": document.type.value,
             }
-            for signature, document in activity_result
+            for signature, document, _ in activity_result[:limit_recent]
         ]
 
         # Generate alerts
@@ -1126,7 +1156,9 @@ class DocumentService:
         """Create an audit log entry for a document or signature event.
 
         This method records all significant events in the document lifecycle
-        for compliance, security, and debugging purposes.
+        for compliance, security, and debugging purposes. Signatures and
+        completed signature requests are committed before this returns;
+        other events are queued and written in the background.
 
         Args:
             event_type: Type of event that occurred.
@@ -1146,20 +1178,27 @@ class DocumentService:
         if event_data:
             event_data_json = json.dumps(event_data)
 
-        audit_log = DocumentAuditLog(
-            event_type=event_type,
-            document_id=document_id,
-            user_id=user_id,
-            signature_id=signature_id,
-            signature_request_id=signature_request_id,
-            event_data=event_data_json,
-            ip_address=ip_address,
-            user_agent=user_agent,
+        now = datetime.now(timezone.utc)
+        row = {
+            "id": uuid4(),
+            "event_type": event_type,
+            "document_id": document_id,
+            "user_id": user_id,
+            "signature_id": signature_id,
+            "signature_request_id": signature_request_id,
+            "event_data": event_data_json,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "timestamp": now,
+            "created_at": now,
+        }
+        await get_audit_writer().write(
+            DocumentAuditLog,
+            row,
+            self.db,
+            durable=event_type in DURABLE_DOCUMENT_AUDIT_EVENTS,
         )
-
-        self.db.add(audit_log)
-        await self.db.commit()
-        await self.db.refresh(audit_log)
+        audit_log = DocumentAuditLog(**row)
 
         logger.info(
             f"Audit log created: {event_type.value} for document {document_id} "
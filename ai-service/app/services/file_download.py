@@ -0,0 +1,189 @@
+"""Streaming download helpers for LAYA AI Service.
+
+Downloads are served without loading the file into memory:
+
+- local files are handed to the server as a path (``FileResponse``), which
+  sends them with ``http.response.pathsend`` where the server supports it
+  and in 64 KB reads otherwise
+- S3 objects are streamed from the ``StreamingBody`` chunk by chunk
+
+Both support resumable and seekable downloads through ``Range`` and
+``If-Range`` requests, and conditional requests through strong ETags
+derived from the stored SHA-256 checksum.
+
+Example:
+    etag = strong_etag(file_record.checksum)
+    byte_range = select_range(request.headers.get("range"),
+                              request.headers.get("if-range"), etag, size)
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+# Bytes read from storage per chunk of a streamed download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiableError(Exception):
+    """Raised when a requested byte range lies outside the file.
+
+    Attributes:
+        size: Size of the file in bytes
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize the error.
+
+        Args:
+            size: Size of the file in bytes
+        """
+        super().__init__(f"Requested range not satisfiable for {size} bytes")
+        self.size = size
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """Inclusive byte range of a file.
+
+    Attributes:
+        start: First byte
+        end: Last byte
+    """
+
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        """Number of bytes in the range."""
+        return self.end - self.start + 1
+
+    def content_range(self, size: int) -> str:
+        """Value of the ``Content-Range`` header for a file of ``size`` bytes."""
+        return f"bytes {self.start}-{self.end}/{size}"
+
+
+@dataclass
+class FileDownload:
+    """Content of a download, ready to be sent.
+
+    Exactly one of ``path`` and ``chunks`` is set.
+
+    Attributes:
+        path: Local file to send as is (the server handles ranges)
+        stat: Stat of the local file
+        chunks: Streamed content of the requested range
+        byte_range: Range streamed in ``chunks``, None for the whole file
+    """
+
+    path: Optional[Path] = None
+    stat: Optional[os.stat_result] = None
+    chunks: Optional[AsyncIterator[bytes]] = None
+    byte_range: Optional[ByteRange] = None
+
+
+def strong_etag(checksum: Optional[str]) -> Optional[str]:
+    """Build a strong ETag from a content checksum.
+
+    Args:
+        checksum: Hexadecimal SHA-256 of the content, if known
+
+    Returns:
+        Optional[str]: Quoted ETag, or None without a checksum
+    """
+    return f'"{checksum}"' if checksum else None
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Check an ``If-None-Match`` header against an ETag.
+
+    Uses the weak comparison the header calls for, so ``W/"x"`` matches
+    ``"x"``.
+
+    Args:
+        if_none_match: Header value, a list of ETags or ``*``
+        etag: Current ETag of the file
+
+    Returns:
+        bool: True if the client copy is current (respond 304)
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[ByteRange]:
+    """Parse a single-range ``Range`` header.
+
+    Headers that cannot be honoured as one range (other units, malformed or
+    multiple ranges) are ignored, as RFC 9110 allows, and the whole file is
+    served.
+
+    Args:
+        range_header: Value of the ``Range`` header
+        size: Size of the file in bytes
+
+    Returns:
+        Optional[ByteRange]: The requested range, clamped to the file, or
+        None to serve the whole file
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts past the end of the file
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            suffix = int(last)
+            if suffix == 0:
+                raise RangeNotSatisfiableError(size)
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(size)
+    if end < start:
+        return None
+    return ByteRange(start, min(end, size - 1))
+
+
+def select_range(
+    range_header: Optional[str],
+    if_range: Optional[str],
+    etag: Optional[str],
+    size: int,
+) -> Optional[ByteRange]:
+    """Select the byte range to serve for a request.
+
+    Args:
+        range_header: Value of the ``Range`` header
+        if_range: Value of the ``If-Range`` header; the range is only served
+            if it matches the current ETag
+        etag: Current strong ETag of the file
+        size: Size of the file in bytes
+
+    Returns:
+        Optional[ByteRange]: Range to serve, or None for the whole file
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts past the end of the file
+    """
+    if if_range is not None and (etag is None or if_range.strip() != etag):
+        # The client's partial copy is stale, send the current file whole
+        return None
+    return parse_range(range_header, size)
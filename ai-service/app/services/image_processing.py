@@ -0,0 +1,219 @@
+"""Image processing for LAYA AI Service.
+
+Thumbnail generation with Pillow, which is imported on the first image
+operation rather than when the storage service is loaded. Pillow is
+synchronous and CPU bound, so async callers go through
+``create_thumbnails_async``, which runs it in a pool of worker processes
+(``THUMBNAIL_WORKERS``) where it is not held back by the GIL.
+
+Every thumbnail size of an image comes from a single decode:
+
+1. JPEGs are decoded with ``Image.draft``, which lets libjpeg scale down
+   by 1/2, 1/4 or 1/8 while decoding, to no less than the largest size
+2. sizes are produced largest first, each resized from the previous one
+   (large -> medium -> small) rather than from the full image, with
+   ``reduce`` taking the large integer steps before the LANCZOS filter
+"""
+
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+# Pillow format names by image MIME type
+IMAGE_FORMATS = {
+    "image/jpeg": "JPEG",
+    "image/png": "PNG",
+    "image/gif": "GIF",
+    "image/webp": "WEBP",
+}
+
+# Resize from at least this many times the target size, reducing first
+REDUCING_GAP = 2.0
+
+# Worker processes for image processing, started on first use
+_image_executor: Optional[ProcessPoolExecutor] = None
+
+
+class ImageProcessingError(Exception):
+    """Raised when an image cannot be decoded or converted."""
+
+
+def _fit(width: int, height: int, max_size: int) -> Tuple[int, int]:
+    """Dimensions of an image scaled to fit ``max_size``, keeping its aspect ratio."""
+    ratio = min(max_size / width, max_size / height)
+    return max(int(width * ratio), 1), max(int(height * ratio), 1)
+
+
+def _encode(image: Any, content_type: str) -> bytes:
+    """Encode an image in the format of its MIME type."""
+    output = io.BytesIO()
+    img_format = IMAGE_FORMATS.get(content_type, "PNG")
+
+    # Set quality for lossy formats
+    save_kwargs = {}
+    if img_format in ("JPEG", "WEBP"):
+        save_kwargs["quality"] = 85
+        save_kwargs["optimize"] = True
+    elif img_format == "PNG":
+        save_kwargs["optimize"] = True
+
+    image.save(output, format=img_format, **save_kwargs)
+    return output.getvalue()
+
+
+def create_thumbnails(
+    image_content: bytes,
+    max_sizes: Sequence[int],
+    content_type: str,
+) -> List[Tuple[bytes, int, int]]:
+    """Create thumbnails of several sizes from one decode (synchronous).
+
+    Args:
+        image_content: Original image as bytes.
+        max_sizes: Maximum dimension (width or height) of each thumbnail.
+        content_type: MIME type of the original image.
+
+    Returns:
+        List of (thumbnail_bytes, width, height), in the order of ``max_sizes``.
+
+    Raises:
+        ImageProcessingError: If image processing fails.
+    """
+    from PIL import Image
+
+    if not max_sizes:
+        return []
+
+    try:
+        with Image.open(io.BytesIO(image_content)) as img:
+            original_width, original_height = img.size
+            targets = {
+                max_size: _fit(original_width, original_height, max_size)
+                for max_size in max_sizes
+            }
+            largest = targets[max(targets)]
+
+            # Let libjpeg decode at a reduced scale, no smaller than needed
+            if img.format == "JPEG":
+                img.draft(img.mode, largest)
+
+            source = img
+            # Convert RGBA to RGB for JPEG output if needed
+            if source.mode in ("RGBA", "P") and content_type == "image/jpeg":
+                source = source.convert("RGB")
+
+            thumbnails = {}
+            # Cascade: resize each size from the previous, larger one
+            for max_size in sorted(targets, reverse=True):
+                target = targets[max_size]
+                if source.width < target[0] or source.height < target[1]:
+                    # Only happens when scaling up; start from the decoded image
+                    source = img if img.mode == source.mode else img.convert(source.mode)
+                if source.size != target:
+                    source = source.resize(
+                        target, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP
+                    )
+                thumbnails[max_size] = (_encode(source, content_type), *target)
+
+            return [thumbnails[max_size] for max_size in max_sizes]
+
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to generate thumbnail: {str(e)}") from e
+
+
+def create_thumbnail(
+    image_content: bytes,
+    max_size: int,
+    content_type: str,
+) -> Tuple[bytes, int, int]:
+    """Create a thumbnail from image content (synchronous).
+
+    Args:
+        image_content: Original image as bytes.
+        max_size: Maximum dimension (width or height) for thumbnail.
+        content_type: MIME type of the original image.
+
+    Returns:
+        Tuple of (thumbnail_bytes, width, height).
+
+    Raises:
+        ImageProcessingError: If image processing fails.
+    """
+    return create_thumbnails(image_content, [max_size], content_type)[0]
+
+
+def _get_image_executor() -> ProcessPoolExecutor:
+    """Get the image worker pool, starting it on first use."""
+    global _image_executor
+    if _image_executor is None:
+        # Spawned, not forked: the parent runs an event loop and threads
+        _image_executor = ProcessPoolExecutor(
+            max_workers=max(1, settings.thumbnail_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _image_executor
+
+
+def shutdown_image_workers() -> None:
+    """Stop the image worker processes, if started."""
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=False, cancel_futures=True)
+        _image_executor = None
+
+
+async def create_thumbnails_async(
+    image_content: bytes,
+    max_sizes: Sequence[int],
+    content_type: str,
+) -> List[Tuple[bytes, int, int]]:
+    """Create thumbnails of several sizes in the image worker processes.
+
+    Args:
+        image_content: Original image as bytes.
+        max_sizes: Maximum dimension (width or height) of each thumbnail.
+        content_type: MIME type of the original image.
+
+    Returns:
+        List of (thumbnail_bytes, width, height), in the order of ``max_sizes``.
+
+    Raises:
+        ImageProcessingError: If image processing fails.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_image_executor(),
+            partial(create_thumbnails, image_content, list(max_sizes), content_type),
+        )
+    except BrokenProcessPool as e:
+        # A worker died (e.g. out of memory); start a new pool next time
+        shutdown_image_workers()
+        raise ImageProcessingError(f"Image worker failed: {e}") from e
+
+
+async def create_thumbnail_async(
+    image_content: bytes,
+    max_size: int,
+    content_type: str,
+) -> Tuple[bytes, int, int]:
+    """Create a thumbnail in the image worker processes.
+
+    Args:
+        image_content: Original image as bytes.
+        max_size: Maximum dimension (width or height) for thumbnail.
+        content_type: MIME type of the original image.
+
+    Returns:
+        Tuple of (thumbnail_bytes, width, height).
+
+    Raises:
+        ImageProcessingError: If image processing fails.
+    """
+    return (await create_thumbnails_async(image_content, [max_size], content_type))[0]
@@ -13,7 +13,7 @@ from uuid import UUID
 
 from sqlalchemy import func, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, selectinload
 
 from app.models.intervention_plan import (
     InterventionConsultation,
@@ -51,6 +51,12 @@ from app.schemas.intervention_plan import (
     VersionCreate,
     VersionResponse,
 )
+from app.services.plan_versioning import (
+    VERSION_CHECKPOINT_INTERVAL,
+    apply_deltas,
+    changes_from_deltas,
+    diff_snapshots,
+)
 
 
 class InterventionPlanServiceError(Exception):
@@ -208,12 +214,12 @@ class InterventionPlanService:
         snapshot = await self._create_plan_snapshot(plan)
 
         # Create initial version record
-        version = InterventionVersion(
+        version = await self._new_version(
             plan_id=plan.id,
             version_number=1,
-            created_by=user_id,
+            user_id=user_id,
             change_summary="Initial plan creation",
-            snapshot_data=snapshot,
+            snapshot=snapshot,
         )
         self.db.add(version)
 
@@ -294,7 +300,8 @@ class InterventionPlanService:
             After snapshot creation:
             - Increments the plan's version number
             - Applies the requested changes
-            - Stores the snapshot in a new InterventionVersion record
+            - Stores the snapshot in a new InterventionVersion record, as a
+              delta from the previous version or in full at checkpoints
             - Generates an automatic change summary from modified fields
 
             This enables full audit trail and version comparison capabilities.
@@ -331,12 +338,12 @@ class InterventionPlanService:
             snapshot = await self._create_plan_snapshot(plan)
             plan.version += 1
 
-            version = InterventionVersion(
+            version = await self._new_version(
                 plan_id=plan.id,
                 version_number=plan.version,
-                created_by=user_id,
+                user_id=user_id,
                 change_summary=self._generate_change_summary(request),
-                snapshot_data=snapshot,
+                snapshot=snapshot,
             )
             self.db.add(version)
 
@@ -511,7 +518,8 @@ class InterventionPlanService:
 
             After snapshot creation:
             - Increments the plan's version number
-            - Stores snapshot in new InterventionVersion record
+            - Stores snapshot in new InterventionVersion record, as a delta
+              from the previous version or in full at checkpoints
             - Enables version comparison and rollback capabilities
 
         Args:
@@ -545,19 +553,21 @@ class InterventionPlanService:
         plan.updated_at = datetime.utcnow()
 
         # Create version record
-        version = InterventionVersion(
+        version = await self._new_version(
             plan_id=plan.id,
             version_number=plan.version,
-            created_by=user_id,
+            user_id=user_id,
             change_summary=change_summary or f"Version {plan.version} created",
-            snapshot_data=snapshot,
+            snapshot=snapshot,
         )
         self.db.add(version)
 
         await self.db.commit()
         await self.db.refresh(version)
 
-        return VersionResponse.model_validate(version)
+        return VersionResponse.model_validate(version).model_copy(
+            update={"snapshot_data": snapshot}
+        )
 
     async def add_progress(
         self,
@@ -648,7 +658,8 @@ class InterventionPlanService:
     ) -> list[VersionResponse]:
         """Get the version history for an intervention plan.
 
-        Returns all version snapshots in chronological order.
+        Returns all versions in chronological order, without their
+        snapshots; use get_version for the snapshot of a version.
 
         Args:
             plan_id: ID of the intervention plan
@@ -675,16 +686,22 @@ class InterventionPlanService:
                 "User does not have permission to access this intervention plan"
             )
 
-        # Get all versions
+        # Get all versions, leaving out snapshots and deltas
         version_query = (
-            select(InterventionVersion)
+            select(
+                InterventionVersion.id,
+                InterventionVersion.plan_id,
+                InterventionVersion.version_number,
+                InterventionVersion.created_by,
+                InterventionVersion.change_summary,
+                InterventionVersion.created_at,
+            )
             .where(InterventionVersion.plan_id == plan_id)
             .order_by(InterventionVersion.version_number.asc())
         )
         version_result = await self.db.execute(version_query)
-        versions = version_result.scalars().all()
 
-        return [VersionResponse.model_validate(v) for v in versions]
+        return [VersionResponse.model_validate(row) for row in version_result.all()]
 
     async def get_version(
         self,
@@ -693,7 +710,9 @@ class InterventionPlanService:
     ) -> VersionResponse:
         """Get a specific version snapshot of the plan.
 
-        Retrieves a specific version record by version number.
+        Retrieves a specific version record by version number. The snapshot
+        of a version stored as a delta is rebuilt from the nearest earlier
+        checkpoint.
 
         Args:
             plan_id: ID of the intervention plan
@@ -730,7 +749,13 @@ class InterventionPlanService:
                 f"Version {version_number} not found for plan {plan_id}"
             )
 
-        return VersionResponse.model_validate(version)
+        if version.is_checkpoint or version.delta_data is None:
+            return VersionResponse.model_validate(version)
+
+        snapshot = await self._rebuild_snapshot(plan_id, version_number)
+        return VersionResponse.model_validate(version).model_copy(
+            update={"snapshot_data": snapshot}
+        )
 
     async def compare_versions(
         self,
@@ -741,7 +766,9 @@ class InterventionPlanService:
         """Compare two version snapshots and highlight differences.
 
         Compares two version snapshots of a plan and returns a detailed
-        diff showing what changed between the versions.
+        diff showing what changed between the versions. For versions close
+        to each other the diff is computed from the deltas of the versions
+        in between; otherwise both snapshots are rebuilt and diffed.
 
         Args:
             plan_id: ID of the intervention plan
@@ -763,107 +790,57 @@ class InterventionPlanService:
         if not plan:
             raise PlanNotFoundError(f"Intervention plan with ID {plan_id} not found")
 
-        # Get both versions
+        # Get both versions, and the deltas in between when they are close
+        first, last = sorted((version1, version2))
+        use_deltas = last - first <= 2 * VERSION_CHECKPOINT_INTERVAL
+        if use_deltas:
+            numbers = InterventionVersion.version_number.between(first, last)
+        else:
+            numbers = InterventionVersion.version_number.in_([first, last])
         version_query = (
             select(InterventionVersion)
-            .where(
-                InterventionVersion.plan_id == plan_id,
-                InterventionVersion.version_number.in_([version1, version2]),
-            )
+            .options(defer(InterventionVersion.snapshot_data))
+            .where(InterventionVersion.plan_id == plan_id, numbers)
             .order_by(InterventionVersion.version_number.asc())
         )
         version_result = await self.db.execute(version_query)
-        versions = version_result.scalars().all()
-
-        if len(versions) != 2:
-            missing = []
-            found_numbers = [v.version_number for v in versions]
-            if version1 not in found_numbers:
-                missing.append(version1)
-            if version2 not in found_numbers:
-                missing.append(version2)
+        versions = {v.version_number: v for v in version_result.scalars().all()}
+
+        missing = [number for number in (version1, version2) if number not in versions]
+        if missing:
             raise PlanVersionError(
                 f"Version(s) {', '.join(map(str, missing))} not found for plan {plan_id}"
             )
 
-        # Extract snapshots
-        v1 = versions[0] if versions[0].version_number == version1 else versions[1]
-        v2 = versions[1] if versions[1].version_number == version2 else versions[0]
+        v1 = versions[version1]
+        v2 = versions[version2]
 
-        snapshot1 = v1.snapshot_data
-        snapshot2 = v2.snapshot_data
+        deltas = [
+            version.delta_data
+            for number, version in versions.items()
+            if first < number <= last
+        ]
+        if use_deltas and all(delta is not None for delta in deltas):
+            diff = changes_from_deltas(deltas, reverse=version1 > version2)
+        else:
+            snapshot1 = await self._rebuild_snapshot(plan_id, version1)
+            snapshot2 = await self._rebuild_snapshot(plan_id, version2)
+            if snapshot1 is None or snapshot2 is None:
+                raise PlanVersionError(
+                    f"Snapshots of versions {version1} and {version2} of plan {plan_id} "
+                    f"are not available"
+                )
+            diff = changes_from_deltas([diff_snapshots(snapshot1, snapshot2)])
 
-        # Compare snapshots and build diff
-        changes = {
+        return {
             "plan_id": str(plan_id),
             "version1": version1,
             "version2": version2,
             "version1_date": v1.created_at.isoformat() if v1.created_at else None,
             "version2_date": v2.created_at.isoformat() if v2.created_at else None,
-            "changes": {},
+            "changes": diff,
         }
 
-        # Compare main plan fields
-        main_fields = [
-            "title", "status", "child_name", "date_of_birth", "diagnosis",
-            "medical_history", "educational_history", "family_context",
-            "review_schedule", "next_review_date", "effective_date", "end_date",
-            "parent_signed",
-        ]
-
-        for field in main_fields:
-            val1 = snapshot1.get(field)
-            val2 = snapshot2.get(field)
-            if val1 != val2:
-                changes["changes"][field] = {
-                    "from": val1,
-                    "to": val2,
-                }
-
-        # Compare relationship collections
-        collection_fields = [
-            "strengths", "needs", "goals", "strategies",
-            "monitoring", "parent_involvements", "consultations",
-        ]
-
-        for collection in collection_fields:
-            items1 = snapshot1.get(collection, [])
-            items2 = snapshot2.get(collection, [])
-
-            # Build ID-based maps for comparison
-            map1 = {item["id"]: item for item in items1}
-            map2 = {item["id"]: item for item in items2}
-
-            added = [item for item_id, item in map2.items() if item_id not in map1]
-            removed = [item for item_id, item in map1.items() if item_id not in map2]
-            modified = []
-
-            # Check for modifications in items that exist in both
-            for item_id in set(map1.keys()) & set(map2.keys()):
-                if map1[item_id] != map2[item_id]:
-                    # Find specific field changes
-                    field_changes = {}
-                    for key in map1[item_id].keys():
-                        if map1[item_id].get(key) != map2[item_id].get(key):
-                            field_changes[key] = {
-                                "from": map1[item_id].get(key),
-                                "to": map2[item_id].get(key),
-                            }
-                    if field_changes:
-                        modified.append({
-                            "id": item_id,
-                            "changes": field_changes,
-                        })
-
-            if added or removed or modified:
-                changes["changes"][collection] = {
-                    "added": added,
-                    "removed": removed,
-                    "modified": modified,
-                }
-
-        return changes
-
     async def get_plans_for_review(
         self,
         user_id: UUID,
@@ -1216,6 +1193,116 @@ class InterventionPlanService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def _load_version_chain(
+        self,
+        plan_id: UUID,
+        version_number: int,
+    ) -> list[InterventionVersion]:
+        """Load a version with the versions back to the nearest checkpoint.
+
+        Args:
+            plan_id: ID of the intervention plan
+            version_number: Version number to load up to
+
+        Returns:
+            The latest checkpoint at or before the version, followed by the
+            later versions up to it, in order. Empty if the plan has no such
+            checkpoint.
+        """
+        checkpoint = (
+            select(func.max(InterventionVersion.version_number))
+            .where(
+                InterventionVersion.plan_id == plan_id,
+                InterventionVersion.is_checkpoint.is_(True),
+                InterventionVersion.version_number <= version_number,
+            )
+            .scalar_subquery()
+        )
+        query = (
+            select(InterventionVersion)
+            .where(
+                InterventionVersion.plan_id == plan_id,
+                InterventionVersion.version_number >= checkpoint,
+                InterventionVersion.version_number <= version_number,
+            )
+            .order_by(InterventionVersion.version_number.asc())
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def _rebuild_snapshot(
+        self,
+        plan_id: UUID,
+        version_number: int,
+        chain: Optional[list[InterventionVersion]] = None,
+    ) -> Optional[dict]:
+        """Rebuild the snapshot of a version from its checkpoint and deltas.
+
+        Args:
+            plan_id: ID of the intervention plan
+            version_number: Version number to rebuild
+            chain: Versions from the checkpoint, if already loaded
+
+        Returns:
+            The snapshot, or None if the version does not exist or a version
+            in between has neither snapshot nor delta
+        """
+        if chain is None:
+            chain = await self._load_version_chain(plan_id, version_number)
+        if not chain or chain[-1].version_number != version_number:
+            return None
+
+        checkpoint, later = chain[0], chain[1:]
+        if checkpoint.snapshot_data is None or any(v.delta_data is None for v in later):
+            return None
+        return apply_deltas(checkpoint.snapshot_data, (v.delta_data for v in later))
+
+    async def _new_version(
+        self,
+        plan_id: UUID,
+        version_number: int,
+        user_id: UUID,
+        change_summary: str,
+        snapshot: dict,
+    ) -> InterventionVersion:
+        """Build a version record storing a snapshot.
+
+        The version stores the delta from the previous version's snapshot,
+        and also the full snapshot when it is the plan's first version or
+        VERSION_CHECKPOINT_INTERVAL versions after the last checkpoint.
+
+        Args:
+            plan_id: ID of the intervention plan
+            version_number: Number of the new version
+            user_id: ID of the user creating the version
+            change_summary: Summary of changes in this version
+            snapshot: Snapshot of the plan at this version
+
+        Returns:
+            InterventionVersion record, not yet added to the session
+        """
+        previous = None
+        chain: list[InterventionVersion] = []
+        if version_number > 1:
+            chain = await self._load_version_chain(plan_id, version_number - 1)
+            if chain:
+                previous = await self._rebuild_snapshot(
+                    plan_id, chain[-1].version_number, chain=chain
+                )
+
+        delta = diff_snapshots(previous, snapshot) if previous is not None else None
+        is_checkpoint = delta is None or len(chain) >= VERSION_CHECKPOINT_INTERVAL
+
+        return InterventionVersion(
+            plan_id=plan_id,
+            version_number=version_number,
+            created_by=user_id,
+            change_summary=change_summary,
+            snapshot_data=snapshot if is_checkpoint else None,
+            delta_data=delta,
+            is_checkpoint=is_checkpoint,
+        )
+
     def _calculate_next_review_date(
         self,
         effective_date: date,
@@ -22,6 +22,8 @@ from sqlalchemy import and_, cast, func, or_, select, String, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache_tags import entity_tag, invalidate_tags
+from app.core.keyset import KeysetPage, KeysetPaginator
 from app.models.messaging import (
     Message,
     MessageAttachment,
@@ -49,6 +51,11 @@ from app.schemas.messaging import (
     ThreadWithMessagesResponse,
     UnreadCountResponse,
 )
+from app.schemas.pagination import SortOrder
+
+# Keyset orderings of the thread and message listings
+THREAD_PAGINATOR = KeysetPaginator(MessageThread, [("updated_at", SortOrder.DESC)])
+MESSAGE_PAGINATOR = KeysetPaginator(Message, [("created_at", SortOrder.ASC)])
 
 
 # =============================================================================
@@ -194,6 +201,7 @@ class MessagingService:
             self.db.add(initial_message)
             await self.db.commit()
 
+        await self._invalidate_thread_listings(thread)
         return await self._build_thread_response(thread, user_id)
 
     async def get_thread(
@@ -265,6 +273,46 @@ class MessagingService:
         Returns:
             List of ThreadResponse objects
         """
+        page = await self.page_threads_for_user(
+            user_id=user_id,
+            child_id=child_id,
+            thread_type=thread_type,
+            include_archived=include_archived,
+            limit=limit,
+            offset=offset,
+        )
+        return page.items
+
+    async def page_threads_for_user(
+        self,
+        user_id: UUID,
+        child_id: Optional[UUID] = None,
+        thread_type: Optional[ThreadType] = None,
+        include_archived: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> KeysetPage[ThreadResponse]:
+        """Get one page of a user's message threads.
+
+        Threads are ordered by most recent activity. Pages are located by
+        cursor (constant cost however deep) or, for older clients, by offset.
+
+        Args:
+            user_id: ID of the user requesting threads
+            child_id: Optional filter by child ID
+            thread_type: Optional filter by thread type
+            include_archived: Whether to include archived (inactive) threads
+            limit: Maximum number of threads to return
+            offset: Number of threads to skip when no cursor is given
+            cursor: Cursor from a previous page
+
+        Returns:
+            KeysetPage of ThreadResponse objects with next/previous cursors
+
+        Raises:
+            InvalidCursorError: When the cursor is invalid
+        """
         # Build the query
         query = select(MessageThread)
 
@@ -294,25 +342,21 @@ class MessagingService:
         if conditions:
             query = query.where(and_(*conditions))
 
-        # Order by most recent activity (updated_at or created_at)
-        query = query.order_by(
-            MessageThread.updated_at.desc().nulls_last(),
-            MessageThread.created_at.desc(),
+        page = await THREAD_PAGINATOR.paginate(
+            self.db, query, limit=limit, cursor=cursor, offset=offset
         )
 
-        # Apply pagination
-        query = query.offset(offset).limit(limit)
-
-        result = await self.db.execute(query)
-        threads = result.scalars().all()
-
         # Build responses
         responses = []
-        for thread in threads:
+        for thread in page.items:
             response = await self._build_thread_response(thread, user_id)
             responses.append(response)
 
-        return responses
+        return KeysetPage(
+            items=responses,
+            next_cursor=page.next_cursor,
+            previous_cursor=page.previous_cursor,
+        )
 
     async def update_thread(
         self,
@@ -364,6 +408,7 @@ class MessagingService:
         await self.db.commit()
         await self.db.refresh(thread)
 
+        await self._invalidate_thread_listings(thread)
         return await self._build_thread_response(thread, user_id)
 
     async def archive_thread(
@@ -471,6 +516,7 @@ class MessagingService:
         thread.updated_at = datetime.utcnow()
         await self.db.commit()
 
+        await self._invalidate_thread_listings(thread)
         return await self._build_message_response(message, thread)
 
     async def get_message(
@@ -554,6 +600,48 @@ class MessagingService:
             ThreadNotFoundError: When the thread is not found
             UnauthorizedAccessError: When the user doesn't have access
         """
+        page = await self.page_messages(
+            thread_id=thread_id,
+            user_id=user_id,
+            limit=limit,
+            offset=offset,
+            before=before,
+            after=after,
+        )
+        return page.items
+
+    async def page_messages(
+        self,
+        thread_id: UUID,
+        user_id: UUID,
+        limit: int = 50,
+        offset: int = 0,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> KeysetPage[MessageResponse]:
+        """Get one page of the messages in a thread.
+
+        Messages are in chronological order (oldest first). Pages are located
+        by cursor (constant cost however deep) or, for older clients, by offset.
+
+        Args:
+            thread_id: Unique identifier of the thread
+            user_id: ID of the user requesting messages
+            limit: Maximum number of messages to return
+            offset: Number of messages to skip when no cursor is given
+            before: Filter messages before this timestamp
+            after: Filter messages after this timestamp
+            cursor: Cursor from a previous page
+
+        Returns:
+            KeysetPage of MessageResponse objects with next/previous cursors
+
+        Raises:
+            ThreadNotFoundError: When the thread is not found
+            UnauthorizedAccessError: When the user doesn't have access
+            InvalidCursorError: When the cursor is invalid
+        """
         # Get the thread to verify access
         thread_query = select(MessageThread).where(
             cast(MessageThread.id, String) == str(thread_id)
@@ -582,21 +670,23 @@ class MessagingService:
             select(Message)
             .options(selectinload(Message.attachments))
             .where(and_(*conditions))
-            .order_by(Message.created_at.asc())
-            .offset(offset)
-            .limit(limit)
         )
 
-        result = await self.db.execute(query)
-        messages = result.scalars().all()
+        page = await MESSAGE_PAGINATOR.paginate(
+            self.db, query, limit=limit, cursor=cursor, offset=offset
+        )
 
         # Build responses
         responses = []
-        for message in messages:
+        for message in page.items:
             response = await self._build_message_response(message, thread)
             responses.append(response)
 
-        return responses
+        return KeysetPage(
+            items=responses,
+            next_cursor=page.next_cursor,
+            previous_cursor=page.previous_cursor,
+        )
 
     async def mark_messages_as_read(
         self,
@@ -637,6 +727,7 @@ class MessagingService:
 
         # Verify access for each message
         marked_count = 0
+        touched_threads = {}
         for message in messages:
             # Get the thread
             thread_query = select(MessageThread).where(
@@ -648,9 +739,12 @@ class MessagingService:
             if thread and self._user_has_thread_access(thread, user_id):
                 message.is_read = True
                 marked_count += 1
+                touched_threads[str(thread.id)] = thread
 
         if marked_count > 0:
             await self.db.commit()
+            for thread in touched_threads.values():
+                await self._invalidate_thread_listings(thread)
 
         return marked_count
 
@@ -706,6 +800,7 @@ class MessagingService:
         result = await self.db.execute(stmt)
         await self.db.commit()
 
+        await self._invalidate_thread_listings(thread)
         return result.rowcount
 
     async def delete_message(
@@ -836,6 +931,20 @@ class MessagingService:
     # Helper Methods
     # =========================================================================
 
+    async def _invalidate_thread_listings(self, thread: MessageThread) -> None:
+        """Drop cached thread lists of everyone taking part in a thread.
+
+        Args:
+            thread: The thread that was created or changed
+        """
+        user_ids = {str(thread.created_by)}
+        for participant in thread.participants or []:
+            if participant.get("user_id"):
+                user_ids.add(participant["user_id"])
+        await invalidate_tags(
+            *(entity_tag("message_threads", user_id) for user_id in sorted(user_ids))
+        )
+
     def _user_has_thread_access(
         self,
         thread: MessageThread,
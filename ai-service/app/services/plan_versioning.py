@@ -0,0 +1,302 @@
+"""Delta storage of intervention plan versions.
+
+Each version of an intervention plan records the plan snapshot taken when
+the version was created. Rather than storing every snapshot in full, a
+version stores a delta: the JSON-patch operations (RFC 6902) turning the
+previous version's snapshot into its own. Every VERSION_CHECKPOINT_INTERVAL
+versions, a version also stores its full snapshot (a checkpoint), so
+rebuilding any version applies fewer than VERSION_CHECKPOINT_INTERVAL
+deltas to the nearest earlier checkpoint.
+
+Deltas are structural: items of the plan sections are addressed by ID
+rather than by position, e.g. ``/goals/<goal id>/status``, so changing one
+goal is one operation whatever the size of the section. Every operation
+replacing or removing a value is preceded by a ``test`` operation holding
+the previous value, which lets the changes between two versions be
+computed from the deltas alone, without rebuilding either snapshot.
+
+Section items have no particular order in snapshots; rebuilt sections keep
+the order of the checkpoint, with added items at the end.
+"""
+
+import copy
+from itertools import chain
+from typing import Any, Iterable, Optional
+
+# Versions between two full snapshots of a plan
+VERSION_CHECKPOINT_INTERVAL = 10
+
+# Plan sections whose items are diffed by ID
+PLAN_SECTIONS = (
+    "strengths",
+    "needs",
+    "goals",
+    "strategies",
+    "monitoring",
+    "parent_involvements",
+    "consultations",
+)
+
+# Plan fields reported when comparing versions
+COMPARED_FIELDS = (
+    "title",
+    "status",
+    "child_name",
+    "date_of_birth",
+    "diagnosis",
+    "medical_history",
+    "educational_history",
+    "family_context",
+    "review_schedule",
+    "next_review_date",
+    "effective_date",
+    "end_date",
+    "parent_signed",
+)
+
+# Value of a field or item absent from a snapshot
+_MISSING = object()
+
+
+def _pointer(*tokens: str) -> str:
+    """JSON pointer to a value from its path tokens."""
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+def _tokens(pointer: str) -> list[str]:
+    """Path tokens of a JSON pointer."""
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]]
+
+
+def _section_items(value: Any) -> Optional[dict[str, dict]]:
+    """Items of a plan section by ID.
+
+    Returns:
+        Optional[dict[str, dict]]: Items by ID, or None if the value is not
+        a list of items with IDs (and is then diffed as a whole)
+    """
+    if not isinstance(value, list):
+        return None
+    if not all(isinstance(item, dict) and "id" in item for item in value):
+        return None
+    return {str(item["id"]): item for item in value}
+
+
+def _diff_value(tokens: tuple[str, ...], old: Any, new: Any, delta: list[dict]) -> None:
+    """Append the operations turning one value into another."""
+    path = _pointer(*tokens)
+    if old is _MISSING and new is _MISSING or old == new:
+        return
+    if old is _MISSING:
+        delta.append({"op": "add", "path": path, "value": new})
+        return
+    delta.append({"op": "test", "path": path, "value": old})
+    if new is _MISSING:
+        delta.append({"op": "remove", "path": path})
+    else:
+        delta.append({"op": "replace", "path": path, "value": new})
+
+
+def diff_snapshots(old: dict, new: dict) -> list[dict]:
+    """Compute the delta turning one plan snapshot into another.
+
+    Args:
+        old: Snapshot of the earlier version
+        new: Snapshot of the later version
+
+    Returns:
+        list[dict]: JSON-patch operations, empty if the snapshots are equal
+    """
+    delta: list[dict] = []
+    for key in chain(old, (key for key in new if key not in old)):
+        before = old.get(key, _MISSING)
+        after = new.get(key, _MISSING)
+        if key in PLAN_SECTIONS:
+            before_items = _section_items(before)
+            after_items = _section_items(after)
+            if before_items is not None and after_items is not None:
+                _diff_section(key, before_items, after_items, delta)
+                continue
+        _diff_value((key,), before, after, delta)
+    return delta
+
+
+def _diff_section(
+    section: str,
+    before: dict[str, dict],
+    after: dict[str, dict],
+    delta: list[dict],
+) -> None:
+    """Append the operations turning the items of a section into others."""
+    for item_id, item in before.items():
+        changed = after.get(item_id, _MISSING)
+        if changed is _MISSING:
+            _diff_value((section, item_id), item, _MISSING, delta)
+            continue
+        for field in chain(item, (field for field in changed if field not in item)):
+            _diff_value(
+                (section, item_id, field),
+                item.get(field, _MISSING),
+                changed.get(field, _MISSING),
+                delta,
+            )
+    for item_id, item in after.items():
+        if item_id not in before:
+            _diff_value((section, item_id), _MISSING, item, delta)
+
+
+def apply_deltas(snapshot: dict, deltas: Iterable[list[dict]]) -> dict:
+    """Rebuild a later snapshot from an earlier one and the deltas between them.
+
+    Args:
+        snapshot: Snapshot of the earlier version (left unchanged)
+        deltas: Deltas of the following versions, oldest first
+
+    Returns:
+        dict: Snapshot of the version of the last delta
+
+    Raises:
+        ValueError: If an operation targets an item of a section without IDs
+    """
+    state = copy.deepcopy(snapshot)
+    sections: dict[str, dict[str, dict]] = {}
+    for operation in chain.from_iterable(deltas):
+        if operation["op"] == "test":
+            continue
+        tokens = _tokens(operation["path"])
+        key = tokens[0]
+        removed = operation["op"] == "remove"
+        value = None if removed else copy.deepcopy(operation["value"])
+
+        if len(tokens) == 1:
+            sections.pop(key, None)
+            if removed:
+                state.pop(key, None)
+            else:
+                state[key] = value
+            continue
+
+        if key not in sections:
+            items = _section_items(state.get(key, []))
+            if items is None:
+                raise ValueError(f"Cannot apply {operation['path']}: {key} has no item IDs")
+            sections[key] = items
+        items = sections[key]
+        if len(tokens) == 2:
+            if removed:
+                items.pop(tokens[1], None)
+            else:
+                items[tokens[1]] = value
+        elif removed:
+            items[tokens[1]].pop(tokens[2], None)
+        else:
+            items[tokens[1]][tokens[2]] = value
+
+    for key, items in sections.items():
+        state[key] = list(items.values())
+    return state
+
+
+def changes_from_deltas(deltas: Iterable[list[dict]], reverse: bool = False) -> dict:
+    """Summarize the changes made by consecutive deltas.
+
+    Only the first and last value of each changed field or item matter, so
+    a value changed and then changed back is not reported.
+
+    Args:
+        deltas: Deltas of consecutive versions, oldest first
+        reverse: Whether to describe the changes from the last version back
+            to the first
+
+    Returns:
+        dict: Changed plan fields as ``{"from": ..., "to": ...}`` and changed
+        sections as ``{"added": [...], "removed": [...], "modified": [...]}``
+    """
+    # Values before the first delta and after the last one, by path tokens.
+    # Items added during the deltas carry later changes to their fields.
+    before: dict[tuple[str, ...], Any] = {}
+    after: dict[tuple[str, ...], Any] = {}
+    for operation in chain.from_iterable(deltas):
+        tokens = tuple(_tokens(operation["path"]))
+        item = tokens[:2]
+        if len(tokens) == 3 and isinstance(after.get(item), dict):
+            if operation["op"] == "remove":
+                after[item].pop(tokens[2], None)
+            elif operation["op"] != "test":
+                after[item][tokens[2]] = copy.deepcopy(operation["value"])
+            continue
+
+        if operation["op"] == "test":
+            value = copy.deepcopy(operation["value"])
+            if len(tokens) == 2 and tokens not in before:
+                # Undo earlier changes to the fields of a removed item
+                for path in list(before):
+                    if len(path) == 3 and path[:2] == tokens:
+                        if before[path] is _MISSING:
+                            value.pop(path[2], None)
+                        else:
+                            value[path[2]] = before[path]
+            before.setdefault(tokens, value)
+            continue
+
+        if len(tokens) == 2:
+            # The whole item is added or removed; its field changes are moot
+            for changed in (before, after):
+                for path in [path for path in changed if path[:2] == tokens and len(path) == 3]:
+                    del changed[path]
+        if operation["op"] == "add":
+            before.setdefault(tokens, _MISSING)
+            after[tokens] = copy.deepcopy(operation["value"])
+        elif operation["op"] == "remove":
+            after[tokens] = _MISSING
+        else:
+            after[tokens] = copy.deepcopy(operation["value"])
+
+    if reverse:
+        before, after = after, before
+
+    def shown(value: Any) -> Any:
+        return None if value is _MISSING else value
+
+    changes: dict[str, Any] = {}
+    for field in chain(COMPARED_FIELDS, PLAN_SECTIONS):
+        path = (field,)
+        if path in after and before.get(path, _MISSING) != after[path]:
+            changes[field] = {"from": shown(before.get(path, _MISSING)), "to": shown(after[path])}
+
+    for section in PLAN_SECTIONS:
+        if section in changes:
+            continue
+        added, removed, modified = [], [], []
+        field_changes: dict[str, dict] = {}
+        for path, value in after.items():
+            if path[0] != section or len(path) == 1:
+                continue
+            old = before.get(path, _MISSING)
+            if len(path) == 2:
+                if old is _MISSING and value is not _MISSING:
+                    added.append(value)
+                elif value is _MISSING and old is not _MISSING:
+                    removed.append(old)
+                elif old is not _MISSING and old != value:
+                    # Removed and added again: compare the fields of the item
+                    for field in chain(old, (field for field in value if field not in old)):
+                        old_field = old.get(field, _MISSING)
+                        new_field = value.get(field, _MISSING)
+                        if old_field != new_field:
+                            field_changes.setdefault(path[1], {})[field] = {
+                                "from": shown(old_field),
+                                "to": shown(new_field),
+                            }
+            elif old != value:
+                field_changes.setdefault(path[1], {})[path[2]] = {
+                    "from": shown(old),
+                    "to": shown(value),
+                }
+        for item_id, fields in field_changes.items():
+            modified.append({"id": item_id, "changes": fields})
+
+        if added or removed or modified:
+            changes[section] = {"added": added, "removed": removed, "modified": modified}
+
+    return changes
@@ -12,6 +12,8 @@ from uuid import UUID
 from sqlalchemy import and_, cast, delete, func, select, String, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.counting import fetch_page
+from app.core.cache_tags import entity_tag, invalidate_tags
 from app.models.portfolio import (
     Milestone,
     MilestoneCategory,
@@ -93,6 +95,14 @@ class PortfolioService:
         """
         self.db = db
 
+    async def _invalidate_summary_cache(self, child_id: UUID) -> None:
+        """Drop cached portfolio summaries of a child after a write.
+
+        Args:
+            child_id: Unique identifier of the child whose portfolio changed.
+        """
+        await invalidate_tags(entity_tag("portfolio", child_id))
+
     # =========================================================================
     # Portfolio Item Operations
     # =========================================================================
@@ -124,6 +134,7 @@ class PortfolioService:
         )
         self.db.add(portfolio_item)
         await self.db.commit()
+        await self._invalidate_summary_cache(portfolio_item.child_id)
         await self.db.refresh(portfolio_item)
         return portfolio_item
 
@@ -197,18 +208,14 @@ class PortfolioService:
         # Note: Tag filtering with ARRAY overlap would need PostgreSQL specific
         # For now, we skip tag filtering in the query for SQLite compatibility
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
-
-        # Apply pagination and ordering
-        query = query.offset(skip).limit(limit).order_by(
-            PortfolioItem.captured_at.desc()
+        # Page and total count in one round trip
+        page = await fetch_page(
+            self.db,
+            query.order_by(PortfolioItem.captured_at.desc()),
+            skip=skip,
+            limit=limit,
         )
-
-        result = await self.db.execute(query)
-        items = list(result.scalars().all())
+        items, total = page.items, page.total
 
         # Apply tag filtering in memory if needed
         if tags:
@@ -258,6 +265,7 @@ class PortfolioService:
             )
             await self.db.execute(stmt)
             await self.db.commit()
+            await self._invalidate_summary_cache(portfolio_item.child_id)
 
         # Re-fetch and return the updated record
         return await self.get_portfolio_item_by_id(item_id)
@@ -288,6 +296,7 @@ class PortfolioService:
         )
         await self.db.execute(stmt)
         await self.db.commit()
+        await self._invalidate_summary_cache(portfolio_item.child_id)
         return True
 
     async def hard_delete_portfolio_item(self, item_id: UUID) -> bool:
@@ -310,6 +319,7 @@ class PortfolioService:
 
         await self.db.delete(portfolio_item)
         await self.db.commit()
+        await self._invalidate_summary_cache(portfolio_item.child_id)
         return True
 
     # =========================================================================
@@ -339,6 +349,7 @@ class PortfolioService:
         )
         self.db.add(observation)
         await self.db.commit()
+        await self._invalidate_summary_cache(observation.child_id)
         await self.db.refresh(observation)
         return observation
 
@@ -461,6 +472,7 @@ class PortfolioService:
             )
             await self.db.execute(stmt)
             await self.db.commit()
+            await self._invalidate_summary_cache(observation.child_id)
 
         # Re-fetch and return the updated record
         return await self.get_observation_by_id(observation_id)
@@ -491,6 +503,7 @@ class PortfolioService:
         )
         await self.db.execute(stmt)
         await self.db.commit()
+        await self._invalidate_summary_cache(observation.child_id)
         return True
 
     # =========================================================================
@@ -520,6 +533,7 @@ class PortfolioService:
         )
         self.db.add(milestone)
         await self.db.commit()
+        await self._invalidate_summary_cache(milestone.child_id)
         await self.db.refresh(milestone)
         return milestone
 
@@ -632,6 +646,7 @@ class PortfolioService:
             )
             await self.db.execute(stmt)
             await self.db.commit()
+            await self._invalidate_summary_cache(milestone.child_id)
 
         # Re-fetch and return the updated record
         return await self.get_milestone_by_id(milestone_id)
@@ -660,6 +675,7 @@ class PortfolioService:
         )
         await self.db.execute(stmt)
         await self.db.commit()
+        await self._invalidate_summary_cache(milestone.child_id)
         return True
 
     async def get_milestone_progress(
@@ -718,6 +734,7 @@ class PortfolioService:
         )
         self.db.add(work_sample)
         await self.db.commit()
+        await self._invalidate_summary_cache(work_sample.child_id)
         await self.db.refresh(work_sample)
         return work_sample
 
@@ -835,6 +852,7 @@ class PortfolioService:
             )
             await self.db.execute(stmt)
             await self.db.commit()
+            await self._invalidate_summary_cache(work_sample.child_id)
 
         # Re-fetch and return the updated record
         return await self.get_work_sample_by_id(work_sample_id)
@@ -863,6 +881,7 @@ class PortfolioService:
         )
         await self.db.execute(stmt)
         await self.db.commit()
+        await self._invalidate_summary_cache(work_sample.child_id)
         return True
 
     # =========================================================================
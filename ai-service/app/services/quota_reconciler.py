@@ -0,0 +1,95 @@
+"""Background reconciliation of storage quotas.
+
+Uploads and deletions keep each quota exact with atomic updates, so a
+full recount of everyone's files is not needed to enforce it. This job
+only guards against drift (e.g. files removed outside the service): it
+periodically recounts the quotas changed since their last reconciliation,
+a bounded batch per run.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaReconciler:
+    """Periodically recounts the usage of recently changed storage quotas.
+
+    Attributes:
+        interval_seconds: Seconds between reconciliation runs
+        batch_size: Maximum number of quotas recounted per run
+        corrected: Number of drifted quotas corrected by this worker
+    """
+
+    def __init__(self, interval_seconds: float, batch_size: int) -> None:
+        """Initialize the reconciler.
+
+        Args:
+            interval_seconds: Seconds between reconciliation runs
+            batch_size: Maximum number of quotas recounted per run
+        """
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.corrected = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """Recount the quotas currently due for reconciliation.
+
+        Returns:
+            int: Number of drifted quotas corrected
+        """
+        from app.database import AsyncSessionLocal
+        from app.services.storage_service import StorageService
+
+        async with AsyncSessionLocal() as db:
+            corrected = await StorageService(db).reconcile_quotas(self.batch_size)
+        self.corrected += corrected
+        return corrected
+
+    async def _run_forever(self) -> None:
+        """Reconciliation loop."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Storage quota reconciliation failed: {e}")
+
+    def start(self) -> None:
+        """Start the background reconciliation loop if it is not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background reconciliation loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global reconciler instance
+_reconciler: Optional[QuotaReconciler] = None
+
+
+def get_quota_reconciler() -> QuotaReconciler:
+    """Get or create the global quota reconciler.
+
+    Returns:
+        QuotaReconciler: Reconciler configured from the settings
+    """
+    global _reconciler
+    if _reconciler is None:
+        _reconciler = QuotaReconciler(
+            interval_seconds=settings.quota_reconcile_interval_seconds,
+            batch_size=settings.quota_reconcile_batch_size,
+        )
+    return _reconciler
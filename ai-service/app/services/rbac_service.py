@@ -13,10 +13,14 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
+from app.core.counting import CountStrategy, count_rows
+from app.core.hot_queries import HotQuery
+from app.core.keyset import KeysetPage
 from app.models.rbac import (
     AuditLog,
     Permission,
@@ -35,6 +39,7 @@ from app.schemas.rbac import (
     UserRoleAssignment,
     UserRoleResponse,
 )
+from app.services.audit_service import AUDIT_LOG_PAGINATOR
 
 if TYPE_CHECKING:
     from app.services.audit_service import AuditService
@@ -43,6 +48,49 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _user_roles_query(organization: bool = False, group: bool = False) -> Select:
+    """Build the active role assignments query of a user.
+
+    Args:
+        organization: Filter on the ``organization_id`` parameter
+        group: Filter on the ``group_id`` parameter
+
+    Returns:
+        Select: Query with ``user_id`` and ``now`` parameters, plus the
+        enabled filter parameters
+    """
+    query = (
+        select(UserRole)
+        .options(selectinload(UserRole.role).selectinload(Role.permissions))
+        .where(
+            and_(
+                UserRole.user_id == bindparam("user_id"),
+                UserRole.is_active == True,
+            )
+        )
+    )
+
+    if organization:
+        query = query.where(
+            (UserRole.organization_id == bindparam("organization_id"))
+            | (UserRole.organization_id.is_(None))
+        )
+
+    if group:
+        query = query.where(
+            (UserRole.group_id == bindparam("group_id")) | (UserRole.group_id.is_(None))
+        )
+
+    # Filter out expired assignments
+    return query.where(
+        (UserRole.expires_at.is_(None)) | (UserRole.expires_at > bindparam("now"))
+    )
+
+
+# Runs on every permission check
+USER_ROLES_QUERY = HotQuery("rbac.user_roles", _user_roles_query)
+
+
 class RBACServiceError(Exception):
     """Base exception for RBAC service errors."""
 
@@ -871,35 +919,18 @@ class RBACService:
         Returns:
             List of UserRole objects with relationships loaded
         """
-        query = (
-            select(UserRole)
-            .options(selectinload(UserRole.role).selectinload(Role.permissions))
-            .where(
-                and_(
-                    UserRole.user_id == user_id,
-                    UserRole.is_active == True,
-                )
-            )
-        )
-
+        params = {"user_id": user_id, "now": datetime.utcnow()}
         if organization_id:
-            query = query.where(
-                (UserRole.organization_id == organization_id)
-                | (UserRole.organization_id.is_(None))
-            )
-
+            params["organization_id"] = organization_id
         if group_id:
-            query = query.where(
-                (UserRole.group_id == group_id) | (UserRole.group_id.is_(None))
-            )
+            params["group_id"] = group_id
 
-        # Filter out expired assignments
-        query = query.where(
-            (UserRole.expires_at.is_(None))
-            | (UserRole.expires_at > datetime.utcnow())
+        result = await USER_ROLES_QUERY.execute(
+            self.db,
+            params,
+            organization=bool(organization_id),
+            group=bool(group_id),
         )
-
-        result = await self.db.execute(query)
         return list(result.scalars().all())
 
     async def _get_role_by_id(self, role_id: UUID) -> Optional[Role]:
@@ -1378,59 +1409,94 @@ class RBACService:
         Returns:
             Tuple of (list of audit log entries, total count)
         """
-        from sqlalchemy import desc, func
+        page, total, _ = await self.get_audit_log_page(
+            user_id=user_id,
+            action=action,
+            resource_type=resource_type,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset,
+        )
+        return page.items, total
+
+    async def get_audit_log_page(
+        self,
+        user_id: Optional[UUID] = None,
+        action: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[KeysetPage[AuditLogResponse], int, bool]:
+        """Get one page of audit logs with optional filtering.
 
+        Entries are newest first. Pages are located by cursor (constant cost
+        however deep in the trail) or, for older clients, by offset.
+
+        Args:
+            user_id: Filter by user ID
+            action: Filter by action type
+            resource_type: Filter by resource type
+            start_date: Filter events after this date
+            end_date: Filter events before this date
+            limit: Maximum number of results to return
+            offset: Number of results to skip when no cursor is given
+            cursor: Cursor from a previous page
+            count_strategy: How the total count is obtained
+
+        Returns:
+            Tuple of (page of audit log entries with cursors, total count,
+            whether the total is approximate)
+
+        Raises:
+            InvalidCursorError: When the cursor is invalid
+        """
         # Build the query with filters
         query = select(AuditLog)
-        count_query = select(func.count(AuditLog.id))
 
         # Apply filters
         if user_id:
             query = query.where(AuditLog.user_id == user_id)
-            count_query = count_query.where(AuditLog.user_id == user_id)
 
         if action:
             query = query.where(AuditLog.action == action)
-            count_query = count_query.where(AuditLog.action == action)
 
         if resource_type:
             query = query.where(AuditLog.resource_type == resource_type)
-            count_query = count_query.where(AuditLog.resource_type == resource_type)
 
         if start_date:
             query = query.where(AuditLog.created_at >= start_date)
-            count_query = count_query.where(AuditLog.created_at >= start_date)
 
         if end_date:
             query = query.where(AuditLog.created_at <= end_date)
-            count_query = count_query.where(AuditLog.created_at <= end_date)
 
         # Get total count
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
+        total, approximate = await count_rows(self.db, query, count_strategy)
 
         # Apply ordering and pagination
-        query = query.order_by(desc(AuditLog.created_at))
-        query = query.offset(offset).limit(limit)
-
-        # Execute query
-        result = await self.db.execute(query)
-        audit_logs = result.scalars().all()
+        page = await AUDIT_LOG_PAGINATOR.paginate(
+            self.db, query, limit=limit, cursor=cursor, offset=offset
+        )
 
         # Convert to response objects
-        responses = [
-            AuditLogResponse(
-                id=log.id,
-                user_id=log.user_id,
-                action=log.action,
-                resource_type=log.resource_type,
-                resource_id=log.resource_id,
-                details=log.details,
-                ip_address=log.ip_address,
-                user_agent=log.user_agent,
-                created_at=log.created_at,
-            )
-            for log in audit_logs
-        ]
-
-        return responses, total
+        return (
+            page.map(
+                lambda log: AuditLogResponse(
+                    id=log.id,
+                    user_id=log.user_id,
+                    action=log.action,
+                    resource_type=log.resource_type,
+                    resource_id=log.resource_id,
+                    details=log.details,
+                    ip_address=log.ip_address,
+                    user_agent=log.user_agent,
+                    created_at=log.created_at,
+                )
+            ),
+            total,
+            approximate,
+        )
@@ -0,0 +1,365 @@
+"""Lazily constructed S3 backend for LAYA AI Service.
+
+Wraps the few S3 operations the storage service needs behind async methods
+that run the synchronous boto3 client in a thread pool. ``boto3`` and
+``botocore`` are imported, and the client built, on the first S3 call, so
+workers storing files locally (or not serving files at all) never load the
+AWS SDK.
+
+Example:
+    backend = get_s3_backend()
+    await backend.put_object("owner/file.pdf", content, "application/pdf")
+"""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from app.config import settings
+
+
+class S3BackendError(Exception):
+    """Raised when an S3 operation fails.
+
+    Attributes:
+        code: S3 error code (e.g. ``"NoSuchKey"``), ``"Unknown"`` if absent
+    """
+
+    def __init__(self, code: str, message: str) -> None:
+        """Initialize the error.
+
+        Args:
+            code: S3 error code
+            message: Error description
+        """
+        super().__init__(f"{code} - {message}")
+        self.code = code
+
+    @property
+    def not_found(self) -> bool:
+        """Whether the object does not exist."""
+        return self.code in ("NoSuchKey", "404")
+
+
+class S3Backend:
+    """Async facade over a lazily created boto3 S3 client.
+
+    Attributes:
+        bucket_name: Bucket holding the objects
+    """
+
+    def __init__(self, bucket_name: str, max_workers: int = 4) -> None:
+        """Initialize the backend without creating the client.
+
+        Args:
+            bucket_name: Bucket holding the objects
+            max_workers: Threads running the synchronous S3 calls
+        """
+        self.bucket_name = bucket_name
+        self._max_workers = max_workers
+        self._client: Any = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+
+    @property
+    def client(self) -> Any:
+        """The boto3 S3 client, created on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    @staticmethod
+    def _create_client() -> Any:
+        """Build the boto3 S3 client from the application settings.
+
+        Supports custom endpoints for S3-compatible services like MinIO.
+        """
+        import boto3
+        from botocore.config import Config as BotoConfig
+
+        client_kwargs = {
+            "service_name": "s3",
+            "region_name": settings.s3_region,
+            "config": BotoConfig(
+                signature_version="s3v4",
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        }
+        if settings.s3_access_key_id and settings.s3_secret_access_key:
+            client_kwargs["aws_access_key_id"] = settings.s3_access_key_id
+            client_kwargs["aws_secret_access_key"] = settings.s3_secret_access_key
+        if settings.s3_endpoint_url:
+            client_kwargs["endpoint_url"] = settings.s3_endpoint_url
+        return boto3.client(**client_kwargs)
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a synchronous S3 call in the thread pool.
+
+        Raises:
+            S3BackendError: If S3 rejects the call
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="s3_"
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        except Exception as e:
+            # Only boto3 calls raise ClientError, so botocore is loaded if it matters
+            client_error = getattr(sys.modules.get("botocore.exceptions"), "ClientError", None)
+            if client_error is not None and isinstance(e, client_error):
+                code = e.response.get("Error", {}).get("Code", "Unknown")
+                raise S3BackendError(code, str(e)) from e
+            raise
+
+    async def _get_client(self) -> Any:
+        """Get the client, building it off the event loop on first use."""
+        if self._client is None:
+            # Importing boto3 and loading its service models takes a while
+            await self._run(lambda: self.client)
+        return self._client
+
+    async def put_object(self, key: str, body: bytes, content_type: str) -> None:
+        """Store an object.
+
+        Args:
+            key: Object key
+            body: Object content
+            content_type: MIME type stored with the object
+        """
+        client = await self._get_client()
+        await self._run(
+            client.put_object,
+            Bucket=self.bucket_name,
+            Key=key,
+            Body=body,
+            ContentType=content_type,
+        )
+
+    async def get_object(self, key: str) -> bytes:
+        """Read a whole object.
+
+        Args:
+            key: Object key
+
+        Returns:
+            bytes: Object content
+        """
+        client = await self._get_client()
+        response = await self._run(client.get_object, Bucket=self.bucket_name, Key=key)
+        return await self._run(response["Body"].read)
+
+    async def open_object(
+        self, key: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> "S3ObjectStream":
+        """Open an object, or a byte range of it, for streaming.
+
+        Args:
+            key: Object key
+            start: First byte of the range, None for the whole object
+            end: Last byte of the range (inclusive), None for the end
+
+        Returns:
+            S3ObjectStream: Stream of the object content
+        """
+        client = await self._get_client()
+        kwargs = {}
+        if start is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        response = await self._run(client.get_object, Bucket=self.bucket_name, Key=key, **kwargs)
+        return S3ObjectStream(self, response["Body"])
+
+    async def delete_object(self, key: str) -> None:
+        """Delete an object.
+
+        Args:
+            key: Object key
+        """
+        client = await self._get_client()
+        await self._run(client.delete_object, Bucket=self.bucket_name, Key=key)
+
+    async def create_multipart_upload(self, key: str, content_type: str) -> str:
+        """Start a multipart upload.
+
+        Args:
+            key: Object key
+            content_type: MIME type stored with the object
+
+        Returns:
+            str: Upload ID identifying the multipart upload
+        """
+        client = await self._get_client()
+        response = await self._run(
+            client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=key,
+            ContentType=content_type,
+        )
+        return response["UploadId"]
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int, body: bytes) -> str:
+        """Upload one part of a multipart upload.
+
+        Args:
+            key: Object key
+            upload_id: Upload ID from ``create_multipart_upload``
+            part_number: Part number, from 1
+            body: Part content (at least 5 MB, except for the last part)
+
+        Returns:
+            str: ETag of the part, needed to complete the upload
+        """
+        client = await self._get_client()
+        response = await self._run(
+            client.upload_part,
+            Bucket=self.bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return response["ETag"]
+
+    async def complete_multipart_upload(
+        self, key: str, upload_id: str, etags: List[str]
+    ) -> None:
+        """Assemble the uploaded parts into the object.
+
+        Args:
+            key: Object key
+            upload_id: Upload ID from ``create_multipart_upload``
+            etags: ETags of the parts, in part number order
+        """
+        client = await self._get_client()
+        await self._run(
+            client.complete_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": etag, "PartNumber": number}
+                    for number, etag in enumerate(etags, start=1)
+                ]
+            },
+        )
+
+    async def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        """Abort a multipart upload, discarding the parts uploaded so far.
+
+        Args:
+            key: Object key
+            upload_id: Upload ID from ``create_multipart_upload``
+        """
+        client = await self._get_client()
+        await self._run(
+            client.abort_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=key,
+            UploadId=upload_id,
+        )
+
+    async def presigned_url(self, key: str, expires_in: int) -> str:
+        """Create a presigned download URL.
+
+        Args:
+            key: Object key
+            expires_in: URL lifetime in seconds
+
+        Returns:
+            str: Presigned URL
+        """
+        client = await self._get_client()
+        return await self._run(
+            client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket_name, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+    async def presigned_urls(self, keys: List[str], expires_in: int) -> List[str]:
+        """Create presigned download URLs for several objects.
+
+        Presigning is local computation, so all URLs are signed in one
+        call to the thread pool rather than one per object.
+
+        Args:
+            keys: Object keys
+            expires_in: URL lifetime in seconds
+
+        Returns:
+            List[str]: Presigned URLs, in the order of ``keys``
+        """
+        client = await self._get_client()
+
+        def sign_all() -> List[str]:
+            return [
+                client.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": self.bucket_name, "Key": key},
+                    ExpiresIn=expires_in,
+                )
+                for key in keys
+            ]
+
+        return await self._run(sign_all)
+
+
+class S3ObjectStream:
+    """Object content streamed from an S3 ``StreamingBody``.
+
+    Each chunk is read in the backend's thread pool, so at most one chunk
+    per download is held in memory. The body is closed once iteration
+    ends, including when the client disconnects mid-download.
+    """
+
+    def __init__(self, backend: S3Backend, body: Any) -> None:
+        """Initialize the stream.
+
+        Args:
+            backend: Backend whose thread pool runs the reads
+            body: botocore ``StreamingBody`` of the object
+        """
+        self._backend = backend
+        self._body = body
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Read the content chunk by chunk.
+
+        Args:
+            chunk_size: Bytes per chunk
+
+        Yields:
+            bytes: Consecutive chunks of the content
+        """
+        try:
+            while True:
+                chunk = await self._backend._run(self._body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self._body.close()
+
+
+# Global S3 backend, created on first use
+_s3_backend: Optional[S3Backend] = None
+
+
+def get_s3_backend() -> S3Backend:
+    """Get the global S3 backend.
+
+    Returns:
+        S3Backend: Backend for the configured bucket (the client itself is
+        only created on the first S3 call)
+    """
+    global _s3_backend
+    if _s3_backend is None:
+        _s3_backend = S3Backend(settings.s3_bucket_name)
+    return _s3_backend
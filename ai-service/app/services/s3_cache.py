@@ -0,0 +1,441 @@
+"""Local read-through cache of S3 objects for LAYA AI Service.
+
+Frequently read files (classroom photos in daily reports, documents out
+for signature) are kept on local disk so repeated reads do not go to S3.
+The cache is bounded in bytes and evicts the least recently used objects.
+
+Entries are keyed by storage path and content checksum, so content that
+changes under the same key is never served stale, and all entries of a
+path are dropped together when the file is deleted::
+
+    <cache_dir>/<2 hex>/<sha256 of storage path>/<checksum or "object">
+
+The cache directory can be shared by all workers on a host:
+
+- entries are written to a temporary file and renamed into place, so a
+  reader only ever sees complete objects
+- recency is the file modification time, refreshed on hits, so it is
+  shared between workers
+- each worker indexes the entries it knows of in memory; when its index
+  passes the size limit, it takes an exclusive lock on the directory,
+  rescans it (picking up other workers' entries) and evicts by mtime
+
+Example:
+    cache = get_s3_cache()
+    content = await cache.get(storage_path, checksum)
+    if content is None:
+        content = await backend.get_object(storage_path)
+        await cache.put(storage_path, checksum, content)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A hit refreshes the recency of an entry at most this often (seconds)
+RECENCY_RESOLUTION_SECONDS = 60
+
+# Eviction frees space down to this fraction of the size limit
+EVICTION_LOW_WATER = 0.9
+
+# Temporary files older than this were left by a crashed writer (seconds)
+STALE_TEMP_SECONDS = 3600
+
+# Name of the lock file serializing eviction between workers
+LOCK_FILENAME = ".lock"
+
+
+class CacheWriter:
+    """Writes one object into the cache as it is streamed.
+
+    The object only becomes visible once ``commit`` renames it into place;
+    writes past the per-object size limit abandon it.
+    """
+
+    def __init__(self, cache: "S3ObjectCache", key: str) -> None:
+        """Initialize the writer.
+
+        Args:
+            cache: Cache the object is written to
+            key: Cache key of the object
+        """
+        self._cache = cache
+        self._key = key
+        self._path = cache.directory / key
+        self._temp_path = self._path.with_name(
+            f".{self._path.name}.{os.getpid()}.{uuid4().hex}.tmp"
+        )
+        self._file: Any = None
+        self._size = 0
+        self._closed = False
+
+    def _open(self) -> None:
+        """Create the temporary file."""
+        self._temp_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._temp_path, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        """Append a chunk, abandoning the object if it grows too large.
+
+        Args:
+            chunk: Next chunk of the object
+        """
+        if self._closed:
+            return
+        self._size += len(chunk)
+        if self._size > self._cache.max_object_bytes:
+            await self.abort()
+            return
+        try:
+            if self._file is None:
+                await asyncio.to_thread(self._open)
+            await asyncio.to_thread(self._file.write, chunk)
+        except OSError as e:
+            logger.warning(f"Failed to write S3 cache entry {self._key}: {e}")
+            await self.abort()
+
+    async def commit(self) -> None:
+        """Make the written object visible in the cache."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._file is None:
+                await asyncio.to_thread(self._open)
+            await asyncio.to_thread(self._finish)
+        except OSError as e:
+            logger.warning(f"Failed to store S3 cache entry {self._key}: {e}")
+            await asyncio.to_thread(self._discard)
+            return
+        await self._cache._ensure_loaded()
+        self._cache._remember(self._key, self._size)
+        await self._cache._evict_if_full()
+
+    async def abort(self) -> None:
+        """Discard the object written so far."""
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.to_thread(self._discard)
+
+    def _finish(self) -> None:
+        """Close the temporary file and rename it into place."""
+        self._file.close()
+        os.replace(self._temp_path, self._path)
+
+    def _discard(self) -> None:
+        """Close and delete the temporary file."""
+        if self._file is not None:
+            self._file.close()
+        self._temp_path.unlink(missing_ok=True)
+
+
+class S3ObjectCache:
+    """Bounded on-disk LRU cache of S3 objects.
+
+    Attributes:
+        directory: Directory holding the cached objects
+        max_bytes: Size limit of the cache
+        max_object_bytes: Largest object cached
+        hits: Reads served from the cache by this worker
+        misses: Reads not found in the cache by this worker
+        evictions: Objects evicted by this worker
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_object_bytes: int) -> None:
+        """Initialize the cache; the directory is scanned on first use.
+
+        Args:
+            directory: Directory holding the cached objects
+            max_bytes: Size limit of the cache
+            max_object_bytes: Largest object cached
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_object_bytes = min(max_object_bytes, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Known entries and their sizes, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @staticmethod
+    def key(storage_path: str, checksum: Optional[str] = None) -> str:
+        """Cache key of an object, relative to the cache directory.
+
+        Args:
+            storage_path: S3 key of the object
+            checksum: SHA-256 of the content, if known
+
+        Returns:
+            str: Relative path of the cached object
+        """
+        digest = hashlib.sha256(storage_path.encode()).hexdigest()
+        return f"{digest[:2]}/{digest}/{checksum.lower() if checksum else 'object'}"
+
+    async def get_path(
+        self, storage_path: str, checksum: Optional[str] = None
+    ) -> Optional[Path]:
+        """Get the local path of a cached object.
+
+        Args:
+            storage_path: S3 key of the object
+            checksum: SHA-256 of the content, if known
+
+        Returns:
+            Optional[Path]: Path of the cached object, None on a miss
+        """
+        await self._ensure_loaded()
+        key = self.key(storage_path, checksum)
+        path = self.directory / key
+        size = await asyncio.to_thread(self._touch, path)
+        if size is None:
+            self._forget(key)
+            self.misses += 1
+            return None
+        # Also adopts entries written by other workers
+        self._remember(key, size)
+        self.hits += 1
+        return path
+
+    async def get(self, storage_path: str, checksum: Optional[str] = None) -> Optional[bytes]:
+        """Read a cached object.
+
+        Args:
+            storage_path: S3 key of the object
+            checksum: SHA-256 of the content, if known
+
+        Returns:
+            Optional[bytes]: Content of the object, None on a miss
+        """
+        path = await self.get_path(storage_path, checksum)
+        if path is None:
+            return None
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except OSError:
+            # Evicted by another worker since
+            self._forget(self.key(storage_path, checksum))
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+    async def put(self, storage_path: str, checksum: Optional[str], content: bytes) -> None:
+        """Store an object, unless it is larger than ``max_object_bytes``.
+
+        Args:
+            storage_path: S3 key of the object
+            checksum: SHA-256 of the content, if known
+            content: Content of the object
+        """
+        writer = self.writer(storage_path, checksum)
+        await writer.write(content)
+        await writer.commit()
+
+    def writer(self, storage_path: str, checksum: Optional[str] = None) -> CacheWriter:
+        """Start storing an object as it is streamed.
+
+        Args:
+            storage_path: S3 key of the object
+            checksum: SHA-256 of the content, if known
+
+        Returns:
+            CacheWriter: Writer to pass the chunks to, then commit
+        """
+        return CacheWriter(self, self.key(storage_path, checksum))
+
+    async def tee(
+        self,
+        chunks: AsyncIterator[bytes],
+        storage_path: str,
+        checksum: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """Pass a stream through, storing the object once it is complete.
+
+        An object whose stream is not read to the end (e.g. the client
+        disconnected) is not stored.
+
+        Args:
+            chunks: Stream of the whole object
+            storage_path: S3 key of the object
+            checksum: SHA-256 of the content, if known
+
+        Yields:
+            bytes: The chunks of ``chunks``
+        """
+        writer = self.writer(storage_path, checksum)
+        try:
+            async for chunk in chunks:
+                await writer.write(chunk)
+                yield chunk
+            await writer.commit()
+        finally:
+            await writer.abort()
+
+    async def invalidate(self, storage_path: str) -> None:
+        """Drop every cached version of an object.
+
+        Args:
+            storage_path: S3 key of the object
+        """
+        prefix = self.key(storage_path).rpartition("/")[0]
+        for key in [key for key in self._entries if key.startswith(f"{prefix}/")]:
+            self._forget(key)
+        await asyncio.to_thread(shutil.rmtree, self.directory / prefix, True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics of this worker.
+
+        Returns:
+            Dict[str, Any]: Size, entries and hit rate of the cache
+        """
+        reads = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "utilization_percent": round(self._total_bytes / self.max_bytes * 100, 2)
+            if self.max_bytes
+            else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(self.hits / reads * 100, 2) if reads else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def _remember(self, key: str, size: int) -> None:
+        """Record an entry as the most recently used."""
+        self._total_bytes += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+
+    def _forget(self, key: str) -> None:
+        """Drop an entry from the index."""
+        self._total_bytes -= self._entries.pop(key, 0)
+
+    @staticmethod
+    def _touch(path: Path) -> Optional[int]:
+        """Refresh the recency of a cached object.
+
+        Returns:
+            Optional[int]: Size of the object, None if it is not cached
+        """
+        try:
+            stat_result = path.stat()
+            if time.time() - stat_result.st_mtime > RECENCY_RESOLUTION_SECONDS:
+                os.utime(path)
+        except OSError:
+            return None
+        return stat_result.st_size
+
+    async def _ensure_loaded(self) -> None:
+        """Index the entries already on disk, once."""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if not self._loaded:
+                await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+                self._reindex(await asyncio.to_thread(self._scan))
+                self._loaded = True
+
+    async def _evict_if_full(self) -> None:
+        """Evict least recently used objects once the size limit is passed."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        entries = await asyncio.to_thread(self._evict, int(self.max_bytes * EVICTION_LOW_WATER))
+        self._reindex(entries)
+
+    def _reindex(self, entries: List[Tuple[str, int, float]]) -> None:
+        """Replace the index with a scan of the directory."""
+        self._entries = OrderedDict((key, size) for key, size, _ in entries)
+        self._total_bytes = sum(self._entries.values())
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """List the cached objects, least recently used first.
+
+        Temporary files left behind by crashed writers are deleted.
+
+        Returns:
+            List[Tuple[str, int, float]]: Key, size and mtime of each object
+        """
+        entries = []
+        now = time.time()
+        for path in self.directory.glob("*/*/*"):
+            try:
+                stat_result = path.stat()
+                if path.name.startswith("."):
+                    if now - stat_result.st_mtime > STALE_TEMP_SECONDS:
+                        path.unlink()
+                    continue
+            except OSError:
+                continue
+            key = path.relative_to(self.directory).as_posix()
+            entries.append((key, stat_result.st_size, stat_result.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def _evict(self, target_bytes: int) -> List[Tuple[str, int, float]]:
+        """Delete least recently used objects until the cache fits ``target_bytes``.
+
+        Holds an exclusive lock on the directory, so workers sharing it
+        evict one at a time from the same view of its content.
+
+        Returns:
+            List[Tuple[str, int, float]]: The objects left, least recently used first
+        """
+        import fcntl
+
+        with open(self.directory / LOCK_FILENAME, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entries = self._scan()
+                total = sum(size for _, size, _ in entries)
+                evicted = 0
+                for key, size, _ in entries:
+                    if total <= target_bytes:
+                        break
+                    path = self.directory / key
+                    path.unlink(missing_ok=True)
+                    try:
+                        path.parent.rmdir()
+                    except OSError:
+                        pass  # Other versions of the object remain
+                    total -= size
+                    evicted += 1
+                self.evictions += evicted
+                return entries[evicted:]
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Global cache instance
+_s3_cache: Optional[S3ObjectCache] = None
+
+
+def get_s3_cache() -> S3ObjectCache:
+    """Get or create the global S3 object cache.
+
+    Returns:
+        S3ObjectCache: Cache configured from the settings
+    """
+    global _s3_cache
+    if _s3_cache is None:
+        _s3_cache = S3ObjectCache(
+            directory=settings.s3_cache_dir,
+            max_bytes=settings.s3_cache_max_mb * 1024 * 1024,
+            max_object_bytes=settings.s3_cache_max_object_mb * 1024 * 1024,
+        )
+    return _s3_cache
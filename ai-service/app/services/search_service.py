@@ -11,10 +11,14 @@ from uuid import UUID
 from sqlalchemy import or_, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.counting import CountStrategy, CountedPage, fetch_page, track_counts
 from app.models.activity import Activity
 from app.schemas.activity import ActivityResponse
 from app.schemas.search import SearchResult, SearchResultType, SearchType
 
+# Cached search totals are invalidated by writes to activities
+track_counts(Activity)
+
 
 class SearchService:
     """Service for full-text search across entities.
@@ -50,7 +54,8 @@ class SearchService:
         query: str,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[SearchResult], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountedPage[SearchResult]:
         """Search activities using full-text search.
 
         Uses PostgreSQL's tsvector and tsquery for efficient full-text
@@ -63,35 +68,40 @@ class SearchService:
             query: Search query string
             skip: Number of records to skip
             limit: Maximum number of records to return
+            count_strategy: How the total number of matches is obtained
 
         Returns:
-            Tuple of (search results, total count)
+            Page of search results with the total count
         """
         search_term = query.strip()
 
         # Check if we're using PostgreSQL with tsvector support
         if self._is_postgresql():
             # Use PostgreSQL tsvector full-text search
-            return await self._search_activities_pg(search_term, skip, limit)
+            return await self._search_activities_pg(search_term, skip, limit, count_strategy)
         else:
             # Fallback to ILIKE for SQLite/other databases
-            return await self._search_activities_fallback(search_term, skip, limit)
+            return await self._search_activities_fallback(
+                search_term, skip, limit, count_strategy
+            )
 
     async def _search_activities_pg(
         self,
         search_term: str,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[SearchResult], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountedPage[SearchResult]:
         """Search activities using PostgreSQL tsvector.
 
         Args:
             search_term: Search query string
             skip: Number of records to skip
             limit: Maximum number of records to return
+            count_strategy: How the total number of matches is obtained
 
         Returns:
-            Tuple of (search results, total count)
+            Page of search results with the total count
         """
         # Create tsquery from search term
         # plainto_tsquery automatically handles stop words, stemming, and special chars
@@ -111,30 +121,14 @@ class SearchService:
                 Activity.search_vector.op('@@')(tsquery)
             )
             .order_by(relevance.desc())
-            .offset(skip)
-            .limit(limit)
         )
 
-        result = await self.db.execute(stmt)
-        rows = result.all()
-
-        # Get total count
-        count_stmt = (
-            select(func.count())
-            .select_from(Activity)
-            .where(
-                Activity.is_active == True,  # noqa: E712
-            )
-            .where(
-                Activity.search_vector.op('@@')(tsquery)
-            )
-        )
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar_one()
+        # Rows and total in one round trip (or a cached/estimated total)
+        page = await fetch_page(self.db, stmt, skip, limit, strategy=count_strategy)
 
         # Convert to search results
         results = []
-        for activity, relevance_score in rows:
+        for activity, relevance_score in page.items:
             # Normalize relevance score to 0-1 range
             # ts_rank typically returns values between 0 and 1, but can be higher
             # Clamp to max of 1.0
@@ -142,23 +136,25 @@ class SearchService:
 
             results.append(self._activity_to_search_result(activity, normalized_score))
 
-        return results, total
+        return CountedPage(items=results, total=page.total, approximate=page.approximate)
 
     async def _search_activities_fallback(
         self,
         search_term: str,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[SearchResult], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountedPage[SearchResult]:
         """Search activities using ILIKE fallback for SQLite.
 
         Args:
             search_term: Search query string
             skip: Number of records to skip
             limit: Maximum number of records to return
+            count_strategy: How the total number of matches is obtained
 
         Returns:
-            Tuple of (search results, total count)
+            Page of search results with the total count
         """
         # Build query using ILIKE for simple pattern matching
         stmt = (
@@ -174,34 +170,14 @@ class SearchService:
                 )
             )
             .order_by(Activity.created_at.desc())
-            .offset(skip)
-            .limit(limit)
         )
 
-        result = await self.db.execute(stmt)
-        activities = result.scalars().all()
-
-        # Get total count
-        count_stmt = (
-            select(func.count())
-            .select_from(Activity)
-            .where(
-                Activity.is_active == True,  # noqa: E712
-            )
-            .where(
-                or_(
-                    Activity.name.ilike(f"%{search_term}%"),
-                    Activity.description.ilike(f"%{search_term}%"),
-                    Activity.special_needs_adaptations.ilike(f"%{search_term}%"),
-                )
-            )
-        )
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar_one()
+        # Rows and total in one round trip (or a cached/estimated total)
+        page = await fetch_page(self.db, stmt, skip, limit, strategy=count_strategy)
 
         # Convert to search results
         results = []
-        for activity in activities:
+        for activity in page.items:
             # Calculate a simple relevance score based on match location
             relevance = 1.0
             if search_term.lower() in activity.name.lower():
@@ -213,7 +189,7 @@ class SearchService:
 
             results.append(self._activity_to_search_result(activity, relevance))
 
-        return results, total
+        return CountedPage(items=results, total=page.total, approximate=page.approximate)
 
     def _activity_to_search_result(
         self,
@@ -264,7 +240,7 @@ class SearchService:
         query: str,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[SearchResult], int]:
+    ) -> CountedPage[SearchResult]:
         """Search children (placeholder for future implementation).
 
         Args:
@@ -273,21 +249,21 @@ class SearchService:
             limit: Maximum number of records to return
 
         Returns:
-            Tuple of (empty search results, 0 count)
+            Empty page of search results
 
         Note:
             Children data is managed by gibbon-service. This is a placeholder
             for future cross-service search integration.
         """
         # Placeholder - children are managed by gibbon-service
-        return [], 0
+        return CountedPage()
 
     async def search_coaching_sessions(
         self,
         query: str,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[SearchResult], int]:
+    ) -> CountedPage[SearchResult]:
         """Search coaching sessions (placeholder for future implementation).
 
         Args:
@@ -296,13 +272,13 @@ class SearchService:
             limit: Maximum number of records to return
 
         Returns:
-            Tuple of (empty search results, 0 count)
+            Empty page of search results
 
         Note:
             This is a placeholder for future coaching session search.
         """
         # Placeholder for future implementation
-        return [], 0
+        return CountedPage()
 
     async def search(
         self,
@@ -310,7 +286,8 @@ class SearchService:
         types: list[SearchType],
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[SearchResult], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountedPage[SearchResult]:
         """Search across multiple entity types.
 
         Args:
@@ -318,12 +295,13 @@ class SearchService:
             types: Entity types to search in
             skip: Number of records to skip
             limit: Maximum number of records to return
+            count_strategy: How the total number of matches is obtained
 
         Returns:
-            Tuple of (combined search results, total count)
+            Page of combined search results with the total count (approximate
+            if any entity type's total is)
         """
-        all_results: list[SearchResult] = []
-        total_count = 0
+        pages: list[CountedPage[SearchResult]] = []
 
         # Determine which types to search
         search_all = SearchType.ALL in types
@@ -331,34 +309,33 @@ class SearchService:
         search_children = search_all or SearchType.CHILDREN in types
         search_coaching = search_all or SearchType.COACHING_SESSIONS in types
 
+        # Each type contributes its best skip + limit results, enough to
+        # fill the requested page once merged by relevance
+        window = skip + limit
+
         # Search activities
         if search_activities:
-            activity_results, activity_total = await self.search_activities(
-                query, skip=0, limit=limit * 2
+            pages.append(
+                await self.search_activities(
+                    query, skip=0, limit=window, count_strategy=count_strategy
+                )
             )
-            all_results.extend(activity_results)
-            total_count += activity_total
 
         # Search children (placeholder)
         if search_children:
-            children_results, children_total = await self.search_children(
-                query, skip=0, limit=limit * 2
-            )
-            all_results.extend(children_results)
-            total_count += children_total
+            pages.append(await self.search_children(query, skip=0, limit=window))
 
         # Search coaching sessions (placeholder)
         if search_coaching:
-            coaching_results, coaching_total = await self.search_coaching_sessions(
-                query, skip=0, limit=limit * 2
-            )
-            all_results.extend(coaching_results)
-            total_count += coaching_total
+            pages.append(await self.search_coaching_sessions(query, skip=0, limit=window))
 
         # Sort all results by relevance score
+        all_results = [result for page in pages for result in page.items]
         all_results.sort(key=lambda r: r.relevance_score, reverse=True)
 
         # Apply pagination to combined results
-        paginated_results = all_results[skip : skip + limit]
-
-        return paginated_results, total_count
+        return CountedPage(
+            items=all_results[skip : skip + limit],
+            total=sum(page.total for page in pages),
+            approximate=any(page.approximate for page in pages),
+        )
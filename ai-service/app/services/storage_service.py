@@ -2,35 +2,36 @@
 
 Provides business logic for file upload, storage, and management.
 Implements local filesystem and S3 backend support with thumbnail generation.
+
+The AWS SDK and Pillow are only loaded once a file actually goes to S3 or a
+thumbnail is generated (see ``s3_backend`` and ``image_processing``).
 """
 
 import asyncio
 import base64
 import hashlib
 import hmac
-import io
+import logging
 import os
 import secrets
 import shutil
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from functools import partial
-from pathlib import Path
-from typing import Optional
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterable, Optional, Union
 from urllib.parse import urlencode
 from uuid import UUID, uuid4
 
-import boto3
-from botocore.config import Config as BotoConfig
-from botocore.exceptions import ClientError
-from PIL import Image
-from sqlalchemy import cast, func, select, String
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.config import settings
 
 
+logger = logging.getLogger(__name__)
+
 # Thumbnail size presets in pixels
 THUMBNAIL_SIZE_PIXELS = {
     "small": 64,
@@ -46,12 +47,14 @@ IMAGE_MIME_TYPES = frozenset({
     "image/webp",
 })
 
-# Thread pool for running sync image processing operations
-_image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image_")
+# Attempts at referencing content whose blob is collected concurrently
+BLOB_STORE_ATTEMPTS = 2
+
 from app.models.storage import (
     File,
     FileThumbnail,
     StorageBackend,
+    StorageBlob,
     StorageQuota,
     ThumbnailSize,
 )
@@ -61,6 +64,28 @@ from app.schemas.storage import (
     StorageQuotaResponse,
     ThumbnailResponse,
 )
+from app.services.file_download import (
+    DOWNLOAD_CHUNK_SIZE,
+    FileDownload,
+    select_range,
+    strong_etag,
+)
+from app.services.image_processing import (
+    ImageProcessingError,
+    create_thumbnails_async,
+)
+from app.services.s3_backend import S3Backend, S3BackendError, get_s3_backend
+from app.services.s3_cache import S3ObjectCache, get_s3_cache
+from app.services.upload_pipeline import (
+    ContentTypeMismatchError,
+    LocalFileSink,
+    S3MultipartSink,
+    UploadResult,
+    UploadSink,
+    UploadTooLargeError,
+    iter_bytes,
+    stream_upload,
+)
 
 
 class StorageServiceError(Exception):
@@ -117,10 +142,6 @@ class UnauthorizedAccessError(StorageServiceError):
     pass
 
 
-# Thread pool for running sync S3 operations
-_s3_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="s3_")
-
-
 class StorageService:
     """Service class for file storage and management logic.
 
@@ -144,17 +165,19 @@ class StorageService:
         self._storage_backend = StorageBackend(settings.storage_backend)
         self._default_quota_bytes = settings.storage_quota_mb * 1024 * 1024
 
-        # Initialize S3 client if using S3 backend
-        self._s3_client = None
+        # Use the shared S3 backend if using S3; its client is created lazily
+        self._s3: Optional[S3Backend] = None
+        self._s3_cache: Optional[S3ObjectCache] = None
         self._s3_bucket_name = settings.s3_bucket_name
         if self._storage_backend == StorageBackend.S3:
             self._init_s3_client()
+            if settings.s3_cache_enabled:
+                self._s3_cache = get_s3_cache()
 
     def _init_s3_client(self) -> None:
-        """Initialize the S3 client with configured credentials.
+        """Attach the S3 backend after checking its configuration.
 
-        Creates a boto3 S3 client using settings from the application config.
-        Supports custom endpoints for S3-compatible services like MinIO.
+        The boto3 client itself is created on the first S3 operation.
 
         Raises:
             S3StorageError: If S3 configuration is missing or invalid.
@@ -165,29 +188,7 @@ class StorageService:
                 "Set the S3_BUCKET_NAME environment variable."
             )
 
-        # Build boto3 config
-        boto_config = BotoConfig(
-            signature_version="s3v4",
-            retries={"max_attempts": 3, "mode": "standard"},
-        )
-
-        # Build client arguments
-        client_kwargs = {
-            "service_name": "s3",
-            "region_name": settings.s3_region,
-            "config": boto_config,
-        }
-
-        # Add credentials if provided
-        if settings.s3_access_key_id and settings.s3_secret_access_key:
-            client_kwargs["aws_access_key_id"] = settings.s3_access_key_id
-            client_kwargs["aws_secret_access_key"] = settings.s3_secret_access_key
-
-        # Add custom endpoint if provided (for S3-compatible services)
-        if settings.s3_endpoint_url:
-            client_kwargs["endpoint_url"] = settings.s3_endpoint_url
-
-        self._s3_client = boto3.client(**client_kwargs)
+        self._s3 = get_s3_backend()
 
     async def upload_file(
         self,
@@ -201,7 +202,9 @@ class StorageService:
         """Upload a file to storage.
 
         Validates file type and size, checks quota, stores the file,
-        and creates the database record.
+        and creates the database record. Content that is already in memory
+        goes through the same pipeline as streamed uploads
+        (see ``upload_stream``).
 
         Args:
             owner_id: UUID of the user uploading the file.
@@ -219,14 +222,9 @@ class StorageService:
             FileTooLargeError: If the file exceeds the maximum size.
             QuotaExceededError: If the upload would exceed the user's quota.
         """
-        # Validate file type
-        if content_type not in self._allowed_file_types:
-            raise InvalidFileTypeError(
-                f"File type '{content_type}' is not allowed. "
-                f"Allowed types: {', '.join(sorted(self._allowed_file_types))}"
-            )
+        self._validate_content_type(content_type)
 
-        # Validate file size
+        # Validate file size before touching the quota
         file_size = len(file_content)
         if file_size > self._max_file_size_bytes:
             raise FileTooLargeError(
@@ -234,64 +232,509 @@ class StorageService:
                 f"allowed size ({self._max_file_size_bytes} bytes)"
             )
 
-        # Check quota
+        return await self.upload_stream(
+            owner_id=owner_id,
+            chunks=iter_bytes(file_content, settings.upload_chunk_size),
+            original_filename=original_filename,
+            content_type=content_type,
+            description=description,
+            is_public=is_public,
+        )
+
+    async def upload_stream(
+        self,
+        owner_id: UUID,
+        chunks: AsyncIterable[bytes],
+        original_filename: str,
+        content_type: str,
+        description: Optional[str] = None,
+        is_public: bool = False,
+    ) -> File:
+        """Upload a file to storage from a stream of chunks.
+
+        The chunks are size-checked, hashed, sniffed and written to the
+        storage backend as they arrive (see ``app.services.upload_pipeline``),
+        so memory use does not grow with the file size. The database record
+        is only created once the file is stored; a rejected or failed
+        upload leaves no file behind.
+
+        Content is stored once per checksum: if it is already stored, the
+        new copy is discarded before it is committed to the backend (so
+        nothing is moved into place, and no S3 PUT or multipart completion
+        is sent) and the file references the existing blob. The content
+        itself must still be received, as proof of possession; clients
+        re-uploading their own content can skip that with
+        ``create_file_from_checksum``. An owner is charged quota once per
+        distinct content.
+
+        Args:
+            owner_id: UUID of the user uploading the file.
+            chunks: The file content, in order.
+            original_filename: Original filename from the upload.
+            content_type: MIME type of the file.
+            description: Optional description of the file.
+            is_public: Whether the file should be publicly accessible.
+
+        Returns:
+            The created File record.
+
+        Raises:
+            InvalidFileTypeError: If the file type is not allowed or the
+                content is not of the declared type.
+            FileTooLargeError: If the file exceeds the maximum size.
+            QuotaExceededError: If the upload would exceed the user's quota.
+            S3StorageError: If the S3 upload fails.
+        """
+        self._validate_content_type(content_type)
+
+        # The upload stops as soon as it passes the size limit or the quota
         quota = await self.get_or_create_quota(owner_id)
-        if quota.used_bytes + file_size > quota.quota_bytes:
-            raise QuotaExceededError(
-                f"Upload would exceed storage quota. "
-                f"Available: {quota.available_bytes} bytes, "
-                f"Required: {file_size} bytes"
-            )
+        available_bytes = max(0, quota.quota_bytes - quota.used_bytes)
+        max_bytes = min(self._max_file_size_bytes, available_bytes)
 
-        # Generate unique filename and calculate checksum
+        # Generate unique filename
         file_id = uuid4()
         file_extension = self._get_file_extension(original_filename)
         stored_filename = f"{file_id}{file_extension}"
-        checksum = self._calculate_checksum(file_content)
 
-        # Store file based on backend
-        if self._storage_backend == StorageBackend.LOCAL:
-            storage_path = await self._upload_to_local(
-                file_content, stored_filename, owner_id
+        stored_blob: Optional[StorageBlob] = None
+
+        async def is_stored(checksum: str) -> bool:
+            # Referenced before the copy is discarded, so it cannot be collected
+            nonlocal stored_blob
+            blob = await self._find_blob(checksum)
+            if blob is None or not await self._reference_blob(blob.id):
+                return False
+            stored_blob = blob
+            return True
+
+        try:
+            upload = await stream_upload(
+                chunks,
+                self._upload_sink(stored_filename, owner_id, content_type),
+                max_bytes=max_bytes,
+                declared_content_type=content_type,
+                is_stored=is_stored,
             )
-        else:
-            storage_path = await self._upload_to_s3(
-                file_content, stored_filename, owner_id, content_type
+        except UploadTooLargeError as e:
+            if e.size > self._max_file_size_bytes:
+                raise FileTooLargeError(
+                    f"File size exceeds maximum allowed size "
+                    f"({self._max_file_size_bytes} bytes)"
+                ) from e
+            raise QuotaExceededError(
+                f"Upload would exceed storage quota. "
+                f"Available: {available_bytes} bytes, "
+                f"Required: more than {available_bytes} bytes"
+            ) from e
+        except ContentTypeMismatchError as e:
+            raise InvalidFileTypeError(str(e)) from e
+        except S3BackendError as e:
+            raise S3StorageError(f"Failed to upload file to S3: {e}") from e
+
+        blob = stored_blob
+        blob_path = None if blob is None else blob.storage_path
+        try:
+            if blob is None:
+                blob = await self._store_blob(upload, content_type)
+                blob_path = blob.storage_path
+            # The blob row is locked by the reference, so a concurrent upload
+            # of the same content by the owner is charged after this one
+            already_charged = await self._owner_has_blob(owner_id, blob.id)
+
+            # Create file record
+            file_record = File(
+                id=file_id,
+                owner_id=owner_id,
+                filename=stored_filename,
+                original_filename=original_filename,
+                content_type=content_type,
+                size_bytes=upload.size_bytes,
+                storage_backend=self._storage_backend,
+                storage_path=blob.storage_path,
+                checksum=upload.checksum,
+                blob_id=blob.id,
+                is_public=is_public,
+                description=description,
             )
+            self.db.add(file_record)
+
+            # Charged last, so the quota row is locked only until the commit
+            charged_bytes = 0 if already_charged else upload.size_bytes
+            if not await self._charge_quota(owner_id, charged_bytes):
+                raise QuotaExceededError(
+                    f"Upload would exceed storage quota. Required: {charged_bytes} bytes"
+                )
+
+            await self.db.commit()
+        except Exception:
+            # Rolling back releases the blob reference and quota charge
+            await self.db.rollback()
+            if upload.storage_path is not None and blob_path in (None, upload.storage_path):
+                await self._discard_upload(upload.storage_path)
+            raise
+
+        await self.db.refresh(file_record)
+
+        return file_record
+
+    async def create_file_from_checksum(
+        self,
+        owner_id: UUID,
+        checksum: str,
+        original_filename: str,
+        content_type: str,
+        description: Optional[str] = None,
+        is_public: bool = False,
+    ) -> Optional[File]:
+        """Create a file from content the owner has already stored.
+
+        Lets clients skip the transfer entirely when re-uploading content.
+        Only content referenced by one of the owner's own files qualifies:
+        knowing a checksum must not grant access to other users' content.
+
+        Args:
+            owner_id: UUID of the user creating the file.
+            checksum: SHA-256 checksum of the content (hexadecimal).
+            original_filename: Original filename of the new file.
+            content_type: MIME type of the file.
+            description: Optional description of the file.
+            is_public: Whether the file should be publicly accessible.
+
+        Returns:
+            The created File record, or None if the content must be uploaded.
 
-        # Create file record
+        Raises:
+            InvalidFileTypeError: If the file type is not allowed.
+        """
+        self._validate_content_type(content_type)
+        await self.get_or_create_quota(owner_id)
+
+        blob = await self._find_blob(checksum.lower())
+        if (
+            blob is None
+            or blob.content_type != content_type
+            or not await self._reference_blob(blob.id)
+        ):
+            return None
+        # Checked once the reference locks the blob row, as in upload_stream
+        if not await self._owner_has_blob(owner_id, blob.id):
+            await self._release_blob(blob.id)
+            await self.db.commit()
+            return None
+
+        file_id = uuid4()
         file_record = File(
             id=file_id,
             owner_id=owner_id,
-            filename=stored_filename,
+            filename=f"{file_id}{self._get_file_extension(original_filename)}",
             original_filename=original_filename,
             content_type=content_type,
-            size_bytes=file_size,
-            storage_backend=self._storage_backend,
-            storage_path=storage_path,
-            checksum=checksum,
+            size_bytes=blob.size_bytes,
+            storage_backend=blob.storage_backend,
+            storage_path=blob.storage_path,
+            checksum=blob.checksum,
+            blob_id=blob.id,
             is_public=is_public,
             description=description,
         )
         self.db.add(file_record)
 
-        # Update quota
-        quota.used_bytes += file_size
-        quota.file_count += 1
+        # The owner was charged for this content already
+        await self._charge_quota(owner_id, 0)
 
         await self.db.commit()
         await self.db.refresh(file_record)
 
         return file_record
 
-    async def download_file(
+    async def _find_blob(self, checksum: str) -> Optional[StorageBlob]:
+        """Get the blob of a content on the configured backend.
+
+        Args:
+            checksum: SHA-256 checksum of the content.
+
+        Returns:
+            The StorageBlob if the content is stored, None otherwise.
+        """
+        query = select(StorageBlob).where(
+            StorageBlob.checksum == checksum,
+            StorageBlob.storage_backend == self._storage_backend,
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def _reference_blob(self, blob_id: UUID) -> bool:
+        """Add a reference to a blob.
+
+        The increment is a single UPDATE, so it either lands before the
+        blob is collected (which then keeps it) or finds it gone.
+
+        Args:
+            blob_id: UUID of the blob.
+
+        Returns:
+            True if the reference was added, False if the blob was collected.
+        """
+        result = await self.db.execute(
+            update(StorageBlob)
+            .where(StorageBlob.id == blob_id)
+            .values(ref_count=StorageBlob.ref_count + 1, orphaned_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def _owner_has_blob(
+        self,
+        owner_id: UUID,
+        blob_id: UUID,
+        exclude_file_id: Optional[UUID] = None,
+    ) -> bool:
+        """Check whether any of the owner's files references a blob.
+
+        Callers reference or release the blob first: that UPDATE locks its
+        row until the commit, so concurrent uploads and deletions of the
+        same content by one owner see each other's files, and the owner is
+        charged and refunded exactly once.
+
+        Args:
+            owner_id: UUID of the owner.
+            blob_id: UUID of the blob.
+            exclude_file_id: File to leave out of the check.
+
+        Returns:
+            True if the owner has a file with this content.
+        """
+        query = select(File.id).where(File.owner_id == owner_id, File.blob_id == blob_id)
+        if exclude_file_id is not None:
+            query = query.where(File.id != exclude_file_id)
+        result = await self.db.execute(query.limit(1))
+        return result.first() is not None
+
+    async def _store_blob(self, upload: UploadResult, content_type: str) -> StorageBlob:
+        """Reference the blob of freshly uploaded content, creating it if new.
+
+        The blob is inserted unless its content is already stored; a
+        concurrent upload of the same content waits for the insert to
+        commit, then references the blob instead of storing its own. If
+        the content was stored first by another upload, the fresh copy is
+        deleted.
+
+        Args:
+            upload: Result of the streaming upload.
+            content_type: MIME type of the content.
+
+        Returns:
+            The StorageBlob now holding the content, with a reference added.
+
+        Raises:
+            StorageServiceError: If the blob keeps being collected meanwhile.
+        """
+        insert = self._insert_ignoring_conflicts(StorageBlob).values(
+            id=uuid4(),
+            checksum=upload.checksum,
+            storage_backend=self._storage_backend,
+            storage_path=upload.storage_path,
+            size_bytes=upload.size_bytes,
+            content_type=content_type,
+            ref_count=0,
+        )
+        for _ in range(BLOB_STORE_ATTEMPTS):
+            await self.db.execute(
+                insert.on_conflict_do_nothing(index_elements=["checksum", "storage_backend"])
+            )
+            blob = await self._find_blob(upload.checksum)
+            # An existing blob may have been collected in between
+            if blob is not None and await self._reference_blob(blob.id):
+                break
+        else:
+            raise StorageServiceError("Failed to store file content")
+
+        if blob.storage_path != upload.storage_path:
+            await self._delete_stored(self._storage_backend, upload.storage_path)
+        return blob
+
+    def _insert_ignoring_conflicts(
+        self, model: type
+    ) -> Union[postgresql.Insert, sqlite.Insert]:
+        """Start an INSERT supporting ``on_conflict_do_nothing``.
+
+        Args:
+            model: Model inserted into.
+
+        Returns:
+            INSERT statement of the session's database dialect.
+        """
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(model)
+        return postgresql.insert(model)
+
+    async def _release_blob(self, blob_id: UUID, references: int = 1) -> bool:
+        """Remove references to a blob.
+
+        Args:
+            blob_id: UUID of the blob.
+            references: Number of references removed.
+
+        Returns:
+            True if no references remain.
+        """
+        result = await self.db.execute(
+            update(StorageBlob)
+            .where(StorageBlob.id == blob_id)
+            .values(
+                ref_count=StorageBlob.ref_count - references,
+                orphaned_at=case(
+                    (StorageBlob.ref_count <= references, func.now()), else_=None
+                ),
+            )
+            .returning(StorageBlob.ref_count)
+            .execution_options(synchronize_session=False)
+        )
+        remaining = result.scalar_one_or_none()
+        return remaining is not None and remaining <= 0
+
+    async def collect_blob(self, blob_id: UUID) -> bool:
+        """Delete a blob, its content and thumbnails if it is unreferenced.
+
+        The row is deleted first, conditionally, and committed: an upload
+        referencing the blob at the same time either keeps it alive or
+        finds it gone and stores its own copy. Content that then fails to
+        delete is logged and left behind.
+
+        Args:
+            blob_id: UUID of the blob.
+
+        Returns:
+            True if the blob was deleted.
+        """
+        result = await self.db.execute(
+            delete(StorageBlob)
+            .where(StorageBlob.id == blob_id, StorageBlob.ref_count <= 0)
+            .returning(
+                StorageBlob.storage_backend,
+                StorageBlob.storage_path,
+                StorageBlob.content_type,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        await self.db.commit()
+        if row is None:
+            return False
+
+        backend, storage_path, content_type = row
+        paths = [storage_path]
+        if content_type in IMAGE_MIME_TYPES:
+            paths.extend(
+                self._thumbnail_storage_path(storage_path, size, content_type)
+                for size in ThumbnailSize
+            )
+        for path in paths:
+            try:
+                await self._delete_stored(backend, path)
+            except StorageServiceError as e:
+                logger.warning(f"Failed to delete content of blob {blob_id} at {path}: {e}")
+        return True
+
+    async def collect_orphaned_blobs(self, grace_seconds: int, limit: int = 500) -> int:
+        """Delete blobs left unreferenced for longer than a grace period.
+
+        Blobs are normally deleted as soon as their last file is; this
+        catches those left behind when that failed or was interrupted.
+
+        Args:
+            grace_seconds: Minimum time a blob has been unreferenced.
+            limit: Maximum number of blobs deleted per call.
+
+        Returns:
+            Number of blobs deleted.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+        result = await self.db.execute(
+            select(StorageBlob.id)
+            .where(StorageBlob.ref_count <= 0, StorageBlob.orphaned_at < cutoff)
+            .order_by(StorageBlob.orphaned_at)
+            .limit(limit)
+        )
+        collected = 0
+        for blob_id in result.scalars().all():
+            if await self.collect_blob(blob_id):
+                collected += 1
+        return collected
+
+    async def _discard_upload(self, storage_path: str) -> None:
+        """Delete the stored copy of an upload that was not recorded.
+
+        Args:
+            storage_path: Path or key of the upload.
+        """
+        try:
+            await self._delete_stored(self._storage_backend, storage_path)
+        except StorageServiceError as e:
+            logger.warning(f"Failed to delete discarded upload at {storage_path}: {e}")
+
+    async def _delete_stored(self, backend: StorageBackend, storage_path: str) -> None:
+        """Delete content from a storage backend.
+
+        Args:
+            backend: Backend holding the content.
+            storage_path: Path or key of the content.
+        """
+        if backend == StorageBackend.LOCAL:
+            await self._delete_from_local(storage_path)
+        else:
+            await self._delete_from_s3(storage_path)
+
+    def _validate_content_type(self, content_type: str) -> None:
+        """Check that a MIME type may be uploaded.
+
+        Args:
+            content_type: MIME type of the file.
+
+        Raises:
+            InvalidFileTypeError: If the file type is not allowed.
+        """
+        if content_type not in self._allowed_file_types:
+            raise InvalidFileTypeError(
+                f"File type '{content_type}' is not allowed. "
+                f"Allowed types: {', '.join(sorted(self._allowed_file_types))}"
+            )
+
+    def _upload_sink(self, filename: str, owner_id: UUID, content_type: str) -> UploadSink:
+        """Create the sink storing an upload on the configured backend.
+
+        Args:
+            filename: Stored filename.
+            owner_id: UUID of the owner for path organization.
+            content_type: MIME type of the file.
+
+        Returns:
+            Sink writing under the owner's directory or key prefix.
+
+        Raises:
+            S3StorageError: If the S3 backend is not initialized.
+        """
+        if self._storage_backend == StorageBackend.LOCAL:
+            return LocalFileSink(
+                self._local_storage_path, str(Path(str(owner_id)) / filename)
+            )
+        if self._s3 is None:
+            raise S3StorageError("S3 client not initialized")
+        return S3MultipartSink(
+            self._s3,
+            self._get_s3_key(owner_id, filename),
+            content_type,
+            part_size=settings.upload_s3_part_size_mb * 1024 * 1024,
+            max_parallel=settings.upload_s3_max_parallel_parts,
+        )
+
+    async def get_downloadable_file(
         self,
         file_id: UUID,
         owner_id: Optional[UUID] = None,
-    ) -> tuple[bytes, File]:
-        """Download a file from storage.
-
-        Retrieves the file content and metadata from storage.
+    ) -> File:
+        """Get the record of a file the user may download.
 
         Args:
             file_id: UUID of the file to download.
@@ -299,7 +742,7 @@ class StorageService:
                      If provided, only returns if owner matches or file is public.
 
         Returns:
-            Tuple of (file_content, file_record).
+            The file record.
 
         Raises:
             FileNotFoundError: If the file does not exist.
@@ -314,25 +757,15 @@ class StorageService:
         if owner_id is not None:
             await self._verify_file_access(file_record, owner_id, require_ownership=False)
 
-        # Retrieve file content based on backend
-        if file_record.storage_backend == StorageBackend.LOCAL:
-            file_content = await self._download_from_local(file_record.storage_path)
-        else:
-            file_content = await self._download_from_s3(file_record.storage_path)
-
-        return file_content, file_record
+        return file_record
 
-    async def download_file_with_signed_url(
+    async def get_signed_downloadable_file(
         self,
         file_id: UUID,
         expires_timestamp: int,
         signature: str,
-    ) -> tuple[bytes, File]:
-        """Download a file using a signed URL.
-
-        Validates the signed URL and retrieves the file content.
-        This method does not require authentication - the signed URL
-        serves as the authorization.
+    ) -> File:
+        """Get the record of a file after validating its signed URL.
 
         Args:
             file_id: UUID of the file to download.
@@ -340,7 +773,7 @@ class StorageService:
             signature: Base64-encoded signature from the signed URL.
 
         Returns:
-            Tuple of (file_content, file_record).
+            The file record.
 
         Raises:
             SignedUrlExpiredError: If the signed URL has expired.
@@ -356,13 +789,85 @@ class StorageService:
         if file_record is None:
             raise FileNotFoundError(f"File with ID {file_id} not found")
 
-        # Retrieve file content based on backend
+        return file_record
+
+    async def open_download(
+        self,
+        file_record: File,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+    ) -> FileDownload:
+        """Open a file for a streaming download.
+
+        Local files, and S3 objects held in the local cache, are returned as
+        a path for the server to send, ranges included. Other S3 objects are
+        opened as a stream of the requested range, and cached as they are
+        sent when read whole.
+
+        Args:
+            file_record: File to download.
+            range_header: Value of the request's ``Range`` header.
+            if_range: Value of the request's ``If-Range`` header.
+
+        Returns:
+            FileDownload with the path or content stream of the file.
+
+        Raises:
+            FileNotFoundError: If the file is missing from storage.
+            RangeNotSatisfiableError: If the range starts past the end of the file.
+            S3StorageError: If the S3 request fails.
+        """
         if file_record.storage_backend == StorageBackend.LOCAL:
-            file_content = await self._download_from_local(file_record.storage_path)
-        else:
-            file_content = await self._download_from_s3(file_record.storage_path)
+            file_path = self._get_local_file_path(file_record.storage_path)
+            try:
+                stat_result = await asyncio.to_thread(file_path.stat)
+            except OSError as e:
+                raise FileNotFoundError(
+                    f"File not found at path: {file_record.storage_path}"
+                ) from e
+            return FileDownload(path=file_path, stat=stat_result)
 
-        return file_content, file_record
+        if self._s3 is None:
+            raise S3StorageError("S3 client not initialized")
+
+        if self._s3_cache is not None:
+            cached_path = await self._s3_cache.get_path(
+                file_record.storage_path, file_record.checksum
+            )
+            if cached_path is not None:
+                try:
+                    stat_result = await asyncio.to_thread(cached_path.stat)
+                except OSError:
+                    pass  # Evicted by another worker since
+                else:
+                    return FileDownload(path=cached_path, stat=stat_result)
+
+        byte_range = select_range(
+            range_header, if_range, strong_etag(file_record.checksum), file_record.size_bytes
+        )
+        try:
+            if byte_range is None:
+                stream = await self._s3.open_object(file_record.storage_path)
+            else:
+                stream = await self._s3.open_object(
+                    file_record.storage_path, byte_range.start, byte_range.end
+                )
+        except S3BackendError as e:
+            if e.not_found:
+                raise FileNotFoundError(
+                    f"File not found in S3: {file_record.storage_path}"
+                ) from e
+            raise S3StorageError(f"Failed to download file from S3: {e}") from e
+
+        chunks = stream.iter_chunks(DOWNLOAD_CHUNK_SIZE)
+        if (
+            self._s3_cache is not None
+            and byte_range is None
+            and file_record.size_bytes <= self._s3_cache.max_object_bytes
+        ):
+            # Cache the object as it is sent
+            chunks = self._s3_cache.tee(chunks, file_record.storage_path, file_record.checksum)
+        return FileDownload(chunks=chunks, byte_range=byte_range)
 
     async def delete_file(
         self,
@@ -372,6 +877,7 @@ class StorageService:
         """Delete a file from storage.
 
         Removes the file from storage and deletes the database record.
+        Content shared with other files is only deleted with the last of them.
 
         Args:
             file_id: UUID of the file to delete.
@@ -393,32 +899,117 @@ class StorageService:
         await self._verify_file_access(file_record, owner_id, require_ownership=True)
 
         file_size = file_record.size_bytes
-
-        # Delete file from storage
-        if file_record.storage_backend == StorageBackend.LOCAL:
-            await self._delete_from_local(file_record.storage_path)
-            # Delete thumbnails if they exist
-            for thumbnail in file_record.thumbnails:
-                await self._delete_from_local(thumbnail.storage_path)
+        blob_id = file_record.blob_id
+        blob_unreferenced = False
+
+        if blob_id is not None:
+            blob_unreferenced = await self._release_blob(blob_id)
+            # Shared content: the owner is only refunded for their last copy
+            if await self._owner_has_blob(owner_id, blob_id, exclude_file_id=file_id):
+                file_size = 0
         else:
-            await self._delete_from_s3(file_record.storage_path)
+            # Delete file from storage
+            await self._delete_stored(file_record.storage_backend, file_record.storage_path)
             # Delete thumbnails if they exist
             for thumbnail in file_record.thumbnails:
-                await self._delete_from_s3(thumbnail.storage_path)
+                await self._delete_stored(file_record.storage_backend, thumbnail.storage_path)
 
         # Delete database record (thumbnails deleted via cascade)
         await self.db.delete(file_record)
-
-        # Update quota
-        quota = await self.get_quota(owner_id)
-        if quota:
-            quota.used_bytes = max(0, quota.used_bytes - file_size)
-            quota.file_count = max(0, quota.file_count - 1)
+        await self._refund_quota(owner_id, file_size)
 
         await self.db.commit()
 
+        # Content and thumbnails go with the last file referencing them
+        if blob_unreferenced:
+            await self.collect_blob(blob_id)
+
         return True
 
+    async def delete_files(
+        self,
+        file_ids: list[UUID],
+        owner_id: UUID,
+    ) -> list[UUID]:
+        """Delete several files of one owner.
+
+        The files are found and checked in one query, and their records,
+        blob references and quota refund are written in one transaction.
+        Content no file references any more is deleted after the commit;
+        failures to delete it are logged and left to the blob collector.
+
+        Args:
+            file_ids: UUIDs of the files to delete.
+            owner_id: UUID of the owner requesting deletion.
+
+        Returns:
+            UUIDs of the deleted files; the others do not exist or are not
+            owned by the user.
+        """
+        files = await self.get_accessible_files(
+            file_ids, owner_id, require_ownership=True, load_thumbnails=True
+        )
+        if not files:
+            return []
+
+        deleted_ids = list(files)
+        references: dict[UUID, int] = {}
+        refund_bytes = 0
+        legacy_paths = []
+        for file_record in files.values():
+            if file_record.blob_id is not None:
+                references[file_record.blob_id] = references.get(file_record.blob_id, 0) + 1
+            else:
+                refund_bytes += file_record.size_bytes
+                legacy_paths.append((file_record.storage_backend, file_record.storage_path))
+                legacy_paths.extend(
+                    (file_record.storage_backend, thumbnail.storage_path)
+                    for thumbnail in file_record.thumbnails
+                )
+
+        unreferenced_blobs = []
+        if references:
+            for blob_id, count in references.items():
+                if await self._release_blob(blob_id, count):
+                    unreferenced_blobs.append(blob_id)
+
+            # The owner is only refunded for content they keep no copy of
+            kept = await self.db.execute(
+                select(File.blob_id)
+                .where(
+                    File.owner_id == owner_id,
+                    File.blob_id.in_(list(references)),
+                    File.id.notin_(deleted_ids),
+                )
+                .distinct()
+            )
+            kept_blobs = set(kept.scalars().all())
+            blob_sizes = {
+                file_record.blob_id: file_record.size_bytes
+                for file_record in files.values()
+                if file_record.blob_id is not None
+            }
+            refund_bytes += sum(
+                size for blob_id, size in blob_sizes.items() if blob_id not in kept_blobs
+            )
+
+        # Delete database records (thumbnails deleted via cascade)
+        for file_record in files.values():
+            await self.db.delete(file_record)
+        await self._refund_quota(owner_id, refund_bytes, len(files))
+
+        await self.db.commit()
+
+        for backend, storage_path in legacy_paths:
+            try:
+                await self._delete_stored(backend, storage_path)
+            except StorageServiceError as e:
+                logger.warning(f"Failed to delete stored file at {storage_path}: {e}")
+        for blob_id in unreferenced_blobs:
+            await self.collect_blob(blob_id)
+
+        return deleted_ids
+
     async def list_files(
         self,
         owner_id: UUID,
@@ -442,7 +1033,7 @@ class StorageService:
         # Build base query
         query = (
             select(File)
-            .where(cast(File.owner_id, String) == str(owner_id))
+            .where(File.owner_id == owner_id)
             .options(selectinload(File.thumbnails))
         )
 
@@ -481,11 +1072,47 @@ class StorageService:
         """
         query = (
             select(File)
-            .where(cast(File.id, String) == str(file_id))
+            .where(File.id == file_id)
             .options(selectinload(File.thumbnails))
         )
         result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return result.scalar_one_or_none()
+
+    async def get_accessible_files(
+        self,
+        file_ids: list[UUID],
+        user_id: UUID,
+        require_ownership: bool = False,
+        load_thumbnails: bool = False,
+    ) -> dict[UUID, File]:
+        """Retrieve the files among several that a user may access, in one query.
+
+        Applies the same rules as ``_verify_file_access``, in SQL.
+
+        Args:
+            file_ids: UUIDs of the files.
+            user_id: UUID of the user requesting access.
+            require_ownership: If True, only the user's own files are returned.
+                If False, public files are returned too.
+            load_thumbnails: Whether to load the thumbnails of the files.
+
+        Returns:
+            The accessible files by ID, in the order of ``file_ids``; files
+            that do not exist or may not be accessed are left out.
+        """
+        if not file_ids:
+            return {}
+
+        access = File.owner_id == user_id
+        if not require_ownership:
+            access = or_(access, File.is_public.is_(True))
+        query = select(File).where(File.id.in_(file_ids), access)
+        if load_thumbnails:
+            query = query.options(selectinload(File.thumbnails))
+        result = await self.db.execute(query)
+
+        files = {file_record.id: file_record for file_record in result.scalars().all()}
+        return {file_id: files[file_id] for file_id in dict.fromkeys(file_ids) if file_id in files}
 
     async def get_quota(self, owner_id: UUID) -> Optional[StorageQuota]:
         """Get storage quota for a user.
@@ -496,8 +1123,12 @@ class StorageService:
         Returns:
             StorageQuota if found, None otherwise.
         """
-        query = select(StorageQuota).where(
-            cast(StorageQuota.owner_id, String) == str(owner_id)
+        # Usage is charged and refunded with UPDATE statements, so refresh
+        # an instance already loaded in the session
+        query = (
+            select(StorageQuota)
+            .where(StorageQuota.owner_id == owner_id)
+            .execution_options(populate_existing=True)
         )
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
@@ -522,12 +1153,69 @@ class StorageService:
                 used_bytes=0,
                 file_count=0,
             )
-            self.db.add(quota)
+            try:
+                async with self.db.begin_nested():
+                    self.db.add(quota)
+            except IntegrityError:
+                # Created by a concurrent request of the same user
+                return await self.get_quota(owner_id)
             await self.db.commit()
             await self.db.refresh(quota)
 
         return quota
 
+    async def _charge_quota(self, owner_id: UUID, size_bytes: int, file_count: int = 1) -> bool:
+        """Add usage to a quota if it stays within the limit.
+
+        A single conditional UPDATE, so concurrent uploads of the same user
+        cannot together exceed the quota. The charge is part of the current
+        transaction and released if it rolls back. The quota must exist.
+
+        Args:
+            owner_id: UUID of the user.
+            size_bytes: Bytes to add to the usage.
+            file_count: Files to add to the file count.
+
+        Returns:
+            True if charged, False if the quota would be exceeded.
+        """
+        query = update(StorageQuota).where(StorageQuota.owner_id == owner_id)
+        if size_bytes > 0:
+            query = query.where(StorageQuota.used_bytes + size_bytes <= StorageQuota.quota_bytes)
+        result = await self.db.execute(
+            query.values(
+                used_bytes=StorageQuota.used_bytes + size_bytes,
+                file_count=StorageQuota.file_count + file_count,
+            )
+            .returning(StorageQuota.used_bytes)
+            .execution_options(synchronize_session=False)
+        )
+        return result.first() is not None
+
+    async def _refund_quota(self, owner_id: UUID, size_bytes: int, file_count: int = 1) -> None:
+        """Remove usage from a quota, in a single UPDATE.
+
+        Args:
+            owner_id: UUID of the user.
+            size_bytes: Bytes to remove from the usage.
+            file_count: Files to remove from the file count.
+        """
+        await self.db.execute(
+            update(StorageQuota)
+            .where(StorageQuota.owner_id == owner_id)
+            .values(
+                used_bytes=case(
+                    (StorageQuota.used_bytes > size_bytes, StorageQuota.used_bytes - size_bytes),
+                    else_=0,
+                ),
+                file_count=case(
+                    (StorageQuota.file_count > file_count, StorageQuota.file_count - file_count),
+                    else_=0,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     async def check_quota(
         self,
         owner_id: UUID,
@@ -637,9 +1325,10 @@ class StorageService:
     ) -> StorageQuota:
         """Recalculate storage quota usage from actual file data.
 
-        Scans all files owned by the user and recalculates the total
-        used bytes and file count. Useful for data consistency checks
-        or recovery after data corruption.
+        Counts the user's files and recalculates the total used bytes (each
+        distinct content counted once) and file count in a single UPDATE.
+        Uploads and deletions keep the quota exact on their own; this
+        repairs drift and is run by ``reconcile_quotas``.
 
         Args:
             owner_id: UUID of the user.
@@ -647,28 +1336,75 @@ class StorageService:
         Returns:
             Updated StorageQuota record with recalculated values.
         """
-        # Get actual usage from files
-        query = select(
-            func.coalesce(func.sum(File.size_bytes), 0).label("total_bytes"),
-            func.count(File.id).label("file_count"),
-        ).where(cast(File.owner_id, String) == str(owner_id))
-
-        result = await self.db.execute(query)
-        row = result.one()
+        quota = await self.get_or_create_quota(owner_id)
+        owner_files = File.owner_id == owner_id
 
-        total_bytes = int(row.total_bytes)
-        file_count = int(row.file_count)
+        # Wait for uploads charging the quota, then count with their files
+        await self.db.execute(
+            select(StorageQuota.id).where(StorageQuota.id == quota.id).with_for_update()
+        )
 
-        # Update quota record
-        quota = await self.get_or_create_quota(owner_id)
-        quota.used_bytes = total_bytes
-        quota.file_count = file_count
+        # Get actual usage from files, counting shared content once
+        unshared_bytes = (
+            select(func.coalesce(func.sum(File.size_bytes), 0))
+            .where(owner_files, File.blob_id.is_(None))
+            .scalar_subquery()
+        )
+        blob_bytes = (
+            select(func.coalesce(func.sum(StorageBlob.size_bytes), 0))
+            .where(StorageBlob.id.in_(select(File.blob_id).where(owner_files)))
+            .scalar_subquery()
+        )
+        file_count = select(func.count(File.id)).where(owner_files).scalar_subquery()
+
+        await self.db.execute(
+            update(StorageQuota)
+            .where(StorageQuota.id == quota.id)
+            .values(
+                used_bytes=unshared_bytes + blob_bytes,
+                file_count=file_count,
+                reconciled_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
         await self.db.commit()
         await self.db.refresh(quota)
 
         return quota
 
+    async def reconcile_quotas(self, limit: int = 200) -> int:
+        """Recalculate the quotas that changed since they were last reconciled.
+
+        Args:
+            limit: Maximum number of quotas recalculated per call.
+
+        Returns:
+            Number of quotas whose usage had drifted and was corrected.
+        """
+        result = await self.db.execute(
+            select(StorageQuota.owner_id, StorageQuota.used_bytes, StorageQuota.file_count)
+            .where(
+                or_(
+                    StorageQuota.reconciled_at.is_(None),
+                    StorageQuota.updated_at > StorageQuota.reconciled_at,
+                )
+            )
+            .order_by(StorageQuota.updated_at)
+            .limit(limit)
+        )
+        corrected = 0
+        for owner_id, used_bytes, file_count in result.all():
+            quota = await self.recalculate_quota(owner_id)
+            if (quota.used_bytes, quota.file_count) != (used_bytes, file_count):
+                corrected += 1
+                logger.warning(
+                    f"Corrected storage quota of {owner_id}: "
+                    f"{used_bytes} -> {quota.used_bytes} bytes, "
+                    f"{file_count} -> {quota.file_count} files"
+                )
+        return corrected
+
     async def update_file_metadata(
         self,
         file_id: UUID,
@@ -729,6 +1465,60 @@ class StorageService:
         Returns:
             The created FileThumbnail record.
 
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            UnauthorizedAccessError: If the user does not have access to the file.
+            InvalidFileTypeError: If the file is not an image.
+            StorageServiceError: If thumbnail generation fails.
+        """
+        thumbnails = await self.generate_thumbnails(file_id, [size], owner_id)
+        return thumbnails[0]
+
+    async def generate_all_thumbnails(
+        self,
+        file_id: UUID,
+        owner_id: Optional[UUID] = None,
+    ) -> list[FileThumbnail]:
+        """Generate all thumbnail sizes for an image file.
+
+        Convenience method to generate small, medium, and large thumbnails
+        for a single image file.
+
+        Args:
+            file_id: UUID of the file to generate thumbnails for.
+            owner_id: Optional owner ID for access control.
+
+        Returns:
+            List of created FileThumbnail records.
+
+        Raises:
+            FileNotFoundError: If the file does not exist or is not accessible.
+            InvalidFileTypeError: If the file is not an image.
+        """
+        return await self.generate_thumbnails(file_id, list(ThumbnailSize), owner_id)
+
+    async def generate_thumbnails(
+        self,
+        file_id: UUID,
+        sizes: list[ThumbnailSize],
+        owner_id: Optional[UUID] = None,
+    ) -> list[FileThumbnail]:
+        """Generate thumbnails of several sizes for an image file.
+
+        The original is downloaded and decoded once, all missing sizes are
+        produced together in the image worker processes, stored
+        concurrently, and recorded in a single transaction. Sizes that
+        already exist are returned as they are, and sizes already made for
+        another file with the same content are shared rather than redone.
+
+        Args:
+            file_id: UUID of the file to generate thumbnails for.
+            sizes: Thumbnail size presets to generate.
+            owner_id: Optional owner ID for access control.
+
+        Returns:
+            The FileThumbnail records, in the order of ``sizes``.
+
         Raises:
             FileNotFoundError: If the file does not exist.
             UnauthorizedAccessError: If the user does not have access to the file.
@@ -752,90 +1542,157 @@ class StorageService:
                 f"{file_record.content_type}"
             )
 
-        # Check if thumbnail already exists for this size
-        for thumb in file_record.thumbnails:
-            if thumb.size == size:
-                return thumb
-
-        # Get thumbnail dimensions
-        target_size = THUMBNAIL_SIZE_PIXELS.get(size.value, 128)
-
-        # Download the original file
+        # Keep thumbnails that already exist
+        thumbnails = {thumb.size: thumb for thumb in file_record.thumbnails}
+        missing = [size for size in dict.fromkeys(sizes) if size not in thumbnails]
+
+        # Share thumbnails already made for the same content
+        created = []
+        if missing and file_record.blob_id is not None:
+            for shared in await self._shared_thumbnails(file_record, missing):
+                thumbnail = FileThumbnail(
+                    file_id=file_id,
+                    size=shared.size,
+                    width=shared.width,
+                    height=shared.height,
+                    storage_path=shared.storage_path,
+                )
+                self.db.add(thumbnail)
+                created.append(thumbnail)
+                thumbnails[shared.size] = thumbnail
+            missing = [size for size in missing if size not in thumbnails]
+
+        if not missing:
+            if created:
+                await self.db.commit()
+                for thumbnail in created:
+                    await self.db.refresh(thumbnail)
+            return [thumbnails[size] for size in sizes]
+
+        # Download the original file once for every size
         if file_record.storage_backend == StorageBackend.LOCAL:
             file_content = await self._download_from_local(file_record.storage_path)
         else:
-            file_content = await self._download_from_s3(file_record.storage_path)
-
-        # Generate thumbnail in thread pool (PIL is synchronous)
-        loop = asyncio.get_event_loop()
-        thumbnail_content, width, height = await loop.run_in_executor(
-            _image_executor,
-            partial(
-                self._create_thumbnail_sync,
+            file_content = await self._download_from_s3(
+                file_record.storage_path, file_record.checksum
+            )
+
+        # Decode once and encode every size in the image worker processes
+        try:
+            rendered = await create_thumbnails_async(
                 file_content,
-                target_size,
+                [THUMBNAIL_SIZE_PIXELS.get(size.value, 128) for size in missing],
                 file_record.content_type,
-            ),
-        )
-
-        # Generate thumbnail filename and path
-        base_filename = file_record.filename.rsplit(".", 1)[0]
-        thumb_extension = self._get_thumbnail_extension(file_record.content_type)
-        thumb_filename = f"{base_filename}_thumb_{size.value}{thumb_extension}"
-
-        # Store thumbnail
-        if self._storage_backend == StorageBackend.LOCAL:
-            thumb_storage_path = await self._upload_to_local(
-                thumbnail_content, thumb_filename, file_record.owner_id
             )
-        else:
-            thumb_storage_path = await self._upload_to_s3(
-                thumbnail_content,
-                thumb_filename,
-                file_record.owner_id,
-                file_record.content_type,
+        except ImageProcessingError as e:
+            raise StorageServiceError(str(e)) from e
+
+        # Store the thumbnails concurrently
+        storage_paths = await asyncio.gather(
+            *(
+                self._store_thumbnail(file_record, size, content)
+                for size, (content, _, _) in zip(missing, rendered)
             )
-
-        # Create thumbnail record
-        thumbnail = FileThumbnail(
-            file_id=file_id,
-            size=size,
-            width=width,
-            height=height,
-            storage_path=thumb_storage_path,
         )
-        self.db.add(thumbnail)
+
+        # Record them all in one transaction
+        for size, (_, width, height), storage_path in zip(missing, rendered, storage_paths):
+            thumbnail = FileThumbnail(
+                file_id=file_id,
+                size=size,
+                width=width,
+                height=height,
+                storage_path=storage_path,
+            )
+            self.db.add(thumbnail)
+            created.append(thumbnail)
+            thumbnails[size] = thumbnail
         await self.db.commit()
-        await self.db.refresh(thumbnail)
+        for thumbnail in created:
+            await self.db.refresh(thumbnail)
 
-        return thumbnail
+        return [thumbnails[size] for size in sizes]
 
-    async def generate_all_thumbnails(
+    async def _shared_thumbnails(
         self,
-        file_id: UUID,
-        owner_id: Optional[UUID] = None,
+        file_record: File,
+        sizes: list[ThumbnailSize],
     ) -> list[FileThumbnail]:
-        """Generate all thumbnail sizes for an image file.
+        """Find thumbnails made for other files with the same content.
 
-        Convenience method to generate small, medium, and large thumbnails
-        for a single image file.
+        Args:
+            file_record: File whose content the thumbnails must show.
+            sizes: Thumbnail sizes wanted.
+
+        Returns:
+            One existing thumbnail per size found.
+        """
+        result = await self.db.execute(
+            select(FileThumbnail)
+            .join(File, FileThumbnail.file_id == File.id)
+            .where(
+                File.blob_id == file_record.blob_id,
+                File.id != file_record.id,
+                FileThumbnail.size.in_(sizes),
+            )
+        )
+        return list({thumb.size: thumb for thumb in result.scalars().all()}.values())
+
+    async def _store_thumbnail(
+        self,
+        file_record: File,
+        size: ThumbnailSize,
+        content: bytes,
+    ) -> str:
+        """Store an encoded thumbnail next to its original.
 
         Args:
-            file_id: UUID of the file to generate thumbnails for.
-            owner_id: Optional owner ID for access control.
+            file_record: Original image file.
+            size: Thumbnail size preset.
+            content: Encoded thumbnail.
 
         Returns:
-            List of created FileThumbnail records.
+            Storage path of the thumbnail.
+        """
+        storage_path = self._thumbnail_storage_path(
+            file_record.storage_path, size, file_record.content_type
+        )
 
-        Raises:
-            FileNotFoundError: If the file does not exist or is not accessible.
-            InvalidFileTypeError: If the file is not an image.
+        if file_record.storage_backend == StorageBackend.LOCAL:
+            file_path = self._get_local_file_path(storage_path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(file_path.write_bytes, content)
+            return storage_path
+
+        if self._s3 is None:
+            raise S3StorageError("S3 client not initialized")
+        try:
+            await self._s3.put_object(storage_path, content, file_record.content_type)
+        except S3BackendError as e:
+            raise S3StorageError(f"Failed to upload file to S3: {e}") from e
+        return storage_path
+
+    def _thumbnail_storage_path(
+        self,
+        storage_path: str,
+        size: ThumbnailSize,
+        content_type: str,
+    ) -> str:
+        """Get the storage path of a thumbnail from that of its original.
+
+        Thumbnails sit next to the content they show, so the thumbnails of
+        shared content are found, and deleted, from the blob alone.
+
+        Args:
+            storage_path: Storage path of the original.
+            size: Thumbnail size preset.
+            content_type: MIME type of the original.
+
+        Returns:
+            Storage path of the thumbnail.
         """
-        thumbnails = []
-        for size in ThumbnailSize:
-            thumb = await self.generate_thumbnail(file_id, size, owner_id)
-            thumbnails.append(thumb)
-        return thumbnails
+        base_path = PurePosixPath(storage_path).with_suffix("")
+        return f"{base_path}_thumb_{size.value}{self._get_thumbnail_extension(content_type)}"
 
     def is_image_file(self, content_type: str) -> bool:
         """Check if a content type is a supported image type.
@@ -925,6 +1782,79 @@ class StorageService:
 
         return url, expires_at
 
+    async def generate_secure_urls(
+        self,
+        file_ids: list[UUID],
+        owner_id: UUID,
+        expires_in_seconds: int = 3600,
+        base_url: Optional[str] = None,
+    ) -> tuple[dict[UUID, str], datetime]:
+        """Generate secure, time-limited URLs for several files.
+
+        Access is checked for all files in one query, and S3 URLs are
+        presigned in a single batch.
+
+        Args:
+            file_ids: UUIDs of the files to generate URLs for.
+            owner_id: UUID of the user requesting the URLs.
+            expires_in_seconds: URL expiration time in seconds (default 3600).
+                Must be between 60 and 86400 seconds (1 min to 24 hours).
+            base_url: Base URL for local storage URLs, derived from the
+                request context. Required for files stored locally.
+
+        Returns:
+            Tuple of (secure URLs by file ID, expires_at_datetime). Files
+            that do not exist or may not be accessed are left out.
+
+        Raises:
+            ValueError: If expires_in_seconds is out of valid range or base_url
+                is missing for local backend.
+            StorageServiceError: If URL generation fails.
+        """
+        if expires_in_seconds < 60 or expires_in_seconds > 86400:
+            raise ValueError(
+                "expires_in_seconds must be between 60 and 86400 "
+                "(1 minute to 24 hours)"
+            )
+
+        files = await self.get_accessible_files(file_ids, owner_id)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in_seconds)
+
+        s3_files = [
+            file_record
+            for file_record in files.values()
+            if file_record.storage_backend == StorageBackend.S3
+        ]
+        urls = {}
+        if s3_files:
+            if self._s3 is None:
+                raise S3StorageError("S3 client not initialized")
+            try:
+                presigned = await self._s3.presigned_urls(
+                    [file_record.storage_path for file_record in s3_files],
+                    expires_in_seconds,
+                )
+            except S3BackendError as e:
+                raise S3StorageError(f"Failed to generate presigned URLs: {e}") from e
+            urls.update(zip((file_record.id for file_record in s3_files), presigned))
+
+        for file_id, file_record in files.items():
+            if file_record.storage_backend == StorageBackend.S3:
+                continue
+            if base_url is None:
+                raise ValueError(
+                    "base_url is required for local storage backend secure URLs. "
+                    "It must be derived from the request context."
+                )
+            urls[file_id] = self._generate_local_signed_url(
+                file_id,
+                file_record.storage_path,
+                expires_at,
+                base_url,
+            )
+
+        return {file_id: urls[file_id] for file_id in files}, expires_at
+
     async def _generate_s3_presigned_url(
         self,
         storage_path: str,
@@ -942,29 +1872,13 @@ class StorageService:
         Raises:
             S3StorageError: If URL generation fails.
         """
-        if self._s3_client is None:
+        if self._s3 is None:
             raise S3StorageError("S3 client not initialized")
 
-        loop = asyncio.get_event_loop()
         try:
-            url = await loop.run_in_executor(
-                _s3_executor,
-                partial(
-                    self._s3_client.generate_presigned_url,
-                    "get_object",
-                    Params={
-                        "Bucket": self._s3_bucket_name,
-                        "Key": storage_path,
-                    },
-                    ExpiresIn=expires_in_seconds,
-                ),
-            )
-            return url
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            raise S3StorageError(
-                f"Failed to generate presigned URL: {error_code} - {str(e)}"
-            ) from e
+            return await self._s3.presigned_url(storage_path, expires_in_seconds)
+        except S3BackendError as e:
+            raise S3StorageError(f"Failed to generate presigned URL: {e}") from e
 
     def _generate_local_signed_url(
         self,
@@ -1084,71 +1998,6 @@ class StorageService:
 
         return True
 
-    def _create_thumbnail_sync(
-        self,
-        image_content: bytes,
-        max_size: int,
-        content_type: str,
-    ) -> tuple[bytes, int, int]:
-        """Create a thumbnail from image content (synchronous).
-
-        This method runs in a thread pool to avoid blocking the event loop.
-
-        Args:
-            image_content: Original image as bytes.
-            max_size: Maximum dimension (width or height) for thumbnail.
-            content_type: MIME type of the original image.
-
-        Returns:
-            Tuple of (thumbnail_bytes, width, height).
-
-        Raises:
-            StorageServiceError: If image processing fails.
-        """
-        try:
-            # Open image from bytes
-            with Image.open(io.BytesIO(image_content)) as img:
-                # Convert RGBA to RGB for JPEG output if needed
-                if img.mode in ("RGBA", "P") and content_type == "image/jpeg":
-                    img = img.convert("RGB")
-
-                # Calculate new dimensions maintaining aspect ratio
-                original_width, original_height = img.size
-                ratio = min(max_size / original_width, max_size / original_height)
-                new_width = int(original_width * ratio)
-                new_height = int(original_height * ratio)
-
-                # Resize using high-quality resampling
-                thumbnail = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                # Save to bytes
-                output = io.BytesIO()
-                format_map = {
-                    "image/jpeg": "JPEG",
-                    "image/png": "PNG",
-                    "image/gif": "GIF",
-                    "image/webp": "WEBP",
-                }
-                img_format = format_map.get(content_type, "PNG")
-
-                # Set quality for lossy formats
-                save_kwargs = {}
-                if img_format in ("JPEG", "WEBP"):
-                    save_kwargs["quality"] = 85
-                    save_kwargs["optimize"] = True
-                elif img_format == "PNG":
-                    save_kwargs["optimize"] = True
-
-                thumbnail.save(output, format=img_format, **save_kwargs)
-                thumbnail_bytes = output.getvalue()
-
-                return thumbnail_bytes, new_width, new_height
-
-        except Exception as e:
-            raise StorageServiceError(
-                f"Failed to generate thumbnail: {str(e)}"
-            ) from e
-
     def _get_thumbnail_extension(self, content_type: str) -> str:
         """Get file extension for a thumbnail based on content type.
 
@@ -1291,35 +2140,6 @@ class StorageService:
         """
         return hashlib.sha256(content).hexdigest()
 
-    async def _upload_to_local(
-        self,
-        content: bytes,
-        filename: str,
-        owner_id: UUID,
-    ) -> str:
-        """Upload file to local filesystem storage.
-
-        Creates owner-specific subdirectory and stores the file.
-
-        Args:
-            content: File content as bytes.
-            filename: Stored filename.
-            owner_id: UUID of the owner for directory organization.
-
-        Returns:
-            Relative storage path for the file.
-        """
-        # Create owner-specific directory
-        owner_dir = self._local_storage_path / str(owner_id)
-        owner_dir.mkdir(parents=True, exist_ok=True)
-
-        # Write file
-        file_path = owner_dir / filename
-        file_path.write_bytes(content)
-
-        # Return relative path
-        return str(Path(str(owner_id)) / filename)
-
     async def _download_from_local(self, storage_path: str) -> bytes:
         """Download file from local filesystem storage.
 
@@ -1369,61 +2189,12 @@ class StorageService:
 
     # S3 storage methods
 
-    async def _upload_to_s3(
-        self,
-        content: bytes,
-        filename: str,
-        owner_id: UUID,
-        content_type: str,
-    ) -> str:
-        """Upload file to S3 storage.
-
-        Creates an owner-prefixed key structure and stores the file in S3.
-
-        Args:
-            content: File content as bytes.
-            filename: Stored filename.
-            owner_id: UUID of the owner for key organization.
-            content_type: MIME type of the file.
-
-        Returns:
-            S3 key path for the file.
-
-        Raises:
-            S3StorageError: If the upload fails.
-        """
-        if self._s3_client is None:
-            raise S3StorageError("S3 client not initialized")
-
-        # Create S3 key with owner prefix
-        s3_key = f"{owner_id}/{filename}"
-
-        # Run S3 upload in thread pool
-        loop = asyncio.get_event_loop()
-        try:
-            await loop.run_in_executor(
-                _s3_executor,
-                partial(
-                    self._s3_client.put_object,
-                    Bucket=self._s3_bucket_name,
-                    Key=s3_key,
-                    Body=content,
-                    ContentType=content_type,
-                ),
-            )
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            raise S3StorageError(
-                f"Failed to upload file to S3: {error_code} - {str(e)}"
-            ) from e
-
-        return s3_key
-
-    async def _download_from_s3(self, storage_path: str) -> bytes:
-        """Download file from S3 storage.
+    async def _download_from_s3(self, storage_path: str, checksum: Optional[str] = None) -> bytes:
+        """Download file from S3 storage, through the local cache if enabled.
 
         Args:
             storage_path: S3 key of the file.
+            checksum: SHA-256 checksum of the content, if known.
 
         Returns:
             File content as bytes.
@@ -1432,35 +2203,26 @@ class StorageService:
             FileNotFoundError: If the file does not exist in S3.
             S3StorageError: If the download fails.
         """
-        if self._s3_client is None:
+        if self._s3 is None:
             raise S3StorageError("S3 client not initialized")
 
-        loop = asyncio.get_event_loop()
+        if self._s3_cache is not None:
+            content = await self._s3_cache.get(storage_path, checksum)
+            if content is not None:
+                return content
+
         try:
-            response = await loop.run_in_executor(
-                _s3_executor,
-                partial(
-                    self._s3_client.get_object,
-                    Bucket=self._s3_bucket_name,
-                    Key=storage_path,
-                ),
-            )
-            # Read the body content
-            body = response["Body"]
-            content = await loop.run_in_executor(
-                _s3_executor,
-                body.read,
-            )
-            return content
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            if error_code in ("NoSuchKey", "404"):
+            content = await self._s3.get_object(storage_path)
+        except S3BackendError as e:
+            if e.not_found:
                 raise FileNotFoundError(
                     f"File not found in S3: {storage_path}"
                 ) from e
-            raise S3StorageError(
-                f"Failed to download file from S3: {error_code} - {str(e)}"
-            ) from e
+            raise S3StorageError(f"Failed to download file from S3: {e}") from e
+
+        if self._s3_cache is not None:
+            await self._s3_cache.put(storage_path, checksum, content)
+        return content
 
     async def _delete_from_s3(self, storage_path: str) -> bool:
         """Delete file from S3 storage.
@@ -1474,25 +2236,17 @@ class StorageService:
         Raises:
             S3StorageError: If the deletion fails.
         """
-        if self._s3_client is None:
+        if self._s3 is None:
             raise S3StorageError("S3 client not initialized")
 
-        loop = asyncio.get_event_loop()
         try:
-            await loop.run_in_executor(
-                _s3_executor,
-                partial(
-                    self._s3_client.delete_object,
-                    Bucket=self._s3_bucket_name,
-                    Key=storage_path,
-                ),
-            )
-            return True
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            raise S3StorageError(
-                f"Failed to delete file from S3: {error_code} - {str(e)}"
-            ) from e
+            await self._s3.delete_object(storage_path)
+        except S3BackendError as e:
+            raise S3StorageError(f"Failed to delete file from S3: {e}") from e
+
+        if self._s3_cache is not None:
+            await self._s3_cache.invalidate(storage_path)
+        return True
 
     def _get_s3_key(self, owner_id: UUID, filename: str) -> str:
         """Generate S3 key for a file.
@@ -1505,3 +2259,23 @@ class StorageService:
             S3 key string.
         """
         return f"{owner_id}/{filename}"
+
+
+async def generate_thumbnails_in_background(file_id: UUID) -> None:
+    """Generate every thumbnail size of an uploaded image.
+
+    Runs after the upload response is sent, in its own database session,
+    so the first view of a photo finds its thumbnails ready. Failures are
+    only logged: the thumbnail endpoint still generates missing sizes on
+    demand.
+
+    Args:
+        file_id: UUID of the uploaded image.
+    """
+    from app.database import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await StorageService(db).generate_all_thumbnails(file_id)
+    except Exception as e:
+        logger.warning(f"Background thumbnail generation failed for file {file_id}: {e}")
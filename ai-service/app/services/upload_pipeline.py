@@ -0,0 +1,379 @@
+"""Streaming upload pipeline for LAYA AI Service.
+
+Moves an upload from the request to storage chunk by chunk, without ever
+holding the whole file in memory. Each chunk passes through:
+
+1. size enforcement, which stops the upload as soon as the limit is passed
+2. an incremental SHA-256 checksum
+3. content sniffing of the first bytes, which rejects files whose content
+   contradicts their declared MIME type
+4. a sink writing it to storage: a partial file renamed into place once
+   complete (local backend), or an S3 multipart upload sending parts in
+   parallel (S3 backend)
+
+Once the content is complete, a caller-supplied ``is_stored`` check can
+report that the same content is already stored; the sink is then aborted
+instead of committed, so a duplicate is never moved into place and, on S3,
+its final PUT (or last part and completion) is never sent.
+
+A failed or rejected upload aborts its sink, leaving nothing behind. Peak
+memory per upload is one chunk locally, and at most ``max_parallel + 1``
+parts on S3.
+
+Example:
+    sink = LocalFileSink(storage_root, f"{owner_id}/{filename}")
+    result = await stream_upload(chunks, sink, max_bytes, "image/png")
+"""
+
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, AsyncIterable, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from app.services.s3_backend import S3Backend
+
+# Bytes needed to recognize every signature in CONTENT_SIGNATURES
+SNIFF_BYTES = 12
+
+# Smallest part S3 accepts in a multipart upload, except for the last one
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+# (offset, magic bytes) signatures of the MIME types that can be recognized
+CONTENT_SIGNATURES: List[Tuple[str, Tuple[Tuple[int, bytes], ...]]] = [
+    ("image/jpeg", ((0, b"\xff\xd8\xff"),)),
+    ("image/png", ((0, b"\x89PNG\r\n\x1a\n"),)),
+    ("image/gif", ((0, b"GIF87a"),)),
+    ("image/gif", ((0, b"GIF89a"),)),
+    ("image/webp", ((0, b"RIFF"), (8, b"WEBP"))),
+    ("application/pdf", ((0, b"%PDF-"),)),
+]
+
+
+class UploadError(Exception):
+    """Base exception for streaming upload errors."""
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an upload passes its size limit.
+
+    Attributes:
+        size: Bytes received when the limit was passed
+        limit: Maximum size in bytes
+    """
+
+    def __init__(self, size: int, limit: int) -> None:
+        """Initialize the error.
+
+        Args:
+            size: Bytes received when the limit was passed
+            limit: Maximum size in bytes
+        """
+        super().__init__(f"Upload exceeds {limit} bytes")
+        self.size = size
+        self.limit = limit
+
+
+class ContentTypeMismatchError(UploadError):
+    """Raised when the content of an upload contradicts its declared MIME type.
+
+    Attributes:
+        declared: MIME type declared by the client
+        detected: MIME type recognized from the content
+    """
+
+    def __init__(self, declared: str, detected: str) -> None:
+        """Initialize the error.
+
+        Args:
+            declared: MIME type declared by the client
+            detected: MIME type recognized from the content
+        """
+        super().__init__(f"File content is '{detected}', not the declared '{declared}'")
+        self.declared = declared
+        self.detected = detected
+
+
+@dataclass
+class UploadResult:
+    """Outcome of a completed streaming upload.
+
+    Attributes:
+        storage_path: Path or key of the stored file, or None if the content
+            was already stored and the upload discarded
+        size_bytes: Size of the file
+        checksum: Hexadecimal SHA-256 of the content
+        detected_content_type: MIME type recognized from the content, if any
+    """
+
+    storage_path: Optional[str]
+    size_bytes: int
+    checksum: str
+    detected_content_type: Optional[str] = None
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Recognize a MIME type from the first bytes of a file.
+
+    Args:
+        head: First bytes of the file (``SNIFF_BYTES`` are enough)
+
+    Returns:
+        Optional[str]: The recognized MIME type, or None if unknown
+    """
+    for content_type, signature in CONTENT_SIGNATURES:
+        if all(head[offset:offset + len(magic)] == magic for offset, magic in signature):
+            return content_type
+    return None
+
+
+class UploadSink:
+    """Destination of a streaming upload.
+
+    ``write`` receives the chunks in order; then either ``commit`` makes
+    the file available or ``abort`` discards everything written.
+    """
+
+    async def write(self, chunk: bytes) -> None:
+        """Write the next chunk.
+
+        Args:
+            chunk: Upload content following the previous chunk
+        """
+        raise NotImplementedError
+
+    async def commit(self) -> str:
+        """Finish the upload.
+
+        Returns:
+            str: Path or key of the stored file
+        """
+        raise NotImplementedError
+
+    async def abort(self) -> None:
+        """Discard the upload."""
+        raise NotImplementedError
+
+
+class LocalFileSink(UploadSink):
+    """Sink writing to a partial file renamed into place on commit.
+
+    File operations run in a worker thread, so disk I/O does not block
+    the event loop.
+    """
+
+    def __init__(self, root: Path, storage_path: str) -> None:
+        """Initialize the sink.
+
+        Args:
+            root: Storage root directory
+            storage_path: Path of the file relative to the root
+        """
+        self.storage_path = storage_path
+        self._path = root / storage_path
+        self._partial_path = self._path.with_name(f".{self._path.name}.part")
+        self._file: Optional[IO[bytes]] = None
+
+    def _open(self) -> IO[bytes]:
+        """Create the directory and open the partial file."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        return open(self._partial_path, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        """Append a chunk to the partial file."""
+        if self._file is None:
+            self._file = await asyncio.to_thread(self._open)
+        await asyncio.to_thread(self._file.write, chunk)
+
+    def _finish(self) -> None:
+        """Close the partial file and move it into place."""
+        if self._file is None:
+            self._file = self._open()
+        self._file.close()
+        os.replace(self._partial_path, self._path)
+
+    async def commit(self) -> str:
+        """Move the complete file into place."""
+        await asyncio.to_thread(self._finish)
+        return self.storage_path
+
+    def _discard(self) -> None:
+        """Close and delete the partial file."""
+        if self._file is not None:
+            self._file.close()
+        self._partial_path.unlink(missing_ok=True)
+
+    async def abort(self) -> None:
+        """Delete the partial file."""
+        await asyncio.to_thread(self._discard)
+
+
+class S3MultipartSink(UploadSink):
+    """Sink uploading to S3, in parallel parts once the file outgrows one part.
+
+    Files smaller than a part are stored with a single ``put_object``.
+    Larger ones start a multipart upload; up to ``max_parallel`` parts are
+    in flight while the next one fills, so memory stays bounded by
+    ``(max_parallel + 1) * part_size``.
+    """
+
+    def __init__(
+        self,
+        backend: S3Backend,
+        key: str,
+        content_type: str,
+        part_size: int = 8 * 1024 * 1024,
+        max_parallel: int = 4,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            backend: S3 backend storing the object
+            key: Object key
+            content_type: MIME type stored with the object
+            part_size: Bytes per part (raised to the S3 minimum of 5 MB)
+            max_parallel: Parts uploaded concurrently
+        """
+        self.backend = backend
+        self.key = key
+        self.content_type = content_type
+        self.part_size = max(part_size, S3_MIN_PART_SIZE)
+        self.max_parallel = max(1, max_parallel)
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List["asyncio.Task[str]"] = []
+
+    async def write(self, chunk: bytes) -> None:
+        """Buffer a chunk, sending every complete part."""
+        self._buffer.extend(chunk)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            await self._send_part(part)
+
+    async def _send_part(self, part: bytes) -> None:
+        """Start uploading a part, first waiting for a free upload slot."""
+        if self._upload_id is None:
+            self._upload_id = await self.backend.create_multipart_upload(
+                self.key, self.content_type
+            )
+        in_flight = [task for task in self._parts if not task.done()]
+        if len(in_flight) >= self.max_parallel:
+            await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        for task in self._parts:
+            if task.done():
+                # Surface a failed part now instead of after the whole upload
+                task.result()
+        self._parts.append(
+            asyncio.create_task(
+                self.backend.upload_part(self.key, self._upload_id, len(self._parts) + 1, part)
+            )
+        )
+
+    async def commit(self) -> str:
+        """Send the remaining content and complete the upload."""
+        if self._upload_id is None:
+            await self.backend.put_object(self.key, bytes(self._buffer), self.content_type)
+        else:
+            if self._buffer:
+                await self._send_part(bytes(self._buffer))
+            etags = await asyncio.gather(*self._parts)
+            await self.backend.complete_multipart_upload(self.key, self._upload_id, list(etags))
+        self._buffer = bytearray()
+        return self.key
+
+    async def abort(self) -> None:
+        """Cancel part uploads and abort the multipart upload."""
+        self._buffer = bytearray()
+        for task in self._parts:
+            task.cancel()
+        await asyncio.gather(*self._parts, return_exceptions=True)
+        if self._upload_id is not None:
+            await self.backend.abort_multipart_upload(self.key, self._upload_id)
+
+
+async def iter_bytes(content: bytes, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Stream in-memory content as chunks.
+
+    Args:
+        content: Content to stream
+        chunk_size: Bytes per chunk
+
+    Yields:
+        bytes: Consecutive chunks of the content
+    """
+    view = memoryview(content)
+    for offset in range(0, len(content), chunk_size):
+        yield bytes(view[offset:offset + chunk_size])
+
+
+async def stream_upload(
+    chunks: AsyncIterable[bytes],
+    sink: UploadSink,
+    max_bytes: int,
+    declared_content_type: Optional[str] = None,
+    is_stored: Optional[Callable[[str], Awaitable[bool]]] = None,
+) -> UploadResult:
+    """Stream an upload into a sink.
+
+    Args:
+        chunks: Upload content, in order
+        sink: Destination of the content
+        max_bytes: Maximum size of the upload
+        declared_content_type: MIME type declared by the client; uploads
+            whose content is recognized as another type are rejected
+        is_stored: Called with the checksum of the complete content; if it
+            returns True, the sink is aborted instead of committed
+
+    Returns:
+        UploadResult: Storage path (None if discarded), size, checksum and
+        detected type
+
+    Raises:
+        UploadTooLargeError: If the upload passes ``max_bytes``
+        ContentTypeMismatchError: If the content contradicts the declared type
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    head = b""
+    detected: Optional[str] = None
+    sniffed = False
+
+    def check_content_type() -> None:
+        nonlocal detected, sniffed
+        sniffed = True
+        detected = sniff_content_type(head)
+        if detected and declared_content_type and detected != declared_content_type:
+            raise ContentTypeMismatchError(declared_content_type, detected)
+
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(size, max_bytes)
+            if not sniffed:
+                head += chunk[:SNIFF_BYTES - len(head)]
+                if len(head) >= SNIFF_BYTES:
+                    check_content_type()
+            hasher.update(chunk)
+            await sink.write(chunk)
+        if not sniffed:
+            check_content_type()
+        checksum = hasher.hexdigest()
+        discard = is_stored is not None and await is_stored(checksum)
+        storage_path = None if discard else await sink.commit()
+    except BaseException:
+        await sink.abort()
+        raise
+    if discard:
+        await sink.abort()
+
+    return UploadResult(
+        storage_path=storage_path,
+        size_bytes=size,
+        checksum=checksum,
+        detected_content_type=detected,
+    )
@@ -24,7 +24,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Set
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
@@ -165,8 +165,13 @@ class SnapshotDataAuditor:
 
     async def _audit_versions(self) -> None:
         """Audit all intervention plan versions."""
-        # Build query
-        stmt = select(InterventionVersion)
+        # Build query; versions stored as deltas have no snapshot of their own
+        stmt = select(InterventionVersion).where(
+            or_(
+                InterventionVersion.is_checkpoint.is_(True),
+                InterventionVersion.delta_data.is_(None),
+            )
+        )
         if self.plan_id:
             stmt = stmt.where(InterventionVersion.plan_id == self.plan_id)
 
@@ -23,7 +23,7 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -179,8 +179,14 @@ class SnapshotDataBackfiller:
 
     async def _backfill_versions(self) -> None:
         """Backfill all intervention plan versions that need it."""
-        # Build query for versions needing backfill
-        stmt = select(InterventionVersion)
+        # Build query for versions needing backfill; versions stored as
+        # deltas have no snapshot of their own
+        stmt = select(InterventionVersion).where(
+            or_(
+                InterventionVersion.is_checkpoint.is_(True),
+                InterventionVersion.delta_data.is_(None),
+            )
+        )
         if self.plan_id:
             stmt = stmt.where(InterventionVersion.plan_id == self.plan_id)
 
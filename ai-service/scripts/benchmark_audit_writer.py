@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Audit log write throughput benchmark for LAYA AI Service.
+
+Measures how many audit events per second concurrent requests can record
+through ``AuditService.log`` against a SQLite database file, each request
+using its own session the way route handlers do:
+
+- inline: every event is inserted and committed in the request's session,
+  the way audit events were written before the audit writer
+- queued: events are queued and bulk-inserted by the audit writer; the
+  time includes writing every queued event
+- durable: events are queued and each request waits for its event to be
+  committed; concurrent events share a batch and a commit
+
+SQLite serializes writers and commits quickly compared to a networked
+PostgreSQL server, so the gains measured here understate those in
+production, where each commit is also a round trip.
+
+Usage:
+    python scripts/benchmark_audit_writer.py                    # 2000 events per mode
+    python scripts/benchmark_audit_writer.py --events 10000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest.mock import patch
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models.rbac import AuditLog  # noqa: E402
+from app.services.audit_service import AuditService  # noqa: E402
+from app.services.audit_writer import AuditWriter  # noqa: E402
+
+MODES = ("inline", "queued", "durable")
+
+AUDIT_LOGS_SQL = """
+CREATE TABLE audit_logs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    resource_type VARCHAR(100) NOT NULL,
+    resource_id TEXT,
+    details JSON,
+    ip_address VARCHAR(45),
+    user_agent VARCHAR(500),
+    created_at TIMESTAMP NOT NULL
+)
+"""
+
+
+async def create_database(path: Path) -> AsyncEngine:
+    """Create a SQLite database file with the audit_logs table.
+
+    Args:
+        path: Database file
+
+    Returns:
+        AsyncEngine: Engine of the database
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 60})
+    async with engine.begin() as conn:
+        await conn.execute(text("PRAGMA journal_mode=WAL"))
+        await conn.execute(text(AUDIT_LOGS_SQL))
+    return engine
+
+
+async def count_events(engine: AsyncEngine) -> int:
+    """Number of audit events in the database."""
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(AuditLog))).scalar_one()
+
+
+async def measure(engine: AsyncEngine, mode: str, events: int, concurrency: int) -> float:
+    """Measure the time to record audit events in one mode.
+
+    Args:
+        engine: Engine of the database
+        mode: One of MODES
+        events: Number of events recorded
+        concurrency: Number of requests recording events at once
+
+    Returns:
+        float: Seconds until every event was written
+    """
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    writer = AuditWriter(
+        batch_size=500,
+        flush_interval_seconds=0.05,
+        max_queue_size=10000,
+        session_factory=session_factory,
+    )
+    user_id = uuid4()
+    pending = iter(range(events))
+
+    async def request() -> None:
+        for number in pending:
+            async with session_factory() as db:
+                await AuditService(db).log(
+                    user_id=user_id,
+                    action="access_granted",
+                    resource_type="child",
+                    resource_id=uuid4(),
+                    details={"event": number},
+                    ip_address="127.0.0.1",
+                    durable=mode == "durable",
+                )
+
+    with patch("app.services.audit_service.get_audit_writer", return_value=writer):
+        start = time.perf_counter()
+        if mode != "inline":
+            writer.start(maintain_partitions=False)
+        await asyncio.gather(*(request() for _ in range(concurrency)))
+        await writer.stop()
+        return time.perf_counter() - start
+
+
+async def run_benchmark(
+    events: int, concurrency: int = 50, rounds: int = 3
+) -> Dict[str, float]:
+    """Measure every mode, keeping the median of several rounds.
+
+    Args:
+        events: Number of events recorded per round
+        concurrency: Number of requests recording events at once
+        rounds: Number of rounds per mode
+
+    Returns:
+        Dict[str, float]: Median events written per second by mode
+    """
+    throughput: Dict[str, List[float]] = {mode: [] for mode in MODES}
+    with tempfile.TemporaryDirectory() as directory:
+        # Interleave rounds so drift in machine load affects every mode alike
+        for number in range(rounds):
+            for mode in MODES:
+                engine = await create_database(Path(directory) / f"{mode}-{number}.db")
+                seconds = await measure(engine, mode, events, concurrency)
+                written = await count_events(engine)
+                await engine.dispose()
+                if written != events:
+                    raise RuntimeError(f"{mode}: wrote {written} of {events} events")
+                throughput[mode].append(events / seconds)
+    return {mode: statistics.median(values) for mode, values in throughput.items()}
+
+
+def print_report(results: Dict[str, float]) -> None:
+    """Print the throughput of each mode."""
+    inline = results["inline"]
+    print(f"{'mode':<10}{'events/s':>12}{'speedup':>10}")
+    for mode, per_second in results.items():
+        print(f"{mode:<10}{per_second:>12.0f}{per_second / inline:>9.1f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark audit log write throughput")
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=2000,
+        help="Events recorded per round (default: 2000)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=50,
+        help="Requests recording events at once (default: 50)",
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per mode (default: 3)")
+    args = parser.parse_args(argv)
+
+    print_report(asyncio.run(run_benchmark(args.events, args.concurrency, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
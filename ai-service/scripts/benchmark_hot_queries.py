@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Hot-query overhead benchmark for LAYA AI Service.
+
+Measures the Python-side cost per execution of the registered hot queries
+(see app/core/hot_queries.py) against an in-memory SQLite database, where
+the database work is negligible next to SQLAlchemy's:
+
+- dynamic: the statement is built for every execution, as the services
+  did before the registry
+- hot: the prebuilt statement is reused with new bind parameter values
+
+Both run through the same session and compiled cache, so the difference is
+the cost of building the expression tree and computing its cache key.
+
+Usage:
+    python scripts/benchmark_hot_queries.py                    # 2000 executions per query
+    python scripts/benchmark_hot_queries.py --executions 10000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import JSON, Column, MetaData, Table, create_engine  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.exc import CompileError  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.auth.jwt import TOKEN_BLACKLISTED_QUERY  # noqa: E402
+from app.core.hot_queries import HotQuery  # noqa: E402
+from app.llm.cache import CACHE_ENTRY_QUERY  # noqa: E402
+from app.services.activity_service import ACTIVITY_BY_ID_QUERY  # noqa: E402
+from app.services.rbac_service import USER_ROLES_QUERY  # noqa: E402
+
+# Query, variant flags and bind parameters of each benchmarked execution
+BenchmarkCase = Tuple[HotQuery, Dict[str, Any], Dict[str, Any]]
+
+
+def benchmark_cases() -> List[BenchmarkCase]:
+    """Hot queries to measure, with representative parameters.
+
+    Returns:
+        List[BenchmarkCase]: One case per hot query
+    """
+    now = datetime.utcnow()
+    return [
+        (
+            USER_ROLES_QUERY,
+            {"organization": True, "group": False},
+            {"user_id": uuid4(), "organization_id": uuid4(), "now": now},
+        ),
+        (ACTIVITY_BY_ID_QUERY, {"sqlite": True}, {"activity_id": str(uuid4())}),
+        (
+            CACHE_ENTRY_QUERY,
+            {"provider": True, "model": True},
+            {"cache_key": "k" * 64, "now": now, "provider": "openai", "model": "gpt-4o"},
+        ),
+        (TOKEN_BLACKLISTED_QUERY, {}, {"token": "token"}),
+    ]
+
+
+def create_database(cases: List[BenchmarkCase]) -> Engine:
+    """Create an in-memory SQLite database with the queried tables.
+
+    Tables are created from their columns alone, without constraints, and
+    PostgreSQL-only column types (ARRAY, JSONB) as JSON; neither matters to
+    queries that filter on the other columns of empty tables.
+
+    Args:
+        cases: Benchmark cases whose tables, and the tables of related
+            entities loaded with them, are created
+
+    Returns:
+        Engine: Engine of the database
+    """
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    for query, variant, _ in cases:
+        for mapper in _related_mappers(query.statement(**variant)):
+            for table in mapper.tables:
+                if table.name not in metadata.tables:
+                    Table(
+                        table.name,
+                        metadata,
+                        *(
+                            Column(column.name, _sqlite_type(column.type, engine))
+                            for column in table.columns
+                        ),
+                    )
+    metadata.create_all(engine)
+    return engine
+
+
+def _sqlite_type(column_type: Any, engine: Engine) -> Any:
+    """Column type as is if SQLite can create it, else JSON."""
+    try:
+        column_type.compile(dialect=engine.dialect)
+    except CompileError:
+        return JSON()
+    return column_type
+
+
+def _related_mappers(statement: Any) -> List[Any]:
+    """Mappers of the queried entities and of every entity related to them."""
+    mappers: List[Any] = []
+    pending = [description["entity"] for description in statement.column_descriptions]
+    while pending:
+        mapper = getattr(pending.pop(), "__mapper__", None)
+        if mapper is None or mapper in mappers:
+            continue
+        mappers.append(mapper)
+        pending.extend(relationship.mapper.class_ for relationship in mapper.relationships)
+    return mappers
+
+
+def measure(
+    session: Session, case: BenchmarkCase, executions: int, hot: bool, warmup: int = 50
+) -> float:
+    """Measure the mean time per execution of one query.
+
+    Args:
+        session: Session executing the query
+        case: Query, variant flags and parameters
+        executions: Number of timed executions
+        hot: Reuse the prebuilt statement instead of building one per execution
+        warmup: Number of untimed executions made first
+
+    Returns:
+        float: Mean seconds per execution
+    """
+    query, variant, params = case
+
+    def execute() -> None:
+        statement = query.statement(**variant) if hot else query.build(**variant)
+        session.execute(statement, params).all()
+
+    for _ in range(warmup):
+        execute()
+
+    start = time.perf_counter()
+    for _ in range(executions):
+        execute()
+    return (time.perf_counter() - start) / executions
+
+
+def run_benchmark(executions: int, rounds: int = 3) -> Dict[str, Dict[str, float]]:
+    """Measure every hot query both ways, keeping the median of several rounds.
+
+    Args:
+        executions: Number of timed executions per round
+        rounds: Number of rounds per query and mode
+
+    Returns:
+        Dict[str, Dict[str, float]]: Median seconds per execution in
+        ``dynamic`` and ``hot`` mode, by query name
+    """
+    cases = benchmark_cases()
+    engine = create_database(cases)
+    timings: Dict[str, Dict[str, List[float]]] = {
+        query.name: {"dynamic": [], "hot": []} for query, _, _ in cases
+    }
+    with Session(engine) as session:
+        # Interleave rounds so drift in machine load affects both modes alike
+        for _ in range(rounds):
+            for case in cases:
+                name = case[0].name
+                timings[name]["dynamic"].append(measure(session, case, executions, hot=False))
+                timings[name]["hot"].append(measure(session, case, executions, hot=True))
+    engine.dispose()
+    return {
+        name: {mode: statistics.median(values) for mode, values in modes.items()}
+        for name, modes in timings.items()
+    }
+
+
+def print_report(results: Dict[str, Dict[str, float]]) -> None:
+    """Print the per-execution cost of each query in both modes."""
+    print(f"{'query':<26}{'dynamic':>12}{'hot':>12}{'saved':>12}")
+    for name, modes in results.items():
+        dynamic, hot = modes["dynamic"], modes["hot"]
+        print(
+            f"{name:<26}{dynamic * 1e6:>9.1f} us{hot * 1e6:>9.1f} us"
+            f"{(dynamic - hot) * 1e6:>9.1f} us"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark hot query overhead")
+    parser.add_argument(
+        "--executions",
+        type=int,
+        default=2000,
+        help="Timed executions per round (default: 2000)",
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per query (default: 3)")
+    args = parser.parse_args(argv)
+
+    print_report(run_benchmark(args.executions, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Middleware overhead benchmark for LAYA AI Service.
+
+Measures the per-request cost of the cross-cutting middleware stack by
+driving an ASGI application in process, with no network or server involved:
+
+- bare: the application without any of these middlewares
+- layered: one ``BaseHTTPMiddleware`` per concern (HTTPS redirect,
+  correlation IDs, XSS headers, HSTS, cache headers, validation), the way
+  the stack was assembled before the fused pipeline
+- fused: the same concerns as hooks of a single ``PipelineMiddleware``
+- service: the service's own middleware stack (``app.main``), as the
+  deployed application runs it; rate limiting is disabled for the run so
+  every request reaches the route
+
+Usage:
+    python scripts/benchmark_middleware.py                  # 2000 requests per stack
+    python scripts/benchmark_middleware.py --requests 10000
+    python scripts/benchmark_middleware.py --service        # also the service stack
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI, Request, Response  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.types import ASGIApp, Message  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.middleware.cache_headers import CacheHeadersHook  # noqa: E402
+from app.middleware.correlation import CorrelationHook  # noqa: E402
+from app.middleware.pipeline import PipelineHook, PipelineMiddleware  # noqa: E402
+from app.middleware.security import (  # noqa: E402
+    HTTPSRedirectHook,
+    SecurityHeadersHook,
+    get_hsts_middleware,
+    get_https_redirect_middleware,
+    get_xss_protection_middleware,
+)
+from app.middleware.validation import get_validation_middleware  # noqa: E402
+
+BENCHMARK_PATH = "/api/v1/benchmark"
+
+
+def build_app() -> FastAPI:
+    """Build the application the middleware stacks wrap.
+
+    Returns:
+        FastAPI: Application with a single small JSON route
+    """
+    app = FastAPI()
+
+    @app.get(BENCHMARK_PATH)
+    async def benchmark() -> Dict[str, object]:
+        return {"status": "ok", "items": [1, 2, 3]}
+
+    return app
+
+
+def _hook_dispatch(hook: PipelineHook) -> Callable:
+    """Wrap a pipeline hook as a ``call_next`` style dispatch function."""
+
+    async def dispatch(request: Request, call_next: Callable) -> Response:
+        state: Dict[str, object] = {}
+        short_circuit = hook.on_request(request.scope, request.headers, state)
+        if short_circuit is not None:
+            return short_circuit
+        response = await call_next(request)
+        hook.on_response_start(request.scope, response.status_code, response.headers, state)
+        return response
+
+    return dispatch
+
+
+def build_layered_stack(app: ASGIApp) -> ASGIApp:
+    """Wrap an application in one ``BaseHTTPMiddleware`` per concern.
+
+    Args:
+        app: Application to wrap
+
+    Returns:
+        ASGIApp: The layered stack, outermost layer first
+    """
+    dispatchers = [
+        get_validation_middleware(),
+        _hook_dispatch(CacheHeadersHook()),
+        get_hsts_middleware(),
+        get_xss_protection_middleware(),
+        _hook_dispatch(CorrelationHook()),
+        get_https_redirect_middleware(),
+    ]
+    for dispatch in dispatchers:
+        app = BaseHTTPMiddleware(app, dispatch=dispatch)
+    return app
+
+
+def build_fused_stack(app: ASGIApp) -> ASGIApp:
+    """Wrap an application in the fused pipeline.
+
+    Args:
+        app: Application to wrap
+
+    Returns:
+        ASGIApp: The pipeline middleware
+    """
+    return PipelineMiddleware(
+        app,
+        hooks=[
+            HTTPSRedirectHook(),
+            CorrelationHook(),
+            SecurityHeadersHook(),
+            CacheHeadersHook(),
+        ],
+    )
+
+
+def build_service_app() -> FastAPI:
+    """Build the benchmark application with the service's middleware stack.
+
+    The middlewares registered on the service application (``app.main``)
+    are added to the benchmark application in the same order, so they run
+    exactly as they do in the service.
+
+    Returns:
+        FastAPI: Benchmark application with the service middleware
+    """
+    from app.main import app as service_app
+
+    app = build_app()
+    app.user_middleware = list(service_app.user_middleware)
+    return app
+
+
+async def call(app: ASGIApp, path: str = BENCHMARK_PATH) -> List[Message]:
+    """Send one GET request through an ASGI application.
+
+    Args:
+        app: Application to call
+        path: Request path
+
+    Returns:
+        List[Message]: Messages the application sent
+    """
+    sent: List[Message] = []
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive() -> Message:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 443),
+    }
+    await app(scope, receive, send)
+    return sent
+
+
+async def measure(app: ASGIApp, requests: int, warmup: int = 50) -> float:
+    """Measure the mean time per request.
+
+    Args:
+        app: Application to call
+        requests: Number of timed requests
+        warmup: Number of untimed requests made first
+
+    Returns:
+        float: Mean seconds per request
+    """
+    for _ in range(warmup):
+        await call(app)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests
+
+
+async def run_benchmark(
+    requests: int, rounds: int = 3, service: bool = False
+) -> Dict[str, float]:
+    """Measure every stack, keeping the median of several rounds.
+
+    Args:
+        requests: Number of timed requests per round
+        rounds: Number of rounds per stack
+        service: Whether to also measure the service's middleware stack
+
+    Returns:
+        Dict[str, float]: Median seconds per request by stack name
+    """
+    stacks: Dict[str, ASGIApp] = {
+        "bare": build_app(),
+        "layered": build_layered_stack(build_app()),
+        "fused": build_fused_stack(build_app()),
+    }
+    if service:
+        stacks["service"] = build_service_app()
+
+    rate_limit_enabled = settings.rate_limit_enabled
+    settings.rate_limit_enabled = False
+    timings: Dict[str, List[float]] = {name: [] for name in stacks}
+    try:
+        # Interleave rounds so drift in machine load affects every stack alike
+        for _ in range(rounds):
+            for name, app in stacks.items():
+                timings[name].append(await measure(app, requests))
+    finally:
+        settings.rate_limit_enabled = rate_limit_enabled
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+def print_report(results: Dict[str, float]) -> None:
+    """Print per-request latency and middleware overhead of each stack."""
+    bare = results["bare"]
+    print(f"{'stack':<10}{'per request':>14}{'overhead':>12}")
+    for name, seconds in results.items():
+        overhead = seconds - bare
+        print(f"{name:<10}{seconds * 1e6:>11.1f} us{overhead * 1e6:>9.1f} us")
+
+    layered = results["layered"] - bare
+    fused = results["fused"] - bare
+    if fused > 0:
+        print(f"\nFused pipeline overhead is {layered / fused:.1f}x lower than layered")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark middleware overhead")
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Timed requests per round (default: 2000)"
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per stack (default: 3)")
+    parser.add_argument(
+        "--service", action="store_true", help="Also measure the service middleware stack"
+    )
+    args = parser.parse_args(argv)
+
+    print_report(asyncio.run(run_benchmark(args.requests, args.rounds, args.service)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Intervention plan version storage benchmark for LAYA AI Service.
+
+Builds the version history of a synthetic intervention plan, edited a
+little between versions the way plans are during reviews (goal progress,
+a new strategy, a reworded need), and reports for full snapshots and for
+delta storage (app/services/plan_versioning.py):
+
+- stored: JSON bytes stored for the whole history
+- compare: JSON bytes read to compare two versions a few versions apart
+- rebuild: time to rebuild the slowest version from its checkpoint
+
+Usage:
+    python scripts/benchmark_plan_versions.py                  # 50 versions
+    python scripts/benchmark_plan_versions.py --versions 200 --items 20
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.plan_versioning import (  # noqa: E402
+    PLAN_SECTIONS,
+    VERSION_CHECKPOINT_INTERVAL,
+    apply_deltas,
+    diff_snapshots,
+)
+
+# Versions between the two versions compared
+COMPARE_DISTANCE = 5
+
+TEXT = (
+    "Observed during circle time and free play; the educator notes the "
+    "context, the prompts given and how the child responded. "
+)
+
+
+def make_item(rng: random.Random) -> Dict:
+    """A section item with the size of a real one."""
+    return {
+        "id": str(uuid4()),
+        "title": f"Item {rng.randint(1, 999)}",
+        "description": TEXT * rng.randint(2, 6),
+        "status": "not_started",
+        "progress_percentage": 0.0,
+        "order": rng.randint(0, 20),
+    }
+
+
+def make_history(versions: int, items: int, seed: int = 1) -> List[Dict]:
+    """Snapshots of a plan edited a little between versions.
+
+    Args:
+        versions: Number of versions
+        items: Number of items per plan section
+        seed: Random seed
+
+    Returns:
+        List[Dict]: Snapshot of every version, oldest first
+    """
+    rng = random.Random(seed)
+    snapshot = {
+        "id": str(uuid4()),
+        "title": "Communication and social skills plan",
+        "status": "active",
+        "version": 1,
+        "medical_history": TEXT * 10,
+        "family_context": TEXT * 10,
+        **{section: [make_item(rng) for _ in range(items)] for section in PLAN_SECTIONS},
+    }
+    history = [snapshot]
+    for number in range(2, versions + 1):
+        snapshot = copy.deepcopy(snapshot)
+        snapshot["version"] = number
+        for goal in rng.sample(snapshot["goals"], k=min(2, len(snapshot["goals"]))):
+            goal["progress_percentage"] = float(rng.choice([25, 50, 75, 100]))
+            goal["status"] = "achieved" if goal["progress_percentage"] == 100 else "in_progress"
+        if rng.random() < 0.3:
+            snapshot["strategies"].append(make_item(rng))
+        if rng.random() < 0.3:
+            rng.choice(snapshot["needs"])["description"] = TEXT * rng.randint(2, 6)
+        history.append(snapshot)
+    return history
+
+
+def sorted_sections(snapshot: Dict) -> Dict:
+    """Snapshot with its section items sorted by ID, as they have no order."""
+    return {
+        key: sorted(value, key=lambda item: item["id"]) if key in PLAN_SECTIONS else value
+        for key, value in snapshot.items()
+    }
+
+
+def size(value) -> int:
+    """Bytes of a value stored as JSON."""
+    return len(json.dumps(value))
+
+
+def run_benchmark(versions: int = 50, items: int = 10) -> Dict[str, Dict[str, float]]:
+    """Measure full snapshot and delta storage of a plan's history.
+
+    Args:
+        versions: Number of versions (at least 2)
+        items: Number of items per plan section
+
+    Returns:
+        Dict[str, Dict[str, float]]: Stored bytes, bytes read per comparison
+        and seconds per rebuild, by storage
+    """
+    history = make_history(versions, items)
+    deltas = [None] + [diff_snapshots(old, new) for old, new in zip(history, history[1:])]
+    checkpoints = {
+        number for number in range(len(history)) if number % VERSION_CHECKPOINT_INTERVAL == 0
+    }
+
+    snapshots = {
+        "stored": sum(size(snapshot) for snapshot in history),
+        "compare": 2 * size(history[-1]),
+        "rebuild": 0.0,
+    }
+
+    compared = range(len(history) - COMPARE_DISTANCE, len(history))
+    stored = sum(size(history[n]) for n in checkpoints)
+    stored += sum(size(delta) for delta in deltas[1:])
+
+    # The last version that is not a checkpoint has the most deltas to apply
+    last = max(n for n in range(len(history)) if n not in checkpoints)
+    checkpoint = max(n for n in checkpoints if n <= last)
+    start = time.perf_counter()
+    rebuilt = apply_deltas(history[checkpoint], deltas[checkpoint + 1:last + 1])
+    seconds = time.perf_counter() - start
+    if sorted_sections(rebuilt) != sorted_sections(history[last]):
+        raise RuntimeError(f"Version {last + 1} was not rebuilt correctly")
+
+    return {
+        "snapshots": snapshots,
+        "deltas": {
+            "stored": stored,
+            "compare": sum(size(deltas[n]) for n in compared),
+            "rebuild": seconds,
+        },
+    }
+
+
+def print_report(results: Dict[str, Dict[str, float]]) -> None:
+    """Print the storage and read costs of each storage."""
+    print(f"{'storage':<12}{'stored KiB':>12}{'compare KiB':>13}{'rebuild ms':>12}")
+    for storage, costs in results.items():
+        print(
+            f"{storage:<12}{costs['stored'] / 1024:>12.1f}"
+            f"{costs['compare'] / 1024:>13.1f}{costs['rebuild'] * 1000:>12.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark plan version storage")
+    parser.add_argument(
+        "--versions",
+        type=int,
+        default=50,
+        help="Versions in the plan history (default: 50)",
+    )
+    parser.add_argument(
+        "--items",
+        type=int,
+        default=10,
+        help="Items per plan section (default: 10)",
+    )
+    args = parser.parse_args(argv)
+
+    print_report(run_benchmark(args.versions, args.items))
+
+
+if __name__ == "__main__":
+    main()
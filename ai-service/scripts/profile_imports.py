@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Import-time profile of LAYA AI Service.
+
+Imports modules in a fresh interpreter with ``python -X importtime`` and
+turns the raw trace into a report of where worker startup time goes:
+
+- total: wall time of the whole import, in milliseconds
+- slowest modules by cumulative time (the module and everything it imported)
+- slowest modules by self time (the module's own top-level code)
+- time per top-level package (``app``, ``sqlalchemy``, ``boto3``, ...)
+
+Usage:
+    python scripts/profile_imports.py                       # profiles app.main
+    python scripts/profile_imports.py app.database app.llm --top 15
+    python scripts/profile_imports.py app.main --json > importtime.json
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """One module in an import-time trace.
+
+    Attributes:
+        name: Dotted module name
+        self_us: Time spent in the module's own code, in microseconds
+        cumulative_us: Time including the modules it imported, in microseconds
+        depth: Nesting level in the import tree (0 for top-level imports)
+    """
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """Parsed import-time trace of one interpreter run.
+
+    Attributes:
+        modules: Imported modules, in the order their imports completed
+        wall_ms: Wall time of the import statement, in milliseconds
+        targets: Modules that were profiled
+    """
+
+    modules: List[ImportRecord] = field(default_factory=list)
+    wall_ms: float = 0.0
+    targets: Sequence[str] = ()
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of the top-level imports, in milliseconds."""
+        return sum(record.cumulative_us for record in self.modules if record.depth == 0) / 1000
+
+    @property
+    def loaded(self) -> List[str]:
+        """Names of every module imported."""
+        return [record.name for record in self.modules]
+
+    def imports(self, name: str) -> bool:
+        """Check whether a module (or any of its submodules) was imported.
+
+        Args:
+            name: Dotted module name
+
+        Returns:
+            bool: True if the module was imported
+        """
+        prefix = f"{name}."
+        return any(loaded == name or loaded.startswith(prefix) for loaded in self.loaded)
+
+    def slowest(self, top: int = 20, by: str = "cumulative") -> List[ImportRecord]:
+        """Slowest modules.
+
+        Args:
+            top: Number of modules to return
+            by: ``"cumulative"`` or ``"self"``
+
+        Returns:
+            List[ImportRecord]: Slowest modules first
+        """
+        key = (lambda r: r.cumulative_us) if by == "cumulative" else (lambda r: r.self_us)
+        return sorted(self.modules, key=key, reverse=True)[:top]
+
+    def by_package(self) -> Dict[str, float]:
+        """Self time per top-level package, in milliseconds, slowest first."""
+        totals: Dict[str, int] = defaultdict(int)
+        for record in self.modules:
+            totals[record.name.split(".")[0]] += record.self_us
+        return {
+            package: micros / 1000
+            for package, micros in sorted(totals.items(), key=lambda item: -item[1])
+        }
+
+    def as_dict(self, top: int = 20) -> Dict[str, object]:
+        """Export the report as JSON-serializable data.
+
+        Args:
+            top: Number of modules in the slowest lists
+
+        Returns:
+            Dict[str, object]: Totals, slowest modules and package times
+        """
+
+        def rows(records: List[ImportRecord]) -> List[Dict[str, object]]:
+            return [
+                {
+                    "module": record.name,
+                    "self_ms": record.self_us / 1000,
+                    "cumulative_ms": record.cumulative_us / 1000,
+                }
+                for record in records
+            ]
+
+        return {
+            "targets": list(self.targets),
+            "total_ms": self.total_ms,
+            "wall_ms": self.wall_ms,
+            "module_count": len(self.modules),
+            "slowest_cumulative": rows(self.slowest(top, "cumulative")),
+            "slowest_self": rows(self.slowest(top, "self")),
+            "packages_ms": self.by_package(),
+        }
+
+
+def parse_importtime(trace: str) -> List[ImportRecord]:
+    """Parse the stderr of ``python -X importtime``.
+
+    Args:
+        trace: Raw trace; lines that are not import-time records are ignored
+
+    Returns:
+        List[ImportRecord]: One record per imported module
+    """
+    records = []
+    for line in trace.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        records.append(
+            ImportRecord(
+                name=name,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=max(0, (len(indent) - 1) // 2),
+            )
+        )
+    return records
+
+
+def profile_imports(
+    modules: Sequence[str] = ("app.main",),
+    python: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> ImportReport:
+    """Import modules in a fresh interpreter and profile the imports.
+
+    Interpreter startup (``site``, encodings) is excluded from the report:
+    it runs before the profiled import statement.
+
+    Args:
+        modules: Modules to import, in order
+        python: Interpreter to use (defaults to the current one)
+        env: Environment of the interpreter (defaults to the current one)
+
+    Returns:
+        ImportReport: Parsed trace of the profiled imports
+
+    Raises:
+        RuntimeError: If the modules cannot be imported
+    """
+    # Mark where interpreter startup ends so its imports can be dropped
+    code = (
+        "import sys, time; sys.stderr.write('--- profile start ---\\n'); "
+        "start = time.perf_counter(); "
+        + "; ".join(f"import {module}" for module in modules)
+        + "; sys.stderr.write(f'--- wall {(time.perf_counter() - start) * 1000:.3f} ---\\n')"
+    )
+    started = time.perf_counter()
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{tail}")
+
+    trace = result.stderr.split("--- profile start ---", 1)[-1]
+    wall = re.search(r"--- wall ([\d.]+) ---", trace)
+    return ImportReport(
+        modules=parse_importtime(trace),
+        wall_ms=float(wall.group(1)) if wall else (time.perf_counter() - started) * 1000,
+        targets=tuple(modules),
+    )
+
+
+def format_report(report: ImportReport, top: int = 20) -> str:
+    """Render a report as text.
+
+    Args:
+        report: Report to render
+        top: Number of modules in the slowest lists
+
+    Returns:
+        str: Human-readable report
+    """
+    lines = [
+        f"Import profile of {', '.join(report.targets)}",
+        f"  wall time: {report.wall_ms:.1f} ms ({len(report.modules)} modules)",
+        "",
+        f"Slowest {top} modules (cumulative ms / self ms):",
+    ]
+    for record in report.slowest(top, "cumulative"):
+        lines.append(
+            f"  {record.cumulative_us / 1000:9.1f} {record.self_us / 1000:9.1f}  {record.name}"
+        )
+    lines += ["", f"Slowest {top} modules by own code (self ms):"]
+    for record in report.slowest(top, "self"):
+        lines.append(f"  {record.self_us / 1000:9.1f}  {record.name}")
+    lines += ["", "Self time per package (ms):"]
+    for package, millis in list(report.by_package().items())[:top]:
+        lines.append(f"  {millis:9.1f}  {package}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Profile the requested modules and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["app.main"], help="Modules to import")
+    parser.add_argument("--top", type=int, default=20, help="Modules per ranking")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = profile_imports(args.modules)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report.as_dict(args.top), indent=2))
+    else:
+        print(format_report(report, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,7 +11,7 @@ from uuid import uuid4
 import jwt
 import pytest
 import pytest_asyncio
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials
 
 from app.auth.jwt import create_token, decode_token, verify_token
@@ -399,6 +399,43 @@ class TestVerifyToken:
         call_args = mock_db_session.execute.call_args
         assert call_args is not None
 
+    @pytest.mark.asyncio
+    async def test_verify_token_reuses_request_payload(self, mock_db_session, valid_credentials):
+        """Test verify_token reuses the payload already decoded for the request."""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db_session.execute.return_value = mock_result
+        request_payload = decode_token(valid_credentials.credentials)
+        request = Request({
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {valid_credentials.credentials}".encode())],
+            "state": {"token_payload": request_payload},
+        })
+
+        with patch("app.auth.jwt.decode_token") as mock_decode:
+            payload = await verify_token(valid_credentials, mock_db_session, request)
+
+        assert payload is request_payload
+        mock_decode.assert_not_called()
+        # The blacklist is still checked
+        mock_db_session.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_verify_token_decodes_without_request_payload(
+        self, mock_db_session, invalid_credentials
+    ):
+        """Test verify_token decodes the token when the request has no payload."""
+        request = Request({
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {invalid_credentials.credentials}".encode())],
+        })
+
+        with pytest.raises(HTTPException) as exc_info:
+            await verify_token(invalid_credentials, mock_db_session, request)
+
+        assert exc_info.value.status_code == 401
+        mock_db_session.execute.assert_not_called()
+
 
 class TestVerifyTokenIntegration:
     """Integration tests for verify_token with real database fixtures."""
@@ -6,8 +6,9 @@ test data, and authentication mocking for coaching, activity, and communication
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import date, datetime, timezone
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Callable, ContextManager, Dict, Iterator, List, Optional
 from uuid import UUID, uuid4
 
 import jwt
@@ -20,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.core.query_stats import QueryStats, instrument_engine, track_queries
 from app.models.base import Base
 from app.models.activity import (
     Activity,
@@ -33,6 +35,9 @@ from app.models.activity import (
 # Test database URL using SQLite for isolation
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
+# The whole suite shares one client address; rate limiting tests enable it
+settings.rate_limit_enabled = False
+
 
 def create_test_token(
     subject: str,
@@ -78,6 +83,9 @@ test_engine = create_async_engine(
     poolclass=StaticPool,
 )
 
+# Record queries so tests can assert query budgets
+instrument_engine(test_engine)
+
 # Session factory for test database sessions
 TestAsyncSessionLocal = sessionmaker(
     test_engine,
@@ -296,6 +304,19 @@ CREATE INDEX IF NOT EXISTS idx_evidence_sources_recommendation ON evidence_sourc
 
 # SQLite-compatible storage tables (for file upload testing)
 SQLITE_CREATE_STORAGE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS storage_blobs (
+    id TEXT PRIMARY KEY,
+    checksum VARCHAR(64) NOT NULL,
+    storage_backend VARCHAR(20) NOT NULL,
+    storage_path VARCHAR(500) NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    content_type VARCHAR(100) NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    orphaned_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (checksum, storage_backend)
+);
+
 CREATE TABLE IF NOT EXISTS files (
     id TEXT PRIMARY KEY,
     owner_id TEXT NOT NULL,
@@ -306,6 +327,7 @@ CREATE TABLE IF NOT EXISTS files (
     storage_backend VARCHAR(20) NOT NULL,
     storage_path VARCHAR(500) NOT NULL,
     checksum VARCHAR(64),
+    blob_id TEXT REFERENCES storage_blobs(id) ON DELETE SET NULL,
     is_public INTEGER NOT NULL DEFAULT 0,
     description TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -328,6 +350,7 @@ CREATE TABLE IF NOT EXISTS storage_quotas (
     quota_bytes INTEGER NOT NULL DEFAULT 104857600,
     used_bytes INTEGER NOT NULL DEFAULT 0,
     file_count INTEGER NOT NULL DEFAULT 0,
+    reconciled_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -336,6 +359,7 @@ CREATE INDEX IF NOT EXISTS idx_files_owner ON files(owner_id);
 CREATE INDEX IF NOT EXISTS idx_files_content_type ON files(content_type);
 CREATE INDEX IF NOT EXISTS idx_files_is_public ON files(is_public);
 CREATE INDEX IF NOT EXISTS idx_files_created_at ON files(created_at);
+CREATE INDEX IF NOT EXISTS idx_files_blob ON files(blob_id);
 CREATE INDEX IF NOT EXISTS idx_file_thumbnails_file ON file_thumbnails(file_id);
 CREATE INDEX IF NOT EXISTS idx_storage_quotas_owner ON storage_quotas(owner_id);
 """
@@ -477,6 +501,44 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def query_budget() -> Callable[..., ContextManager[QueryStats]]:
+    """Assert how many queries a block of code may run.
+
+    Fails the test when the block runs more than ``max_queries`` statements,
+    or when one statement repeats often enough to suggest an N+1 pattern.
+
+    Example:
+        async def test_list_threads(client, query_budget):
+            with query_budget(max_queries=3):
+                await client.get("/api/v1/messages/threads")
+
+    Returns:
+        Callable: Context manager factory taking ``max_queries`` and optional
+        ``n_plus_one_threshold`` (None disables the N+1 check)
+    """
+
+    @contextmanager
+    def budget(
+        max_queries: int,
+        n_plus_one_threshold: Optional[int] = settings.db_n_plus_one_threshold,
+    ) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+
+        assert stats.count <= max_queries, (
+            f"Expected at most {max_queries} queries, {stats.count} were executed:\n"
+            + "\n".join(f"{n} x {sql}" for sql, n in stats.fingerprints.most_common())
+        )
+        if n_plus_one_threshold is not None:
+            suspects = stats.suspected_n_plus_one(n_plus_one_threshold)
+            assert not suspects, "Suspected N+1 query pattern:\n" + "\n".join(
+                f"{n} x {sql}" for sql, n in suspects.items()
+            )
+
+    return budget
+
+
 # ============================================================================
 # Shared authentication fixtures
 # ============================================================================
@@ -1686,6 +1748,25 @@ CREATE INDEX IF NOT EXISTS idx_password_reset_email ON password_reset_tokens(ema
 """
 
 
+# SQLite-compatible RBAC audit log table (PostgreSQL JSONB not supported in SQLite)
+SQLITE_CREATE_AUDIT_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    resource_type VARCHAR(100) NOT NULL,
+    resource_id TEXT,
+    details JSON,
+    ip_address VARCHAR(45),
+    user_agent VARCHAR(500),
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user ON audit_logs(user_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at);
+"""
+
+
 # SQLite-compatible development profile tables (PostgreSQL ARRAY/JSONB not supported in SQLite)
 SQLITE_CREATE_DOCUMENT_TABLES_SQL = """
 CREATE TABLE IF NOT EXISTS documents (
@@ -1719,7 +1800,7 @@ CREATE TABLE IF NOT EXISTS signatures (
     signer_id TEXT NOT NULL,
     signature_image_url TEXT NOT NULL,
     ip_address TEXT NOT NULL,
-    timestamp TIMESTAMP NOT NULL,
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     device_info TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -4,14 +4,25 @@ This module tests the GzipCompressionMiddleware to ensure proper compression
 of responses based on content type, size, and client capabilities.
 """
 
+import asyncio
 import gzip
+import zlib
+from unittest.mock import patch
 
 import pytest
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.testclient import TestClient
 
-from app.middleware.compression import GzipCompressionMiddleware, create_compression_middleware
+from app.middleware.compression import (
+    ENCODERS,
+    CompressionMiddleware,
+    GzipCompressionMiddleware,
+    PrecompressedCache,
+    choose_level,
+    create_compression_middleware,
+    negotiate_encoding,
+)
 
 
 @pytest.fixture
@@ -86,9 +97,9 @@ def app():
     async def get_already_compressed():
         """Test endpoint with existing Content-Encoding."""
         return Response(
-            content=b"already compressed data" * 100,
+            content=gzip.compress(b"already compressed data" * 100),
             media_type="text/plain",
-            headers={"Content-Encoding": "br"}
+            headers={"Content-Encoding": "gzip"}
         )
 
     @test_app.get("/custom-compressible")
@@ -215,10 +226,11 @@ def test_pdf_not_compressed(app):
 def test_already_compressed_not_recompressed(app):
     """Test that responses with existing Content-Encoding are not recompressed."""
     client = TestClient(app)
-    response = client.get("/already-compressed", headers={"Accept-Encoding": "gzip"})
+    response = client.get("/already-compressed", headers={"Accept-Encoding": "br, gzip"})
 
     assert response.status_code == 200
-    assert response.headers.get("content-encoding") == "br"  # Original encoding preserved
+    assert response.headers.get("content-encoding") == "gzip"  # Original encoding preserved
+    assert response.content == b"already compressed data" * 100
 
 
 def test_compression_reduces_size(app):
@@ -485,3 +497,243 @@ def test_compression_level_affects_size():
     size_best = int(response_best.headers.get("content-length", 0))
 
     assert size_best <= size_fast
+
+
+# =============================================================================
+# Multi-codec negotiation, streaming and adaptive levels
+# =============================================================================
+
+requires_brotli = pytest.mark.skipif("br" not in ENCODERS, reason="brotli not installed")
+requires_zstd = pytest.mark.skipif("zstd" not in ENCODERS, reason="zstandard not installed")
+
+
+def test_negotiate_encoding_prefers_highest_q_value():
+    """Test that the coding with the highest q-value wins."""
+    available = {"br", "zstd", "gzip"}
+
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert negotiate_encoding("gzip, br, zstd", available) == "br"
+    assert negotiate_encoding("gzip;q=0.8, zstd", available) == "zstd"
+
+
+def test_negotiate_encoding_wildcard_and_refusals():
+    """Test wildcard handling and q=0 refusals."""
+    available = {"br", "zstd", "gzip"}
+
+    assert negotiate_encoding("*", available) == "br"
+    assert negotiate_encoding("br;q=0, *;q=0.5", available) == "zstd"
+    assert negotiate_encoding("gzip;q=0", available) is None
+    assert negotiate_encoding("identity", available) is None
+    assert negotiate_encoding("", available) is None
+
+
+def test_negotiate_encoding_skips_unavailable_codecs():
+    """Test that codecs the server cannot produce are never chosen."""
+    assert negotiate_encoding("br, gzip;q=0.5", {"gzip"}) == "gzip"
+
+
+def test_choose_level_adapts_to_load_and_size():
+    """Test that levels drop under load and for large or streamed bodies."""
+    with patch("app.middleware.compression.current_cpu_load", return_value=0.1):
+        balanced = choose_level("gzip", 6, size=10_000)
+        large = choose_level("gzip", 6, size=10 * 1024 * 1024)
+        streaming = choose_level("gzip", 6, streaming=True)
+        reusable = choose_level("gzip", 6, size=10_000, reusable=True)
+
+    with patch("app.middleware.compression.current_cpu_load", return_value=2.0):
+        loaded = choose_level("gzip", 6, size=10_000, reusable=True)
+
+    assert balanced == 6
+    assert large < balanced
+    assert streaming < balanced
+    assert reusable == 9
+    assert loaded == 1
+
+
+@requires_brotli
+def test_brotli_compression(app):
+    """Test that brotli is used when the client prefers it."""
+    client = TestClient(app)
+    response = client.get("/api/data", headers={"Accept-Encoding": "br, gzip;q=0.5"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert "test response" in response.json()["message"]
+
+
+@requires_zstd
+def test_zstd_compression(app):
+    """Test that zstd is used when the client prefers it."""
+    client = TestClient(app)
+    response = client.get("/api/data", headers={"Accept-Encoding": "zstd, gzip;q=0.5"})
+
+    assert response.headers["content-encoding"] == "zstd"
+    assert "test response" in response.json()["message"]
+
+
+@pytest.fixture
+def streaming_app():
+    """App streaming server-sent events through the compression middleware."""
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware)
+
+    @test_app.get("/stream")
+    async def stream():
+        async def events():
+            for index in range(20):
+                yield f"data: {{\"token\": \"chunk {index} of the completion\"}}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return test_app
+
+
+def test_streaming_response_compressed_incrementally(streaming_app):
+    """Test that each streamed chunk is compressed and flushed on its own."""
+    received = []
+    requested = []
+    finished = asyncio.Event()
+
+    async def receive():
+        if not requested:
+            requested.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        received.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+        "http_version": "1.1",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("testclient", 123),
+        "root_path": "",
+    }
+
+    asyncio.run(streaming_app(scope, receive, send))
+
+    start = received[0]
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    # Every chunk decodes on arrival, without waiting for the end of the stream
+    decoder = zlib.decompressobj(31)
+    bodies = [m for m in received[1:] if m["type"] == "http.response.body"]
+    decoded_chunks = [decoder.decompress(m["body"]) for m in bodies if m["body"]]
+    assert decoded_chunks[0].startswith(b"data: ")
+    assert len([chunk for chunk in decoded_chunks if chunk]) >= 20
+    assert b"".join(decoded_chunks).count(b"data: ") == 20
+
+
+def test_event_stream_round_trip(streaming_app):
+    """Test that compressed event streams decode to the original events."""
+    client = TestClient(streaming_app)
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.count("data: ") == 20
+
+
+def test_precompressed_body_reused_for_strong_etag():
+    """Test that bodies with a strong ETag are compressed once and reused."""
+    test_app = FastAPI()
+    precompressed = PrecompressedCache()
+    test_app.add_middleware(CompressionMiddleware, precompressed=precompressed)
+
+    @test_app.get("/cached")
+    async def cached():
+        return JSONResponse({"items": ["entry"] * 200}, headers={"ETag": '"abc123"'})
+
+    @test_app.get("/weak")
+    async def weak():
+        return JSONResponse({"items": ["entry"] * 200}, headers={"ETag": 'W/"abc123"'})
+
+    client = TestClient(test_app)
+    first = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    client.get("/weak", headers={"Accept-Encoding": "gzip"})
+
+    assert first.json() == second.json()
+    assert precompressed.hits == 1
+    assert precompressed.misses == 1
+
+
+def test_precompressed_cache_evicts_least_recently_used():
+    """Test that the precompressed cache stays within its byte budget."""
+    precompressed = PrecompressedCache(max_bytes=10)
+    precompressed.put('"a"', "gzip", b"12345")
+    precompressed.put('"b"', "gzip", b"12345")
+    precompressed.get('"a"', "gzip")
+    precompressed.put('"c"', "gzip", b"12345")
+
+    assert precompressed.get('"a"', "gzip") == b"12345"
+    assert precompressed.get('"b"', "gzip") is None
+    assert precompressed.get('"c"', "gzip") == b"12345"
+
+
+def test_partial_content_is_neither_compressed_nor_reused(tmp_path):
+    """Test that a range response does not stand in for the full body later."""
+    path = tmp_path / "notes.txt"
+    path.write_text("Observation notes for the day.\n" * 250)
+    test_app = FastAPI()
+    precompressed = PrecompressedCache()
+    test_app.add_middleware(CompressionMiddleware, precompressed=precompressed)
+
+    @test_app.get("/notes")
+    async def notes():
+        return FileResponse(path, media_type="text/plain")
+
+    client = TestClient(test_app)
+    partial = client.get(
+        "/notes", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-999"}
+    )
+    full = client.get("/notes", headers={"Accept-Encoding": "gzip"})
+
+    assert partial.status_code == 206
+    assert "content-encoding" not in partial.headers
+    assert len(partial.content) == 1000
+    assert full.status_code == 200
+    assert full.headers["content-encoding"] == "gzip"
+    assert full.content == path.read_bytes()
+
+
+def test_compressed_response_has_weak_etag():
+    """Test that compressed bytes are not named by the original strong ETag."""
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware)
+
+    @test_app.get("/cached")
+    async def cached():
+        return JSONResponse({"items": ["entry"] * 200}, headers={"ETag": '"abc123"'})
+
+    client = TestClient(test_app)
+    compressed = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/cached", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["etag"] == 'W/"abc123"'
+    assert identity.headers["etag"] == '"abc123"'
+
+
+def test_error_responses_not_compressed():
+    """Test that only 200 responses are compressed."""
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware)
+
+    @test_app.get("/missing")
+    async def missing():
+        return JSONResponse({"detail": "x" * 1000}, status_code=404)
+
+    response = TestClient(test_app).get("/missing", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 404
+    assert "content-encoding" not in response.headers
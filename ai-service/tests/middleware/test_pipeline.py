@@ -0,0 +1,251 @@
+"""Tests for the fused pure-ASGI middleware pipeline."""
+
+import asyncio
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope
+
+from app.core.context import clear_context, get_correlation_id
+from app.middleware.cache_headers import CacheHeadersHook
+from app.middleware.correlation import CorrelationHook
+from app.middleware.pipeline import HookState, PipelineHook, PipelineMiddleware
+from app.middleware.security import HTTPSRedirectHook, SecurityHeadersHook
+
+
+class RecordingHook(PipelineHook):
+    """Hook recording the order it runs in."""
+
+    def __init__(self, name: str, calls: list) -> None:
+        self.name = name
+        self.calls = calls
+
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        self.calls.append(f"{self.name}:request")
+        state[self.name] = headers.get("x-test")
+        return None
+
+    def on_response_start(
+        self, scope: Scope, status: int, headers: MutableHeaders, state: HookState
+    ) -> None:
+        self.calls.append(f"{self.name}:response")
+        headers.append("X-Hooks", f"{self.name}={state[self.name]}")
+
+
+class AwaitingHook(PipelineHook):
+    """Hook doing asynchronous work before the response is sent."""
+
+    def __init__(self, calls: list) -> None:
+        self.calls = calls
+
+    async def before_response(self, scope: Scope, status: int, state: HookState) -> None:
+        await asyncio.sleep(0)
+        self.calls.append(f"before_response:{status}")
+
+
+class BlockingHook(PipelineHook):
+    """Hook answering every request itself."""
+
+    def on_request(
+        self, scope: Scope, headers: Headers, state: HookState
+    ) -> Optional[ASGIApp]:
+        return PlainTextResponse("blocked", status_code=403)
+
+
+@pytest.fixture(autouse=True)
+def reset_context() -> None:
+    """Reset context before each test."""
+    clear_context()
+
+
+def build_app(hooks) -> FastAPI:
+    """Build an app with the given pipeline hooks."""
+    app = FastAPI()
+    app.add_middleware(PipelineMiddleware, hooks=hooks)
+
+    @app.get("/api/data")
+    async def data(request: Request):
+        return {
+            "correlation_id_context": get_correlation_id(),
+            "request_id_state": getattr(request.state, "request_id", None),
+        }
+
+    return app
+
+
+def test_hooks_run_in_order_and_share_state():
+    """Test that hooks run in order and share per-request state."""
+    calls = []
+    client = TestClient(build_app([RecordingHook("a", calls), RecordingHook("b", calls)]))
+
+    response = client.get("/api/data", headers={"X-Test": "value"})
+
+    assert calls == ["a:request", "b:request", "a:response", "b:response"]
+    assert response.headers.get_list("X-Hooks") == ["a=value", "b=value"]
+
+
+def test_request_hook_can_short_circuit():
+    """Test that a hook response skips the application and later hooks."""
+    calls = []
+    client = TestClient(build_app([BlockingHook(), RecordingHook("a", calls)]))
+
+    response = client.get("/api/data")
+
+    assert response.status_code == 403
+    assert response.text == "blocked"
+    assert calls == []
+
+
+def test_hooks_without_overrides_are_skipped():
+    """Test that hooks are only registered for the phases they implement."""
+    pipeline = PipelineMiddleware(FastAPI(), [CorrelationHook(), HTTPSRedirectHook()])
+
+    assert len(pipeline._request_hooks) == 2
+    assert len(pipeline._response_hooks) == 1
+    assert pipeline._before_response_hooks == []
+
+
+def test_before_response_hooks_are_awaited_before_sending():
+    """Test that before_response hooks finish before the response starts."""
+    calls = []
+    app = build_app([AwaitingHook(calls), RecordingHook("a", calls)])
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/data",
+        "raw_path": b"/api/data",
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        calls.append(message["type"])
+
+    asyncio.run(app(scope, receive, send))
+
+    assert calls[:4] == [
+        "a:request",
+        "a:response",
+        "before_response:200",
+        "http.response.start",
+    ]
+
+
+def test_full_stack_headers():
+    """Test that the default hooks decorate responses together."""
+    client = TestClient(
+        build_app([HTTPSRedirectHook(), CorrelationHook(), SecurityHeadersHook(), CacheHeadersHook()])
+    )
+
+    response = client.get("/api/data", headers={"X-Correlation-ID": "corr-1"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Correlation-ID"] == "corr-1"
+    assert response.json()["correlation_id_context"] == "corr-1"
+    assert response.json()["request_id_state"] == response.headers["X-Request-ID"]
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert "no-store" in response.headers["Cache-Control"]
+    assert "Strict-Transport-Security" not in response.headers
+
+
+def test_https_redirect_and_hsts_when_enforced():
+    """Test HTTPS redirects and HSTS headers with enforcement enabled."""
+    client = TestClient(
+        build_app([HTTPSRedirectHook(), SecurityHeadersHook()]), follow_redirects=False
+    )
+
+    with patch("app.middleware.security.settings.enforce_https", True):
+        redirected = client.get("/api/data?page=2")
+        proxied = client.get("/api/data", headers={"X-Forwarded-Proto": "https"})
+
+    assert redirected.status_code == 301
+    assert redirected.headers["location"] == "https://testserver/api/data?page=2"
+    assert proxied.status_code == 200
+    assert "max-age=31536000" in proxied.headers["Strict-Transport-Security"]
+
+
+def test_cache_headers_hook_keeps_existing_vary():
+    """Test that cache headers extend rather than replace Vary."""
+    app = FastAPI()
+    app.add_middleware(PipelineMiddleware, hooks=[CacheHeadersHook()])
+
+    @app.get("/api/data")
+    async def data():
+        return JSONResponse({"ok": True}, headers={"Vary": "Accept-Encoding"})
+
+    response = TestClient(app).get("/api/data")
+
+    assert response.headers["Vary"] == "Accept-Encoding, Accept, Authorization"
+
+
+def test_streaming_response_is_not_buffered():
+    """Test that the first chunk is sent before the stream finishes."""
+    app = FastAPI()
+    app.add_middleware(
+        PipelineMiddleware, hooks=[CorrelationHook(), SecurityHeadersHook()]
+    )
+    release = asyncio.Event()
+    sent = []
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            yield b"data: first\n\n"
+            await release.wait()
+            yield b"data: second\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    requested = []
+    finished = asyncio.Event()
+
+    async def receive():
+        if not requested:
+            requested.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body" and message.get("body") == b"data: first\n\n":
+            # The pipeline forwarded the first chunk while the stream is still open
+            release.set()
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "http_version": "1.1",
+        "server": ("testserver", 80),
+        "client": ("testclient", 123),
+    }
+
+    asyncio.run(asyncio.wait_for(app(scope, receive, send), timeout=5))
+
+    start = sent[0]
+    assert start["type"] == "http.response.start"
+    assert (b"x-frame-options", b"DENY") in start["headers"]
+    bodies = [message["body"] for message in sent[1:] if message["body"]]
+    assert bodies == [b"data: first\n\n", b"data: second\n\n"]
@@ -0,0 +1,22 @@
+"""Performance tests for the batched audit writer.
+
+Compares the throughput of audit events written by the audit writer with
+events committed one by one in each request, using the benchmark in
+scripts/benchmark_audit_writer.py. The throughput comparison is a
+benchmark, run only with RUN_BENCHMARKS=1.
+"""
+
+import asyncio
+
+import pytest
+
+from scripts.benchmark_audit_writer import run_benchmark
+
+
+@pytest.mark.benchmark
+def test_batched_writes_have_higher_throughput():
+    """Test that queued and durable batched writes outpace per-event commits."""
+    results = asyncio.run(run_benchmark(events=300, concurrency=30, rounds=1))
+
+    assert results["queued"] > results["inline"]
+    assert results["durable"] > results["inline"]
@@ -0,0 +1,36 @@
+"""Performance tests for the hot-query registry.
+
+Compares the per-execution overhead of the prebuilt hot queries against
+building the same statements on every execution, using the benchmark in
+scripts/benchmark_hot_queries.py. The timing comparison is a benchmark,
+run only with RUN_BENCHMARKS=1.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from scripts.benchmark_hot_queries import benchmark_cases, create_database, run_benchmark
+
+
+def test_hot_and_dynamic_statements_agree():
+    """Test that the benchmark compares statements producing the same SQL."""
+    cases = benchmark_cases()
+    engine = create_database(cases)
+
+    with Session(engine) as session:
+        for query, variant, params in cases:
+            hot = query.statement(**variant)
+            dynamic = query.build(**variant)
+
+            assert str(hot) == str(dynamic)
+            assert session.execute(hot, params).all() == session.execute(dynamic, params).all()
+    engine.dispose()
+
+
+@pytest.mark.benchmark
+def test_hot_queries_have_lower_overhead():
+    """Test that reusing prebuilt statements costs less per execution."""
+    results = run_benchmark(executions=200, rounds=3)
+
+    for name, modes in results.items():
+        assert modes["hot"] < modes["dynamic"], name
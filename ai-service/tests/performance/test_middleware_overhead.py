@@ -0,0 +1,54 @@
+"""Performance tests for the fused middleware pipeline.
+
+Compares the per-request overhead of the fused pure-ASGI pipeline, and of
+the service's own middleware stack, against the same concerns stacked as
+one BaseHTTPMiddleware each, using the stacks from
+scripts/benchmark_middleware.py. The timing comparison is a benchmark, run
+only with RUN_BENCHMARKS=1.
+"""
+
+import asyncio
+
+import pytest
+
+from scripts.benchmark_middleware import (
+    build_app,
+    build_fused_stack,
+    build_layered_stack,
+    call,
+    run_benchmark,
+)
+
+
+def response_headers(app) -> dict:
+    """Send one request and return the response headers (minus random IDs)."""
+    messages = asyncio.run(call(app))
+    headers = {
+        name.decode(): value.decode()
+        for name, value in messages[0]["headers"]
+        if name not in (b"x-request-id", b"x-correlation-id")
+    }
+    return headers
+
+
+def test_stacks_apply_the_same_headers():
+    """Test that the benchmark compares stacks doing equivalent work."""
+    layered = response_headers(build_layered_stack(build_app()))
+    fused = response_headers(build_fused_stack(build_app()))
+
+    assert fused == layered
+    assert "content-security-policy" in fused
+    assert "cache-control" in fused
+
+
+@pytest.mark.benchmark
+def test_fused_pipeline_has_lower_overhead():
+    """Test that the fused pipeline and the service stack add less overhead."""
+    results = asyncio.run(run_benchmark(requests=200, rounds=3, service=True))
+
+    layered_overhead = results["layered"] - results["bare"]
+    fused_overhead = results["fused"] - results["bare"]
+    service_overhead = results["service"] - results["bare"]
+
+    assert fused_overhead < layered_overhead
+    assert service_overhead < layered_overhead
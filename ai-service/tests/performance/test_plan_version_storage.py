@@ -0,0 +1,16 @@
+"""Performance tests for delta storage of intervention plan versions.
+
+Compares the bytes stored and read for a plan history kept as full
+snapshots and as deltas with checkpoints, using the benchmark in
+scripts/benchmark_plan_versions.py.
+"""
+
+from scripts.benchmark_plan_versions import run_benchmark
+
+
+def test_deltas_store_and_read_less_than_snapshots():
+    """Test that deltas shrink the stored history and the data read to compare versions."""
+    results = run_benchmark(versions=40, items=8)
+
+    assert results["deltas"]["stored"] * 3 < results["snapshots"]["stored"]
+    assert results["deltas"]["compare"] * 5 < results["snapshots"]["compare"]
@@ -0,0 +1,90 @@
+"""Startup-time regression tests for LAYA AI Service workers.
+
+Imports the modules a worker loads at startup in a fresh interpreter with
+``python -X importtime`` (see scripts/profile_imports.py) and checks that
+heavy optional subsystems stay unloaded and that the import stays within a
+time budget. The budget check is a wall-clock benchmark, run only with
+``RUN_BENCHMARKS=1``; set ``STARTUP_BUDGET_MS`` to adjust the budget on
+slow runners.
+"""
+
+import os
+
+import pytest
+
+from scripts.profile_imports import parse_importtime, profile_imports
+
+# Modules imported while a worker starts, short of the routers
+WORKER_MODULES = (
+    "app.database",
+    "app.services",
+    "app.schemas",
+    "app.llm",
+    "app.services.llm_service",
+    "app.services.mfa_service",
+    "app.services.storage_service",
+)
+
+# Subsystems that must only load on first use
+LAZY_SUBSYSTEMS = (
+    "boto3",
+    "botocore",
+    "PIL",
+    "aiohttp",
+    "app.llm.providers.anthropic_provider",
+    "app.llm.providers.openai_provider",
+    "app.services.alert_manager",
+)
+
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "3000"))
+
+SAMPLE_TRACE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+--- profile start ---
+import time:       300 |        300 |     app.config
+import time:      1500 |       2000 |   app.core
+import time:       400 |       2400 | app
+unrelated output
+"""
+
+
+def test_parse_importtime():
+    """Test that import-time traces are parsed with their nesting."""
+    records = parse_importtime(SAMPLE_TRACE.split("--- profile start ---")[1])
+
+    assert [(r.name, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("app.config", 300, 300, 2),
+        ("app.core", 1500, 2000, 1),
+        ("app", 400, 2400, 0),
+    ]
+
+
+def test_report_rankings():
+    """Test the totals and rankings of a profile report."""
+    report = profile_imports(["json"])
+
+    assert report.imports("json")
+    assert report.total_ms > 0
+    assert report.slowest(1)[0].name == "json"
+    assert "json" in report.by_package()
+    assert report.as_dict(top=3)["targets"] == ["json"]
+
+
+def test_heavy_subsystems_load_lazily():
+    """Test that worker startup does not import optional subsystems."""
+    report = profile_imports(WORKER_MODULES)
+
+    assert [module for module in LAZY_SUBSYSTEMS if report.imports(module)] == []
+
+
+@pytest.mark.benchmark
+def test_worker_startup_within_budget():
+    """Test that importing the worker modules stays within the budget."""
+    # Best of three runs, to keep the check stable on busy machines
+    wall_ms = min(profile_imports(WORKER_MODULES).wall_ms for _ in range(3))
+
+    assert wall_ms < STARTUP_BUDGET_MS, (
+        f"Worker startup imports took {wall_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms). "
+        f"Run scripts/profile_imports.py {' '.join(WORKER_MODULES)} to find the slow imports."
+    )
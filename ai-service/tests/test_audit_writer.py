@@ -0,0 +1,321 @@
+"""Tests for the batched audit writer and audit log partitions."""
+
+import asyncio
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import DocumentAuditEventType, DocumentAuditLog
+from app.models.rbac import AuditLog
+from app.schemas.rbac import AuditAction
+from app.services.audit_partitions import (
+    create_partition_sql,
+    drop_expired_audit_partitions,
+    ensure_audit_partitions,
+    month_start,
+    partition_month,
+)
+from app.services.audit_service import AuditService
+from app.services.audit_writer import AuditWriter
+from app.services.document_service import DocumentService
+from tests.conftest import SQLITE_CREATE_AUDIT_TABLES_SQL
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Session factory on a SQLite file with the audit_logs table."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        for statement in SQLITE_CREATE_AUDIT_TABLES_SQL.strip().split(";"):
+            statement = statement.strip()
+            if statement:
+                await conn.execute(text(statement))
+
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def writer(session_factory):
+    """Audit writer on the test database, used by AuditService."""
+    writer = AuditWriter(
+        batch_size=100,
+        flush_interval_seconds=0.05,
+        max_queue_size=1000,
+        session_factory=session_factory,
+    )
+    with patch("app.services.audit_service.get_audit_writer", return_value=writer):
+        yield writer
+
+
+async def count_logs(session_factory) -> int:
+    """Number of audit log entries."""
+    async with session_factory() as db:
+        return (await db.execute(select(func.count()).select_from(AuditLog))).scalar_one()
+
+
+async def log(session_factory, action=AuditAction.ACCESS_GRANTED.value, **kwargs):
+    """Log an audit event in a session of its own, like a request."""
+    async with session_factory() as db:
+        return await AuditService(db).log(
+            user_id=uuid4(), action=action, resource_type="child", **kwargs
+        )
+
+
+def audit_row(**values) -> dict:
+    """Column values of a queued audit log event."""
+    return {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "action": AuditAction.ACCESS_GRANTED.value,
+        "resource_type": "child",
+        "created_at": datetime.utcnow(),
+        **values,
+    }
+
+
+class TestAuditWriter:
+    """Tests for AuditWriter."""
+
+    @pytest.mark.asyncio
+    async def test_queued_events_are_written_in_batches(self, writer, session_factory):
+        writer.start(maintain_partitions=False)
+
+        with patch.object(
+            writer, "_write_batch", wraps=writer._write_batch
+        ) as write_batch:
+            await asyncio.gather(*(log(session_factory) for _ in range(250)))
+            await writer.stop()
+
+        assert await count_logs(session_factory) == 250
+        assert writer.written == 250
+        assert 3 <= write_batch.await_count < 10
+        assert all(len(call.args[0]) <= 100 for call in write_batch.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_durable_events_are_committed_before_returning(
+        self, writer, session_factory
+    ):
+        # A long flush interval: only durable events end the wait for a batch
+        writer.flush_interval_seconds = 60
+        writer.start(maintain_partitions=False)
+
+        queued = await log(session_factory)
+        durable = await log(session_factory, action=AuditAction.ROLE_ASSIGNED.value)
+
+        async with session_factory() as db:
+            ids = set((await db.execute(select(AuditLog.id))).scalars().all())
+        assert ids == {queued.id, durable.id}
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_durable_write_is_raised(self, writer, session_factory):
+        writer.start(maintain_partitions=False)
+
+        with patch.object(writer, "_session", side_effect=RuntimeError("database down")):
+            with pytest.raises(RuntimeError, match="database down"):
+                await log(session_factory, durable=True)
+            await writer.stop()
+
+        assert writer.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_events_are_written_inline_when_not_running(self, writer, session_factory):
+        entry = await log(session_factory, details={"resource": "child"})
+
+        assert not writer.running
+        async with session_factory() as db:
+            stored = (await db.execute(select(AuditLog))).scalar_one()
+        assert (stored.id, stored.details) == (entry.id, {"resource": "child"})
+
+    @pytest.mark.asyncio
+    async def test_inline_events_are_added_to_the_callers_session(self, writer):
+        db = MagicMock()
+        db.commit = AsyncMock()
+        db.execute = AsyncMock()
+
+        entry = await AuditService(db).log(
+            user_id=uuid4(), action=AuditAction.LOGIN.value, resource_type="user"
+        )
+
+        (added,) = db.add.call_args.args
+        assert isinstance(added, AuditLog)
+        assert added.id == entry.id
+        db.commit.assert_awaited_once()
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self, writer, session_factory):
+        attempts = []
+
+        def flaky_session():
+            attempts.append(len(attempts))
+            if len(attempts) == 1:
+                raise RuntimeError("connection reset")
+            return session_factory()
+
+        events = [(AuditLog.__table__, audit_row(), None) for _ in range(3)]
+        with patch.object(writer, "_session", side_effect=flaky_session), \
+             patch("app.services.audit_writer.BATCH_RETRY_BACKOFF_SECONDS", 0):
+            await writer._write_batch(events)
+
+        assert len(attempts) == 2
+        assert await count_logs(session_factory) == 3
+        assert (writer.written, writer.failed) == (3, 0)
+
+    @pytest.mark.asyncio
+    async def test_bad_row_does_not_lose_the_rest_of_its_batch(
+        self, writer, session_factory
+    ):
+        loop = asyncio.get_running_loop()
+        durable, rejected = loop.create_future(), loop.create_future()
+        events = [
+            (AuditLog.__table__, audit_row(), None),
+            (AuditLog.__table__, audit_row(action=None), rejected),
+            (AuditLog.__table__, audit_row(), durable),
+        ]
+
+        with patch("app.services.audit_writer.BATCH_RETRY_BACKOFF_SECONDS", 0):
+            await writer._write_batch(events)
+
+        assert await count_logs(session_factory) == 2
+        assert (writer.written, writer.failed) == (2, 1)
+        assert durable.result() is None
+        assert rejected.exception() is not None
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_queued_events(self, writer, session_factory):
+        writer.flush_interval_seconds = 60
+        writer.start(maintain_partitions=False)
+        for _ in range(5):
+            await log(session_factory)
+
+        await writer.stop()
+
+        assert await count_logs(session_factory) == 5
+        assert writer.stats() == {"running": False, "queued": 0, "written": 5, "failed": 0}
+
+
+class TestDurability:
+    """Tests for which audit events are committed before returning."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "action,durable",
+        [
+            (AuditAction.ACCESS_GRANTED, False),
+            (AuditAction.ACCESS_DENIED, False),
+            (AuditAction.LOGIN, False),
+            (AuditAction.ROLE_ASSIGNED, True),
+            (AuditAction.DATA_DELETED, True),
+        ],
+    )
+    async def test_audit_actions(self, action, durable):
+        writer = MagicMock()
+        writer.write = AsyncMock()
+
+        with patch("app.services.audit_service.get_audit_writer", return_value=writer):
+            entry = await AuditService(MagicMock()).log(
+                user_id=uuid4(), action=action.value, resource_type="child"
+            )
+
+        model, row, _ = writer.write.await_args.args
+        assert model is AuditLog
+        assert row["id"] == entry.id
+        assert writer.write.await_args.kwargs["durable"] is durable
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "event_type,durable",
+        [
+            (DocumentAuditEventType.DOCUMENT_CREATED, False),
+            (DocumentAuditEventType.SIGNATURE_REQUEST_VIEWED, False),
+            (DocumentAuditEventType.SIGNATURE_CREATED, True),
+            (DocumentAuditEventType.SIGNATURE_REQUEST_COMPLETED, True),
+        ],
+    )
+    async def test_document_audit_events(self, event_type, durable):
+        writer = MagicMock()
+        writer.write = AsyncMock()
+
+        with patch("app.services.document_service.get_audit_writer", return_value=writer):
+            entry = await DocumentService(MagicMock()).create_audit_log(
+                event_type=event_type,
+                document_id=uuid4(),
+                user_id=uuid4(),
+                event_data={"title": "Enrollment"},
+            )
+
+        model, row, _ = writer.write.await_args.args
+        assert model is DocumentAuditLog
+        assert (entry.id, entry.event_data) == (row["id"], '{"title": "Enrollment"}')
+        assert entry.timestamp is not None
+        assert writer.write.await_args.kwargs["durable"] is durable
+
+
+class TestAuditPartitions:
+    """Tests for the monthly partitions of the audit tables."""
+
+    def test_months(self):
+        assert month_start(date(2026, 10, 18)) == date(2026, 10, 1)
+        assert month_start(date(2026, 11, 30), 2) == date(2027, 1, 1)
+        assert month_start(date(2026, 1, 5), -13) == date(2024, 12, 1)
+
+    def test_partition_names(self):
+        assert create_partition_sql("audit_logs", date(2026, 12, 18)) == (
+            "CREATE TABLE IF NOT EXISTS audit_logs_y2026m12 PARTITION OF audit_logs "
+            "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+        )
+        assert partition_month("audit_logs", "audit_logs_y2026m12") == date(2026, 12, 1)
+        assert partition_month("audit_logs", "audit_logs_default") is None
+        assert partition_month("audit_logs", "document_audit_logs_y2026m12") is None
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_do_on_sqlite(self, session_factory):
+        async with session_factory() as db:
+            assert await ensure_audit_partitions(db, months_ahead=3) == []
+            assert await drop_expired_audit_partitions(db, retention_months=1) == []
+
+    @pytest.mark.asyncio
+    async def test_missing_partitions_are_created(self):
+        db = AsyncMock()
+        db.bind.dialect.name = "postgresql"
+        existing = MagicMock()
+        existing.scalars.return_value.all.return_value = ["audit_logs_y2026m10"]
+        db.execute.return_value = existing
+
+        created = await ensure_audit_partitions(db, months_ahead=1, today=date(2026, 10, 18))
+
+        assert created == [
+            "audit_logs_y2026m11",
+            "document_audit_logs_y2026m10",
+            "document_audit_logs_y2026m11",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_expired_partitions_are_dropped(self):
+        db = AsyncMock()
+        db.bind.dialect.name = "postgresql"
+        partitions = MagicMock()
+        partitions.scalars.return_value.all.return_value = [
+            "audit_logs_default",
+            "audit_logs_y2026m07",
+            "audit_logs_y2026m08",
+            "audit_logs_y2026m09",
+        ]
+        db.execute.return_value = partitions
+
+        dropped = await drop_expired_audit_partitions(
+            db, retention_months=2, today=date(2026, 10, 18)
+        )
+
+        assert dropped == ["audit_logs_y2026m07"]
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        assert "ALTER TABLE audit_logs DETACH PARTITION audit_logs_y2026m07" in statements
+        assert "DROP TABLE audit_logs_y2026m07" in statements
@@ -74,14 +74,14 @@ class TestWebhookCacheInvalidation:
         payload = {"name": "Test Child", "age": 5}
         mock_db = MagicMock()
 
-        with patch("app.routers.webhooks.invalidate_cache", new_callable=AsyncMock) as mock_invalidate:
+        with patch("app.routers.webhooks.invalidate_tags", new_callable=AsyncMock) as mock_invalidate:
             mock_invalidate.return_value = 2
 
             # Process child profile update event
             result = await process_child_profile_event(child_id, payload, mock_db)
 
-            # Verify cache was invalidated with correct pattern
-            mock_invalidate.assert_called_once_with("child_profile", f"*{child_id}*")
+            # Verify only entries tagged with this child were invalidated
+            mock_invalidate.assert_called_once_with(f"child:{child_id}", db=mock_db)
 
             # Verify result message
             assert "cache invalidated" in result.lower()
@@ -211,6 +211,84 @@ class TestWebhookCacheInvalidation:
             assert "checked out" in result.lower()
 
 
+    @pytest.mark.asyncio
+    async def test_attendance_with_facility_invalidates_facility_tags(self):
+        """Test that attendance for a known facility only invalidates its dashboards."""
+        facility_id = str(uuid4())
+        payload = {"child_id": str(uuid4()), "facility_id": facility_id}
+        mock_db = MagicMock()
+
+        with patch("app.routers.webhooks.invalidate_tags", new_callable=AsyncMock) as mock_invalidate, \
+             patch("app.routers.webhooks.invalidate_cache", new_callable=AsyncMock) as mock_prefix:
+            await process_attendance_event(
+                WebhookEventType.ATTENDANCE_CHECKED_IN,
+                str(uuid4()),
+                payload,
+                mock_db
+            )
+
+            mock_invalidate.assert_called_once_with(
+                f"facility:{facility_id}", "facility:all", db=mock_db
+            )
+            mock_prefix.assert_called_once_with("activity_catalog")
+
+
+class TestCacheTags:
+    """Test entity-tag tracking and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_deletes_only_tagged_keys(self):
+        """Test that invalidating a tag removes only the keys tagged with it."""
+        from app.core.cache_tags import invalidate_tags
+
+        mock_redis = MagicMock()
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock(return_value=[{"activity_catalog:list:a1"}])
+        mock_redis.pipeline.return_value = mock_pipe
+        mock_redis.delete = AsyncMock(return_value=1)
+
+        with patch("app.core.cache_tags.get_redis_client", new_callable=AsyncMock) as mock_client:
+            mock_client.return_value = mock_redis
+            removed = await invalidate_tags("activity:a1")
+
+        assert removed == 1
+        mock_pipe.smembers.assert_called_once_with("cache_tags:activity:a1")
+        mock_redis.delete.assert_any_call("activity_catalog:list:a1")
+        mock_redis.delete.assert_any_call("cache_tags:activity:a1")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_reaches_llm_cache(self):
+        """Test that tagged LLM cache entries are dropped from memory caches."""
+        from app.core.cache_tags import invalidate_tags
+        from app.llm.cache import LLMCache
+
+        llm_cache = LLMCache()
+        llm_cache._memory_cache["abc"] = {"cache_key": "abc"}
+        llm_cache._memory_cache["other"] = {"cache_key": "other"}
+
+        mock_redis = MagicMock()
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock(return_value=[{"llm_cache:abc"}])
+        mock_redis.pipeline.return_value = mock_pipe
+        mock_redis.delete = AsyncMock(return_value=1)
+
+        with patch("app.core.cache_tags.get_redis_client", new_callable=AsyncMock) as mock_client:
+            mock_client.return_value = mock_redis
+            removed = await invalidate_tags("child:c1")
+
+        assert removed == 1
+        assert "abc" not in llm_cache._memory_cache
+        assert "other" in llm_cache._memory_cache
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_survives_redis_outage(self):
+        """Test that tag invalidation never raises when Redis is down."""
+        from app.core.cache_tags import invalidate_tags
+
+        with patch("app.core.cache_tags.get_redis_client", side_effect=Exception("down")):
+            assert await invalidate_tags("child:c1") == 0
+
+
 class TestServiceMethodCacheInvalidation:
     """Test cache invalidation in service methods."""
 
@@ -9,6 +9,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch, MagicMock
 
+from app.core.cache_metrics import CacheMetrics, _live_key_slices
 from app.main import app
 from app.schemas.cache import CacheStatsResponse, CachePrefixStats
 from app.services.cache_service import get_cache_statistics, _format_bytes
@@ -40,46 +41,206 @@ class TestFormatBytes:
         assert _format_bytes(1024 * 1024 * 1024 * 3) == "3.0G"
 
 
-@pytest.mark.asyncio
-class TestCacheStatisticsService:
-    """Tests for cache statistics service."""
+class FakeRedisPipeline:
+    """Minimal pipeline stand-in that queues calls against FakeStatsRedis."""
 
-    async def test_get_cache_statistics_success(self) -> None:
-        """Test getting cache statistics successfully."""
-        # Mock Redis client
-        mock_redis = AsyncMock()
+    def __init__(self, redis: "FakeStatsRedis") -> None:
+        self._redis = redis
+        self._calls: list = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
 
-        # Mock info command
-        mock_redis.info.return_value = {
+    async def execute(self) -> list:
+        results = [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+class FakeStatsRedis:
+    """In-memory Redis stand-in supporting the commands used for statistics."""
+
+    def __init__(self, info: dict | None = None) -> None:
+        self.hashes: dict = {}
+        self.sets: dict = {}
+        self.expirations: dict = {}
+        self._info = info or {
             "db0": {"keys": 42},
-            "used_memory": 1048576,  # 1MB
+            "used_memory": 1048576,
             "uptime_in_seconds": 3600,
             "connected_clients": 5,
         }
+        self.scan_calls = 0
+
+    async def info(self) -> dict:
+        return self._info
+
+    async def scan_iter(self, match=None, count=100):
+        self.scan_calls += 1
+        return
+        yield
+
+    def pipeline(self, transaction: bool = True) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def hset(self, key: str, field: str, value) -> int:
+        self.hashes.setdefault(key, {})[field] = str(value)
+        return 1
+
+    def hgetall(self, key: str) -> dict:
+        return dict(self.hashes.get(key, {}))
+
+    def hmget(self, key: str, *fields: str) -> list:
+        bucket = self.hashes.get(key, {})
+        return [bucket.get(field) for field in fields]
+
+    def expire(self, key: str, seconds: int) -> bool:
+        self.expirations[key] = seconds
+        return True
+
+    def pfadd(self, key: str, *values: str) -> int:
+        members = self.sets.setdefault(key, set())
+        before = len(members)
+        members.update(values)
+        return 1 if len(members) > before else 0
+
+    def pfcount(self, *keys: str) -> int:
+        return len(set().union(*(self.sets.get(key, set()) for key in keys)))
+
+
+@pytest.mark.asyncio
+class TestCacheMetrics:
+    """Tests for incrementally maintained cache counters."""
+
+    async def test_counters_are_buffered_locally_until_flush(self) -> None:
+        """Recording only touches worker memory until a flush."""
+        fake_redis = FakeStatsRedis()
+        metrics = CacheMetrics(flush_interval=3600)
+
+        with patch("app.core.cache_metrics.get_redis_client", return_value=fake_redis):
+            metrics.record_miss("child_profile")
+            metrics.record_set("child_profile", "child_profile:f:1", 120, ttl=300)
+            metrics.record_hit("child_profile", 120)
+            await metrics.maybe_flush()
+
+            assert fake_redis.hashes == {}
+            local = metrics.local_snapshot()["child_profile"]
+            assert (local.hits, local.misses, local.sets) == (1, 1, 1)
+            assert local.ttl == 300
+
+            await metrics.flush()
+
+        counters = fake_redis.hashes["cache_stats:child_profile"]
+        assert counters["hits"] == "1"
+        assert counters["misses"] == "1"
+        assert counters["sets"] == "1"
+        assert counters["bytes_set"] == "120"
+        assert counters["bytes_served"] == "120"
+        assert counters["ttl"] == "300"
+        assert fake_redis.pfcount(*_live_key_slices("child_profile", 300)) == 1
+
+    async def test_key_rewritten_before_ttl_counts_as_eviction(self) -> None:
+        """Setting a key again well before its TTL elapsed records an eviction."""
+        fake_redis = FakeStatsRedis()
+        metrics = CacheMetrics()
+
+        with patch("app.core.cache_metrics.get_redis_client", return_value=fake_redis), \
+             patch("app.core.cache_metrics.time.time", return_value=1_000_000.0):
+            metrics.record_set("activity_catalog", "activity_catalog:f:1", 10, ttl=3600)
+            await metrics.flush()
+            metrics.record_set("activity_catalog", "activity_catalog:f:1", 10, ttl=3600)
+            await metrics.flush()
+
+        assert fake_redis.hashes["cache_stats:activity_catalog"]["evictions"] == "1"
+        assert metrics.local_snapshot()["activity_catalog"].evictions == 1
+
+    async def test_key_rewritten_after_expiry_is_not_an_eviction(self) -> None:
+        """Re-populating an entry that expired naturally is not an eviction."""
+        fake_redis = FakeStatsRedis()
+        metrics = CacheMetrics()
+
+        with patch("app.core.cache_metrics.get_redis_client", return_value=fake_redis), \
+             patch("app.core.cache_metrics.time.time") as mock_time:
+            mock_time.return_value = 1_000_000.0
+            metrics.record_set("activity_catalog", "activity_catalog:f:1", 10, ttl=3600)
+            await metrics.flush()
+            mock_time.return_value = 1_000_000.0 + 3600
+            metrics.record_set("activity_catalog", "activity_catalog:f:1", 10, ttl=3600)
+            await metrics.flush()
+
+        assert "evictions" not in fake_redis.hashes["cache_stats:activity_catalog"]
+        assert metrics.local_snapshot()["activity_catalog"].evictions == 0
+
+    async def test_key_count_drops_once_entries_expire(self) -> None:
+        """Keys no longer count once their TTL (plus one slice) has elapsed."""
+        fake_redis = FakeStatsRedis()
+        metrics = CacheMetrics()
+
+        with patch("app.core.cache_metrics.get_redis_client", return_value=fake_redis), \
+             patch("app.core.cache_metrics.time.time") as mock_time:
+            mock_time.return_value = 1_000_000.0
+            for i in range(3):
+                metrics.record_set("child_profile", f"child_profile:f:{i}", 10, ttl=300)
+            await metrics.flush()
+            live = await metrics.read_prefix_stats(["child_profile"])
+
+            mock_time.return_value = 1_000_000.0 + 300 + 75
+            expired = await metrics.read_prefix_stats(["child_profile"])
+
+        assert live["child_profile"][1] == 3
+        assert expired["child_profile"][1] == 0
+
+    async def test_flush_failure_is_swallowed(self) -> None:
+        """A Redis outage drops buffered deltas without raising."""
+        metrics = CacheMetrics()
+        metrics.record_miss("llm_response")
+
+        with patch("app.core.cache_metrics.get_redis_client", side_effect=Exception("down")):
+            await metrics.flush()
+
+        assert metrics.local_snapshot()["llm_response"].misses == 1
+
+    async def test_local_hit_ratios(self) -> None:
+        """Sliding-window hit ratios are computed from worker buckets."""
+        metrics = CacheMetrics()
+        for _ in range(3):
+            metrics.record_hit("analytics_dashboard", 5)
+        metrics.record_miss("analytics_dashboard")
+
+        ratios = metrics.local_hit_ratios("analytics_dashboard")
+
+        assert ratios == {"1m": 0.75, "5m": 0.75, "15m": 0.75}
+        assert metrics.local_hit_ratios("child_profile")["5m"] is None
+
 
-        # Mock scan_iter for different prefixes
-        async def mock_scan_iter(match=None, count=100):
-            """Mock scan iterator that yields keys based on pattern."""
-            if match == "child_profile:*":
-                for i in range(10):
-                    yield f"child_profile:func:{i}"
-            elif match == "activity_catalog:*":
-                for i in range(5):
-                    yield f"activity_catalog:func:{i}"
-            elif match == "analytics_dashboard:*":
-                for i in range(3):
-                    yield f"analytics_dashboard:func:{i}"
-            elif match == "llm_response:*":
-                for i in range(8):
-                    yield f"llm_response:func:{i}"
-
-        mock_redis.scan_iter = mock_scan_iter
-
-        # Mock TTL command
-        mock_redis.ttl.return_value = 300
-
-        # Patch get_redis_client
-        with patch("app.services.cache_service.get_redis_client", return_value=mock_redis):
+@pytest.mark.asyncio
+class TestCacheStatisticsService:
+    """Tests for cache statistics service."""
+
+    async def test_get_cache_statistics_success(self) -> None:
+        """Test getting cache statistics from maintained counters."""
+        fake_redis = FakeStatsRedis()
+        metrics = CacheMetrics()
+
+        for i in range(10):
+            metrics.record_miss("child_profile")
+            metrics.record_set("child_profile", f"child_profile:func:{i}", 100, ttl=300)
+        for _ in range(30):
+            metrics.record_hit("child_profile", 100)
+        metrics.record_invalidation("activity_catalog", 5)
+
+        with patch("app.core.cache_metrics.get_redis_client", return_value=fake_redis), \
+             patch("app.services.cache_service.get_redis_client", return_value=fake_redis), \
+             patch("app.services.cache_service.get_cache_metrics", return_value=metrics):
             stats = await get_cache_statistics()
 
         # Verify stats structure
@@ -90,88 +251,47 @@ class TestCacheStatisticsService:
         assert stats.uptime_seconds == 3600
         assert stats.connected_clients == 5
 
-        # Verify by_prefix stats
-        assert "child_profile" in stats.by_prefix
-        assert stats.by_prefix["child_profile"].key_count == 10
-        assert stats.by_prefix["child_profile"].sample_ttl == 300
-
-        assert "activity_catalog" in stats.by_prefix
-        assert stats.by_prefix["activity_catalog"].key_count == 5
-
-        assert "analytics_dashboard" in stats.by_prefix
-        assert stats.by_prefix["analytics_dashboard"].key_count == 3
-
-        assert "llm_response" in stats.by_prefix
-        assert stats.by_prefix["llm_response"].key_count == 8
-
-    async def test_get_cache_statistics_no_keys(self) -> None:
-        """Test getting cache statistics when no keys exist."""
-        # Mock Redis client
-        mock_redis = AsyncMock()
-
-        # Mock info command with no keys
-        mock_redis.info.return_value = {
-            "db0": {},
-            "used_memory": 1024,
-            "uptime_in_seconds": 100,
-            "connected_clients": 1,
-        }
-
-        # Mock scan_iter with no keys
-        async def mock_scan_iter(match=None, count=100):
-            """Mock scan iterator that yields no keys."""
-            return
-            yield  # Make it a generator
-
-        mock_redis.scan_iter = mock_scan_iter
+        # Verify by_prefix stats come from counters, not a keyspace scan
+        assert fake_redis.scan_calls == 0
+        child = stats.by_prefix["child_profile"]
+        assert child.key_count == 10
+        assert child.sample_ttl == 300
+        assert child.hits == 30
+        assert child.misses == 10
+        assert child.sets == 10
+        assert child.bytes_set == 1000
+        assert child.estimated_bytes == 1000
+        assert child.hit_ratio == 0.75
+        assert child.hit_ratio_windows["5m"] == 0.75
+
+        assert stats.by_prefix["activity_catalog"].invalidations == 5
+
+    async def test_get_cache_statistics_no_activity(self) -> None:
+        """Test getting cache statistics when nothing has been cached."""
+        fake_redis = FakeStatsRedis(
+            info={
+                "db0": {},
+                "used_memory": 1024,
+                "uptime_in_seconds": 100,
+                "connected_clients": 1,
+            }
+        )
 
-        # Patch get_redis_client
-        with patch("app.services.cache_service.get_redis_client", return_value=mock_redis):
+        with patch("app.core.cache_metrics.get_redis_client", return_value=fake_redis), \
+             patch("app.services.cache_service.get_redis_client", return_value=fake_redis), \
+             patch("app.services.cache_service.get_cache_metrics", return_value=CacheMetrics()):
             stats = await get_cache_statistics()
 
         # Verify stats
         assert stats.total_keys == 0
         assert stats.memory_used_bytes == 1024
 
-        # All prefixes should have 0 keys
+        # All prefixes should report empty counters
         for prefix in ["child_profile", "activity_catalog", "analytics_dashboard", "llm_response"]:
             assert stats.by_prefix[prefix].key_count == 0
             assert stats.by_prefix[prefix].sample_ttl is None
-
-    async def test_get_cache_statistics_ttl_no_expiration(self) -> None:
-        """Test cache statistics when keys have no expiration."""
-        # Mock Redis client
-        mock_redis = AsyncMock()
-
-        # Mock info command
-        mock_redis.info.return_value = {
-            "db0": {"keys": 5},
-            "used_memory": 2048,
-            "uptime_in_seconds": 200,
-            "connected_clients": 2,
-        }
-
-        # Mock scan_iter
-        async def mock_scan_iter(match=None, count=100):
-            """Mock scan iterator."""
-            if match == "child_profile:*":
-                yield "child_profile:func:1"
-            elif match in ["activity_catalog:*", "analytics_dashboard:*", "llm_response:*"]:
-                return
-                yield
-
-        mock_redis.scan_iter = mock_scan_iter
-
-        # Mock TTL returning -1 (no expiration)
-        mock_redis.ttl.return_value = -1
-
-        # Patch get_redis_client
-        with patch("app.services.cache_service.get_redis_client", return_value=mock_redis):
-            stats = await get_cache_statistics()
-
-        # Verify TTL is None when key has no expiration
-        assert stats.by_prefix["child_profile"].key_count == 1
-        assert stats.by_prefix["child_profile"].sample_ttl is None
+            assert stats.by_prefix[prefix].hit_ratio is None
+            assert stats.by_prefix[prefix].hit_ratio_windows["1m"] is None
 
 
 @pytest.mark.asyncio
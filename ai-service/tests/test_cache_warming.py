@@ -5,86 +5,24 @@ data on application startup without blocking the application.
 """
 
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import pytest
 
+from app.config import settings
 from app.core.cache_warming import (
+    CacheWarmingScheduler,
+    WarmingTarget,
+    _default_targets,
     get_warming_status,
-    warm_activity_catalog,
     warm_all_caches,
     warm_analytics_dashboard,
+    warm_child_profile,
 )
-
-
-class TestWarmActivityCatalog:
-    """Tests for warming the activity catalog cache."""
-
-    @pytest.mark.asyncio
-    async def test_warm_activity_catalog_success(self):
-        """Test successful warming of activity catalog cache."""
-        mock_activities = [
-            {"id": "1", "name": "Activity 1", "type": "sensory"},
-            {"id": "2", "name": "Activity 2", "type": "motor"},
-            {"id": "3", "name": "Activity 3", "type": "cognitive"},
-        ]
-
-        with patch("app.core.cache_warming.AsyncSessionLocal") as mock_session_factory:
-            mock_db = AsyncMock()
-            mock_session_factory.return_value.__aenter__.return_value = mock_db
-
-            # Mock ActivityService
-            with patch("app.core.cache_warming.ActivityService") as mock_service_class:
-                mock_service = AsyncMock()
-                mock_service.get_activity_catalog.return_value = mock_activities
-                mock_service_class.return_value = mock_service
-
-                # Warm cache
-                result = await warm_activity_catalog()
-
-                # Verify success
-                assert result is True
-
-                # Verify ActivityService was created with db session
-                mock_service_class.assert_called_once_with(mock_db)
-
-                # Verify get_activity_catalog was called
-                mock_service.get_activity_catalog.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_warm_activity_catalog_database_error(self):
-        """Test activity catalog warming handles database errors gracefully."""
-        with patch("app.core.cache_warming.AsyncSessionLocal") as mock_session_factory:
-            # Simulate database connection error
-            mock_session_factory.return_value.__aenter__.side_effect = Exception(
-                "Database connection failed"
-            )
-
-            # Warm cache
-            result = await warm_activity_catalog()
-
-            # Should return False but not crash
-            assert result is False
-
-    @pytest.mark.asyncio
-    async def test_warm_activity_catalog_service_error(self):
-        """Test activity catalog warming handles service errors gracefully."""
-        with patch("app.core.cache_warming.AsyncSessionLocal") as mock_session_factory:
-            mock_db = AsyncMock()
-            mock_session_factory.return_value.__aenter__.return_value = mock_db
-
-            with patch("app.core.cache_warming.ActivityService") as mock_service_class:
-                mock_service = AsyncMock()
-                mock_service.get_activity_catalog.side_effect = Exception(
-                    "Service error"
-                )
-                mock_service_class.return_value = mock_service
-
-                # Warm cache
-                result = await warm_activity_catalog()
-
-                # Should return False but not crash
-                assert result is False
+from app.services.analytics_service import AnalyticsService
+from app.services.child_service import ChildService
 
 
 class TestWarmAnalyticsDashboard:
@@ -167,120 +105,59 @@ class TestWarmAllCaches:
     async def test_warm_all_caches_success(self):
         """Test successful warming of all caches."""
         with patch(
-            "app.core.cache_warming.warm_activity_catalog"
-        ) as mock_warm_activities:
-            with patch(
-                "app.core.cache_warming.warm_analytics_dashboard"
-            ) as mock_warm_analytics:
-                mock_warm_activities.return_value = True
-                mock_warm_analytics.return_value = True
-
-                # Warm all caches
-                results = await warm_all_caches()
+            "app.core.cache_warming.warm_analytics_dashboard"
+        ) as mock_warm_analytics:
+            mock_warm_analytics.return_value = True
 
-                # Verify both warming functions were called
-                mock_warm_activities.assert_called_once()
-                mock_warm_analytics.assert_called_once()
+            # Warm all caches
+            results = await warm_all_caches()
 
-                # Verify results
-                assert results == {
-                    "activity_catalog": True,
-                    "analytics_dashboard": True,
-                }
+            # Verify the default dashboard was warmed
+            mock_warm_analytics.assert_called_once_with()
 
-    @pytest.mark.asyncio
-    async def test_warm_all_caches_partial_failure(self):
-        """Test warming continues even when some caches fail to warm."""
-        with patch(
-            "app.core.cache_warming.warm_activity_catalog"
-        ) as mock_warm_activities:
-            with patch(
-                "app.core.cache_warming.warm_analytics_dashboard"
-            ) as mock_warm_analytics:
-                # Activity catalog succeeds, analytics fails
-                mock_warm_activities.return_value = True
-                mock_warm_analytics.return_value = False
-
-                # Warm all caches
-                results = await warm_all_caches()
-
-                # Verify both warming functions were called despite failure
-                mock_warm_activities.assert_called_once()
-                mock_warm_analytics.assert_called_once()
-
-                # Verify results show partial success
-                assert results == {
-                    "activity_catalog": True,
-                    "analytics_dashboard": False,
-                }
+            # Verify results
+            assert results == {"analytics_dashboard": True}
 
     @pytest.mark.asyncio
-    async def test_warm_all_caches_complete_failure(self):
-        """Test warming reports failures correctly when all caches fail."""
+    async def test_warm_all_caches_failure(self):
+        """Test warming reports failures correctly."""
         with patch(
-            "app.core.cache_warming.warm_activity_catalog"
-        ) as mock_warm_activities:
-            with patch(
-                "app.core.cache_warming.warm_analytics_dashboard"
-            ) as mock_warm_analytics:
-                # Both fail
-                mock_warm_activities.return_value = False
-                mock_warm_analytics.return_value = False
-
-                # Warm all caches
-                results = await warm_all_caches()
+            "app.core.cache_warming.warm_analytics_dashboard"
+        ) as mock_warm_analytics:
+            mock_warm_analytics.return_value = False
 
-                # Verify both warming functions were called
-                mock_warm_activities.assert_called_once()
-                mock_warm_analytics.assert_called_once()
+            # Warm all caches
+            results = await warm_all_caches()
 
-                # Verify results show complete failure
-                assert results == {
-                    "activity_catalog": False,
-                    "analytics_dashboard": False,
-                }
+            # Verify results show the failure
+            assert results == {"analytics_dashboard": False}
 
     @pytest.mark.asyncio
-    async def test_warm_all_caches_runs_in_parallel(self):
-        """Test that cache warming operations can run efficiently."""
-        # This test verifies the warming functions are called in the correct order
+    async def test_targets_are_warmed_in_parallel(self):
+        """Test that cache warming operations run concurrently."""
         call_order = []
 
-        async def mock_warm_activities():
-            call_order.append("activities_start")
-            await asyncio.sleep(0.01)  # Simulate some work
-            call_order.append("activities_end")
-            return True
-
-        async def mock_warm_analytics():
-            call_order.append("analytics_start")
-            await asyncio.sleep(0.01)  # Simulate some work
-            call_order.append("analytics_end")
-            return True
-
-        with patch(
-            "app.core.cache_warming.warm_activity_catalog", new=mock_warm_activities
-        ):
-            with patch(
-                "app.core.cache_warming.warm_analytics_dashboard",
-                new=mock_warm_analytics,
-            ):
-                # Warm all caches
-                results = await warm_all_caches()
+        def make_warm(name):
+            async def warm():
+                call_order.append(f"{name}_start")
+                await asyncio.sleep(0.01)  # Simulate some work
+                call_order.append(f"{name}_end")
+                return True
+            return warm
+
+        scheduler = CacheWarmingScheduler()
+        for name in ("profiles", "dashboard"):
+            scheduler.register(
+                WarmingTarget(name=name, ttl=300, warm_default=make_warm(name))
+            )
 
-                # Verify sequential execution (activities then analytics)
-                assert call_order == [
-                    "activities_start",
-                    "activities_end",
-                    "analytics_start",
-                    "analytics_end",
-                ]
+        with patch("app.core.cache_warming.get_redis_client", side_effect=Exception("down")):
+            results = await scheduler.run_once(force=True)
 
-                # Verify results
-                assert results == {
-                    "activity_catalog": True,
-                    "analytics_dashboard": True,
-                }
+        # Verify both targets started before either finished
+        assert call_order[:2] == ["profiles_start", "dashboard_start"]
+        assert sorted(call_order[2:]) == ["dashboard_end", "profiles_end"]
+        assert results == {"profiles": True, "dashboard": True}
 
 
 class TestGetWarmingStatus:
@@ -292,13 +169,124 @@ class TestGetWarmingStatus:
         status = await get_warming_status()
 
         # Verify status has expected keys
-        assert "activity_catalog" in status
         assert "analytics_dashboard" in status
 
         # Verify values are boolean
-        assert isinstance(status["activity_catalog"], bool)
         assert isinstance(status["analytics_dashboard"], bool)
 
+    def test_child_profiles_only_warmed_with_service_credential(self):
+        """Child profiles are cached per credential, so warming needs one."""
+        with patch.object(settings, "cache_warming_gibbon_token", ""):
+            assert "child_profile" not in [t.name for t in _default_targets()]
+        with patch.object(settings, "cache_warming_gibbon_token", "service-token"):
+            assert "child_profile" in [t.name for t in _default_targets()]
+
+
+class TestCacheWarmingScheduler:
+    """Tests for the adaptive warming scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_warms_hottest_entries_with_bounded_concurrency(self):
+        """Hot identifiers from access statistics are warmed under the limit."""
+        in_flight = 0
+        peak = 0
+        warmed = []
+
+        async def warm_entry(identifier):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            warmed.append(identifier)
+            return True
+
+        mock_metrics = MagicMock()
+        mock_metrics.flush = AsyncMock()
+        mock_metrics.get_hottest = AsyncMock(return_value=["a", "b", "c", "d", "e"])
+        mock_metrics.decay_accesses = AsyncMock()
+
+        scheduler = CacheWarmingScheduler(concurrency=2)
+        scheduler.register(
+            WarmingTarget(name="child_profile", ttl=300, warm_entry=warm_entry, top_n=5)
+        )
+
+        with patch("app.core.cache_warming.get_cache_metrics", return_value=mock_metrics), \
+             patch("app.core.cache_warming.get_redis_client", side_effect=Exception("down")):
+            results = await scheduler.run_once()
+
+        assert results == {"child_profile": True}
+        assert sorted(warmed) == ["a", "b", "c", "d", "e"]
+        assert peak == 2
+        mock_metrics.get_hottest.assert_called_once_with("child_profile", 5)
+
+        status = scheduler.get_status()["child_profile"]
+        assert status.success is True
+        assert status.warmed == 5
+        assert status.failed == 0
+        assert status.last_run_at is not None
+
+    @pytest.mark.asyncio
+    async def test_skips_target_when_lease_held_elsewhere(self):
+        """Another worker holding the Redis lease means no duplicate work."""
+        warm_default = AsyncMock(return_value=True)
+        mock_redis = AsyncMock()
+        mock_redis.set.return_value = None
+
+        scheduler = CacheWarmingScheduler()
+        scheduler.register(
+            WarmingTarget(name="activity_catalog", ttl=3600, warm_default=warm_default)
+        )
+
+        with patch("app.core.cache_warming.get_redis_client", return_value=mock_redis):
+            results = await scheduler.run_once()
+
+        assert results == {}
+        warm_default.assert_not_called()
+        assert scheduler.get_status()["activity_catalog"].skipped_reason is not None
+
+    @pytest.mark.asyncio
+    async def test_targets_are_not_rewarmed_before_due(self):
+        """A target is only re-warmed once its refresh interval has elapsed."""
+        warm_default = AsyncMock(return_value=True)
+
+        scheduler = CacheWarmingScheduler()
+        scheduler.register(
+            WarmingTarget(name="activity_catalog", ttl=3600, warm_default=warm_default)
+        )
+
+        with patch("app.core.cache_warming.get_redis_client", side_effect=Exception("down")):
+            await scheduler.run_once()
+            await scheduler.run_once()
+
+        assert warm_default.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_entries_are_reported(self):
+        """Partial failures are recorded with counts rather than raised."""
+        async def warm_entry(identifier):
+            if identifier == "bad":
+                raise Exception("boom")
+            return True
+
+        mock_metrics = MagicMock()
+        mock_metrics.flush = AsyncMock()
+        mock_metrics.get_hottest = AsyncMock(return_value=["good", "bad"])
+        mock_metrics.decay_accesses = AsyncMock()
+
+        scheduler = CacheWarmingScheduler()
+        scheduler.register(
+            WarmingTarget(name="analytics_dashboard", ttl=900, warm_entry=warm_entry)
+        )
+
+        with patch("app.core.cache_warming.get_cache_metrics", return_value=mock_metrics), \
+             patch("app.core.cache_warming.get_redis_client", side_effect=Exception("down")):
+            results = await scheduler.run_once()
+
+        assert results == {"analytics_dashboard": False}
+        status = scheduler.get_status()["analytics_dashboard"]
+        assert (status.warmed, status.failed) == (1, 1)
+
 
 class TestCacheWarmingIntegration:
     """Integration tests for cache warming."""
@@ -310,25 +298,20 @@ class TestCacheWarmingIntegration:
         # should be resilient and not prevent application startup
 
         with patch(
-            "app.core.cache_warming.warm_activity_catalog"
-        ) as mock_warm_activities:
-            with patch(
-                "app.core.cache_warming.warm_analytics_dashboard"
-            ) as mock_warm_analytics:
-                # Simulate catastrophic failures
-                mock_warm_activities.side_effect = Exception("Critical error")
-                mock_warm_analytics.side_effect = Exception("Critical error")
-
-                # This should not raise an exception
-                try:
-                    # Note: warm_all_caches catches exceptions internally
-                    results = await warm_all_caches()
-
-                    # Should return failure results, not crash
-                    assert results["activity_catalog"] is False
-                    assert results["analytics_dashboard"] is False
-                except Exception as e:
-                    pytest.fail(f"Cache warming should not crash: {e}")
+            "app.core.cache_warming.warm_analytics_dashboard"
+        ) as mock_warm_analytics:
+            # Simulate catastrophic failures
+            mock_warm_analytics.side_effect = Exception("Critical error")
+
+            # This should not raise an exception
+            try:
+                # Note: warm_all_caches catches exceptions internally
+                results = await warm_all_caches()
+
+                # Should return failure results, not crash
+                assert results["analytics_dashboard"] is False
+            except Exception as e:
+                pytest.fail(f"Cache warming should not crash: {e}")
 
     @pytest.mark.asyncio
     async def test_cache_warming_logs_progress(self, caplog):
@@ -338,24 +321,90 @@ class TestCacheWarmingIntegration:
         caplog.set_level(logging.INFO)
 
         with patch(
-            "app.core.cache_warming.warm_activity_catalog"
-        ) as mock_warm_activities:
-            with patch(
-                "app.core.cache_warming.warm_analytics_dashboard"
-            ) as mock_warm_analytics:
-                mock_warm_activities.return_value = True
-                mock_warm_analytics.return_value = True
-
-                # Warm all caches
-                await warm_all_caches()
-
-                # Verify logging occurred
-                log_messages = [record.message for record in caplog.records]
-
-                # Should log start and completion
-                assert any(
-                    "Starting cache warming" in msg for msg in log_messages
-                ), "Should log cache warming start"
-                assert any(
-                    "complete" in msg for msg in log_messages
-                ), "Should log cache warming completion"
+            "app.core.cache_warming.warm_analytics_dashboard"
+        ) as mock_warm_analytics:
+            mock_warm_analytics.return_value = True
+
+            # Warm all caches
+            await warm_all_caches()
+
+            # Verify logging occurred
+            log_messages = [record.message for record in caplog.records]
+
+            # Should log start and completion
+            assert any(
+                "Starting cache warming" in msg for msg in log_messages
+            ), "Should log cache warming start"
+            assert any(
+                "complete" in msg for msg in log_messages
+            ), "Should log cache warming completion"
+
+
+class TestWarmedKeysMatchRequests:
+    """Warm-ups must populate the entries that real requests read."""
+
+    @staticmethod
+    def _recording_redis():
+        """Build a Redis mock recording the keys read through it."""
+        keys = []
+
+        async def get(key):
+            keys.append(key)
+            return json.dumps({"cached": True})
+
+        redis = AsyncMock()
+        redis.get.side_effect = get
+        return redis, keys
+
+    @staticmethod
+    def _metrics():
+        """Build a cache statistics recorder mock."""
+        metrics = MagicMock()
+        metrics.maybe_flush = AsyncMock()
+        return metrics
+
+    @pytest.mark.asyncio
+    async def test_child_profile_key_includes_credential(self):
+        """Profiles are keyed by credential; warming uses the service one."""
+        redis, keys = self._recording_redis()
+        child_id = uuid4()
+
+        service = ChildService(gibbon_api_url="http://gibbon.test", timeout=5.0)
+
+        with patch("app.core.cache.get_redis_client", return_value=redis), \
+             patch("app.core.cache.get_cache_metrics", return_value=self._metrics()), \
+             patch("app.core.cache_warming.ChildService", return_value=service), \
+             patch.object(settings, "cache_warming_gibbon_token", "service-token"):
+            assert await warm_child_profile(child_id) is True
+            await service.get_child_profile(child_id, "service-token")
+            await service.get_child_profile(child_id, "other-user-token")
+            await service.get_child_profile(child_id)
+
+        warmed, service_call, other_user, anonymous = keys
+        assert warmed == service_call
+        assert len({warmed, other_user, anonymous}) == 3
+
+    @pytest.mark.asyncio
+    async def test_child_profile_not_warmed_without_credential(self):
+        """Without a service credential nothing is fetched anonymously."""
+        with patch("app.core.cache_warming.ChildService") as mock_service, \
+             patch.object(settings, "cache_warming_gibbon_token", ""):
+            assert await warm_child_profile(uuid4()) is False
+
+        mock_service.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dashboard_key_matches_router_call(self):
+        """The warmed dashboard is the entry the analytics router reads."""
+        redis, keys = self._recording_redis()
+
+        with patch("app.core.cache.get_redis_client", return_value=redis), \
+             patch("app.core.cache.get_cache_metrics", return_value=self._metrics()), \
+             patch("app.core.cache_warming.AsyncSessionLocal") as mock_session_factory:
+            mock_session_factory.return_value.__aenter__.return_value = AsyncMock()
+            assert await warm_analytics_dashboard() is True
+            await AnalyticsService(AsyncMock()).get_dashboard(facility_id=None)
+            await AnalyticsService(AsyncMock()).get_dashboard()
+
+        assert len(keys) == 3
+        assert len(set(keys)) == 1
@@ -0,0 +1,276 @@
+"""Tests for the row counting strategies of paginated listings."""
+
+import asyncio
+from typing import Dict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import Integer, StaticPool, String, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.core.counting import (
+    CountStrategy,
+    _pending_invalidations,
+    count_rows,
+    count_tag,
+    fetch_page,
+    install_count_invalidation,
+    track_counts,
+)
+from app.core.query_stats import instrument_engine, track_queries
+from app.schemas.search import SearchType
+from app.services.search_service import SearchService
+
+
+class Base(DeclarativeBase):
+    """Declarative base of the test model."""
+
+
+class Item(Base):
+    """Counted listing row."""
+
+    __tablename__ = "counting_items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+
+
+class ItemNote(Base):
+    """Row joined to counted listing rows."""
+
+    __tablename__ = "counting_item_notes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands of the count cache."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, str] = {}
+
+    async def get(self, key: str):
+        return self.values.get(key)
+
+    async def setex(self, key: str, ttl: int, value: int) -> None:
+        self.values[key] = str(value)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    instrument_engine(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add_all(Item(id=index, kind="a" if index % 2 else "b") for index in range(10))
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("app.core.counting.get_redis_client", AsyncMock(return_value=redis)), patch(
+        "app.core.counting.tag_keys", AsyncMock()
+    ) as tag_keys:
+        redis.tag_keys = tag_keys
+        yield redis
+
+
+def listing(kind: str = "a"):
+    return select(Item).where(Item.kind == kind).order_by(Item.id)
+
+
+class TestExactCount:
+    """Tests for the windowed exact count."""
+
+    @pytest.mark.asyncio
+    async def test_rows_and_total_in_one_query(self, session):
+        with track_queries() as stats:
+            page = await fetch_page(session, listing(), skip=1, limit=2)
+
+        assert stats.count == 1
+        assert "count(*) OVER ()" in next(iter(stats.fingerprints))
+        assert [item.id for item in page.items] == [3, 5]
+        assert page.total == 5
+        assert not page.approximate
+
+    @pytest.mark.asyncio
+    async def test_multi_column_queries_return_tuples(self, session):
+        query = select(Item.id, Item.kind).where(Item.kind == "b").order_by(Item.id)
+
+        page = await fetch_page(session, query, skip=0, limit=2)
+
+        assert page.items == [(0, "b"), (2, "b")]
+        assert page.total == 5
+
+    @pytest.mark.asyncio
+    async def test_past_last_page_still_counts(self, session):
+        page = await fetch_page(session, listing(), skip=20, limit=5)
+
+        assert page.items == []
+        assert page.total == 5
+
+    @pytest.mark.asyncio
+    async def test_empty_listing(self, session):
+        with track_queries() as stats:
+            page = await fetch_page(session, listing("missing"), skip=0, limit=5)
+
+        assert page.total == 0
+        assert stats.count == 1
+
+
+class TestCachedCount:
+    """Tests for the Redis count cache."""
+
+    @pytest.mark.asyncio
+    async def test_total_is_cached_per_filter(self, session, fake_redis):
+        first = await fetch_page(
+            session, listing(), skip=0, limit=2, strategy=CountStrategy.CACHED
+        )
+
+        with track_queries() as stats:
+            second = await fetch_page(
+                session, listing(), skip=2, limit=2, strategy=CountStrategy.CACHED
+            )
+        other = await count_rows(session, listing("b"), CountStrategy.CACHED)
+
+        assert first.total == second.total == 5
+        assert stats.count == 1
+        assert other == (5, False)
+        assert len(fake_redis.values) == 2
+        assert fake_redis.tag_keys.call_args.args[1] == [count_tag("counting_items")]
+
+    @pytest.mark.asyncio
+    async def test_joined_tables_are_tagged(self, session, fake_redis):
+        query = select(Item).join(ItemNote, ItemNote.item_id == Item.id).where(Item.kind == "a")
+
+        assert await count_rows(session, query, CountStrategy.CACHED) == (0, False)
+
+        assert fake_redis.tag_keys.call_args.args[1] == [
+            count_tag("counting_item_notes"),
+            count_tag("counting_items"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_counts_rows(self, session):
+        with patch(
+            "app.core.counting.get_redis_client",
+            AsyncMock(side_effect=ConnectionError("down")),
+        ):
+            assert await count_rows(session, listing(), CountStrategy.CACHED) == (5, False)
+
+
+class TestEstimatedCount:
+    """Tests for planner-estimated counts."""
+
+    @pytest.mark.asyncio
+    async def test_other_databases_count_exactly(self, session):
+        page = await fetch_page(
+            session, listing(), skip=0, limit=2, strategy=CountStrategy.ESTIMATED
+        )
+
+        assert page.total == 5
+        assert not page.approximate
+
+    @pytest.mark.asyncio
+    async def test_large_estimates_are_flagged_approximate(self):
+        db = MagicMock()
+        db.bind.dialect.name = "postgresql"
+
+        with patch(
+            "app.core.counting._planner_estimate", AsyncMock(return_value=2_000_000)
+        ), patch("app.core.counting._exact_count", AsyncMock(return_value=1_999_123)):
+            assert await count_rows(db, listing(), CountStrategy.ESTIMATED) == (2_000_000, True)
+
+    @pytest.mark.asyncio
+    async def test_small_estimates_are_counted_exactly(self):
+        db = MagicMock()
+        db.bind.dialect.name = "postgresql"
+
+        with patch("app.core.counting._planner_estimate", AsyncMock(return_value=40)), patch(
+            "app.core.counting._exact_count", AsyncMock(return_value=42)
+        ):
+            assert await count_rows(db, listing(), CountStrategy.ESTIMATED) == (42, False)
+
+
+class TestCountInvalidation:
+    """Tests for invalidating cached totals on write."""
+
+    @pytest.fixture
+    def tracked(self, session):
+        install_count_invalidation()
+        track_counts(Item)
+        with patch("app.core.counting.invalidate_tags", AsyncMock()) as invalidate:
+            yield invalidate
+
+    @pytest.mark.asyncio
+    async def test_commit_invalidates_written_tables(self, session, tracked):
+        session.add(Item(id=100, kind="a"))
+        await session.commit()
+        await asyncio.sleep(0)
+
+        tracked.assert_awaited_once_with(count_tag("counting_items"))
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_invalidates(self, session, tracked):
+        await session.execute(update(Item).where(Item.id == 1).values(kind="b"))
+        await session.commit()
+        await asyncio.sleep(0)
+
+        tracked.assert_awaited_once_with(count_tag("counting_items"))
+
+    @pytest.mark.asyncio
+    async def test_invalidation_task_is_kept_until_done(self, session, tracked, caplog):
+        release = asyncio.Event()
+
+        async def invalidate(*tags):
+            await release.wait()
+            raise ConnectionError("down")
+
+        tracked.side_effect = invalidate
+        session.add(Item(id=102, kind="a"))
+        await session.commit()
+
+        assert len(_pending_invalidations) == 1
+        release.set()
+        await asyncio.gather(*_pending_invalidations, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert not _pending_invalidations
+        assert "Count cache invalidation failed: down" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_rollback_and_reads_do_not_invalidate(self, session, tracked):
+        await session.execute(select(func.count()).select_from(Item))
+        await session.commit()
+        session.add(Item(id=101, kind="a"))
+        await session.flush()
+        await session.rollback()
+        await asyncio.sleep(0)
+
+        tracked.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_counts_in_the_page_query(db_session, sample_activities, query_budget):
+    """Test that activity search fetches results and total in one query."""
+    service = SearchService(db_session)
+
+    with query_budget(max_queries=1):
+        page = await service.search(
+            sample_activities[0].name, [SearchType.ACTIVITIES], skip=0, limit=5
+        )
+
+    assert page.total >= 1
+    assert page.items[0].title == sample_activities[0].name
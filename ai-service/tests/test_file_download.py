@@ -0,0 +1,175 @@
+"""Tests for streaming and ranged file downloads."""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.storage import StorageBackend
+from app.services.file_download import (
+    ByteRange,
+    RangeNotSatisfiableError,
+    etag_matches,
+    parse_range,
+    select_range,
+    strong_etag,
+)
+from app.services.s3_backend import S3Backend, S3BackendError, S3ObjectStream
+from app.services.storage_service import (
+    FileNotFoundError as StorageFileNotFoundError,
+    StorageService,
+)
+
+CHECKSUM = "ab" * 32
+ETAG = f'"{CHECKSUM}"'
+
+
+class TestRanges:
+    """Tests for Range and conditional header handling."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("bytes=0-99", ByteRange(0, 99)),
+            ("bytes=100-", ByteRange(100, 999)),
+            ("bytes=-100", ByteRange(900, 999)),
+            ("bytes=-5000", ByteRange(0, 999)),
+            ("bytes=900-5000", ByteRange(900, 999)),
+            (None, None),
+            ("items=0-10", None),
+            ("bytes=0-10,20-30", None),
+            ("bytes=abc-", None),
+            ("bytes=50-10", None),
+        ],
+    )
+    def test_parse_range(self, header, expected):
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+    def test_unsatisfiable_range(self, header):
+        with pytest.raises(RangeNotSatisfiableError) as raised:
+            parse_range(header, 1000)
+
+        assert raised.value.size == 1000
+
+    def test_content_range(self):
+        byte_range = ByteRange(100, 199)
+
+        assert byte_range.length == 100
+        assert byte_range.content_range(1000) == "bytes 100-199/1000"
+
+    def test_if_range_must_match_current_etag(self):
+        assert select_range("bytes=10-", ETAG, ETAG, 100) == ByteRange(10, 99)
+        assert select_range("bytes=10-", '"stale"', ETAG, 100) is None
+        assert select_range("bytes=10-", ETAG, None, 100) is None
+
+    def test_etags(self):
+        assert strong_etag(CHECKSUM) == ETAG
+        assert strong_etag(None) is None
+        assert etag_matches(f'"other", W/{ETAG}', ETAG)
+        assert etag_matches("*", ETAG)
+        assert not etag_matches('"other"', ETAG)
+        assert not etag_matches(ETAG, None)
+
+
+class TestS3ObjectStream:
+    """Tests for streaming S3 object bodies."""
+
+    @pytest.mark.asyncio
+    async def test_reads_body_in_chunks_and_closes_it(self):
+        body = MagicMock(wraps=io.BytesIO(b"x" * 25))
+        stream = S3ObjectStream(S3Backend("bucket"), body)
+
+        chunks = [chunk async for chunk in stream.iter_chunks(10)]
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        body.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_open_object_requests_range(self):
+        backend = S3Backend("bucket")
+        client = MagicMock()
+        client.get_object.return_value = {"Body": io.BytesIO(b"data")}
+        backend._client = client
+
+        await backend.open_object("owner/file.mp4", 100, 199)
+        await backend.open_object("owner/file.mp4")
+
+        assert client.get_object.call_args_list[0].kwargs == {
+            "Bucket": "bucket",
+            "Key": "owner/file.mp4",
+            "Range": "bytes=100-199",
+        }
+        assert "Range" not in client.get_object.call_args_list[1].kwargs
+
+
+class TestOpenDownload:
+    """Tests for StorageService.open_download."""
+
+    @pytest.fixture
+    def settings(self, tmp_path):
+        with patch("app.services.storage_service.settings") as settings:
+            settings.storage_backend = "local"
+            settings.local_storage_path = str(tmp_path)
+            settings.s3_bucket_name = "bucket"
+            settings.s3_cache_enabled = False
+            yield settings
+
+    def record(self, backend, size=1000):
+        return SimpleNamespace(
+            storage_backend=backend,
+            storage_path="owner/file.bin",
+            size_bytes=size,
+            checksum=CHECKSUM,
+        )
+
+    @pytest.mark.asyncio
+    async def test_local_file_is_sent_by_path(self, settings, tmp_path):
+        (tmp_path / "owner").mkdir()
+        (tmp_path / "owner" / "file.bin").write_bytes(b"y" * 10)
+        service = StorageService(MagicMock())
+
+        download = await service.open_download(self.record(StorageBackend.LOCAL), "bytes=0-4")
+
+        assert download.path == tmp_path / "owner" / "file.bin"
+        assert download.stat.st_size == 10
+        assert download.chunks is None
+
+    @pytest.mark.asyncio
+    async def test_missing_local_file(self, settings):
+        service = StorageService(MagicMock())
+
+        with pytest.raises(StorageFileNotFoundError):
+            await service.open_download(self.record(StorageBackend.LOCAL))
+
+    @pytest.mark.asyncio
+    async def test_s3_range_is_streamed(self, settings):
+        settings.storage_backend = "s3"
+        s3 = MagicMock()
+        s3.open_object = AsyncMock(
+            return_value=S3ObjectStream(S3Backend("bucket"), io.BytesIO(b"z" * 100))
+        )
+        with patch("app.services.storage_service.get_s3_backend", return_value=s3):
+            service = StorageService(MagicMock())
+
+        download = await service.open_download(
+            self.record(StorageBackend.S3), "bytes=100-199", ETAG
+        )
+
+        s3.open_object.assert_awaited_once_with("owner/file.bin", 100, 199)
+        assert download.byte_range == ByteRange(100, 199)
+        assert b"".join([chunk async for chunk in download.chunks]) == b"z" * 100
+
+    @pytest.mark.asyncio
+    async def test_s3_errors(self, settings):
+        settings.storage_backend = "s3"
+        s3 = MagicMock()
+        s3.open_object = AsyncMock(side_effect=S3BackendError("NoSuchKey", "missing"))
+        with patch("app.services.storage_service.get_s3_backend", return_value=s3):
+            service = StorageService(MagicMock())
+
+        with pytest.raises(StorageFileNotFoundError):
+            await service.open_download(self.record(StorageBackend.S3))
+        with pytest.raises(RangeNotSatisfiableError):
+            await service.open_download(self.record(StorageBackend.S3), "bytes=5000-")
@@ -521,6 +521,23 @@ async def test_check_redis_pool_failure() -> None:
             assert "error" in result
 
 
+def test_check_s3_cache() -> None:
+    """Test S3 cache check reports size and hit rate."""
+    from app.routers.health import check_s3_cache
+
+    cache = MagicMock()
+    cache.stats.return_value = {"entries": 3, "hit_rate_percent": 75.0}
+
+    with patch("app.services.s3_cache.get_s3_cache", return_value=cache):
+        with patch("app.config.settings.s3_cache_enabled", True):
+            result = check_s3_cache()
+
+        assert result == {"status": "healthy", "entries": 3, "hit_rate_percent": 75.0}
+
+        with patch("app.config.settings.s3_cache_enabled", False):
+            assert check_s3_cache() == {"status": "disabled"}
+
+
 @pytest.mark.asyncio
 async def test_connection_pools_endpoint(client: AsyncClient) -> None:
     """Test connection pools monitoring endpoint.
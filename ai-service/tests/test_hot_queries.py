@@ -0,0 +1,99 @@
+"""Tests for the hot-query registry."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import bindparam, column, select, table
+
+from app.core.hot_queries import HotQuery, get_hot_query, hot_query_stats
+
+items = table("items", column("id"), column("owner"))
+
+
+def build_items_query(owner: bool = False):
+    query = select(items.c.id).where(items.c.id == bindparam("item_id"))
+    if owner:
+        query = query.where(items.c.owner == bindparam("owner"))
+    return query
+
+
+@pytest.fixture
+def query() -> HotQuery:
+    return HotQuery("tests.items", MagicMock(side_effect=build_items_query))
+
+
+class TestHotQuery:
+    """Tests for HotQuery."""
+
+    def test_statement_is_built_once_per_variant(self, query):
+        first = query.statement()
+
+        assert query.statement() is first
+        assert query.statement(owner=True) is not first
+        assert query.statement(owner=True) is query.statement(owner=True)
+        assert query.build.call_count == 2
+
+    def test_cache_key_is_memoized(self, query):
+        statement = query.statement()
+
+        assert statement._generate_cache_key() is statement._generate_cache_key()
+
+    def test_variants_bind_their_parameters(self, query):
+        assert "owner" not in str(query.statement())
+        assert ":owner" in str(query.statement(owner=True))
+
+    @pytest.mark.asyncio
+    async def test_execute_passes_parameters(self, query):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value="result")
+
+        result = await query.execute(session, {"item_id": 1, "owner": "a"}, owner=True)
+
+        assert result == "result"
+        session.execute.assert_awaited_once_with(
+            query.statement(owner=True), {"item_id": 1, "owner": "a"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_stats(self, query):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await query.execute(session, {"item_id": 1})
+        await query.execute(session, {"item_id": 2})
+
+        assert query.stats() == {"executions": 2, "variants": 1}
+        assert hot_query_stats()["tests.items"] == {"executions": 2, "variants": 1}
+
+    def test_registry(self, query):
+        assert get_hot_query("tests.items") is query
+        with pytest.raises(KeyError):
+            get_hot_query("tests.missing")
+
+
+class TestRegisteredQueries:
+    """Tests for the hot queries of the services."""
+
+    def test_services_register_their_queries(self):
+        import app.auth.jwt  # noqa: F401
+        import app.llm.cache  # noqa: F401
+        import app.services.activity_service  # noqa: F401
+        import app.services.rbac_service  # noqa: F401
+
+        assert {
+            "activities.by_id",
+            "auth.token_blacklisted",
+            "llm_cache.entry",
+            "llm_cache.record_hit",
+            "rbac.user_roles",
+        } <= set(hot_query_stats())
+
+    def test_user_roles_filters_are_optional(self):
+        from app.services.rbac_service import USER_ROLES_QUERY
+
+        plain = str(USER_ROLES_QUERY.statement())
+        scoped = str(USER_ROLES_QUERY.statement(organization=True, group=True))
+
+        assert ":organization_id" not in plain and ":group_id" not in plain
+        assert ":organization_id" in scoped and ":group_id" in scoped
+        assert ":now" in plain
@@ -0,0 +1,214 @@
+"""Tests for keyset pagination with signed cursors."""
+
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import DateTime, Integer, StaticPool, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.core.keyset import InvalidCursorError, KeysetPaginator
+from app.core.pagination import encode_signed_cursor
+from app.core.query_stats import instrument_engine, track_queries
+from app.schemas.pagination import SortOrder
+
+
+class Base(DeclarativeBase):
+    """Declarative base of the test model."""
+
+
+class Entry(Base):
+    """Listing row with a non-unique sort key."""
+
+    __tablename__ = "keyset_entries"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    score: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    instrument_engine(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        # Pairs of rows share a timestamp so the tiebreaker matters
+        session.add_all(
+            Entry(created_at=START + timedelta(minutes=index // 2), score=index % 3)
+            for index in range(11)
+        )
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+async def expected_order(session: AsyncSession, *order_by) -> List[UUID]:
+    result = await session.execute(select(Entry.id).order_by(*order_by))
+    return list(result.scalars().all())
+
+
+async def walk_forward(paginator, session, limit):
+    """Follow next cursors from the first page, returning every page."""
+    pages = [await paginator.paginate(session, select(Entry), limit=limit)]
+    while pages[-1].next_cursor:
+        pages.append(
+            await paginator.paginate(
+                session, select(Entry), limit=limit, cursor=pages[-1].next_cursor
+            )
+        )
+    return pages
+
+
+class TestKeysetPaginator:
+    """Tests for KeysetPaginator."""
+
+    @pytest.mark.asyncio
+    async def test_forward_walk_visits_every_row_once(self, session):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.DESC)])
+
+        pages = await walk_forward(paginator, session, limit=4)
+
+        ids = [entry.id for page in pages for entry in page.items]
+        assert ids == await expected_order(session, Entry.created_at.desc(), Entry.id.desc())
+        assert [len(page.items) for page in pages] == [4, 4, 3]
+        assert pages[0].previous_cursor is None
+        assert pages[-1].next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_backward_walk_returns_same_pages(self, session):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.ASC)])
+        pages = await walk_forward(paginator, session, limit=3)
+
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = await paginator.paginate(
+                session, select(Entry), limit=3, cursor=page.previous_cursor
+            )
+            assert [entry.id for entry in page.items] == [entry.id for entry in expected.items]
+            assert page.next_cursor is not None
+
+        assert page.previous_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_mixed_sort_directions(self, session):
+        paginator = KeysetPaginator(
+            Entry, [("score", SortOrder.DESC), ("created_at", SortOrder.ASC)]
+        )
+
+        pages = await walk_forward(paginator, session, limit=4)
+
+        ids = [entry.id for page in pages for entry in page.items]
+        assert ids == await expected_order(
+            session, Entry.score.desc(), Entry.created_at.asc(), Entry.id.asc()
+        )
+
+    @pytest.mark.asyncio
+    async def test_filters_are_kept(self, session):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.ASC)])
+        query = select(Entry).where(Entry.score == 0)
+
+        first = await paginator.paginate(session, query, limit=2)
+        second = await paginator.paginate(session, query, limit=2, cursor=first.next_cursor)
+
+        assert all(entry.score == 0 for entry in first.items + second.items)
+        assert len(first.items + second.items) == 4
+
+    @pytest.mark.asyncio
+    async def test_offset_pages_carry_cursors(self, session):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.ASC)])
+        order = await expected_order(session, Entry.created_at.asc(), Entry.id.asc())
+
+        page = await paginator.paginate(session, select(Entry), limit=3, offset=3)
+        following = await paginator.paginate(
+            session, select(Entry), limit=3, cursor=page.next_cursor
+        )
+        preceding = await paginator.paginate(
+            session, select(Entry), limit=3, cursor=page.previous_cursor
+        )
+
+        assert [entry.id for entry in page.items] == order[3:6]
+        assert [entry.id for entry in following.items] == order[6:9]
+        assert [entry.id for entry in preceding.items] == order[0:3]
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_is_a_single_seek_query(self, session):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.DESC)])
+        first = await paginator.paginate(session, select(Entry), limit=4)
+
+        with track_queries() as stats:
+            await paginator.paginate(session, select(Entry), limit=4, cursor=first.next_cursor)
+
+        assert stats.count == 1
+        (statement,) = stats.fingerprints
+        assert "(keyset_entries.created_at, keyset_entries.id) < (?)" in statement
+
+    @pytest.mark.asyncio
+    async def test_empty_listing(self, session):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.DESC)])
+
+        page = await paginator.paginate(session, select(Entry).where(Entry.score > 5), limit=4)
+
+        assert page.items == []
+        assert not page.has_more
+        assert page.previous_cursor is None
+
+
+class TestCursorValidation:
+    """Tests for cursor tampering and misuse."""
+
+    @pytest.mark.asyncio
+    async def test_tampered_cursor_is_rejected(self, session):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.DESC)])
+        page = await paginator.paginate(session, select(Entry), limit=4)
+        payload, signature = page.next_cursor.split(".")
+
+        with pytest.raises(InvalidCursorError):
+            await paginator.paginate(
+                session, select(Entry), limit=4, cursor=f"{payload}x.{signature}"
+            )
+
+    @pytest.mark.asyncio
+    async def test_cursor_from_another_sort_is_rejected(self, session):
+        by_date = KeysetPaginator(Entry, [("created_at", SortOrder.DESC)])
+        by_score = KeysetPaginator(Entry, [("score", SortOrder.DESC)])
+        page = await by_date.paginate(session, select(Entry), limit=4)
+
+        with pytest.raises(InvalidCursorError, match="does not belong"):
+            await by_score.paginate(session, select(Entry), limit=4, cursor=page.next_cursor)
+
+    def test_signed_cursor_with_bad_values_is_rejected(self):
+        paginator = KeysetPaginator(Entry, [("created_at", SortOrder.DESC)])
+        cursor = encode_signed_cursor(
+            {"k": ["not-a-date", str(uuid4())], "d": "next", "s": paginator._signature}
+        )
+
+        with pytest.raises(InvalidCursorError, match="Invalid cursor value"):
+            paginator.decode_cursor(cursor)
+
+    def test_invalid_sort_field(self):
+        with pytest.raises(ValueError, match="Invalid sort field"):
+            KeysetPaginator(Entry, [("missing", SortOrder.ASC)])
+
+    def test_sort_field_must_be_allowed(self):
+        with pytest.raises(ValueError, match="not allowed"):
+            KeysetPaginator(Entry, [("score", SortOrder.ASC)], allowed_fields=["created_at"])
+
+    def test_tiebreaker_is_appended_once(self):
+        paginator = KeysetPaginator(
+            Entry, [("created_at", SortOrder.DESC), ("id", SortOrder.ASC)]
+        )
+
+        assert paginator.sorts == [("created_at", SortOrder.DESC), ("id", SortOrder.DESC)]
@@ -0,0 +1,189 @@
+"""Tests for lazily loaded subsystems and lazy package exports."""
+
+import io
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from PIL import Image
+
+from app.core.lazy import lazy_exports, preload_subsystems
+from app.llm.exceptions import LLMProviderError
+from app.llm.factory import LLMProviderFactory
+from app.llm.providers.openai_provider import OpenAIProvider
+from app.services.image_processing import (
+    ImageProcessingError,
+    create_thumbnail,
+    create_thumbnail_async,
+)
+from app.services.s3_backend import S3Backend, S3BackendError
+from app.services.storage_service import StorageService
+
+
+@pytest.fixture
+def lazy_package():
+    package = types.ModuleType("lazy_package")
+    package.__getattr__, package.__dir__ = lazy_exports(
+        "lazy_package", {"dumps": "json", "parse": "json:loads"}
+    )
+    sys.modules["lazy_package"] = package
+    yield package
+    del sys.modules["lazy_package"]
+
+
+def png_bytes(width: int = 40, height: int = 20) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 128)).save(output, format="PNG")
+    return output.getvalue()
+
+
+class TestLazyExports:
+    """Tests for lazy_exports."""
+
+    def test_exports_resolve_on_access(self, lazy_package):
+        assert "dumps" not in vars(lazy_package)
+
+        assert lazy_package.dumps({"a": 1}) == '{"a": 1}'
+        assert lazy_package.parse("[1]") == [1]
+        # Cached on the module after the first access
+        assert "dumps" in vars(lazy_package)
+
+    def test_unknown_name(self, lazy_package):
+        with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+            _ = lazy_package.missing
+
+    def test_dir_lists_exports(self, lazy_package):
+        assert {"dumps", "parse"} <= set(dir(lazy_package))
+
+    def test_package_exports_still_resolve(self):
+        from app.llm import LLMClient
+        from app.schemas import PaginatedResponse
+        from app.services import AlertSeverity
+
+        assert LLMClient.__module__ == "app.llm.client"
+        assert PaginatedResponse.__module__ == "app.schemas.base"
+        assert AlertSeverity.__module__ == "app.services.alert_manager"
+
+    def test_preload_skips_missing_modules(self):
+        assert preload_subsystems(["json", "not_a_real_module"]) == {
+            "json": True,
+            "not_a_real_module": False,
+        }
+
+
+class TestLazyProviders:
+    """Tests for lazily imported LLM providers."""
+
+    def test_builtin_providers_are_registered_by_path(self):
+        factory = LLMProviderFactory()
+
+        assert factory.available_providers == ["openai", "anthropic"]
+        assert isinstance(factory._providers["openai"], str)
+
+    def test_provider_is_imported_on_first_use(self):
+        factory = LLMProviderFactory()
+
+        provider = factory.get_provider("openai", api_key="sk-test")
+
+        assert isinstance(provider, OpenAIProvider)
+        assert factory._providers["openai"] is OpenAIProvider
+
+    def test_unimportable_provider(self):
+        factory = LLMProviderFactory()
+        factory.register_provider("broken", "app.llm.providers.missing:Provider")
+
+        with pytest.raises(LLMProviderError, match="Cannot load provider 'broken'"):
+            factory.get_provider("broken")
+
+    def test_import_path_must_name_a_class(self):
+        with pytest.raises(ValueError, match="module:class"):
+            LLMProviderFactory().register_provider("bad", "app.llm.providers")
+
+
+class TestS3Backend:
+    """Tests for the lazily constructed S3 backend."""
+
+    @pytest.fixture
+    def client(self):
+        client = MagicMock()
+        with patch.object(S3Backend, "_create_client", return_value=client) as create:
+            client.create = create
+            yield client
+
+    @pytest.mark.asyncio
+    async def test_client_is_created_on_first_call(self, client):
+        backend = S3Backend("bucket")
+        assert client.create.call_count == 0
+
+        await backend.put_object("owner/a.txt", b"data", "text/plain")
+        await backend.delete_object("owner/a.txt")
+
+        assert client.create.call_count == 1
+        client.put_object.assert_called_once_with(
+            Bucket="bucket", Key="owner/a.txt", Body=b"data", ContentType="text/plain"
+        )
+        client.delete_object.assert_called_once_with(Bucket="bucket", Key="owner/a.txt")
+
+    @pytest.mark.asyncio
+    async def test_get_object_and_presigned_url(self, client):
+        client.get_object.return_value = {"Body": io.BytesIO(b"content")}
+        client.generate_presigned_url.return_value = "https://s3/url"
+        backend = S3Backend("bucket")
+
+        assert await backend.get_object("key") == b"content"
+        assert await backend.presigned_url("key", 60) == "https://s3/url"
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_translated(self, client):
+        client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject"
+        )
+
+        with pytest.raises(S3BackendError) as raised:
+            await S3Backend("bucket").get_object("key")
+
+        assert raised.value.code == "NoSuchKey"
+        assert raised.value.not_found
+
+    def test_storage_service_does_not_build_the_client(self):
+        with patch("app.services.storage_service.settings") as settings, patch(
+            "app.services.storage_service.get_s3_backend", return_value=S3Backend("bucket")
+        ):
+            settings.storage_backend = "s3"
+            settings.s3_bucket_name = "bucket"
+            settings.max_file_size_mb = 10
+            settings.storage_quota_mb = 100
+            settings.allowed_file_types = "image/png"
+            settings.local_storage_path = "/tmp"
+
+            service = StorageService(MagicMock())
+
+        assert service._s3 is not None
+        assert service._s3._client is None
+
+
+class TestImageProcessing:
+    """Tests for the image processing facade."""
+
+    def test_thumbnail_keeps_aspect_ratio(self):
+        content, width, height = create_thumbnail(png_bytes(), 10, "image/png")
+
+        assert (width, height) == (10, 5)
+        with Image.open(io.BytesIO(content)) as image:
+            assert image.format == "PNG"
+
+    def test_rgba_to_jpeg(self):
+        content, _, _ = create_thumbnail(png_bytes(), 16, "image/jpeg")
+
+        with Image.open(io.BytesIO(content)) as image:
+            assert image.format == "JPEG"
+
+    @pytest.mark.asyncio
+    async def test_async_thumbnail_and_errors(self):
+        _, width, _ = await create_thumbnail_async(png_bytes(), 20, "image/png")
+        assert width == 20
+
+        with pytest.raises(ImageProcessingError):
+            await create_thumbnail_async(b"not an image", 20, "image/png")
@@ -0,0 +1,232 @@
+"""Unit tests for the queued log pipeline.
+
+Tests for sampling rules, the non-blocking queue handler, and queued
+structured logging end to end.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import time
+from io import StringIO
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+import structlog
+
+from app.core.log_pipeline import (
+    LogPipeline,
+    LogSampler,
+    QueuedLogHandler,
+    SamplingRule,
+    parse_sampling_rules,
+    record_event_type,
+)
+from app.core.logging import (
+    configure_logging,
+    get_log_pipeline_stats,
+    get_logger,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_logging() -> Iterator[None]:
+    """Reset logging configuration around each test."""
+    logging.root.handlers = []
+    structlog.reset_defaults()
+    yield
+    shutdown_logging()
+    logging.root.handlers = []
+    structlog.reset_defaults()
+
+
+def make_record(msg: object, level: int = logging.INFO, **extra: object) -> logging.LogRecord:
+    """Build a log record with optional extra attributes."""
+    record = logging.LogRecord("test", level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class SlowStream(StringIO):
+    """Stream taking a while to write, like a blocked stdout pipe."""
+
+    def write(self, text: str) -> int:
+        time.sleep(0.05)
+        return super().write(text)
+
+
+def test_parse_sampling_rules() -> None:
+    """Test parsing of event=rate[/per_second] rules."""
+    rules = parse_sampling_rules("verify_success=0.01, Outbound request=1/50,,broken")
+
+    assert rules == {
+        "verify_success": SamplingRule(rate=0.01),
+        "Outbound request": SamplingRule(rate=1.0, per_second=50.0),
+    }
+
+
+@pytest.mark.parametrize("spec", ["event=1.5", "event=-0.1", "event=1/0"])
+def test_parse_sampling_rules_rejects_invalid_values(spec: str) -> None:
+    """Test that out-of-range rates and limits are rejected."""
+    with pytest.raises(ValueError):
+        parse_sampling_rules(spec)
+
+
+def test_record_event_type() -> None:
+    """Test that event types come from extras, structlog events or messages."""
+    assert record_event_type(make_record("Token ok", event_type="verify_success")) == (
+        "verify_success"
+    )
+    assert record_event_type(make_record({"event": "Outbound request"})) == "Outbound request"
+    assert record_event_type(make_record("Plain message")) == "Plain message"
+
+
+def test_sampler_keeps_a_fraction_of_sampled_events() -> None:
+    """Test that 1% of successes and every failure are kept."""
+    sampler = LogSampler({"verify_success": SamplingRule(rate=0.01)})
+
+    kept_successes = sum(
+        sampler.filter(make_record("ok", event_type="verify_success")) for _ in range(300)
+    )
+    kept_failures = sum(
+        sampler.filter(make_record("failed", event_type="verify_failed")) for _ in range(300)
+    )
+
+    assert kept_successes == 3
+    assert kept_failures == 300
+    assert sampler.sampled_out == {"verify_success": 297}
+
+
+def test_sampler_rate_limits_events() -> None:
+    """Test that rate-limited events are capped per second."""
+    sampler = LogSampler({"Outbound request": SamplingRule(per_second=5)})
+    record = make_record({"event": "Outbound request"})
+
+    with patch("app.core.log_pipeline.time.monotonic", return_value=100.0):
+        burst = sum(sampler.filter(record) for _ in range(20))
+    with patch("app.core.log_pipeline.time.monotonic", return_value=101.0):
+        next_second = sum(sampler.filter(record) for _ in range(20))
+
+    assert burst == 5
+    assert next_second == 5
+    assert sampler.sampled_out["Outbound request"] == 30
+
+
+def test_handler_drops_and_counts_when_queue_is_full() -> None:
+    """Test that a full queue drops records instead of blocking."""
+    handler = QueuedLogHandler(queue.Queue(maxsize=2))
+
+    for _ in range(5):
+        handler.handle(make_record("message"))
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_handler_does_not_render_records() -> None:
+    """Test that records are enqueued unrendered, with their arguments merged."""
+    handler = QueuedLogHandler(queue.Queue())
+    event = {"event": "Outbound request", "url": "http://example.com"}
+    args = ["first"]
+
+    handler.handle(make_record(event))
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "value %s", (args,), None)
+    handler.handle(record)
+    args.append("mutated later")
+
+    assert handler.queue.get_nowait().msg is event
+    assert handler.queue.get_nowait().msg == "value ['first']"
+
+
+def test_pipeline_stop_writes_queued_records() -> None:
+    """Test that stopping the pipeline drains the queue first."""
+    output = StringIO()
+    target = logging.StreamHandler(output)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    pipeline = LogPipeline([target], queue_size=100)
+    pipeline.start()
+
+    for i in range(50):
+        pipeline.handler.handle(make_record(f"record {i}"))
+    pipeline.stop()
+
+    assert output.getvalue().splitlines() == [f"record {i}" for i in range(50)]
+    assert pipeline.stats()["running"] is False
+
+
+def test_queued_logging_writes_json_on_background_thread() -> None:
+    """Test that queued logging returns before slow writes complete."""
+    output = SlowStream()
+    configure_logging(log_level="INFO", json_logs=True, stream=output, queued=True)
+    logger = get_logger(__name__)
+
+    started = time.perf_counter()
+    for i in range(5):
+        logger.info("test message", index=i)
+    elapsed = time.perf_counter() - started
+    shutdown_logging()
+
+    assert elapsed < 0.05 * 5
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [line["index"] for line in lines] == list(range(5))
+    assert lines[0]["event"] == "test message"
+    assert lines[0]["level"] == "info"
+    assert "timestamp" in lines[0]
+
+
+def test_queued_logging_renders_standard_library_records() -> None:
+    """Test that records from standard library loggers are rendered too."""
+    output = StringIO()
+    configure_logging(log_level="INFO", json_logs=True, stream=output, queued=True)
+
+    logging.getLogger("ai_service.auth.audit").warning("Token verification failed")
+    shutdown_logging()
+
+    line = json.loads(output.getvalue().splitlines()[0])
+    assert line["event"] == "Token verification failed"
+    assert line["level"] == "warning"
+    assert line["logger"] == "ai_service.auth.audit"
+
+
+def test_queued_logging_applies_level_and_sampling() -> None:
+    """Test level filtering and sampling in queued mode."""
+    output = StringIO()
+    configure_logging(
+        log_level="INFO",
+        stream=output,
+        queued=True,
+        sampling={"verify_success": SamplingRule(rate=0.1)},
+    )
+    audit = logging.getLogger("ai_service.auth.audit")
+    logger = get_logger(__name__)
+
+    logger.debug("hidden")
+    for _ in range(20):
+        audit.info("Token verification successful", extra={"event_type": "verify_success"})
+    audit.warning("Token verification failed", extra={"event_type": "verify_failed"})
+    stats = get_log_pipeline_stats()
+    shutdown_logging()
+
+    events = [json.loads(line)["event"] for line in output.getvalue().splitlines()]
+    assert events == ["Token verification successful"] * 2 + [
+        "Token verification failed",
+        "Log pipeline stopped: 0 records dropped, 18 sampled out",
+    ]
+    assert stats is not None
+    assert stats["sampled_out"] == {"verify_success": 18}
+    assert get_log_pipeline_stats() is None
+
+
+def test_records_logged_after_shutdown_are_still_written() -> None:
+    """Test that logging keeps working synchronously after shutdown."""
+    output = StringIO()
+    configure_logging(log_level="INFO", stream=output, queued=True)
+    shutdown_logging()
+
+    get_logger(__name__).info("late message")
+
+    assert json.loads(output.getvalue().splitlines()[-1])["event"] == "late message"
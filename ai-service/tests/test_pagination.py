@@ -10,6 +10,7 @@ Tests cover:
 - CursorPaginatedRequest validation and defaults
 - CursorPaginatedResponse structure and cursors
 - Pagination helper functions (encode/decode cursor, build responses)
+- Signed cursors rejecting tampered values
 """
 
 import pytest
@@ -20,7 +21,9 @@ from app.core.pagination import (
     build_paginated_response,
     calculate_total_pages,
     decode_cursor,
+    decode_signed_cursor,
     encode_cursor,
+    encode_signed_cursor,
 )
 from app.schemas.pagination import (
     CursorPaginatedRequest,
@@ -359,6 +362,28 @@ class TestPaginationHelpers:
             decoded = decode_cursor(cursor)
             assert decoded == original
 
+    def test_signed_cursor_roundtrip(self):
+        """Test a signed cursor decodes to its value."""
+        original = {"k": ["2024-01-01T00:00:00", "abc"], "d": "next"}
+        cursor = encode_signed_cursor(original)
+        assert "=" not in cursor
+        assert decode_signed_cursor(cursor) == original
+
+    def test_signed_cursor_rejects_tampering(self):
+        """Test a signed cursor with an edited payload is rejected."""
+        cursor = encode_signed_cursor({"k": [1]})
+        _, signature = cursor.split(".")
+        forged = encode_signed_cursor({"k": [2]}).split(".")[0]
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_signed_cursor(f"{forged}.{signature}")
+
+    def test_signed_cursor_rejects_garbage(self):
+        """Test malformed signed cursors raise ValueError."""
+        for cursor in ["", "no-signature", "a.b", encode_cursor({"k": [1]})]:
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                decode_signed_cursor(cursor)
+
     def test_calculate_total_pages_exact_division(self):
         """Test calculating total pages with exact division."""
         assert calculate_total_pages(100, 20) == 5
@@ -0,0 +1,399 @@
+"""Tests for delta storage of intervention plan versions."""
+
+import copy
+import random
+from datetime import datetime
+from itertools import count
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.intervention_plan import InterventionVersion
+from app.services.intervention_plan_service import InterventionPlanService, PlanVersionError
+from app.services.plan_versioning import (
+    PLAN_SECTIONS,
+    VERSION_CHECKPOINT_INTERVAL,
+    apply_deltas,
+    changes_from_deltas,
+    diff_snapshots,
+)
+
+
+def make_snapshot(goals=(), **fields) -> dict:
+    """Plan snapshot with the given goals and no other section items."""
+    snapshot = {"title": "Reading plan", "status": "draft", "version": 1, **fields}
+    for section in PLAN_SECTIONS:
+        snapshot.setdefault(section, [])
+    snapshot["goals"] = [copy.deepcopy(goal) for goal in goals]
+    return snapshot
+
+
+def by_id(snapshot: dict) -> dict:
+    """Snapshot with its section items sorted, which have no order."""
+    return {
+        key: sorted(value, key=lambda item: item["id"]) if key in PLAN_SECTIONS else value
+        for key, value in snapshot.items()
+    }
+
+
+def sorted_changes(changes: dict) -> dict:
+    """Changes with their added and removed items sorted by ID."""
+    result = copy.deepcopy(changes)
+    for change in result.values():
+        for key in ("added", "removed", "modified"):
+            if key in change:
+                change[key].sort(key=lambda item: item["id"])
+    return result
+
+
+def random_history(rng: random.Random, versions: int) -> list[dict]:
+    """Snapshots of a plan edited at random between versions."""
+    ids = count()
+    snapshot = make_snapshot(
+        goals=[{"id": f"g{next(ids)}", "title": "Goal", "status": "not_started"}]
+    )
+    history = [snapshot]
+    removed = []
+    for number in range(2, versions + 1):
+        snapshot = copy.deepcopy(snapshot)
+        snapshot["version"] = number
+        for _ in range(rng.randint(0, 4)):
+            section = snapshot[rng.choice(["goals", "needs"])]
+            choice = rng.random()
+            if choice < 0.2:
+                snapshot["title"] = rng.choice(["Reading plan", "Speech plan", "Motor plan"])
+            elif choice < 0.4 and section:
+                removed.append(section.pop(rng.randrange(len(section))))
+            elif choice < 0.5 and removed:
+                # Added again, possibly with other values
+                item = removed.pop(rng.randrange(len(removed)))
+                item["status"] = rng.choice(["not_started", "a", "b"])
+                section.append(item)
+            elif choice < 0.6 or not section:
+                section.append({"id": f"g{next(ids)}", "title": "New", "status": "not_started"})
+            else:
+                item = rng.choice(section)
+                field = rng.choice(["title", "status", "notes"])
+                if field in item and rng.random() < 0.3:
+                    del item[field]
+                else:
+                    item[field] = rng.choice(["a", "b", "c"])
+            rng.shuffle(section)
+        history.append(snapshot)
+    return history
+
+
+def version(number: int, snapshot=None, delta=None, is_checkpoint=None) -> InterventionVersion:
+    """Version record as loaded from the database."""
+    return InterventionVersion(
+        id=uuid4(),
+        plan_id=uuid4(),
+        version_number=number,
+        created_by=uuid4(),
+        change_summary=f"Version {number}",
+        snapshot_data=snapshot,
+        delta_data=delta,
+        is_checkpoint=snapshot is not None if is_checkpoint is None else is_checkpoint,
+        created_at=datetime(2026, 10, number % 28 + 1),
+    )
+
+
+def scalars_result(rows: list) -> MagicMock:
+    """Query result whose scalars are the given rows."""
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    result.scalar_one_or_none.return_value = rows[0] if rows else None
+    return result
+
+
+class TestDiffSnapshots:
+    """Tests for diff_snapshots and apply_deltas."""
+
+    def test_changed_fields_record_their_previous_value(self):
+        delta = diff_snapshots(make_snapshot(), make_snapshot(title="Speech plan"))
+
+        assert delta == [
+            {"op": "test", "path": "/title", "value": "Reading plan"},
+            {"op": "replace", "path": "/title", "value": "Speech plan"},
+        ]
+
+    def test_section_items_are_addressed_by_id(self):
+        goal = {"id": "g1", "title": "Read", "status": "not_started"}
+        old = make_snapshot(goals=[goal, {"id": "g2", "title": "Write"}])
+        new = make_snapshot(
+            goals=[{"id": "g3", "title": "Count"}, {**goal, "status": "achieved"}]
+        )
+
+        delta = diff_snapshots(old, new)
+
+        assert delta == [
+            {"op": "test", "path": "/goals/g1/status", "value": "not_started"},
+            {"op": "replace", "path": "/goals/g1/status", "value": "achieved"},
+            {"op": "test", "path": "/goals/g2", "value": {"id": "g2", "title": "Write"}},
+            {"op": "remove", "path": "/goals/g2"},
+            {"op": "add", "path": "/goals/g3", "value": {"id": "g3", "title": "Count"}},
+        ]
+        assert by_id(apply_deltas(old, [delta])) == by_id(new)
+
+    def test_unchanged_snapshots_have_an_empty_delta(self):
+        goals = [{"id": "g1", "title": "Read"}, {"id": "g2", "title": "Write"}]
+
+        assert diff_snapshots(make_snapshot(goals=goals), make_snapshot(goals=goals[::-1])) == []
+
+    def test_sections_without_ids_are_replaced_whole(self):
+        old = make_snapshot(strengths=[{"description": "Visual learner"}])
+        new = make_snapshot(strengths=[])
+
+        delta = diff_snapshots(old, new)
+
+        assert [op["path"] for op in delta] == ["/strengths", "/strengths"]
+        assert apply_deltas(old, [delta]) == new
+
+    def test_keys_are_escaped(self):
+        old = make_snapshot(goals=[{"id": "a/b~c", "title": "Read"}])
+        new = make_snapshot(goals=[{"id": "a/b~c", "title": "Write"}])
+
+        delta = diff_snapshots(old, new)
+
+        assert delta[1]["path"] == "/goals/a~1b~0c/title"
+        assert apply_deltas(old, [delta]) == new
+
+    def test_history_is_rebuilt_from_deltas(self):
+        history = random_history(random.Random(7), 30)
+        deltas = [diff_snapshots(old, new) for old, new in zip(history, history[1:])]
+        base = copy.deepcopy(history[0])
+
+        for number in range(1, len(history)):
+            assert by_id(apply_deltas(history[0], deltas[:number])) == by_id(history[number])
+        assert history[0] == base
+
+
+class TestChangesFromDeltas:
+    """Tests for changes_from_deltas."""
+
+    def test_changes_match_those_between_snapshots(self):
+        rng = random.Random(11)
+        for _ in range(20):
+            history = random_history(rng, 8)
+            deltas = [diff_snapshots(old, new) for old, new in zip(history, history[1:])]
+            for first in range(len(history)):
+                for last in range(first + 1, len(history)):
+                    direct = diff_snapshots(history[first], history[last])
+                    reverse = diff_snapshots(history[last], history[first])
+
+                    assert sorted_changes(changes_from_deltas(deltas[first:last])) == (
+                        sorted_changes(changes_from_deltas([direct]))
+                    )
+                    assert sorted_changes(
+                        changes_from_deltas(deltas[first:last], reverse=True)
+                    ) == sorted_changes(changes_from_deltas([reverse]))
+
+    def test_reverted_changes_are_not_reported(self):
+        history = [
+            make_snapshot(),
+            make_snapshot(title="Speech plan"),
+            make_snapshot(title="Reading plan", status="active"),
+        ]
+        deltas = [diff_snapshots(old, new) for old, new in zip(history, history[1:])]
+
+        assert changes_from_deltas(deltas) == {"status": {"from": "draft", "to": "active"}}
+
+    def test_removed_items_are_reported_as_they_were_first(self):
+        goal = {"id": "g1", "title": "Read", "status": "not_started"}
+        history = [
+            make_snapshot(goals=[goal]),
+            make_snapshot(goals=[{**goal, "status": "in_progress"}]),
+            make_snapshot(),
+        ]
+        deltas = [diff_snapshots(old, new) for old, new in zip(history, history[1:])]
+
+        assert changes_from_deltas(deltas) == {
+            "goals": {"added": [], "removed": [goal], "modified": []}
+        }
+
+
+    def test_items_removed_and_added_again_report_their_changed_fields(self):
+        goal = {"id": "g1", "title": "Read", "status": "not_started"}
+        history = [
+            make_snapshot(goals=[goal]),
+            make_snapshot(goals=[{**goal, "status": "in_progress"}]),
+            make_snapshot(),
+            make_snapshot(goals=[{"id": "g1", "title": "Read aloud", "status": "not_started"}]),
+        ]
+        deltas = [diff_snapshots(old, new) for old, new in zip(history, history[1:])]
+        direct = diff_snapshots(history[0], history[-1])
+        expected = {
+            "goals": {
+                "added": [],
+                "removed": [],
+                "modified": [
+                    {"id": "g1", "changes": {"title": {"from": "Read", "to": "Read aloud"}}}
+                ],
+            }
+        }
+
+        assert changes_from_deltas(deltas) == expected
+        assert changes_from_deltas([direct]) == expected
+        assert changes_from_deltas(deltas, reverse=True) == changes_from_deltas(
+            [diff_snapshots(history[-1], history[0])]
+        )
+
+
+class TestServiceVersioning:
+    """Tests for how InterventionPlanService stores and reads versions."""
+
+    @pytest.mark.asyncio
+    async def test_first_version_is_a_checkpoint(self):
+        db = AsyncMock()
+        snapshot = make_snapshot()
+
+        created = await InterventionPlanService(db)._new_version(
+            uuid4(), 1, uuid4(), "Initial plan creation", snapshot
+        )
+
+        db.execute.assert_not_awaited()
+        assert created.is_checkpoint is True
+        assert created.snapshot_data == snapshot
+        assert created.delta_data is None
+
+    @pytest.mark.asyncio
+    async def test_later_versions_store_deltas(self):
+        db = AsyncMock()
+        db.execute.return_value = scalars_result([version(1, make_snapshot())])
+
+        created = await InterventionPlanService(db)._new_version(
+            uuid4(), 2, uuid4(), "Retitled", make_snapshot(title="Speech plan")
+        )
+
+        assert created.is_checkpoint is False
+        assert created.snapshot_data is None
+        assert created.delta_data == diff_snapshots(
+            make_snapshot(), make_snapshot(title="Speech plan")
+        )
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_bound_the_deltas_to_apply(self):
+        history = random_history(random.Random(3), VERSION_CHECKPOINT_INTERVAL + 1)
+        chain = [version(1, history[0])] + [
+            version(number + 1, delta=diff_snapshots(old, new))
+            for number, (old, new) in enumerate(zip(history, history[1:-1]), start=1)
+        ]
+        db = AsyncMock()
+        db.execute.return_value = scalars_result(chain)
+
+        created = await InterventionPlanService(db)._new_version(
+            uuid4(), len(history), uuid4(), "Checkpoint", history[-1]
+        )
+
+        assert len(chain) == VERSION_CHECKPOINT_INTERVAL
+        assert created.is_checkpoint is True
+        assert created.snapshot_data == history[-1]
+        assert by_id(apply_deltas(history[-2], [created.delta_data])) == by_id(history[-1])
+
+    @pytest.mark.asyncio
+    async def test_version_without_rebuildable_predecessor_is_a_checkpoint(self):
+        db = AsyncMock()
+        db.execute.return_value = scalars_result(
+            [version(1, make_snapshot()), version(2, is_checkpoint=False)]
+        )
+
+        created = await InterventionPlanService(db)._new_version(
+            uuid4(), 3, uuid4(), "Retitled", make_snapshot(title="Speech plan")
+        )
+
+        assert created.is_checkpoint is True
+        assert created.delta_data is None
+
+    @pytest.mark.asyncio
+    async def test_get_version_rebuilds_delta_versions(self):
+        history = random_history(random.Random(5), 4)
+        chain = [version(1, history[0])] + [
+            version(number, delta=diff_snapshots(old, new))
+            for number, (old, new) in enumerate(zip(history, history[1:]), start=2)
+        ]
+        db = AsyncMock()
+        db.execute.side_effect = [
+            scalars_result([MagicMock()]),
+            scalars_result([chain[-1]]),
+            scalars_result(chain),
+        ]
+
+        result = await InterventionPlanService(db).get_version(uuid4(), 4)
+
+        assert result.version_number == 4
+        assert by_id(result.snapshot_data) == by_id(history[3])
+
+    @pytest.mark.asyncio
+    async def test_compare_versions_uses_deltas(self):
+        history = random_history(random.Random(9), 5)
+        versions = [version(1, history[0])] + [
+            version(number, delta=diff_snapshots(old, new))
+            for number, (old, new) in enumerate(zip(history, history[1:]), start=2)
+        ]
+        db = AsyncMock()
+        db.execute.side_effect = [scalars_result([MagicMock()]), scalars_result(versions[1:])]
+        service = InterventionPlanService(db)
+
+        with patch.object(service, "_rebuild_snapshot") as rebuild:
+            comparison = await service.compare_versions(uuid4(), 5, 2)
+
+        rebuild.assert_not_called()
+        assert db.execute.await_count == 2
+        assert (comparison["version1"], comparison["version2"]) == (5, 2)
+        assert sorted_changes(comparison["changes"]) == sorted_changes(
+            changes_from_deltas([diff_snapshots(history[4], history[1])])
+        )
+
+    @pytest.mark.asyncio
+    async def test_compare_distant_versions_rebuilds_snapshots(self):
+        last = 3 * VERSION_CHECKPOINT_INTERVAL
+        db = AsyncMock()
+        db.execute.side_effect = [
+            scalars_result([MagicMock()]),
+            scalars_result([version(1, make_snapshot()), version(last, delta=[])]),
+        ]
+        service = InterventionPlanService(db)
+        snapshots = {1: make_snapshot(), last: make_snapshot(status="active")}
+
+        with patch.object(
+            service, "_rebuild_snapshot", side_effect=lambda plan_id, number: snapshots[number]
+        ):
+            comparison = await service.compare_versions(uuid4(), 1, last)
+
+        assert comparison["changes"] == {"status": {"from": "draft", "to": "active"}}
+
+    @pytest.mark.asyncio
+    async def test_compare_missing_version(self):
+        db = AsyncMock()
+        db.execute.side_effect = [scalars_result([MagicMock()]), scalars_result([version(1)])]
+
+        with pytest.raises(PlanVersionError, match="Version\\(s\\) 3 not found"):
+            await InterventionPlanService(db).compare_versions(uuid4(), 1, 3)
+
+    @pytest.mark.asyncio
+    async def test_history_leaves_out_snapshots(self):
+        user_id = uuid4()
+        plan = MagicMock(created_by=user_id)
+        row = MagicMock(
+            id=uuid4(),
+            plan_id=uuid4(),
+            version_number=1,
+            created_by=user_id,
+            change_summary="Initial plan creation",
+            created_at=datetime(2026, 10, 18),
+            spec=["id", "plan_id", "version_number", "created_by", "change_summary", "created_at"],
+        )
+        history_result = MagicMock()
+        history_result.all.return_value = [row]
+        db = AsyncMock()
+        db.execute.side_effect = [scalars_result([plan]), history_result]
+        service = InterventionPlanService(db)
+
+        with patch.object(service, "_user_has_plan_access", return_value=True):
+            history = await service.get_plan_history(uuid4(), user_id)
+
+        columns = {column.name for column in db.execute.await_args.args[0].selected_columns}
+        assert "snapshot_data" not in columns and "delta_data" not in columns
+        assert history[0].snapshot_data is None
+        assert history[0].change_summary == "Initial plan creation"
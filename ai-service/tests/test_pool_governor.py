@@ -0,0 +1,319 @@
+"""Tests for the pool governor, database bulkheads and statement timeouts."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.core.bulkheads import (
+    Bulkhead,
+    BulkheadFullError,
+    _after_begin,
+    _statement_timeout,
+    get_bulkhead,
+)
+from app.core.pool_governor import (
+    MIN_SAMPLES,
+    OVERFLOW_STEP,
+    GovernedQueuePool,
+    PoolGovernor,
+    WaitHistogram,
+)
+from app.database import db_bulkhead, db_statement_timeout, get_pool_health
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=GovernedQueuePool,
+        pool_size=1,
+        max_overflow=10,
+        pool_timeout=0.1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+def governor_for(engine, **kwargs) -> PoolGovernor:
+    options = dict(min_overflow=2, max_overflow=12, wait_target=0.05, enabled=True)
+    options.update(kwargs)
+    return PoolGovernor(engine, **options)
+
+
+class TestWaitHistogram:
+    """Tests for WaitHistogram."""
+
+    def test_quantiles_and_export(self):
+        histogram = WaitHistogram()
+        for _ in range(90):
+            histogram.observe(0.0005)
+        for _ in range(10):
+            histogram.observe(0.2)
+        histogram.observe(40.0, timed_out=True)
+
+        exported = histogram.as_dict()
+
+        assert histogram.quantile(0.5) == 0.001
+        assert histogram.quantile(0.95) == 0.25
+        assert exported["count"] == 101
+        assert exported["timeouts"] == 1
+        assert exported["p50_ms"] == 1.0
+        assert exported["buckets"]["0.001"] == 90
+        assert exported["buckets"]["+Inf"] == 101
+
+    def test_since_snapshot(self):
+        histogram = WaitHistogram()
+        histogram.observe(0.2)
+        snapshot = histogram.copy()
+        histogram.observe(0.003, timed_out=True)
+
+        window = histogram.since(snapshot)
+
+        assert window.count == 1
+        assert window.timeouts == 1
+        assert window.quantile(0.95) == 0.005
+
+    def test_empty(self):
+        assert WaitHistogram().quantile(0.95) is None
+        assert WaitHistogram().as_dict()["p95_ms"] is None
+
+
+class TestGovernedQueuePool:
+    """Tests for GovernedQueuePool."""
+
+    @pytest.mark.asyncio
+    async def test_checkouts_are_recorded(self, engine):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        assert engine.pool.wait_times.count == 1
+
+    @pytest.mark.asyncio
+    async def test_timeouts_are_recorded(self, engine):
+        engine.pool.set_max_overflow(0)
+
+        async with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        assert engine.pool.wait_times.timeouts == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_history_survives_dispose(self, engine):
+        async with engine.connect():
+            pass
+        await engine.dispose()
+
+        assert engine.pool.wait_times.count == 1
+
+
+class TestPoolGovernor:
+    """Tests for PoolGovernor."""
+
+    def test_slow_checkouts_grow_overflow(self, engine):
+        governor = governor_for(engine)
+        for _ in range(MIN_SAMPLES):
+            engine.pool.wait_times.observe(0.2)
+
+        assert governor.adjust() == 10 + OVERFLOW_STEP
+        assert engine.pool.max_overflow == 12
+        assert governor.adjustments[-1]["reason"] == "checkout waits above target"
+
+    def test_growth_stops_at_upper_bound(self, engine):
+        governor = governor_for(engine, max_overflow=11)
+        engine.pool.wait_times.observe(0.1, timed_out=True)
+
+        assert governor.adjust() == 11
+        engine.pool.wait_times.observe(0.1, timed_out=True)
+        assert governor.adjust() is None
+
+    def test_few_slow_samples_are_ignored(self, engine):
+        governor = governor_for(engine)
+        engine.pool.peak_overflow = 10
+        engine.pool.wait_times.observe(0.2)
+
+        assert governor.adjust() is None
+
+    def test_unused_overflow_shrinks(self, engine):
+        governor = governor_for(engine)
+        for _ in range(MIN_SAMPLES):
+            engine.pool.wait_times.observe(0.0005)
+
+        assert governor.adjust() == 9
+        assert governor.adjustments[-1]["reason"] == "overflow headroom unused"
+
+    def test_busy_overflow_is_kept(self, engine):
+        governor = governor_for(engine)
+        engine.pool.peak_overflow = 9
+
+        assert governor.adjust() is None
+
+    def test_configured_overflow_is_brought_within_bounds(self, engine):
+        governor = governor_for(engine, min_overflow=2, max_overflow=6)
+        engine.pool.peak_overflow = 10
+
+        assert governor.adjust() == 6
+
+    def test_other_pools_are_left_alone(self):
+        engine = MagicMock()
+        governor = governor_for(engine)
+
+        assert governor.adjust() is None
+        assert governor.state()["max_overflow"] is None
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, engine):
+        governor = governor_for(engine, interval=0.01, min_overflow=12)
+        governor.start()
+        engine.pool.wait_times.observe(0.1, timed_out=True)
+        await asyncio.sleep(0.05)
+        await governor.stop()
+
+        assert engine.pool.max_overflow == 12
+
+
+class TestBulkhead:
+    """Tests for Bulkhead."""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        bulkhead = Bulkhead("reports", limit=2, max_queue=10, queue_timeout=1.0)
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            async with bulkhead.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(work() for _ in range(6)))
+
+        assert peak == 2
+        assert bulkhead.admitted == 6
+        assert bulkhead.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_fails_fast(self):
+        bulkhead = Bulkhead("reports", limit=1, max_queue=0, queue_timeout=1.0)
+
+        async with bulkhead.slot():
+            with pytest.raises(BulkheadFullError) as raised:
+                await bulkhead.acquire()
+
+        assert raised.value.group == "reports"
+        assert bulkhead.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_times_out(self):
+        bulkhead = Bulkhead("reports", limit=1, max_queue=1, queue_timeout=0.01)
+
+        async with bulkhead.slot():
+            with pytest.raises(BulkheadFullError):
+                await bulkhead.acquire()
+
+        assert bulkhead.stats()["waiting"] == 0
+        await bulkhead.acquire()
+        assert bulkhead.in_flight == 1
+
+    def test_limits_come_from_configuration(self):
+        with patch("app.core.bulkheads._bulkheads", {}), patch(
+            "app.core.bulkheads.settings.db_bulkheads", "exports=3:1"
+        ):
+            assert get_bulkhead("exports").stats()["limit"] == 3
+            assert get_bulkhead("exports").max_queue == 1
+            assert get_bulkhead("other").limit == 10
+
+
+class TestStatementTimeout:
+    """Tests for per-route statement timeouts."""
+
+    def test_applied_on_postgresql_only(self):
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+        token = _statement_timeout.set(2.5)
+        try:
+            _after_begin(MagicMock(), MagicMock(), connection)
+            connection.dialect.name = "sqlite"
+            _after_begin(MagicMock(), MagicMock(), connection)
+        finally:
+            _statement_timeout.reset(token)
+
+        connection.exec_driver_sql.assert_called_once_with("SET LOCAL statement_timeout = 2500")
+
+    def test_no_timeout_by_default(self):
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+
+        _after_begin(MagicMock(), MagicMock(), connection)
+
+        connection.exec_driver_sql.assert_not_called()
+
+
+class TestDbBulkhead:
+    """Tests for the db_bulkhead and db_statement_timeout dependencies."""
+
+    @pytest.fixture
+    def app(self):
+        release = asyncio.Event()
+        app = FastAPI()
+
+        with patch("app.core.bulkheads._bulkheads", {}), patch(
+            "app.core.bulkheads.settings.db_bulkheads", "slow=1:0"
+        ):
+            guarded = Depends(db_bulkhead("slow", statement_timeout=5.0))
+
+            @app.get("/slow", dependencies=[guarded])
+            async def slow():
+                await release.wait()
+                return {"timeout": _statement_timeout.get()}
+
+            @app.get(
+                "/fast",
+                dependencies=[guarded, Depends(db_statement_timeout(1.0))],
+            )
+            async def fast():
+                return {"timeout": _statement_timeout.get()}
+
+            app.state.release = release
+            yield app
+
+    @pytest.mark.asyncio
+    async def test_full_group_is_rejected(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            pending = asyncio.create_task(client.get("/slow"))
+            await asyncio.sleep(0.05)
+            rejected = await client.get("/fast")
+            app.state.release.set()
+            admitted = await pending
+            after = await client.get("/fast")
+
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "5"
+        assert admitted.json() == {"timeout": 5.0}
+        assert after.json() == {"timeout": 1.0}
+        assert _statement_timeout.get() is None
+
+
+@pytest.mark.asyncio
+async def test_pool_health_exports_wait_times(engine):
+    async with engine.connect():
+        pass
+
+    with patch("app.database.engine", engine), patch(
+        "app.database.pool_governor", governor_for(engine)
+    ):
+        health = await get_pool_health()
+
+    assert health["wait_times"]["count"] == 1
+    assert health["governor"]["max_overflow"] == 10
+    assert health["max_connections"] == settings.db_pool_size + 10
+    assert "bulkheads" in health
@@ -0,0 +1,219 @@
+"""Tests for per-request SQL instrumentation and N+1 detection."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.context import clear_context, set_correlation_id
+from app.core.query_stats import (
+    QueryStats,
+    _before_cursor_execute,
+    fingerprint,
+    track_queries,
+)
+from app.middleware.correlation import CorrelationHook
+from app.middleware.pipeline import PipelineMiddleware
+from app.middleware.query_stats import QueryStatsHook
+from tests.conftest import test_engine
+
+
+@pytest.fixture(autouse=True)
+def reset_context() -> None:
+    """Reset context before each test."""
+    clear_context()
+
+
+async def select_activities_one_by_one(session: AsyncSession, count: int) -> None:
+    """Run the same statement once per id, the shape of an N+1 pattern."""
+    for index in range(count):
+        await session.execute(
+            text("SELECT id FROM activities WHERE name = :name"), {"name": f"a{index}"}
+        )
+
+
+class TestFingerprint:
+    """Tests for statement fingerprints."""
+
+    def test_parameters_and_literals_are_normalized(self):
+        assert fingerprint("SELECT * FROM t WHERE id = $1") == fingerprint(
+            "SELECT * FROM t WHERE id = $2"
+        )
+        assert fingerprint("SELECT * FROM t WHERE name = 'a' AND n = 1") == (
+            "SELECT * FROM t WHERE name = ? AND n = ?"
+        )
+        assert fingerprint("SELECT * FROM t WHERE id = %(id_1)s") == (
+            "SELECT * FROM t WHERE id = ?"
+        )
+
+    def test_in_lists_collapse(self):
+        assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == fingerprint(
+            "SELECT * FROM t WHERE id IN (?)"
+        )
+
+    def test_casts_are_kept(self):
+        assert fingerprint("SELECT id::text FROM t") == "SELECT id::text FROM t"
+
+
+class TestQueryStats:
+    """Tests for QueryStats."""
+
+    def test_server_timing_and_log_fields(self):
+        stats = QueryStats(correlation_id="corr-1")
+        stats.record("SELECT 1", 0.0125)
+        stats.record("SELECT 2", 0.0025)
+
+        assert stats.server_timing() == 'db;dur=15.0;desc="2 queries"'
+        assert stats.log_fields() == {
+            "correlation_id": "corr-1",
+            "query_count": 2,
+            "db_time_ms": 15.0,
+            "distinct_queries": 1,
+        }
+
+    def test_suspected_n_plus_one_uses_threshold(self):
+        stats = QueryStats()
+        for _ in range(4):
+            stats.record("SELECT * FROM t WHERE id = 1", 0.001)
+
+        assert stats.suspected_n_plus_one(threshold=5) == {}
+        assert stats.suspected_n_plus_one(threshold=4) == {
+            "SELECT * FROM t WHERE id = ?": 4
+        }
+
+
+class TestTrackQueries:
+    """Tests for engine instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_queries_are_counted_and_timed(self, db_session):
+        with track_queries() as stats:
+            await select_activities_one_by_one(db_session, 3)
+
+        assert stats.count == 3
+        assert stats.total_time > 0
+        assert stats.fingerprints == {
+            "SELECT id FROM activities WHERE name = ?": 3
+        }
+
+    @pytest.mark.asyncio
+    async def test_queries_outside_tracker_are_ignored(self, db_session):
+        await db_session.execute(text("SELECT 1"))
+
+        with track_queries() as stats:
+            pass
+
+        assert stats.count == 0
+
+    @pytest.mark.asyncio
+    async def test_nested_trackers_both_record(self, db_session):
+        with track_queries() as outer:
+            await db_session.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                await db_session.execute(text("SELECT 2"))
+
+        assert outer.count == 2
+        assert inner.count == 1
+
+    def test_stats_bound_to_correlation_id(self):
+        set_correlation_id("corr-42")
+
+        with track_queries() as stats:
+            pass
+
+        assert stats.correlation_id == "corr-42"
+
+
+class TestQueryStatsHook:
+    """Tests for the per-request pipeline hook."""
+
+    @pytest.fixture
+    def app(self, db_session):
+        app = FastAPI()
+        app.add_middleware(
+            PipelineMiddleware, hooks=[CorrelationHook(), QueryStatsHook(n_plus_one_threshold=3)]
+        )
+
+        @app.get("/batched")
+        async def batched():
+            await db_session.execute(text("SELECT id FROM activities"))
+            return {"ok": True}
+
+        @app.get("/n-plus-one")
+        async def n_plus_one():
+            await select_activities_one_by_one(db_session, 3)
+            return {"ok": True}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_server_timing_header(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/batched")
+
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert response.headers["Server-Timing"].endswith('desc="1 queries"')
+
+    @pytest.mark.asyncio
+    async def test_n_plus_one_logged_with_correlation_id(self, app):
+        with patch("app.middleware.query_stats.logger") as logger:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                await client.get("/n-plus-one", headers={"X-Correlation-ID": "corr-7"})
+
+        logger.info.assert_called_once()
+        assert logger.info.call_args.kwargs["query_count"] == 3
+        logger.warning.assert_called_once()
+        warning = logger.warning.call_args.kwargs
+        assert warning["correlation_id"] == "corr-7"
+        assert warning["repeated_statements"] == {
+            "SELECT id FROM activities WHERE name = ?": 3
+        }
+
+    @pytest.mark.asyncio
+    async def test_requests_are_tracked_separately(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/n-plus-one")
+            response = await client.get("/batched")
+
+        assert response.headers["Server-Timing"].endswith('desc="1 queries"')
+
+
+class TestQueryBudgetFixture:
+    """Tests for the query_budget fixture."""
+
+    @pytest.mark.asyncio
+    async def test_within_budget(self, db_session, query_budget):
+        with query_budget(max_queries=2) as stats:
+            await db_session.execute(text("SELECT id FROM activities"))
+
+        assert stats.count == 1
+
+    @pytest.mark.asyncio
+    async def test_over_budget_fails(self, db_session, query_budget):
+        with pytest.raises(AssertionError, match="at most 1 queries, 2 were executed"):
+            with query_budget(max_queries=1):
+                await db_session.execute(text("SELECT 1"))
+                await db_session.execute(text("SELECT 2"))
+
+    @pytest.mark.asyncio
+    async def test_n_plus_one_fails(self, db_session, query_budget):
+        with pytest.raises(AssertionError, match="Suspected N\\+1"):
+            with query_budget(max_queries=10, n_plus_one_threshold=3):
+                await select_activities_one_by_one(db_session, 3)
+
+    @pytest.mark.asyncio
+    async def test_n_plus_one_check_can_be_disabled(self, db_session, query_budget):
+        with query_budget(max_queries=10, n_plus_one_threshold=None) as stats:
+            await select_activities_one_by_one(db_session, 6)
+
+        assert stats.count == 6
+
+
+def test_test_engine_is_instrumented():
+    """Test that the shared test engine records queries."""
+    assert event.contains(test_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
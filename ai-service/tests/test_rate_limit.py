@@ -1,18 +1,41 @@
 """Tests for rate limiting middleware."""
 
+from unittest.mock import AsyncMock, patch
+
 import pytest
 from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
 
+from app.auth.jwt import create_token, get_bearer_token_payload
+from app.config import settings
+from app.core.rate_limiter import RateLimiter
 from app.main import app
 from app.middleware.rate_limit import (
+    RateLimitMiddleware,
     get_auth_limit,
     get_general_limit,
     get_rate_limit_key,
+    get_rate_limit_policies,
+    get_route_cost,
     limiter,
 )
 
 
+def make_request(path: str, authorization: str = "") -> Request:
+    """Build a request to a path from a local client."""
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+        }
+    )
+
+
 class TestRateLimitConfiguration:
     """Test rate limit configuration and helper functions."""
 
@@ -231,3 +254,103 @@ class TestRateLimitIntegration:
 
         # In-memory storage is configured in rate_limit.py
         # This is suitable for development but should use Redis in production
+
+
+class TestDistributedRateLimitMiddleware:
+    """Test the distributed per-IP, per-user and per-org middleware."""
+
+    @pytest.fixture
+    def limited_client(self):
+        """Client for an app limited by a local-only rate limiter."""
+        test_app = FastAPI()
+        test_app.add_middleware(RateLimitMiddleware)
+
+        @test_app.get("/api/v1/items")
+        async def list_items():
+            return {"items": []}
+
+        @test_app.post("/api/v1/coaching/guidance")
+        async def guidance():
+            return {"guidance": "ok"}
+
+        @test_app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        rate_limiter = RateLimiter(lease_max=1, lease_ttl=60)
+        with patch.object(settings, "rate_limit_enabled", True), patch.object(
+            settings, "rate_limit_general", 10
+        ), patch(
+            "app.middleware.rate_limit.get_rate_limiter", return_value=rate_limiter
+        ), patch(
+            "app.core.rate_limiter.get_redis_client",
+            AsyncMock(side_effect=ConnectionError("Redis unavailable")),
+        ):
+            yield TestClient(test_app)
+
+    def test_route_costs(self):
+        """Test that LLM-backed routes cost more than plain routes."""
+        assert get_route_cost("/api/v1/coaching/guidance") == 5
+        assert get_route_cost("/api/v1/activities/recommendations/abc") == 3
+        assert get_route_cost("/api/v1/activities") == 1
+
+    def test_policies_for_anonymous_request(self):
+        """Test that anonymous requests are limited by IP only."""
+        policies = get_rate_limit_policies(make_request("/api/v1/activities"))
+
+        assert [policy.scope for policy in policies] == ["ip"]
+        assert policies[0].limit == settings.rate_limit_general
+
+    def test_policies_for_authenticated_request(self):
+        """Test that authenticated requests are limited per user and org."""
+        token = create_token("user-1", additional_claims={"organization_id": "org-1"})
+
+        policies = get_rate_limit_policies(
+            make_request("/api/v1/activities", f"Bearer {token}")
+        )
+
+        assert [policy.scope for policy in policies] == ["ip", "user", "org"]
+        assert policies[1].identifier == "user-1"
+        assert policies[2].identifier == "org-1"
+
+    def test_invalid_token_is_limited_by_ip_only(self):
+        """Test that forged tokens do not create extra buckets."""
+        request = make_request("/api/v1/activities", "Bearer not-a-token")
+
+        assert [p.scope for p in get_rate_limit_policies(request)] == ["ip"]
+
+    def test_token_is_decoded_once_per_request(self):
+        """Test that the decoded token is shared through the request state."""
+        token = create_token("user-1")
+        request = make_request("/api/v1/activities", f"Bearer {token}")
+
+        with patch(
+            "app.auth.jwt.get_bearer_token_payload", wraps=get_bearer_token_payload
+        ) as decode:
+            get_rate_limit_policies(request)
+            get_rate_limit_policies(request)
+
+        decode.assert_called_once()
+        assert request.scope["state"]["token_payload"]["sub"] == "user-1"
+
+    def test_returns_429_with_retry_after(self, limited_client):
+        """Test that requests over the limit are rejected with Retry-After."""
+        responses = [limited_client.get("/api/v1/items") for _ in range(11)]
+
+        assert all(r.status_code == 200 for r in responses[:10])
+        assert responses[10].status_code == 429
+        assert int(responses[10].headers["Retry-After"]) >= 1
+        assert responses[0].headers["X-RateLimit-Limit"] == "10"
+
+    def test_llm_routes_consume_more_tokens(self, limited_client):
+        """Test that weighted routes exhaust the limit sooner."""
+        responses = [
+            limited_client.post("/api/v1/coaching/guidance") for _ in range(3)
+        ]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+
+    def test_health_checks_are_exempt(self, limited_client):
+        """Test that health probes are never rate limited."""
+        for _ in range(20):
+            assert limited_client.get("/health").status_code == 200
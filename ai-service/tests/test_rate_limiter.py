@@ -0,0 +1,169 @@
+"""Tests for the distributed GCRA rate limiter."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.rate_limiter import LocalGCRA, RateLimiter, RateLimitPolicy
+
+
+class FakeScript:
+    """Lease script stand-in sharing buckets between limiter instances."""
+
+    def __init__(self) -> None:
+        self.buckets = LocalGCRA()
+        self.calls = 0
+
+    async def __call__(self, keys, args):
+        self.calls += 1
+        wanted, minimum = args[0], args[1]
+        policies = [
+            SimpleNamespace(key=key, interval_ms=args[2 + i * 2], tolerance_ms=args[3 + i * 2])
+            for i, key in enumerate(keys)
+        ]
+        granted, retry_after, limiting, remaining = self.buckets.acquire(
+            policies, wanted, minimum, now_ms=0
+        )
+        return [granted, retry_after, limiting + 1, remaining]
+
+
+class FakeRedis:
+    """Redis client stand-in returning a shared FakeScript."""
+
+    def __init__(self, script: FakeScript) -> None:
+        self.script = script
+
+    def register_script(self, source):
+        return self.script
+
+
+def ip_policy(limit: int = 10) -> RateLimitPolicy:
+    return RateLimitPolicy(scope="ip", identifier="general:1.2.3.4", limit=limit)
+
+
+def user_policy(limit: int = 10) -> RateLimitPolicy:
+    return RateLimitPolicy(scope="user", identifier="user-1", limit=limit)
+
+
+class TestLocalGCRA:
+    """Tests for the in-process GCRA buckets."""
+
+    def test_allows_full_bucket_then_denies(self):
+        buckets = LocalGCRA()
+
+        results = [buckets.acquire([ip_policy(3)], 1, 1, now_ms=0) for _ in range(4)]
+
+        assert [granted for granted, *_ in results] == [1, 1, 1, 0]
+        # One token replenishes every 20 seconds
+        assert results[-1][1] == pytest.approx(20000)
+
+    def test_replenishes_over_time(self):
+        buckets = LocalGCRA()
+        for _ in range(3):
+            buckets.acquire([ip_policy(3)], 1, 1, now_ms=0)
+
+        granted, *_ = buckets.acquire([ip_policy(3)], 1, 1, now_ms=20000)
+
+        assert granted == 1
+
+    def test_grants_batch_up_to_available_tokens(self):
+        buckets = LocalGCRA()
+
+        granted, _, _, remaining = buckets.acquire([ip_policy(10)], 4, 1, now_ms=0)
+
+        assert granted == 4
+        assert remaining == 6
+
+    def test_denied_request_consumes_no_bucket(self):
+        buckets = LocalGCRA()
+        buckets.acquire([user_policy(1)], 1, 1, now_ms=0)
+
+        granted, _, limiting, _ = buckets.acquire(
+            [ip_policy(10), user_policy(1)], 1, 1, now_ms=0
+        )
+
+        assert granted == 0
+        assert limiting == 1
+        # The IP bucket was left untouched by the denied request
+        assert buckets.acquire([ip_policy(10)], 10, 1, now_ms=0)[0] == 10
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter leasing and fallback behavior."""
+
+    @pytest.mark.asyncio
+    async def test_weighted_cost_consumes_multiple_tokens(self):
+        script = FakeScript()
+        limiter = RateLimiter(lease_max=1, lease_ttl=60)
+
+        with patch(
+            "app.core.rate_limiter.get_redis_client",
+            AsyncMock(return_value=FakeRedis(script)),
+        ):
+            first = await limiter.check([ip_policy(10)], cost=5)
+            second = await limiter.check([ip_policy(10)], cost=5)
+            third = await limiter.check([ip_policy(10)], cost=5)
+
+        assert first.allowed and second.allowed
+        assert not third.allowed
+        assert third.retry_after > 0
+        assert third.scope == "ip"
+
+    @pytest.mark.asyncio
+    async def test_workers_share_limits_through_redis(self):
+        script = FakeScript()
+        workers = [RateLimiter(lease_max=5, lease_ttl=60) for _ in range(3)]
+
+        with patch(
+            "app.core.rate_limiter.get_redis_client",
+            AsyncMock(return_value=FakeRedis(script)),
+        ):
+            allowed = 0
+            for _ in range(20):
+                for worker in workers:
+                    decision = await worker.check([ip_policy(30)])
+                    allowed += decision.allowed
+
+        # Leasing never admits more than the shared limit
+        assert allowed <= 30
+
+    @pytest.mark.asyncio
+    async def test_busy_client_is_served_from_local_lease(self):
+        script = FakeScript()
+        limiter = RateLimiter(lease_max=20, lease_ttl=60)
+
+        with patch(
+            "app.core.rate_limiter.get_redis_client",
+            AsyncMock(return_value=FakeRedis(script)),
+        ):
+            for _ in range(50):
+                assert (await limiter.check([ip_policy(200)])).allowed
+
+        assert script.calls < 50
+
+    @pytest.mark.asyncio
+    async def test_strict_limits_are_not_leased(self):
+        script = FakeScript()
+        limiter = RateLimiter(lease_max=20, lease_ttl=60)
+
+        with patch(
+            "app.core.rate_limiter.get_redis_client",
+            AsyncMock(return_value=FakeRedis(script)),
+        ):
+            for _ in range(5):
+                await limiter.check([ip_policy(5)])
+
+        assert script.calls == 5
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_buckets_without_redis(self):
+        limiter = RateLimiter(lease_max=1, lease_ttl=60)
+        get_client = AsyncMock(side_effect=ConnectionError("Redis unavailable"))
+
+        with patch("app.core.rate_limiter.get_redis_client", get_client):
+            decisions = [await limiter.check([ip_policy(2)]) for _ in range(3)]
+
+        assert [d.allowed for d in decisions] == [True, True, False]
+        # Redis is not retried on every request after a failure
+        assert get_client.await_count == 1
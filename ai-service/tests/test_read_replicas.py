@@ -0,0 +1,263 @@
+"""Tests for read-replica routing and read-your-writes stickiness."""
+
+from typing import Set
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import StaticPool, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.auth.jwt import create_token
+from app.core.read_replicas import STICKY_KEY_PREFIX, ReplicaRouter
+from app.database import get_db, get_read_db
+from app.middleware.pipeline import PipelineMiddleware
+from app.middleware.read_replicas import ReadYourWritesHook
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands the router uses."""
+
+    def __init__(self) -> None:
+        self.keys: Set[str] = set()
+
+    async def set(self, key: str, value: str, px: int) -> None:
+        self.keys.add(key)
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.keys)
+
+
+def make_engine():
+    """Create an in-memory SQLite engine standing in for a replica."""
+    return create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch(
+        "app.core.read_replicas.get_redis_client", AsyncMock(return_value=redis)
+    ):
+        yield redis
+
+
+@pytest.fixture
+async def router():
+    engines = [make_engine(), make_engine()]
+    router = ReplicaRouter(engines, max_lag=5.0, sticky_window=10.0, check_interval=1.0)
+    yield router
+    await router.stop()
+    for engine in engines:
+        await engine.dispose()
+
+
+class TestReplicaRouter:
+    """Tests for ReplicaRouter."""
+
+    @pytest.mark.asyncio
+    async def test_no_replicas_uses_primary(self):
+        router = ReplicaRouter()
+
+        assert not router.enabled
+        assert await router.choose("user-1") is None
+
+    @pytest.mark.asyncio
+    async def test_round_robin(self, router, fake_redis):
+        chosen = [(await router.choose("user-1")).name for _ in range(4)]
+
+        assert chosen == ["replica-1", "replica-2", "replica-1", "replica-2"]
+
+    @pytest.mark.asyncio
+    async def test_lagging_and_unhealthy_replicas_are_skipped(self, router, fake_redis):
+        router.replicas[0].lag = 30.0
+
+        assert {(await router.choose()).name for _ in range(3)} == {"replica-2"}
+
+        router.replicas[1].healthy = False
+
+        assert await router.choose() is None
+
+    @pytest.mark.asyncio
+    async def test_writer_sticks_to_primary(self, router, fake_redis):
+        await router.mark_write("user-1")
+
+        assert await router.choose("user-1") is None
+        assert await router.choose("user-2") is not None
+        assert f"{STICKY_KEY_PREFIX}:user-1" in fake_redis.keys
+
+    @pytest.mark.asyncio
+    async def test_write_on_other_worker_is_seen_through_redis(self, router, fake_redis):
+        fake_redis.keys.add(f"{STICKY_KEY_PREFIX}:user-1")
+
+        assert await router.choose("user-1") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_primary(self, router):
+        with patch(
+            "app.core.read_replicas.get_redis_client",
+            AsyncMock(side_effect=ConnectionError("down")),
+        ):
+            assert await router.choose("user-1") is None
+            assert await router.choose() is not None
+
+    @pytest.mark.asyncio
+    async def test_check_replicas_marks_failures(self, router):
+        await router.check_replicas()
+        assert all(replica.healthy for replica in router.replicas)
+        assert all(replica.checked_at > 0 for replica in router.replicas)
+
+        broken = MagicMock()
+        broken.connect.side_effect = OSError("connection refused")
+        router.replicas[0].engine = broken
+        await router.check_replicas()
+
+        assert [replica.healthy for replica in router.replicas] == [False, True]
+
+    def test_pool_health(self, router):
+        router.replicas[1].lag = 12.0
+
+        health = router.pool_health()
+
+        assert [entry["name"] for entry in health] == ["replica-1", "replica-2"]
+        assert [entry["serving_reads"] for entry in health] == [True, False]
+        assert health[1]["lag_seconds"] == 12.0
+
+
+class TestGetReadDb:
+    """Tests for the get_read_db dependency."""
+
+    @pytest.fixture
+    def app(self, router, fake_redis):
+        primary = make_engine()
+        app = FastAPI()
+
+        async def primary_session():
+            async with AsyncSession(primary) as session:
+                yield session
+
+        async def which_database(db: AsyncSession = Depends(get_read_db)):
+            return {"primary": db.bind is primary}
+
+        app.dependency_overrides[get_db] = primary_session
+        app.add_api_route("/read", which_database, methods=["GET", "POST"])
+        app.add_middleware(PipelineMiddleware, hooks=[ReadYourWritesHook(router)])
+
+        with patch("app.database.replica_router", router):
+            yield app
+
+    @pytest.mark.asyncio
+    async def test_get_uses_replica(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/read")
+
+        assert response.json() == {"primary": False}
+
+    @pytest.mark.asyncio
+    async def test_unsafe_method_uses_primary(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/read")
+
+        assert response.json() == {"primary": True}
+
+    @pytest.mark.asyncio
+    async def test_reads_after_write_use_primary(self, app):
+        headers = {"Authorization": f"Bearer {create_token('user-1')}"}
+        other = {"Authorization": f"Bearer {create_token('user-2')}"}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/read", headers=headers)).json() == {"primary": False}
+            await client.post("/read", headers=headers)
+            assert (await client.get("/read", headers=headers)).json() == {"primary": True}
+            assert (await client.get("/read", headers=other)).json() == {"primary": False}
+
+
+class TestReadYourWritesHook:
+    """Tests for ReadYourWritesHook."""
+
+    @pytest.fixture
+    def router(self):
+        router = MagicMock(spec=ReplicaRouter)
+        router.enabled = True
+        return router
+
+    @pytest.fixture
+    def app(self, router):
+        app = FastAPI()
+        app.add_middleware(PipelineMiddleware, hooks=[ReadYourWritesHook(router)])
+
+        @app.post("/ok")
+        async def ok():
+            return {"ok": True}
+
+        @app.post("/rejected", status_code=422)
+        async def rejected():
+            return {"ok": False}
+
+        @app.get("/ok")
+        async def read():
+            return {"ok": True}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_successful_write_is_marked(self, app, router):
+        headers = {"Authorization": f"Bearer {create_token('user-1')}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/ok", headers=headers)
+
+        router.mark_write.assert_awaited_once_with("user-1")
+
+    @pytest.mark.asyncio
+    async def test_failed_write_and_reads_are_not_marked(self, app, router):
+        headers = {"Authorization": f"Bearer {create_token('user-1')}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/rejected", headers=headers)
+            await client.get("/ok", headers=headers)
+            await client.post("/ok")
+
+        router.mark_write.assert_not_called()
+
+
+class TestWriteStickinessAcrossWorkers:
+    """Tests that other workers can see a write as soon as it is answered."""
+
+    @pytest.mark.asyncio
+    async def test_write_is_shared_before_response_is_sent(self, router, fake_redis):
+        app = FastAPI()
+        app.add_middleware(PipelineMiddleware, hooks=[ReadYourWritesHook(router)])
+
+        @app.post("/ok")
+        async def ok():
+            return {"ok": True}
+
+        shared_at_start = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                shared_at_start.append(f"{STICKY_KEY_PREFIX}:user-1" in fake_redis.keys)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        token = create_token("user-1")
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/ok",
+            "raw_path": b"/ok",
+            "root_path": "",
+            "scheme": "http",
+            "query_string": b"",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("test", 80),
+        }
+        await app(scope, receive, send)
+
+        assert shared_at_start == [True]
@@ -0,0 +1,300 @@
+"""Tests for the shared response cache middleware."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.auth.jwt import create_token
+from app.middleware.response_cache import (
+    ResponseCacheMiddleware,
+    cache_response,
+    compute_etag,
+    etag_matches,
+    token_revoked,
+)
+
+
+class FakeHashPipeline:
+    """Pipeline stand-in for FakeHashRedis."""
+
+    def __init__(self, redis: "FakeHashRedis") -> None:
+        self.redis = redis
+        self.ops = []
+
+    def hset(self, key, mapping):
+        self.ops.append(("hset", key, mapping))
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key, ttl))
+
+    async def execute(self):
+        for op, key, value in self.ops:
+            if op == "hset":
+                self.redis.hashes.setdefault(key, {}).update(value)
+            else:
+                self.redis.ttls[key] = value
+        return [True] * len(self.ops)
+
+
+class FakeHashRedis:
+    """Minimal async Redis supporting the hash commands used by the cache."""
+
+    def __init__(self) -> None:
+        self.hashes = {}
+        self.ttls = {}
+        self.hgetall_calls = 0
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        self.hgetall_calls += 1
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return FakeHashPipeline(self)
+
+
+def auth_header(subject: str, role: str = "director") -> dict:
+    """Build an Authorization header for a test user."""
+    return {"Authorization": f"Bearer {create_token(subject, additional_claims={'role': role})}"}
+
+
+@pytest.fixture
+def redis():
+    """Fake Redis shared by the middleware under test."""
+    return FakeHashRedis()
+
+
+@pytest.fixture
+def calls():
+    """Number of times each endpoint ran."""
+    return {"summary": 0, "dashboard": 0, "plain": 0}
+
+
+@pytest.fixture
+def client(redis, calls):
+    """Client for an app with cached and uncached routes."""
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+
+    @app.get("/children/{child_id}/summary")
+    @cache_response(
+        key_prefix="portfolio_summary",
+        ttl=30,
+        tags=lambda params: [f"portfolio:{params['child_id']}"],
+    )
+    async def summary(child_id: str):
+        calls["summary"] += 1
+        if child_id == "missing":
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"child_id": child_id, "items": [1, 2, 3]}
+
+    @app.get("/dashboard")
+    @cache_response(key_prefix="analytics_dashboard", ttl=15, vary="role")
+    async def dashboard():
+        calls["dashboard"] += 1
+        return {"kpis": []}
+
+    @app.get("/plain")
+    async def plain():
+        calls["plain"] += 1
+        return {"ok": True}
+
+    tag_keys = AsyncMock()
+    token_revoked = AsyncMock(return_value=False)
+    with patch(
+        "app.middleware.response_cache.get_redis_client", AsyncMock(return_value=redis)
+    ), patch("app.middleware.response_cache.tag_keys", tag_keys), patch(
+        "app.middleware.response_cache.token_revoked", token_revoked
+    ):
+        test_client = TestClient(app)
+        test_client.tag_keys = tag_keys
+        test_client.token_revoked = token_revoked
+        yield test_client
+
+
+class TestETags:
+    """Tests for ETag helpers."""
+
+    def test_etag_is_strong_content_hash(self):
+        assert compute_etag(b'{"a":1}') == compute_etag(b'{"a":1}')
+        assert compute_etag(b'{"a":1}') != compute_etag(b'{"a":2}')
+        assert not compute_etag(b"{}").startswith("W/")
+
+    def test_etag_matches_lists_weak_and_wildcard(self):
+        etag = compute_etag(b"{}")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+
+
+class TestResponseCacheMiddleware:
+    """Tests for ResponseCacheMiddleware."""
+
+    def test_second_request_is_served_from_cache(self, client, calls):
+        headers = auth_header("user-1")
+
+        first = client.get("/children/c1/summary", headers=headers)
+        second = client.get("/children/c1/summary", headers=headers)
+
+        assert calls["summary"] == 1
+        assert first.json() == second.json() == {"child_id": "c1", "items": [1, 2, 3]}
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert first.headers["ETag"] == second.headers["ETag"]
+        assert second.headers["Cache-Control"] == "private, no-cache"
+
+    def test_matching_if_none_match_returns_304_without_body(self, client, calls, redis):
+        headers = auth_header("user-1")
+        etag = client.get("/children/c1/summary", headers=headers).headers["ETag"]
+        redis.hgetall_calls = 0
+
+        response = client.get(
+            "/children/c1/summary", headers={**headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert calls["summary"] == 1
+        # Only the ETag was read from Redis
+        assert redis.hgetall_calls == 0
+
+    def test_stale_if_none_match_returns_body(self, client):
+        headers = {**auth_header("user-1"), "If-None-Match": '"stale"'}
+        client.get("/children/c1/summary", headers=auth_header("user-1"))
+
+        response = client.get("/children/c1/summary", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["child_id"] == "c1"
+
+    def test_entries_vary_by_user(self, client, calls):
+        client.get("/children/c1/summary", headers=auth_header("user-1"))
+        client.get("/children/c1/summary", headers=auth_header("user-2"))
+
+        assert calls["summary"] == 2
+
+    def test_entries_shared_by_role(self, client, calls):
+        client.get("/dashboard", headers=auth_header("user-1", role="director"))
+        client.get("/dashboard", headers=auth_header("user-2", role="director"))
+        client.get("/dashboard", headers=auth_header("user-3", role="educator"))
+
+        assert calls["dashboard"] == 2
+
+    def test_revoked_token_is_not_served_from_cache(self, client, calls):
+        headers = auth_header("user-1")
+        etag = client.get("/children/c1/summary", headers=headers).headers["ETag"]
+        client.token_revoked.return_value = True
+
+        response = client.get("/children/c1/summary", headers=headers)
+        revalidated = client.get(
+            "/children/c1/summary", headers={**headers, "If-None-Match": etag}
+        )
+
+        # Both requests reached the route, whose authentication rejects them
+        assert calls["summary"] == 3
+        assert "X-Cache" not in response.headers
+        assert revalidated.status_code == 200
+        client.token_revoked.assert_awaited_with(headers["Authorization"].split()[1])
+
+    def test_blacklist_is_only_checked_on_hits(self, client):
+        client.get("/children/c1/summary", headers=auth_header("user-1"))
+
+        client.token_revoked.assert_not_awaited()
+
+    def test_entries_use_existing_cache_prefix(self, client, redis):
+        client.get("/dashboard", headers=auth_header("user-1"))
+
+        [key] = redis.hashes
+        assert key.startswith("analytics_dashboard:response:")
+        assert redis.ttls[key] == 15
+
+    def test_entries_are_tagged(self, client):
+        client.get("/children/c1/summary", headers=auth_header("user-1"))
+
+        cache_key, tags, ttl = client.tag_keys.await_args.args
+        assert tags == ["portfolio:c1"]
+        assert ttl == 30
+
+    def test_anonymous_requests_are_not_cached(self, client, calls, redis):
+        response = client.get("/children/c1/summary")
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert redis.hashes == {}
+
+    def test_error_responses_are_not_cached(self, client, calls, redis):
+        client.get("/children/missing/summary", headers=auth_header("user-1"))
+        client.get("/children/missing/summary", headers=auth_header("user-1"))
+
+        assert calls["summary"] == 2
+        assert redis.hashes == {}
+
+    def test_routes_without_policy_pass_through(self, client, calls, redis):
+        response = client.get("/plain", headers=auth_header("user-1"))
+
+        assert response.json() == {"ok": True}
+        assert "X-Cache" not in response.headers
+        assert redis.hashes == {}
+
+    def test_no_cache_request_bypasses_cached_body(self, client, calls):
+        headers = auth_header("user-1")
+        client.get("/children/c1/summary", headers=headers)
+
+        response = client.get(
+            "/children/c1/summary", headers={**headers, "Cache-Control": "no-cache"}
+        )
+
+        assert response.status_code == 200
+        assert calls["summary"] == 2
+
+    def test_redis_failure_falls_back_to_route(self, calls):
+        app = FastAPI()
+        app.add_middleware(ResponseCacheMiddleware)
+
+        @app.get("/dashboard")
+        @cache_response(key_prefix="analytics_dashboard")
+        async def dashboard():
+            calls["dashboard"] += 1
+            return {"kpis": []}
+
+        with patch(
+            "app.middleware.response_cache.get_redis_client",
+            AsyncMock(side_effect=ConnectionError("Redis unavailable")),
+        ), patch(
+            "app.middleware.response_cache.token_revoked", AsyncMock(return_value=False)
+        ):
+            client = TestClient(app)
+            responses = [
+                client.get("/dashboard", headers=auth_header("user-1")) for _ in range(2)
+            ]
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert calls["dashboard"] == 2
+
+
+class TestTokenRevoked:
+    """Tests for the blacklist check made before serving cached bodies."""
+
+    async def test_blacklisted_token_is_revoked(self):
+        with patch(
+            "app.middleware.response_cache.AsyncSessionLocal", MagicMock()
+        ), patch(
+            "app.middleware.response_cache.is_token_blacklisted",
+            AsyncMock(return_value=True),
+        ):
+            assert await token_revoked("token") is True
+
+    async def test_failed_check_counts_as_revoked(self):
+        with patch(
+            "app.middleware.response_cache.AsyncSessionLocal",
+            MagicMock(side_effect=ConnectionError("Database unavailable")),
+        ):
+            assert await token_revoked("token") is True
@@ -0,0 +1,209 @@
+"""Tests for the local read-through cache of S3 objects."""
+
+import io
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.storage import StorageBackend
+from app.services.s3_backend import S3Backend, S3BackendError, S3ObjectStream
+from app.services.s3_cache import S3ObjectCache
+from app.services.storage_service import S3StorageError, StorageService
+
+CHECKSUM = "cd" * 32
+
+
+def age(cache, storage_path, checksum=None, seconds=600):
+    """Make a cached object look last used ``seconds`` ago."""
+    path = cache.directory / cache.key(storage_path, checksum)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+class TestS3ObjectCache:
+    """Tests for S3ObjectCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return S3ObjectCache(str(tmp_path / "cache"), max_bytes=1000, max_object_bytes=400)
+
+    @pytest.mark.asyncio
+    async def test_read_through(self, cache):
+        assert await cache.get("owner/a.jpg", CHECKSUM) is None
+
+        await cache.put("owner/a.jpg", CHECKSUM, b"a" * 100)
+
+        assert await cache.get("owner/a.jpg", CHECKSUM) == b"a" * 100
+        # Keyed by content too: another checksum is another object
+        assert await cache.get("owner/a.jpg", "ef" * 32) is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate_percent"]) == (1, 2, 33.33)
+        assert (stats["entries"], stats["size_bytes"]) == (1, 100)
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_are_evicted_by_bytes(self, cache):
+        for number in range(3):
+            await cache.put(f"owner/{number}.jpg", None, b"x" * 300)
+            age(cache, f"owner/{number}.jpg", seconds=600 - number)
+        # Reading the oldest makes it the most recently used
+        assert await cache.get("owner/0.jpg") is not None
+
+        await cache.put("owner/3.jpg", None, b"x" * 300)
+
+        assert await cache.get("owner/1.jpg") is None
+        for number in (0, 2, 3):
+            assert await cache.get(f"owner/{number}.jpg") is not None
+        assert cache.stats()["size_bytes"] == 900
+        assert cache.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_large_objects_are_not_cached(self, cache):
+        await cache.put("owner/big.pdf", None, b"x" * 401)
+
+        assert await cache.get("owner/big.pdf") is None
+        assert not [path for path in cache.directory.rglob("*") if path.is_file()]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_every_version(self, cache):
+        await cache.put("owner/a.jpg", CHECKSUM, b"a")
+        await cache.put("owner/a.jpg", None, b"a")
+        await cache.put("owner/b.jpg", None, b"b")
+
+        await cache.invalidate("owner/a.jpg")
+
+        assert await cache.get("owner/a.jpg", CHECKSUM) is None
+        assert await cache.get("owner/a.jpg") is None
+        assert await cache.get("owner/b.jpg") == b"b"
+        assert cache.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tee_caches_only_complete_streams(self, cache):
+        async def chunks():
+            for _ in range(3):
+                yield b"x" * 10
+
+        partial = cache.tee(chunks(), "owner/partial.bin")
+        assert await partial.__anext__() == b"x" * 10
+        await partial.aclose()
+        full = [chunk async for chunk in cache.tee(chunks(), "owner/full.bin")]
+        assert b"".join(full) == b"x" * 30
+
+        assert await cache.get("owner/partial.bin") is None
+        assert await cache.get("owner/full.bin") == b"x" * 30
+        assert not [path for path in cache.directory.rglob(".*.tmp")]
+
+    @pytest.mark.asyncio
+    async def test_workers_share_the_directory(self, tmp_path):
+        directory = str(tmp_path / "cache")
+        first = S3ObjectCache(directory, max_bytes=1000, max_object_bytes=400)
+        second = S3ObjectCache(directory, max_bytes=1000, max_object_bytes=400)
+
+        await first.put("owner/a.jpg", None, b"a" * 400)
+        age(first, "owner/a.jpg")
+        assert await second.get("owner/a.jpg") == b"a" * 400
+
+        # The second worker's eviction accounts for the first worker's objects
+        await second.put("owner/b.jpg", None, b"b" * 400)
+        await second.put("owner/c.jpg", None, b"c" * 400)
+        on_disk = sum(path.stat().st_size for path in (tmp_path / "cache").glob("*/*/*"))
+        assert on_disk <= 1000
+
+        # An object evicted or invalidated by another worker is a miss
+        await first.invalidate("owner/c.jpg")
+        assert await second.get("owner/c.jpg") is None
+
+    @pytest.mark.asyncio
+    async def test_existing_objects_are_indexed_on_first_use(self, tmp_path):
+        directory = str(tmp_path / "cache")
+        await S3ObjectCache(directory, 1000, 400).put("owner/a.jpg", None, b"a" * 50)
+
+        restarted = S3ObjectCache(directory, 1000, 400)
+        await restarted.get("owner/missing.jpg")
+
+        assert restarted.stats()["size_bytes"] == 50
+
+
+class TestStorageServiceCache:
+    """Tests for S3 reads through the cache in StorageService."""
+
+    @pytest.fixture
+    def s3(self):
+        objects = {"owner/file.pdf": b"%PDF" + b"p" * 96}
+        s3 = MagicMock()
+        s3.get_object = AsyncMock(side_effect=lambda key: objects[key])
+        s3.open_object = AsyncMock(
+            side_effect=lambda key, *byte_range: S3ObjectStream(
+                S3Backend("bucket"), io.BytesIO(objects[key])
+            )
+        )
+        s3.delete_object = AsyncMock(side_effect=lambda key: objects.pop(key))
+        return s3
+
+    @pytest.fixture
+    def service(self, tmp_path, s3):
+        cache = S3ObjectCache(str(tmp_path / "cache"), max_bytes=10_000, max_object_bytes=1000)
+        with patch("app.services.storage_service.settings") as settings, patch(
+            "app.services.storage_service.get_s3_backend", return_value=s3
+        ), patch("app.services.storage_service.get_s3_cache", return_value=cache):
+            settings.storage_backend = "s3"
+            settings.s3_bucket_name = "bucket"
+            settings.s3_cache_enabled = True
+            service = StorageService(MagicMock())
+        return service
+
+    def record(self):
+        return SimpleNamespace(
+            storage_backend=StorageBackend.S3,
+            storage_path="owner/file.pdf",
+            size_bytes=100,
+            checksum=CHECKSUM,
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_are_served_locally(self, service, s3):
+        first = await service._download_from_s3("owner/file.pdf", CHECKSUM)
+        second = await service._download_from_s3("owner/file.pdf", CHECKSUM)
+
+        assert first == second
+        s3.get_object.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_streamed_download_populates_cache(self, service, s3):
+        download = await service.open_download(self.record())
+        content = b"".join([chunk async for chunk in download.chunks])
+
+        cached = await service.open_download(self.record(), "bytes=0-9")
+
+        s3.open_object.assert_awaited_once()
+        assert cached.chunks is None
+        assert cached.path.read_bytes() == content
+        assert cached.stat.st_size == 100
+
+    @pytest.mark.asyncio
+    async def test_ranged_miss_is_not_cached(self, service, s3):
+        download = await service.open_download(self.record(), "bytes=0-9")
+        [chunk async for chunk in download.chunks]
+
+        await service.open_download(self.record(), "bytes=0-9")
+
+        assert s3.open_object.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates(self, service):
+        await service._download_from_s3("owner/file.pdf", CHECKSUM)
+
+        await service._delete_from_s3("owner/file.pdf")
+
+        assert await service._s3_cache.get("owner/file.pdf", CHECKSUM) is None
+
+    @pytest.mark.asyncio
+    async def test_s3_errors_are_not_cached(self, service, s3):
+        s3.get_object.side_effect = S3BackendError("InternalError", "unavailable")
+
+        with pytest.raises(S3StorageError):
+            await service._download_from_s3("owner/file.pdf", CHECKSUM)
+
+        assert service._s3_cache.stats()["entries"] == 0
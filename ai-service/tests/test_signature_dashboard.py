@@ -0,0 +1,226 @@
+"""Tests for the signature dashboard aggregation and its cache."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import StaticPool, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache_tags import SIGNATURE_DASHBOARD_TAG, entity_tag
+from app.core.query_stats import instrument_engine
+from app.models.document import Document, DocumentStatus, DocumentType, Signature
+from app.schemas.document import DocumentCreate, SignatureCreate
+from app.services.document_service import DocumentService
+from tests.conftest import SQLITE_CREATE_DOCUMENT_TABLES_SQL
+
+NOW = datetime.now(timezone.utc)
+LAST_MONTH = NOW.replace(day=1, hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Session on a fresh in-memory database with the document tables."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    instrument_engine(engine)
+    async with engine.begin() as conn:
+        for statement in SQLITE_CREATE_DOCUMENT_TABLES_SQL.strip().split(";"):
+            statement = statement.strip()
+            if statement:
+                await conn.execute(text(statement))
+
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def redis():
+    """Redis client that misses on every read."""
+    redis = AsyncMock()
+    redis.get.return_value = None
+    with patch("app.core.cache.get_redis_client", AsyncMock(return_value=redis)), patch(
+        "app.core.cache.tag_keys", AsyncMock()
+    ):
+        yield redis
+
+
+def add_document(session, created_by, status, document_type=DocumentType.ENROLLMENT,
+                 created_at=NOW):
+    """Add a document."""
+    document = Document(
+        id=uuid4(),
+        type=document_type,
+        title=f"{document_type.value} {status.value}",
+        content_url="https://example.com/document.pdf",
+        status=status,
+        created_by=created_by,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    session.add(document)
+    return document
+
+
+def add_signature(session, document, signer_id, created_at=NOW):
+    """Add a signature of a document."""
+    signature = Signature(
+        id=uuid4(),
+        document_id=document.id,
+        signer_id=signer_id,
+        signature_image_url="https://example.com/signature.png",
+        ip_address="127.0.0.1",
+        timestamp=created_at,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    session.add(signature)
+    return signature
+
+
+class TestSignatureDashboard:
+    """Tests for DocumentService.get_signature_dashboard."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_is_aggregated_in_two_queries(self, session, redis, query_budget):
+        user_id = uuid4()
+        add_document(session, user_id, DocumentStatus.DRAFT)
+        add_document(session, user_id, DocumentStatus.PENDING)
+        add_document(session, user_id, DocumentStatus.PENDING, DocumentType.MEDICAL)
+        add_document(session, user_id, DocumentStatus.EXPIRED, created_at=LAST_MONTH)
+        signed = [
+            add_document(session, user_id, DocumentStatus.SIGNED, DocumentType.MEDICAL),
+            add_document(session, user_id, DocumentStatus.SIGNED, created_at=LAST_MONTH),
+        ]
+        add_document(session, uuid4(), DocumentStatus.SIGNED)
+        add_signature(session, signed[1], user_id, created_at=LAST_MONTH)
+        latest = add_signature(session, signed[0], user_id, created_at=NOW)
+        add_signature(session, signed[0], uuid4())
+        await session.commit()
+
+        with query_budget(max_queries=2):
+            dashboard = await DocumentService(session).get_signature_dashboard(
+                user_id=user_id, limit_recent=1
+            )
+
+        assert dashboard["summary"] == {
+            "total_documents": 6,
+            "pending_signatures": 2,
+            "signed_documents": 2,
+            "expired_documents": 1,
+            "draft_documents": 1,
+            "completion_rate": 40.0,
+            "documents_this_month": 4,
+            "signatures_this_month": 1,
+        }
+        assert sorted(
+            (row["status"], row["count"]) for row in dashboard["status_breakdown"]
+        ) == [("draft", 1), ("expired", 1), ("pending", 2), ("signed", 2)]
+        assert sorted(dashboard["type_breakdown"], key=lambda row: row["type"]) == [
+            {"type": "enrollment", "count": 4, "pending": 1, "signed": 1},
+            {"type": "medical", "count": 2, "pending": 1, "signed": 1},
+        ]
+        assert [activity["signer_id"] for activity in dashboard["recent_activity"]] == [
+            str(user_id)
+        ]
+        assert dashboard["recent_activity"][0]["document_id"] == str(latest.document_id)
+        assert dashboard["alerts"] == [
+            "You have 2 documents awaiting signature",
+            "1 document has expired",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_dashboard(self, session, redis):
+        for _ in range(2):
+            document = add_document(session, uuid4(), DocumentStatus.SIGNED)
+            add_signature(session, document, uuid4())
+        await session.commit()
+
+        dashboard = await DocumentService(session).get_signature_dashboard()
+
+        assert dashboard["summary"]["total_documents"] == 2
+        assert dashboard["summary"]["signatures_this_month"] == 2
+        assert len(dashboard["recent_activity"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_dashboard(self, session, redis):
+        dashboard = await DocumentService(session).get_signature_dashboard(user_id=uuid4())
+
+        assert dashboard["summary"]["total_documents"] == 0
+        assert dashboard["summary"]["signatures_this_month"] == 0
+        assert dashboard["summary"]["completion_rate"] == 0.0
+        assert dashboard["recent_activity"] == []
+        assert dashboard["alerts"] == []
+
+    @pytest.mark.asyncio
+    async def test_cached_dashboard_skips_the_database(self, session, redis, query_budget):
+        cached = {"summary": {"total_documents": 3}}
+        redis.get.return_value = json.dumps(cached)
+
+        with query_budget(max_queries=0):
+            dashboard = await DocumentService(session).get_signature_dashboard(user_id=uuid4())
+
+        assert dashboard == cached
+
+
+class TestSignatureDashboardInvalidation:
+    """Tests for dropping cached dashboards on document and signature changes."""
+
+    @pytest.mark.asyncio
+    async def test_document_creation_invalidates_creator_dashboard(self, session):
+        user_id = uuid4()
+
+        with patch(
+            "app.services.document_service.invalidate_tags", AsyncMock()
+        ) as invalidate:
+            await DocumentService(session).create_document(
+                DocumentCreate(
+                    type="enrollment",
+                    title="Enrollment",
+                    content_url="https://example.com/enrollment.pdf",
+                    created_by=user_id,
+                )
+            )
+
+        invalidate.assert_awaited_once_with(
+            SIGNATURE_DASHBOARD_TAG, entity_tag("signature_dashboard", user_id)
+        )
+
+    @pytest.mark.asyncio
+    async def test_signature_invalidates_creator_and_signer_dashboards(self, session):
+        creator_id, signer_id = uuid4(), uuid4()
+        document = add_document(session, creator_id, DocumentStatus.PENDING)
+        await session.commit()
+        service = DocumentService(session)
+
+        with patch.object(
+            service, "get_document_by_id", AsyncMock(return_value=document)
+        ), patch.object(
+            service, "get_signature_request_by_document", AsyncMock(return_value=None)
+        ), patch(
+            "app.services.document_service.invalidate_tags", AsyncMock()
+        ) as invalidate:
+            await service.create_signature(
+                SignatureCreate(
+                    document_id=document.id,
+                    signer_id=signer_id,
+                    signature_image_url="https://example.com/signature.png",
+                    ip_address="127.0.0.1",
+                )
+            )
+
+        invalidate.assert_awaited_once_with(
+            SIGNATURE_DASHBOARD_TAG,
+            entity_tag("signature_dashboard", creator_id),
+            entity_tag("signature_dashboard", signer_id),
+        )
+        assert document.status == DocumentStatus.SIGNED
@@ -0,0 +1,302 @@
+"""Tests for batch file operations."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import StaticPool, delete, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.storage import File, StorageBackend, StorageBlob
+from app.services.s3_backend import S3Backend
+from app.services.storage_service import StorageService
+from tests.conftest import SQLITE_CREATE_STORAGE_TABLES_SQL
+
+
+async def chunked(content: bytes, size: int = 1024):
+    """Yield content in chunks."""
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+def stored_files(root):
+    """Paths of the files under a storage root."""
+    return sorted(path for path in root.rglob("*") if path.is_file())
+
+
+def pdf(number: int) -> bytes:
+    """Distinct PDF content."""
+    return f"%PDF-1.4 {number:04d} ".encode() + b"a" * 1000
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Session on a fresh in-memory database with the storage tables."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        for statement in SQLITE_CREATE_STORAGE_TABLES_SQL.strip().split(";"):
+            statement = statement.strip()
+            if statement:
+                await conn.execute(text(statement))
+
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(session, tmp_path):
+    """StorageService on the local backend under a temporary directory."""
+    with patch("app.services.storage_service.settings") as settings:
+        settings.storage_backend = "local"
+        settings.local_storage_path = str(tmp_path)
+        settings.max_file_size_mb = 1
+        settings.storage_quota_mb = 10
+        settings.allowed_file_types = "application/pdf"
+        settings.s3_bucket_name = ""
+        settings.upload_chunk_size = 64 * 1024
+        service = StorageService(session)
+
+    return service
+
+
+async def upload(service, owner_id, number=0, filename="report.pdf", is_public=False):
+    """Upload a PDF."""
+    return await service.upload_stream(
+        owner_id, chunked(pdf(number)), filename, "application/pdf", is_public=is_public
+    )
+
+
+class TestLookups:
+    """Tests for the single-owner and single-file lookups."""
+
+    @pytest.mark.asyncio
+    async def test_get_file_by_id(self, service):
+        record = await upload(service, uuid4(), 1)
+
+        found = await service.get_file_by_id(record.id)
+
+        assert found is not None and found.id == record.id
+        assert await service.get_file_by_id(uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_list_files_of_owner(self, service):
+        owner_id = uuid4()
+        records = [await upload(service, owner_id, number) for number in range(3)]
+        await upload(service, uuid4(), 4)
+
+        files, total = await service.list_files(owner_id)
+
+        assert total == 3
+        assert {file_record.id for file_record in files} == {record.id for record in records}
+
+    @pytest.mark.asyncio
+    async def test_get_quota_reflects_charges(self, service):
+        owner_id = uuid4()
+        quota = await service.get_or_create_quota(owner_id)
+
+        record = await upload(service, owner_id, 1)
+
+        assert await service.get_quota(owner_id) is quota
+        assert quota.used_bytes == record.size_bytes
+        assert quota.file_count == 1
+
+
+class TestGetAccessibleFiles:
+    """Tests for StorageService.get_accessible_files."""
+
+    @pytest.mark.asyncio
+    async def test_returns_accessible_files_in_request_order(self, service):
+        owner_id, other_id = uuid4(), uuid4()
+        own = await upload(service, owner_id, 1)
+        public = await upload(service, other_id, 2, is_public=True)
+        private = await upload(service, other_id, 3)
+        missing = uuid4()
+
+        files = await service.get_accessible_files(
+            [public.id, missing, private.id, own.id, public.id], owner_id
+        )
+
+        assert list(files) == [public.id, own.id]
+
+    @pytest.mark.asyncio
+    async def test_require_ownership_excludes_public_files(self, service):
+        owner_id = uuid4()
+        own = await upload(service, owner_id, 1)
+        public = await upload(service, uuid4(), 2, is_public=True)
+
+        files = await service.get_accessible_files(
+            [own.id, public.id], owner_id, require_ownership=True
+        )
+
+        assert list(files) == [own.id]
+
+    @pytest.mark.asyncio
+    async def test_queries_once(self, service):
+        owner_id = uuid4()
+        records = [await upload(service, owner_id, number) for number in range(5)]
+
+        with patch.object(service.db, "execute", wraps=service.db.execute) as execute:
+            files = await service.get_accessible_files(
+                [record.id for record in records], owner_id
+            )
+
+        assert len(files) == 5
+        assert execute.await_count == 1
+
+
+class TestDeleteFiles:
+    """Tests for StorageService.delete_files."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_owned_files_and_refunds_quota(self, service, tmp_path):
+        owner_id, other_id = uuid4(), uuid4()
+        records = [await upload(service, owner_id, number) for number in range(3)]
+        foreign = await upload(service, other_id, 9, is_public=True)
+
+        with patch.object(service.db, "commit", wraps=service.db.commit) as commit, patch.object(
+            service, "collect_blob", wraps=service.collect_blob
+        ) as collect:
+            deleted = await service.delete_files(
+                [records[0].id, records[1].id, foreign.id, uuid4()], owner_id
+            )
+
+        assert deleted == [records[0].id, records[1].id]
+        # One commit for the records and quota, then one per collected blob
+        assert collect.await_count == 2
+        assert commit.await_count == 1 + collect.await_count
+        assert stored_files(tmp_path) == sorted(
+            [tmp_path / records[2].storage_path, tmp_path / foreign.storage_path]
+        )
+        quota = await service.get_quota(owner_id)
+        assert (quota.used_bytes, quota.file_count) == (records[2].size_bytes, 1)
+        remaining = await service.db.execute(select(File.id))
+        assert set(remaining.scalars().all()) == {records[2].id, foreign.id}
+
+    @pytest.mark.asyncio
+    async def test_shared_content_is_kept_and_refunded_once(self, service, tmp_path):
+        owner_id, other_id = uuid4(), uuid4()
+        first = await upload(service, owner_id, 1)
+        copy = await upload(service, owner_id, 1, filename="copy.pdf")
+        kept = await upload(service, owner_id, 1, filename="kept.pdf")
+        shared = await upload(service, other_id, 2)
+        own_shared = await upload(service, owner_id, 2)
+
+        deleted = await service.delete_files([first.id, copy.id, own_shared.id], owner_id)
+
+        assert len(deleted) == 3
+        # The owner keeps a copy of the first content; the second is still
+        # referenced by another owner
+        quota = await service.get_quota(owner_id)
+        assert (quota.used_bytes, quota.file_count) == (kept.size_bytes, 1)
+        blobs = await service.db.execute(
+            select(StorageBlob.id, StorageBlob.ref_count).execution_options(
+                populate_existing=True
+            )
+        )
+        assert dict(blobs.all()) == {first.blob_id: 1, shared.blob_id: 1}
+        assert len(stored_files(tmp_path)) == 2
+
+    @pytest.mark.asyncio
+    async def test_legacy_files_are_deleted(self, service, tmp_path):
+        owner_id = uuid4()
+        record = await upload(service, owner_id)
+        # A file stored before content was deduplicated
+        await service.db.execute(
+            update(File).where(File.id == record.id).values(blob_id=None)
+        )
+        await service.db.execute(delete(StorageBlob))
+        await service.db.commit()
+
+        assert await service.delete_files([record.id], owner_id) == [record.id]
+        assert stored_files(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_delete(self, service):
+        with patch.object(service.db, "commit", AsyncMock()) as commit:
+            assert await service.delete_files([uuid4()], uuid4()) == []
+
+        commit.assert_not_called()
+
+
+class TestGenerateSecureUrls:
+    """Tests for StorageService.generate_secure_urls."""
+
+    @pytest.mark.asyncio
+    async def test_local_files_are_signed(self, service):
+        owner_id = uuid4()
+        records = [await upload(service, owner_id, number) for number in range(2)]
+        file_ids = [records[1].id, uuid4(), records[0].id]
+
+        with patch("app.services.storage_service.settings") as settings:
+            settings.jwt_secret_key = "secret"
+            urls, expires_at = await service.generate_secure_urls(
+                file_ids, owner_id, 600, base_url="https://api.example.com"
+            )
+
+            assert list(urls) == [records[1].id, records[0].id]
+            for file_id, url in urls.items():
+                assert url.startswith(
+                    f"https://api.example.com/api/v1/storage/files/{file_id}/signed-download?"
+                )
+                expires = int(expires_at.timestamp())
+                signature = url.split("signature=")[1]
+                assert service.verify_local_signed_url(file_id, expires, signature)
+
+    @pytest.mark.asyncio
+    async def test_local_files_require_base_url(self, service):
+        owner_id = uuid4()
+        record = await upload(service, owner_id)
+
+        with pytest.raises(ValueError, match="base_url"):
+            await service.generate_secure_urls([record.id], owner_id)
+
+    @pytest.mark.asyncio
+    async def test_s3_urls_are_presigned_in_one_batch(self, service):
+        owner_id = uuid4()
+        records = [await upload(service, owner_id, number) for number in range(3)]
+        await service.db.execute(
+            update(File).where(File.owner_id == owner_id).values(storage_backend=StorageBackend.S3)
+        )
+        await service.db.commit()
+        service._s3 = MagicMock()
+        service._s3.presigned_urls = AsyncMock(
+            side_effect=lambda keys, expires_in: [f"https://s3/{key}" for key in keys]
+        )
+
+        urls, _ = await service.generate_secure_urls(
+            [record.id for record in records], owner_id, 900
+        )
+
+        service._s3.presigned_urls.assert_awaited_once()
+        assert urls == {record.id: f"https://s3/{record.storage_path}" for record in records}
+
+    @pytest.mark.asyncio
+    async def test_expiration_is_validated(self, service):
+        with pytest.raises(ValueError, match="expires_in_seconds"):
+            await service.generate_secure_urls([uuid4()], uuid4(), 30)
+
+
+class TestPresignedUrls:
+    """Tests for S3Backend.presigned_urls."""
+
+    @pytest.mark.asyncio
+    async def test_signs_every_key_in_order(self):
+        backend = S3Backend("bucket")
+        client = MagicMock()
+        client.generate_presigned_url.side_effect = (
+            lambda operation, Params, ExpiresIn: f"https://s3/{Params['Key']}?e={ExpiresIn}"
+        )
+        backend._get_client = AsyncMock(return_value=client)
+
+        urls = await backend.presigned_urls(["a.pdf", "b.pdf"], 60)
+
+        assert urls == ["https://s3/a.pdf?e=60", "https://s3/b.pdf?e=60"]
+        assert client.generate_presigned_url.call_count == 2
@@ -0,0 +1,245 @@
+"""Tests for content-addressed (deduplicated) file storage."""
+
+import hashlib
+import io
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from PIL import Image
+from sqlalchemy import StaticPool, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.storage import File, StorageBlob, ThumbnailSize
+from app.services.storage_service import StorageService
+from tests.conftest import SQLITE_CREATE_STORAGE_TABLES_SQL
+
+
+async def chunked(content: bytes, size: int = 1024):
+    """Yield content in chunks."""
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+def stored_files(root):
+    """Paths of the files under a storage root."""
+    return sorted(path for path in root.rglob("*") if path.is_file())
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Session on a fresh in-memory database with the storage tables."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        for statement in SQLITE_CREATE_STORAGE_TABLES_SQL.strip().split(";"):
+            statement = statement.strip()
+            if statement:
+                await conn.execute(text(statement))
+
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(session, tmp_path):
+    """StorageService on the local backend under a temporary directory."""
+    with patch("app.services.storage_service.settings") as settings:
+        settings.storage_backend = "local"
+        settings.local_storage_path = str(tmp_path)
+        settings.max_file_size_mb = 1
+        settings.storage_quota_mb = 10
+        settings.allowed_file_types = "image/png,application/pdf"
+        settings.s3_bucket_name = ""
+        settings.upload_chunk_size = 64 * 1024
+        service = StorageService(session)
+
+    return service
+
+
+PDF = b"%PDF-1.4 " + b"a" * 3000
+
+
+async def upload(service, owner_id, content=PDF, filename="report.pdf"):
+    """Upload content as a PDF."""
+    return await service.upload_stream(owner_id, chunked(content), filename, "application/pdf")
+
+
+async def get_blob(service, blob_id):
+    """Reload a blob from the database."""
+    result = await service.db.execute(
+        select(StorageBlob)
+        .where(StorageBlob.id == blob_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+class TestDeduplicatedUploads:
+    """Tests for uploads of content that is already stored."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_content_is_stored_once(self, service, tmp_path):
+        first = await upload(service, uuid4())
+        second = await upload(service, uuid4(), filename="copy.pdf")
+
+        assert first.blob_id == second.blob_id
+        assert first.storage_path == second.storage_path
+        assert second.checksum == hashlib.sha256(PDF).hexdigest()
+        assert stored_files(tmp_path) == [tmp_path / first.storage_path]
+        blob = await get_blob(service, first.blob_id)
+        assert (blob.ref_count, blob.size_bytes) == (2, len(PDF))
+
+    @pytest.mark.asyncio
+    async def test_duplicate_content_is_not_stored_again(self, service):
+        await upload(service, uuid4())
+
+        with patch.object(service, "_delete_stored", AsyncMock()) as delete_stored:
+            record = await upload(service, uuid4(), filename="copy.pdf")
+
+        # Discarded before it was moved into place: nothing to delete
+        delete_stored.assert_not_called()
+        assert (await get_blob(service, record.blob_id)).ref_count == 2
+
+    @pytest.mark.asyncio
+    async def test_owner_is_charged_once_per_content(self, service):
+        owner_id = uuid4()
+        await upload(service, owner_id)
+        await upload(service, owner_id, filename="again.pdf")
+
+        quota = await service.get_quota(owner_id)
+        assert (quota.used_bytes, quota.file_count) == (len(PDF), 2)
+
+
+class TestCreateFileFromChecksum:
+    """Tests for StorageService.create_file_from_checksum."""
+
+    @pytest.mark.asyncio
+    async def test_owner_reuses_own_content(self, service):
+        owner_id = uuid4()
+        original = await upload(service, owner_id)
+
+        record = await service.create_file_from_checksum(
+            owner_id, original.checksum.upper(), "copy.pdf", "application/pdf"
+        )
+
+        assert record.blob_id == original.blob_id
+        assert record.storage_path == original.storage_path
+        assert record.size_bytes == len(PDF)
+        assert (await get_blob(service, original.blob_id)).ref_count == 2
+        quota = await service.get_quota(owner_id)
+        assert (quota.used_bytes, quota.file_count) == (len(PDF), 2)
+
+    @pytest.mark.asyncio
+    async def test_other_owners_content_is_not_shared(self, service):
+        original = await upload(service, uuid4())
+
+        record = await service.create_file_from_checksum(
+            uuid4(), original.checksum, "copy.pdf", "application/pdf"
+        )
+
+        assert record is None
+        assert (await get_blob(service, original.blob_id)).ref_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_content_or_other_type(self, service):
+        owner_id = uuid4()
+        original = await upload(service, owner_id)
+
+        assert await service.create_file_from_checksum(
+            owner_id, "0" * 64, "copy.pdf", "application/pdf"
+        ) is None
+        assert await service.create_file_from_checksum(
+            owner_id, original.checksum, "copy.png", "image/png"
+        ) is None
+
+
+class TestBlobCollection:
+    """Tests for deleting files and collecting unreferenced blobs."""
+
+    @pytest.mark.asyncio
+    async def test_content_is_deleted_with_last_reference(self, service, tmp_path):
+        first_owner, second_owner = uuid4(), uuid4()
+        first = await upload(service, first_owner)
+        second = await upload(service, second_owner)
+
+        assert await service.delete_file(first.id, first_owner)
+        assert (tmp_path / second.storage_path).is_file()
+        assert (await get_blob(service, first.blob_id)).ref_count == 1
+
+        assert await service.delete_file(second.id, second_owner)
+        assert stored_files(tmp_path) == []
+        assert await get_blob(service, first.blob_id) is None
+
+    @pytest.mark.asyncio
+    async def test_refund_waits_for_owners_last_copy(self, service):
+        owner_id = uuid4()
+        first = await upload(service, owner_id)
+        second = await upload(service, owner_id, filename="again.pdf")
+
+        await service.delete_file(first.id, owner_id)
+        quota = await service.get_quota(owner_id)
+        assert (quota.used_bytes, quota.file_count) == (len(PDF), 1)
+
+        await service.delete_file(second.id, owner_id)
+        quota = await service.get_quota(owner_id)
+        assert (quota.used_bytes, quota.file_count) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_orphaned_blobs_are_collected_after_grace_period(self, service, tmp_path):
+        record = await upload(service, uuid4())
+        # Leave the blob unreferenced, as if the worker stopped before collecting it
+        await service.db.execute(
+            update(StorageBlob)
+            .where(StorageBlob.id == record.blob_id)
+            .values(ref_count=0, orphaned_at=datetime.now(timezone.utc) - timedelta(minutes=5))
+        )
+        await service.db.commit()
+
+        assert await service.collect_orphaned_blobs(grace_seconds=3600) == 0
+        assert (tmp_path / record.storage_path).is_file()
+
+        assert await service.collect_orphaned_blobs(grace_seconds=60) == 1
+        assert stored_files(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_referenced_blob_is_not_collected(self, service, tmp_path):
+        record = await upload(service, uuid4())
+
+        assert not await service.collect_blob(record.blob_id)
+        assert (tmp_path / record.storage_path).is_file()
+
+
+class TestSharedThumbnails:
+    """Tests for thumbnails of files sharing content."""
+
+    @pytest.mark.asyncio
+    async def test_thumbnails_are_rendered_once_per_content(self, service, tmp_path):
+        output = io.BytesIO()
+        Image.new("RGB", (400, 200), "blue").save(output, format="PNG")
+        content = output.getvalue()
+        first = await service.upload_stream(
+            uuid4(), chunked(content), "a.png", "image/png"
+        )
+        second = await service.upload_stream(
+            uuid4(), chunked(content), "b.png", "image/png"
+        )
+
+        rendered = await service.generate_thumbnails(first.id, [ThumbnailSize.SMALL])
+        with patch("app.services.storage_service.create_thumbnails_async") as render:
+            shared = await service.generate_thumbnails(second.id, [ThumbnailSize.SMALL])
+
+        render.assert_not_called()
+        assert shared[0].file_id == second.id
+        assert shared[0].storage_path == rendered[0].storage_path
+        assert (tmp_path / shared[0].storage_path).is_file()
+        rows = await service.db.execute(select(File).where(File.blob_id == first.blob_id))
+        assert len(rows.scalars().all()) == 2
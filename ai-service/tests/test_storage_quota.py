@@ -0,0 +1,252 @@
+"""Tests for atomic storage quota accounting and reconciliation."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.storage import File, StorageQuota
+from app.services.quota_reconciler import QuotaReconciler
+from app.services.storage_service import QuotaExceededError, StorageService
+from tests.conftest import SQLITE_CREATE_STORAGE_TABLES_SQL
+
+FILE_SIZE = 1000
+
+
+async def chunked(content: bytes, size: int = 256):
+    """Yield content in chunks, letting other uploads run in between."""
+    for start in range(0, len(content), size):
+        await asyncio.sleep(0)
+        yield content[start:start + size]
+
+
+def pdf(number: int) -> bytes:
+    """Distinct PDF content of FILE_SIZE bytes."""
+    header = f"%PDF-1.4 {number:04d} ".encode()
+    return header + b"a" * (FILE_SIZE - len(header))
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Session factory on a SQLite file, so each session has its own connection."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'storage.db'}",
+        connect_args={"timeout": 30},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text("PRAGMA journal_mode=WAL"))
+        for statement in SQLITE_CREATE_STORAGE_TABLES_SQL.strip().split(";"):
+            statement = statement.strip()
+            if statement:
+                await conn.execute(text(statement))
+
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    """Build StorageServices on the local backend under a temporary directory."""
+    storage_path = tmp_path / "files"
+
+    def make(session: AsyncSession) -> StorageService:
+        with patch("app.services.storage_service.settings") as settings:
+            settings.storage_backend = "local"
+            settings.local_storage_path = str(storage_path)
+            settings.max_file_size_mb = 1
+            settings.storage_quota_mb = 10
+            settings.allowed_file_types = "application/pdf"
+            settings.s3_bucket_name = ""
+            settings.upload_chunk_size = 64 * 1024
+            service = StorageService(session)
+        return service
+
+    make.storage_path = storage_path
+    return make
+
+
+async def create_quota(session_factory, make_service, owner_id, quota_bytes):
+    """Create an owner's quota with a limit."""
+    async with session_factory() as session:
+        service = make_service(session)
+        await service.get_or_create_quota(owner_id)
+        await service.update_quota(owner_id, quota_bytes)
+
+
+async def load_quota(session_factory, owner_id):
+    """Read an owner's quota."""
+    async with session_factory() as session:
+        result = await session.execute(
+            select(StorageQuota).where(StorageQuota.owner_id == owner_id)
+        )
+        return result.scalar_one()
+
+
+class TestAtomicQuota:
+    """Tests for quota charges under concurrent uploads."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_uploads_cannot_exceed_quota(self, session_factory, make_service):
+        owner_id = uuid4()
+        await create_quota(session_factory, make_service, owner_id, 5 * FILE_SIZE + 500)
+
+        async def upload(number):
+            async with session_factory() as session:
+                service = make_service(session)
+                return await service.upload_stream(
+                    owner_id, chunked(pdf(number)), f"{number}.pdf", "application/pdf"
+                )
+
+        results = await asyncio.gather(
+            *(upload(number) for number in range(12)), return_exceptions=True
+        )
+
+        uploaded = [result for result in results if isinstance(result, File)]
+        rejected = [result for result in results if isinstance(result, QuotaExceededError)]
+        assert (len(uploaded), len(rejected)) == (5, 7)
+        quota = await load_quota(session_factory, owner_id)
+        assert (quota.used_bytes, quota.file_count) == (5 * FILE_SIZE, 5)
+        root = make_service.storage_path
+        stored = sorted(path for path in root.rglob("*") if path.is_file())
+        assert stored == sorted(root / record.storage_path for record in uploaded)
+
+    @pytest.mark.asyncio
+    async def test_parallel_uploads_of_same_content_are_charged_once(
+        self, session_factory, make_service
+    ):
+        owner_id = uuid4()
+        await create_quota(session_factory, make_service, owner_id, 10 * FILE_SIZE)
+
+        async def upload(number):
+            async with session_factory() as session:
+                return await make_service(session).upload_stream(
+                    owner_id, chunked(pdf(1)), f"{number}.pdf", "application/pdf"
+                )
+
+        records = await asyncio.gather(*(upload(number) for number in range(4)))
+
+        assert len({record.blob_id for record in records}) == 1
+        quota = await load_quota(session_factory, owner_id)
+        assert (quota.used_bytes, quota.file_count) == (FILE_SIZE, 4)
+        assert len([path for path in make_service.storage_path.rglob("*") if path.is_file()]) == 1
+
+    @pytest.mark.asyncio
+    async def test_parallel_deletes_of_same_content_refund_once(
+        self, session_factory, make_service
+    ):
+        owner_id = uuid4()
+        await create_quota(session_factory, make_service, owner_id, 10 * FILE_SIZE)
+        records = []
+        for number in range(3):
+            async with session_factory() as session:
+                records.append(await make_service(session).upload_stream(
+                    owner_id, chunked(pdf(1)), f"{number}.pdf", "application/pdf"
+                ))
+
+        async def delete(record):
+            async with session_factory() as session:
+                await make_service(session).delete_file(record.id, owner_id)
+
+        await asyncio.gather(*(delete(record) for record in records))
+
+        quota = await load_quota(session_factory, owner_id)
+        assert (quota.used_bytes, quota.file_count) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_parallel_deletes_refund_exactly(self, session_factory, make_service):
+        owner_id = uuid4()
+        await create_quota(session_factory, make_service, owner_id, 10 * FILE_SIZE)
+        records = []
+        for number in range(6):
+            async with session_factory() as session:
+                records.append(await make_service(session).upload_stream(
+                    owner_id, chunked(pdf(number)), f"{number}.pdf", "application/pdf"
+                ))
+
+        async def delete(record):
+            async with session_factory() as session:
+                await make_service(session).delete_file(record.id, owner_id)
+
+        await asyncio.gather(*(delete(record) for record in records[:4]))
+
+        quota = await load_quota(session_factory, owner_id)
+        assert (quota.used_bytes, quota.file_count) == (2 * FILE_SIZE, 2)
+
+    @pytest.mark.asyncio
+    async def test_charge_with_no_bytes_ignores_limit(self, session_factory, make_service):
+        owner_id = uuid4()
+        await create_quota(session_factory, make_service, owner_id, FILE_SIZE)
+        async with session_factory() as session:
+            service = make_service(session)
+            await session.execute(
+                update(StorageQuota)
+                .where(StorageQuota.owner_id == owner_id)
+                .values(used_bytes=2 * FILE_SIZE)
+            )
+
+            assert not await service._charge_quota(owner_id, 1)
+            assert await service._charge_quota(owner_id, 0)
+            await session.commit()
+
+        quota = await load_quota(session_factory, owner_id)
+        assert (quota.used_bytes, quota.file_count) == (2 * FILE_SIZE, 1)
+
+
+class TestQuotaReconciliation:
+    """Tests for StorageService.reconcile_quotas."""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_quotas_are_recounted(self, session_factory, make_service):
+        owner_id, idle_owner_id = uuid4(), uuid4()
+        await create_quota(session_factory, make_service, idle_owner_id, FILE_SIZE)
+        await create_quota(session_factory, make_service, owner_id, 10 * FILE_SIZE)
+        async with session_factory() as session:
+            service = make_service(session)
+            await service.upload_stream(owner_id, chunked(pdf(1)), "a.pdf", "application/pdf")
+            await service.upload_stream(owner_id, chunked(pdf(1)), "b.pdf", "application/pdf")
+            await service.upload_stream(owner_id, chunked(pdf(2)), "c.pdf", "application/pdf")
+
+            # Nothing drifted: shared content is counted once either way
+            assert await service.reconcile_quotas() == 0
+            with patch.object(service, "recalculate_quota", AsyncMock()) as recalculate:
+                assert await service.reconcile_quotas() == 0
+            recalculate.assert_not_called()
+
+            # Usage drifts after the last reconciliation, e.g. a file was
+            # removed outside the service
+            await session.execute(
+                update(StorageQuota)
+                .where(StorageQuota.owner_id == owner_id)
+                .values(
+                    used_bytes=123,
+                    reconciled_at=datetime.now(timezone.utc) - timedelta(hours=1),
+                )
+            )
+            await session.commit()
+
+            assert await service.reconcile_quotas() == 1
+
+        quota = await load_quota(session_factory, owner_id)
+        assert (quota.used_bytes, quota.file_count) == (2 * FILE_SIZE, 3)
+        assert quota.reconciled_at is not None
+
+    @pytest.mark.asyncio
+    async def test_reconciler_runs_a_batch(self):
+        service = AsyncMock()
+        service.reconcile_quotas.return_value = 2
+        session = AsyncMock()
+        reconciler = QuotaReconciler(interval_seconds=60, batch_size=50)
+
+        with patch("app.database.AsyncSessionLocal", return_value=session), patch(
+            "app.services.storage_service.StorageService", return_value=service
+        ):
+            assert await reconciler.run_once() == 2
+
+        service.reconcile_quotas.assert_awaited_once_with(50)
+        assert reconciler.corrected == 2
@@ -0,0 +1,165 @@
+"""Tests for the single-decode thumbnail pipeline."""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
+
+from app.models.storage import StorageBackend, ThumbnailSize
+from app.services.image_processing import create_thumbnails, create_thumbnails_async
+from app.services.storage_service import (
+    InvalidFileTypeError,
+    StorageService,
+    generate_thumbnails_in_background,
+)
+
+
+def image_bytes(size, image_format="JPEG", mode="RGB"):
+    """Encode a solid image of the given size."""
+    output = io.BytesIO()
+    Image.new(mode, size, "red").save(output, format=image_format)
+    return output.getvalue()
+
+
+class TestCreateThumbnails:
+    """Tests for create_thumbnails."""
+
+    def test_sizes_keep_order_and_aspect_ratio(self):
+        results = create_thumbnails(image_bytes((2000, 1000)), [64, 256, 128], "image/jpeg")
+
+        assert [(width, height) for _, width, height in results] == [
+            (64, 32),
+            (256, 128),
+            (128, 64),
+        ]
+        for content, width, height in results:
+            with Image.open(io.BytesIO(content)) as image:
+                assert image.format == "JPEG"
+                assert image.size == (width, height)
+
+    def test_jpeg_is_drafted_and_sizes_cascade(self):
+        draft = JpegImageFile.draft
+        resize = Image.Image.resize
+        drafts = []
+        resized_from = []
+
+        def record_draft(image, mode, size):
+            drafts.append(size)
+            return draft(image, mode, size)
+
+        def record_resize(image, size, *args, **kwargs):
+            resized_from.append(image.size)
+            return resize(image, size, *args, **kwargs)
+
+        with patch.object(JpegImageFile, "draft", record_draft), patch.object(
+            Image.Image, "resize", record_resize
+        ):
+            create_thumbnails(image_bytes((2048, 1024)), [64, 128, 256], "image/jpeg")
+
+        assert drafts == [(256, 128)]
+        # Decoded at 1/8 scale, already the large size, then medium -> small
+        assert resized_from == [(256, 128), (128, 64)]
+
+    def test_png_with_alpha_to_jpeg_and_upscaling(self):
+        results = create_thumbnails(
+            image_bytes((8, 4), "PNG", "RGBA"), [16, 64], "image/jpeg"
+        )
+
+        assert [(width, height) for _, width, height in results] == [(16, 8), (64, 32)]
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self):
+        results = await create_thumbnails_async(
+            image_bytes((300, 300), "PNG"), [64, 128], "image/png"
+        )
+
+        assert [width for _, width, _ in results] == [64, 128]
+
+
+class TestGenerateThumbnails:
+    """Tests for StorageService.generate_thumbnails."""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        with patch("app.services.storage_service.settings") as settings:
+            settings.storage_backend = "local"
+            settings.local_storage_path = str(tmp_path)
+            db = MagicMock()
+            db.commit = AsyncMock()
+            db.refresh = AsyncMock()
+            service = StorageService(db)
+        return service
+
+    def file_record(self, service, tmp_path, content_type="image/jpeg", thumbnails=()):
+        owner_id = uuid4()
+        (tmp_path / str(owner_id)).mkdir()
+        (tmp_path / str(owner_id) / "photo.jpg").write_bytes(image_bytes((1000, 500)))
+        record = SimpleNamespace(
+            id=uuid4(),
+            owner_id=owner_id,
+            filename="photo.jpg",
+            content_type=content_type,
+            storage_backend=StorageBackend.LOCAL,
+            storage_path=f"{owner_id}/photo.jpg",
+            blob_id=None,
+            thumbnails=list(thumbnails),
+        )
+        service.get_file_by_id = AsyncMock(return_value=record)
+        return record
+
+    @pytest.mark.asyncio
+    async def test_missing_sizes_are_made_together(self, service, tmp_path):
+        existing = SimpleNamespace(size=ThumbnailSize.SMALL)
+        record = self.file_record(service, tmp_path, thumbnails=[existing])
+
+        with patch(
+            "app.services.storage_service.create_thumbnails_async",
+            wraps=create_thumbnails_async,
+        ) as render:
+            thumbnails = await service.generate_all_thumbnails(record.id)
+
+        render.assert_awaited_once()
+        assert render.await_args.args[1] == [128, 256]
+        assert thumbnails[0] is existing
+        assert [(thumb.size, thumb.width) for thumb in thumbnails[1:]] == [
+            (ThumbnailSize.MEDIUM, 128),
+            (ThumbnailSize.LARGE, 256),
+        ]
+        for thumb in thumbnails[1:]:
+            assert (tmp_path / thumb.storage_path).is_file()
+        assert service.db.add.call_count == 2
+        service.db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_existing_sizes_skip_rendering(self, service, tmp_path):
+        existing = SimpleNamespace(size=ThumbnailSize.MEDIUM)
+        record = self.file_record(service, tmp_path, thumbnails=[existing])
+
+        with patch("app.services.storage_service.create_thumbnails_async") as render:
+            thumbnail = await service.generate_thumbnail(record.id, ThumbnailSize.MEDIUM)
+
+        assert thumbnail is existing
+        render.assert_not_called()
+        service.db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_non_image_is_rejected(self, service, tmp_path):
+        record = self.file_record(service, tmp_path, content_type="application/pdf")
+
+        with pytest.raises(InvalidFileTypeError):
+            await service.generate_all_thumbnails(record.id)
+
+    @pytest.mark.asyncio
+    async def test_background_job_logs_failures(self, caplog):
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(side_effect=RuntimeError("database down"))
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.database.AsyncSessionLocal", return_value=session):
+            await generate_thumbnails_in_background(uuid4())
+
+        assert "database down" in caplog.text
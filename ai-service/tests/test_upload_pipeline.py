@@ -0,0 +1,346 @@
+"""Tests for the streaming upload pipeline."""
+
+import asyncio
+import hashlib
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.storage_service import (
+    FileTooLargeError,
+    InvalidFileTypeError,
+    QuotaExceededError,
+    StorageService,
+)
+from app.services.upload_pipeline import (
+    ContentTypeMismatchError,
+    LocalFileSink,
+    S3MultipartSink,
+    UploadTooLargeError,
+    iter_bytes,
+    sniff_content_type,
+    stream_upload,
+)
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 8
+
+
+class FakeS3Backend:
+    """S3 backend recording calls and the number of parts in flight."""
+
+    def __init__(self, fail_part: int = 0) -> None:
+        self.objects = {}
+        self.parts = {}
+        self.completed = None
+        self.aborted = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_part = fail_part
+
+    async def put_object(self, key, body, content_type):
+        self.objects[key] = body
+
+    async def create_multipart_upload(self, key, content_type):
+        return "upload-1"
+
+    async def upload_part(self, key, upload_id, part_number, body):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if part_number == self.fail_part:
+                raise RuntimeError("part failed")
+            self.parts[part_number] = body
+            return f"etag-{part_number}"
+        finally:
+            self.in_flight -= 1
+
+    async def complete_multipart_upload(self, key, upload_id, etags):
+        self.completed = etags
+        self.objects[key] = b"".join(self.parts[n] for n in sorted(self.parts))
+
+    async def abort_multipart_upload(self, key, upload_id):
+        self.aborted = True
+
+
+async def chunked(content: bytes, size: int = 4):
+    async for chunk in iter_bytes(content, size):
+        yield chunk
+
+
+def s3_sink(backend: FakeS3Backend, part_size: int = 10, max_parallel: int = 2):
+    sink = S3MultipartSink(backend, "owner/file.bin", "application/pdf", max_parallel=max_parallel)
+    sink.part_size = part_size
+    return sink
+
+
+class TestSniffing:
+    """Tests for content type sniffing."""
+
+    @pytest.mark.parametrize(
+        "head, expected",
+        [
+            (b"\xff\xd8\xff\xe0" + b"\x00" * 8, "image/jpeg"),
+            (PNG_HEADER, "image/png"),
+            (b"GIF89a" + b"\x00" * 6, "image/gif"),
+            (b"RIFF\x00\x00\x00\x00WEBP", "image/webp"),
+            (b"%PDF-1.7\n", "application/pdf"),
+            (b"plain text file", None),
+        ],
+    )
+    def test_signatures(self, head, expected):
+        assert sniff_content_type(head) == expected
+
+
+class TestLocalStreaming:
+    """Tests for streaming uploads to local storage."""
+
+    @pytest.mark.asyncio
+    async def test_streams_to_file_with_checksum(self, tmp_path):
+        content = PNG_HEADER + b"x" * 1000
+
+        result = await stream_upload(
+            chunked(content, 64), LocalFileSink(tmp_path, "owner/a.png"), 2000, "image/png"
+        )
+
+        assert (tmp_path / "owner" / "a.png").read_bytes() == content
+        assert result.storage_path == "owner/a.png"
+        assert result.size_bytes == len(content)
+        assert result.checksum == hashlib.sha256(content).hexdigest()
+        assert result.detected_content_type == "image/png"
+        assert list((tmp_path / "owner").iterdir()) == [tmp_path / "owner" / "a.png"]
+
+    @pytest.mark.asyncio
+    async def test_too_large_stops_and_cleans_up(self, tmp_path):
+        chunks_read = 0
+
+        async def chunks():
+            nonlocal chunks_read
+            while True:
+                chunks_read += 1
+                yield b"x" * 10
+
+        with pytest.raises(UploadTooLargeError) as raised:
+            await stream_upload(chunks(), LocalFileSink(tmp_path, "owner/a.bin"), 95)
+
+        assert raised.value.size == 100
+        assert chunks_read == 10
+        assert list((tmp_path / "owner").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_content_type_mismatch_is_rejected(self, tmp_path):
+        with pytest.raises(ContentTypeMismatchError) as raised:
+            await stream_upload(
+                chunked(PNG_HEADER * 4), LocalFileSink(tmp_path, "a.jpg"), 1000, "image/jpeg"
+            )
+
+        assert raised.value.detected == "image/png"
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_unrecognized_content_keeps_declared_type(self, tmp_path):
+        result = await stream_upload(
+            chunked(b"short"), LocalFileSink(tmp_path, "a.pdf"), 100, "application/pdf"
+        )
+
+        assert result.detected_content_type is None
+        assert (tmp_path / "a.pdf").read_bytes() == b"short"
+
+    @pytest.mark.asyncio
+    async def test_empty_upload(self, tmp_path):
+        result = await stream_upload(chunked(b""), LocalFileSink(tmp_path, "empty.txt"), 100)
+
+        assert result.size_bytes == 0
+        assert (tmp_path / "empty.txt").read_bytes() == b""
+
+
+class TestS3Streaming:
+    """Tests for streaming uploads to S3."""
+
+    @pytest.mark.asyncio
+    async def test_small_file_uses_single_put(self):
+        backend = FakeS3Backend()
+
+        await stream_upload(chunked(b"%PDF-1.7 small"), s3_sink(backend, part_size=100), 1000)
+
+        assert backend.objects["owner/file.bin"] == b"%PDF-1.7 small"
+        assert backend.completed is None
+
+    @pytest.mark.asyncio
+    async def test_large_file_uses_parallel_parts(self):
+        backend = FakeS3Backend()
+        content = bytes(range(256)) * 2
+
+        result = await stream_upload(chunked(content, 7), s3_sink(backend, part_size=50), 1000)
+
+        assert backend.objects["owner/file.bin"] == content
+        assert backend.completed == [f"etag-{n}" for n in range(1, 12)]
+        assert len(backend.parts[11]) == len(content) - 500
+        assert 1 < backend.max_in_flight <= 2
+        assert result.checksum == hashlib.sha256(content).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_failed_part_aborts_upload(self):
+        backend = FakeS3Backend(fail_part=2)
+
+        with pytest.raises(RuntimeError, match="part failed"):
+            await stream_upload(chunked(b"y" * 200, 10), s3_sink(backend, part_size=20), 1000)
+
+        assert backend.aborted
+        assert backend.completed is None
+
+    @pytest.mark.asyncio
+    async def test_too_large_aborts_multipart_upload(self):
+        backend = FakeS3Backend()
+
+        with pytest.raises(UploadTooLargeError):
+            await stream_upload(chunked(b"z" * 100, 10), s3_sink(backend, part_size=20), 50)
+
+        assert backend.aborted
+
+
+class TestStoredContent:
+    """Tests for discarding uploads of content that is already stored."""
+
+    @pytest.mark.asyncio
+    async def test_stored_content_is_not_moved_into_place(self, tmp_path):
+        content = b"%PDF-1.7 " + b"x" * 100
+        is_stored = AsyncMock(return_value=True)
+
+        result = await stream_upload(
+            chunked(content), LocalFileSink(tmp_path, "owner/a.pdf"), 1000, is_stored=is_stored
+        )
+
+        is_stored.assert_awaited_once_with(hashlib.sha256(content).hexdigest())
+        assert result.storage_path is None
+        assert result.size_bytes == len(content)
+        assert list((tmp_path / "owner").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_stored_content_is_not_put_to_s3(self):
+        backend = FakeS3Backend()
+
+        result = await stream_upload(
+            chunked(b"%PDF-1.7 small"),
+            s3_sink(backend, part_size=100),
+            1000,
+            is_stored=AsyncMock(return_value=True),
+        )
+
+        assert result.storage_path is None
+        assert backend.objects == {}
+
+    @pytest.mark.asyncio
+    async def test_new_content_is_committed(self):
+        backend = FakeS3Backend()
+
+        result = await stream_upload(
+            chunked(b"%PDF-1.7 small"),
+            s3_sink(backend, part_size=100),
+            1000,
+            is_stored=AsyncMock(return_value=False),
+        )
+
+        assert result.storage_path == "owner/file.bin"
+        assert backend.objects["owner/file.bin"] == b"%PDF-1.7 small"
+
+
+class TestStorageServiceStreaming:
+    """Tests for StorageService.upload_stream."""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        with patch("app.services.storage_service.settings") as settings:
+            settings.storage_backend = "local"
+            settings.local_storage_path = str(tmp_path)
+            settings.max_file_size_mb = 1
+            settings.storage_quota_mb = 10
+            settings.allowed_file_types = "image/png,application/pdf"
+            settings.s3_bucket_name = ""
+            settings.upload_chunk_size = 64 * 1024
+            db = MagicMock()
+            db.commit = AsyncMock()
+            db.rollback = AsyncMock()
+            db.refresh = AsyncMock()
+            service = StorageService(db)
+        # Content deduplication and quota accounting are covered in
+        # test_storage_dedup.py and test_storage_quota.py
+        service._charge_quota = AsyncMock(return_value=True)
+        service._find_blob = AsyncMock(return_value=None)
+        service._store_blob = AsyncMock(
+            side_effect=lambda upload, content_type: SimpleNamespace(
+                id=uuid4(), storage_path=upload.storage_path
+            )
+        )
+        service._owner_has_blob = AsyncMock(return_value=False)
+        return service
+
+    def quota(self, service, used: int, total: int):
+        quota = SimpleNamespace(quota_bytes=total, used_bytes=used, file_count=0)
+        service.get_or_create_quota = AsyncMock(return_value=quota)
+        return quota
+
+    @pytest.mark.asyncio
+    async def test_upload_stream_stores_file_and_record(self, service, tmp_path):
+        self.quota(service, used=0, total=10_000)
+        owner_id = uuid4()
+        content = b"%PDF-1.4 " + b"a" * 500
+
+        record = await service.upload_stream(
+            owner_id, chunked(content, 100), "report.PDF", "application/pdf"
+        )
+
+        assert (tmp_path / record.storage_path).read_bytes() == content
+        assert record.storage_path == f"{owner_id}/{record.id}.pdf"
+        assert record.size_bytes == len(content)
+        assert record.checksum == hashlib.sha256(content).hexdigest()
+        service._charge_quota.assert_awaited_once_with(owner_id, len(content))
+        service.db.add.assert_called_once_with(record)
+        service.db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_quota_is_enforced_while_streaming(self, service, tmp_path):
+        self.quota(service, used=900, total=1000)
+
+        with pytest.raises(QuotaExceededError):
+            await service.upload_stream(
+                uuid4(), chunked(b"x" * 500, 50), "a.pdf", "application/pdf"
+            )
+
+        service.db.add.assert_not_called()
+        assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+
+    @pytest.mark.asyncio
+    async def test_quota_taken_by_concurrent_upload_is_rolled_back(self, service, tmp_path):
+        self.quota(service, used=0, total=10_000)
+        service._charge_quota.return_value = False
+
+        with pytest.raises(QuotaExceededError):
+            await service.upload_stream(
+                uuid4(), chunked(b"%PDF-1.4 " + b"a" * 500, 100), "a.pdf", "application/pdf"
+            )
+
+        service.db.rollback.assert_awaited_once()
+        service.db.commit.assert_not_awaited()
+        assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+
+    @pytest.mark.asyncio
+    async def test_file_size_limit(self, service):
+        self.quota(service, used=0, total=10 * 1024 * 1024)
+
+        with pytest.raises(FileTooLargeError):
+            await service.upload_stream(
+                uuid4(), chunked(b"x" * (1024 * 1024 + 1), 64 * 1024), "a.pdf", "application/pdf"
+            )
+
+    @pytest.mark.asyncio
+    async def test_disallowed_and_mismatched_types(self, service):
+        self.quota(service, used=0, total=10_000)
+
+        with pytest.raises(InvalidFileTypeError):
+            await service.upload_file(uuid4(), b"data", "a.exe", "application/x-msdownload")
+        with pytest.raises(InvalidFileTypeError, match="not the declared"):
+            await service.upload_file(uuid4(), PNG_HEADER, "a.pdf", "application/pdf")
+        service.db.add.assert_not_called()